@@ -11,6 +11,7 @@ from pdf_exporter import create_pdf_from_html
 from html_generator import generate_preview_from_llm_responses
 import json
 import uuid
+from io import BytesIO
 from datetime import datetime
 import logging
 from pathlib import Path
@@ -23,6 +24,7 @@ from utils.request_correlation import (
     start_request, end_request, get_current_request_id, 
     correlation_manager, set_metadata
 )
+from utils.tracing import get_tracer, trace_request, trace_span
 from utils.memory_manager import memory_manager, get_memory_status, estimate_document_memory_mb
 from utils.staged_testing import StagedTestingPipeline, TestPipelineConfig
 
@@ -213,20 +215,52 @@ def download_docx_resume(request_id):
         
         # Import the docx builder
         from utils.docx_builder import build_docx
-        
-        # Build the DOCX file with debug flag
-        docx_bytes = build_docx(request_id, temp_dir, debug=debug)
+        from utils.docx_cache import docx_fingerprint, get_cached_docx
+        from utils.session_store import get_session_store
         
         # Set the output filename
         filename = f"tailored_resume_{request_id}.docx"
         
-        # Send the file for download
-        return send_file(
-            docx_bytes,
+        sections = get_session_store(temp_dir).load_sections(request_id)
+        if debug or not sections:
+            # Debug builds write artifacts, so always run them; unknown requests are not cached
+            return send_file(
+                build_docx(request_id, temp_dir, debug=debug),
+                as_attachment=True,
+                download_name=filename,
+                mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+            )
+        
+        # The fingerprint of the sections and styles is the ETag; a client that
+        # already has this build gets a 304 before the cache is read or a build runs
+        etag = docx_fingerprint(request_id, sections)
+        if etag in request.if_none_match:
+            response = app.response_class(status=304)
+            response.set_etag(etag)
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            response.headers['X-Docx-Cache'] = 'not-modified'
+            return response
+        
+        # Serve from the rendered DOCX cache
+        with trace_request(request_id), trace_span("docx_download") as span:
+            docx_bytes, etag, cache_hit = get_cached_docx(
+                request_id, sections, lambda: build_docx(request_id, temp_dir, debug=False)
+            )
+            span.set(cache_hit=cache_hit, bytes=len(docx_bytes))
+        response = send_file(
+            BytesIO(docx_bytes),
             as_attachment=True,
             download_name=filename,
-            mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+            mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+            etag=etag,
+            conditional=True,
+            max_age=0
         )
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        response.headers['X-Docx-Cache'] = 'hit' if cache_hit else 'miss'
+        return response
         
     except FileNotFoundError:
         app.logger.error(f"Data not found for generating DOCX for request_id: {request_id}")
@@ -484,6 +518,99 @@ def get_analytics_summary():
             'error': f'Analytics error: {str(e)}'
         }), 500
 
+@app.route('/api/llm-cache/summary')
+def get_llm_cache_summary_endpoint():
+    """Get LLM response cache hit/miss counters."""
+    try:
+        from utils.llm_response_cache import get_llm_cache_summary
+        return jsonify({
+            'success': True,
+            'cache': get_llm_cache_summary()
+        })
+    except Exception as e:
+        app.logger.error(f"Error getting LLM cache summary: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': f'LLM cache error: {str(e)}'
+        }), 500
+
+@app.route('/api/analytics/caches')
+def get_cache_analytics():
+    """Get hit/miss/eviction counters for every application cache."""
+    try:
+        from utils.llm_response_cache import get_llm_cache_summary
+        from utils.resume_parse_cache import get_resume_parse_cache_summary
+        from utils.job_analysis_cache import get_job_analysis_cache_summary
+        from utils.docx_cache import get_docx_cache
+        from utils.prompt_cache import get_prompt_cache_stats
+        from utils.prompt_budget import token_counter_stats
+        return jsonify({
+            'success': True,
+            'caches': {
+                'llm_responses': get_llm_cache_summary(),
+                'resume_parses': get_resume_parse_cache_summary(),
+                'job_analyses': get_job_analysis_cache_summary(app.config.get('JOB_ANALYSIS_CACHE_DIR')),
+                'docx': get_docx_cache().summary(),
+                'provider_prompt_cache': get_prompt_cache_stats().summary(),
+                'token_counts': token_counter_stats(),
+            }
+        })
+    except Exception as e:
+        app.logger.error(f"Error getting cache analytics: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': f'Cache analytics error: {str(e)}'
+        }), 500
+
+@app.route('/api/analytics/stages')
+def get_stage_latency_analytics():
+    """Get per-stage latency percentiles from pipeline tracing."""
+    try:
+        tracer = get_tracer()
+        return jsonify({
+            'success': True,
+            'stages': tracer.stage_summary(),
+            'recent_requests': tracer.recent_traces()[:20]
+        })
+    except Exception as e:
+        app.logger.error(f"Error getting stage latency analytics: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': f'Stage analytics error: {str(e)}'
+        }), 500
+
+@app.route('/api/analytics/providers')
+def get_provider_resilience_analytics():
+    """Get per-provider retry, circuit breaker, failover, hedging and rate limiter counters."""
+    try:
+        from utils.resilient_llm import get_resilient_caller
+        from utils.rate_limiter import get_rate_limiter
+        return jsonify({
+            'success': True,
+            'resilience': get_resilient_caller().summary(),
+            'rate_limits': get_rate_limiter().summary()
+        })
+    except Exception as e:
+        app.logger.error(f"Error getting provider analytics: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': f'Provider analytics error: {str(e)}'
+        }), 500
+
+@app.route('/api/analytics/trace/<request_id>')
+def get_request_trace(request_id):
+    """Get the span timeline recorded for one tailoring request."""
+    timeline = get_tracer().timeline(request_id)
+    if timeline is None:
+        return jsonify({
+            'success': False,
+            'error': f'No trace recorded for request {request_id}'
+        }), 404
+    return jsonify({
+        'success': True,
+        'trace': timeline
+    })
+
 @app.route('/api/analytics/user/<user_id>')
 def get_user_analytics(user_id):
     """Get analytics for a specific user (A8)."""
@@ -1,34 +1,81 @@
 import os
+import re
 import json
 import time
+import atexit
 import datetime
+import threading
+from collections import deque
 from pathlib import Path
 
+# claude_api_log_<date>[.<segment>].jsonl; legacy JSON-array logs end in .json
+_SEGMENT_PATTERN = re.compile(r"^claude_api_log_(\d{4}-\d{2}-\d{2})(?:\.(\d+))?\.(jsonl|json)$")
+
+
 class ClaudeAPILogger:
-    """Simple logger for Claude API requests and responses"""
-    
-    def __init__(self, log_dir="logs"):
-        """Initialize the logger with a directory for log files"""
+    """
+    Append-only JSON Lines logger for Claude API requests and responses.
+
+    Entries are buffered and appended in batches to
+    ``logs/claude_api_log_<date>[.<n>].jsonl``; a new segment starts every
+    day and whenever the current one reaches ``max_bytes``. Each batch is a
+    single O_APPEND write, so concurrent gunicorn workers never overwrite
+    each other's entries.
+    """
+
+    def __init__(self, log_dir="logs", max_bytes=10 * 1024 * 1024, batch_size=20,
+                 flush_interval=1.0, background_writer=True):
+        """
+        Initialize the logger with a directory for log files
+
+        Args:
+            log_dir: Directory holding the log segments
+            max_bytes: Start a new segment once the current one reaches this size
+            batch_size: Flush as soon as this many entries are buffered
+            flush_interval: Flush buffered entries at least this often (seconds)
+            background_writer: Flush from a daemon thread instead of the caller's
+        """
         self.log_dir = log_dir
-        
+        self.max_bytes = max_bytes
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.background_writer = background_writer
+
         # Create logs directory if it doesn't exist
         Path(log_dir).mkdir(exist_ok=True)
-        
-        # Log file path - use date in filename
-        self.log_file = os.path.join(
-            log_dir, 
-            f"claude_api_log_{datetime.datetime.now().strftime('%Y-%m-%d')}.json"
-        )
-        
-        # Initialize log file if it doesn't exist
-        if not os.path.exists(self.log_file):
-            with open(self.log_file, 'w', encoding='utf-8') as f:
-                f.write("[]")
-    
+
+        self._buffer = []
+        self._buffer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._writer_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._pid = os.getpid()
+        self._writer = None
+        self._wakeup = threading.Event()
+        atexit.register(self.flush)
+
+    @property
+    def log_file(self):
+        """Segment currently being appended to"""
+        date = datetime.datetime.now().strftime('%Y-%m-%d')
+        segment = 0
+        while True:
+            path = self._segment_path(date, segment)
+            try:
+                if os.path.getsize(path) < self.max_bytes:
+                    return path
+            except FileNotFoundError:
+                return path
+            segment += 1
+
+    def _segment_path(self, date, segment):
+        suffix = f".{segment}" if segment else ""
+        return os.path.join(self.log_dir, f"claude_api_log_{date}{suffix}.jsonl")
+
     def log_api_call(self, request_data, response_data, resume_id, section, token_usage=None):
         """
-        Log an API call to the log file - simplified to avoid serialization issues
-        
+        Log an API call - simplified to avoid serialization issues
+
         Args:
             request_data: Summary of the request to Claude API
             response_data: Summary of the response from Claude API
@@ -37,44 +84,77 @@ class ClaudeAPILogger:
             token_usage: Token usage information if available
         """
         try:
-            # Simplify to basic types to avoid serialization issues
-            timestamp = datetime.datetime.now().isoformat()
-            
             # Create a simplified log entry with only string/number values
             log_entry = {
-                "timestamp": timestamp,
+                "timestamp": datetime.datetime.now().isoformat(),
                 "resume_id": str(resume_id),
                 "section": str(section),
                 "request": self._simplify_for_json(request_data),
                 "response": self._simplify_for_json(response_data),
                 "token_usage": self._simplify_for_json(token_usage or {})
             }
-            
-            # Load existing logs (simple approach)
-            try:
-                with open(self.log_file, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    if content and content != "[]":
-                        logs = json.loads(content)
-                    else:
-                        logs = []
-            except Exception as e:
-                print(f"Error reading log file, starting fresh: {e}")
-                logs = []
-            
-            # Add new log entry
-            logs.append(log_entry)
-            
-            # Write updated logs back to file
-            with open(self.log_file, 'w', encoding='utf-8') as f:
-                json.dump(logs, f, ensure_ascii=False)
-            
-            print(f"API call logged to {self.log_file}")
+            line = json.dumps(log_entry, ensure_ascii=False) + "\n"
+
+            self._check_fork()
+            with self._buffer_lock:
+                self._buffer.append(line)
+                due = (len(self._buffer) >= self.batch_size
+                       or time.monotonic() - self._last_flush >= self.flush_interval)
+
+            if self.background_writer:
+                self._ensure_writer()
+                if due:
+                    self._wakeup.set()
+            elif due:
+                self.flush()
             return True
         except Exception as e:
             print(f"Error logging API call: {str(e)}")
             return False
-    
+
+    def flush(self):
+        """Append all buffered entries to the current segment"""
+        with self._write_lock:
+            with self._buffer_lock:
+                lines, self._buffer = self._buffer, []
+                self._last_flush = time.monotonic()
+            if not lines:
+                return
+            try:
+                data = "".join(lines).encode('utf-8')
+                fd = os.open(self.log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, data)
+                finally:
+                    os.close(fd)
+            except Exception as e:
+                print(f"Error writing API log batch ({len(lines)} entries): {e}")
+
+    def _ensure_writer(self):
+        if self._writer is None or not self._writer.is_alive():
+            with self._writer_lock:
+                if self._writer is None or not self._writer.is_alive():
+                    self._writer = threading.Thread(
+                        target=self._writer_loop, name="claude-api-log-writer", daemon=True)
+                    self._writer.start()
+
+    def _writer_loop(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def _check_fork(self):
+        # A forked child inherits the parent's buffer but not its writer thread
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._buffer = []
+            self._buffer_lock = threading.Lock()
+            self._write_lock = threading.Lock()
+            self._writer_lock = threading.Lock()
+            self._wakeup = threading.Event()
+            self._writer = None
+
     def _simplify_for_json(self, data):
         """Convert complex data to simple JSON-serializable values"""
         if isinstance(data, (str, int, float, bool)) or data is None:
@@ -86,18 +166,78 @@ class ClaudeAPILogger:
         else:
             # For any other type, convert to string
             return str(data)
-    
-    def get_logs(self):
-        """Get all logged API calls"""
+
+    def segments(self):
+        """Log files in chronological order (legacy .json arrays included)"""
+        found = []
         try:
-            with open(self.log_file, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                if content:
-                    return json.loads(content)
-                return []
-        except Exception as e:
-            print(f"Error reading logs: {e}")
+            names = os.listdir(self.log_dir)
+        except FileNotFoundError:
             return []
+        for name in names:
+            match = _SEGMENT_PATTERN.match(name)
+            if match:
+                date, segment, _ = match.groups()
+                found.append((date, int(segment or 0), os.path.join(self.log_dir, name)))
+        return [path for _, _, path in sorted(found)]
+
+    def iter_logs(self, resume_id=None, section=None):
+        """
+        Stream logged API calls oldest first, one segment at a time
+
+        Args:
+            resume_id: Only yield entries for this resume ID
+            section: Only yield entries for this section
+        """
+        self.flush()
+        for path in self.segments():
+            for entry in self._read_segment(path):
+                if resume_id is not None and entry.get("resume_id") != str(resume_id):
+                    continue
+                if section is not None and entry.get("section") != str(section):
+                    continue
+                yield entry
+
+    def get_logs(self, resume_id=None, section=None, limit=None):
+        """Get logged API calls, optionally filtered and capped to the newest `limit`"""
+        if limit is None:
+            return list(self.iter_logs(resume_id, section))
+        return list(deque(self.iter_logs(resume_id, section), maxlen=limit))
+
+    def _read_segment(self, path):
+        try:
+            if path.endswith(".json"):
+                with open(path, 'r', encoding='utf-8') as f:
+                    content = f.read().strip()
+                yield from (json.loads(content) if content else [])
+                return
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn line from a crashed writer; skip it
+                        continue
+        except Exception as e:
+            print(f"Error reading logs from {path}: {e}")
+
+
+def _logger_from_config():
+    try:
+        from config import Config
+        return ClaudeAPILogger(
+            max_bytes=Config.CLAUDE_API_LOG_MAX_BYTES,
+            batch_size=Config.CLAUDE_API_LOG_BATCH_SIZE,
+            flush_interval=Config.CLAUDE_API_LOG_FLUSH_INTERVAL_SECONDS,
+            background_writer=Config.CLAUDE_API_LOG_BACKGROUND_WRITER,
+        )
+    except Exception as e:
+        print(f"Error reading API log settings, using defaults: {e}")
+        return ClaudeAPILogger()
+
 
 # Global logger instance
-api_logger = ClaudeAPILogger() 
\ No newline at end of file
+api_logger = _logger_from_config()
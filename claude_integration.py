@@ -6,21 +6,34 @@ import time
 import traceback
 import re
 import io
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from docx import Document
 from docx.shared import Pt
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 import docx2txt
-from typing import Dict, List, Tuple, Optional, Any, Union
+from typing import Callable, Dict, List, Tuple, Optional, Any, Union
 from datetime import datetime
-from flask import current_app
+from flask import current_app, has_app_context
 
 # Third-party imports for Claude
-from anthropic import Anthropic, RateLimitError
+from anthropic import RateLimitError
 
 # Third-party imports for OpenAI
 import openai
 from openai import OpenAI
 from claude_api_logger import api_logger
+from utils.llm_client_registry import get_llm_client
+from utils.llm_response_cache import get_llm_response_cache, make_cache_key
+from utils.prompt_cache import (CachedPrompt, anthropic_request, cache_usage, get_prompt_cache_stats,
+                                openai_messages)
+from utils.prompt_budget import (TRIM_LINES, PromptComponent, count_instruction_tokens, count_tokens,
+                                 fit_components)
+from utils.rate_limiter import Reservation, get_rate_limiter
+from utils.resilient_llm import ProviderCall, get_resilient_caller
+from utils.session_store import get_session_store
+from utils.tracing import annotate_span, trace_request, trace_span
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -144,144 +157,192 @@ def clean_bullet_points(text: str) -> str:
     return cleaned_text
 
 
-class LLMClient:
-    """Base class for LLM API clients"""
-    
-    def __init__(self, api_key: str):
-        self.api_key = api_key
-        
-    def tailor_resume_content(
-    self,
-    section_name: str,
-    content: str,
-     job_data: Dict) -> Union[Dict, List, str]:
-        """Tailor resume content using LLM API - to be implemented by subclasses"""
-        raise NotImplementedError("Subclasses must implement this method")
+TAILORING_SYSTEM_MESSAGE = "Return valid JSON. Each 'achievements' string must contain: EITHER ≥1 digit (then no '??') OR exactly one '??' placeholder. Nothing else counts as a metric."
+
+# Output shape and rules per section for the combined (single-request) tailoring prompt
+_COMBINED_SECTION_SPECS = {
+    "experience": (
+        '[{"company": "...", "location": "...", "position": "...", "dates": "...", '
+        '"role_description": "1-2 sentences", "achievements": ["...", "..."]}]',
+        "Process EVERY job entry. Keep company, location, position and dates exactly. Tailor the "
+        "role_description, or generate one from the position and achievements if it is empty. Rewrite each "
+        "achievement as one sentence of 115-130 characters; keep any number the original bullet had, otherwise "
+        "insert a single '??' placeholder with a unit, never both. Do not add or remove bullets."
+    ),
+    "education": (
+        '[{"institution": "...", "location": "...", "degree": "...", "dates": "...", "highlights": ["..."]}]',
+        "Keep degree names, institutions and dates exactly; only make highlights more relevant."
+    ),
+    "skills": (
+        '{"technical": ["..."], "soft": ["..."], "other": ["..."]}',
+        "Prioritize skills named in the job, use its terminology and only include skills authentic to the candidate."
+    ),
+    "projects": (
+        '[{"title": "...", "dates": "...", "details": ["..."]}]',
+        "Keep every project, its title and dates; emphasize relevant technologies and quantified impact."
+    ),
+}
+_COMBINED_TEXT_SPEC = ('"..."', "Return the tailored section as a single string with the same basic information.")
+
+
+def _job_context_components(job_data: Dict) -> List[PromptComponent]:
+    """
+    Job context of a tailoring prompt as budget components, in prompt order.
 
+    The target line is always kept; under budget pressure the analysis fields
+    go first (ideal candidate, then profile and soft skills, then hard skills),
+    then trailing requirement lines, then the skills list.
+    """
+    job_title = job_data.get('job_title', 'the position')
+    company = job_data.get('company', 'the company')
+    requirements = job_data.get('requirements', [])
+    skills = job_data.get('skills', [])
+    requirements_text = "\n".join([f"- {req}" for req in requirements]) if requirements else "Not specified"
+    skills_text = ", ".join(skills) if skills else "Not specified"
+
+    components = [
+        PromptComponent("target", f"\nTARGET POSITION: {job_title} at {company}\n", required=True),
+        PromptComponent("requirements", requirements_text, priority=3, trim=TRIM_LINES,
+                        header="\nJOB REQUIREMENTS:\n"),
+        PromptComponent("skills", skills_text, priority=4, header="\n\nREQUIRED SKILLS:\n"),
+    ]
+    analysis = job_data.get('analysis')
+    if isinstance(analysis, dict):
+        if analysis.get('candidate_profile'):
+            components.append(PromptComponent("candidate_profile", analysis['candidate_profile'], priority=1,
+                                              header="\n\nCANDIDATE PROFILE:\n"))
+        if analysis.get('hard_skills'):
+            components.append(PromptComponent("hard_skills", ', '.join(analysis['hard_skills']), priority=2,
+                                              header="\n\nKEY HARD SKILLS:\n"))
+        if analysis.get('soft_skills'):
+            components.append(PromptComponent("soft_skills", ', '.join(analysis['soft_skills']), priority=1,
+                                              header="\n\nKEY SOFT SKILLS:\n"))
+        if analysis.get('ideal_candidate'):
+            components.append(PromptComponent("ideal_candidate", analysis['ideal_candidate'], priority=0,
+                                              header="\n\nIDEAL CANDIDATE:\n"))
+    return components
+
+
+def _compact_json(content: Any) -> str:
+    """Whitespace-free JSON: the lossless fallback rendering for over-budget prompts"""
+    return json.dumps(content, ensure_ascii=False, separators=(',', ':'))
+
+
+def build_combined_tailoring_prompt(sections: Dict[str, Any], job_data: Dict) -> CachedPrompt:
+    """
+    Build one prompt that tailors several resume sections at once.
 
-class ClaudeClient(LLMClient):
-    """Client for interacting with Claude API"""
-    
-    def __init__(self, api_key: str, api_url: str = None):
-        """Initialize the Claude API client"""
-        super().__init__(api_key)
-        self.api_key = api_key
-        self.api_url = api_url
-        self.client = None
+    The job context (requirements, skills, analysis) is sent once instead of
+    once per section; the reply is a single JSON object keyed by section name.
+    The instructions depend only on which sections are included, so they form
+    the cacheable prefix; the job and the original sections are the suffix,
+    fitted to the 'combined' token budget.
+    """
+    originals, compact_originals, shapes, rules = [], [], [], []
+    for name, content in sections.items():
+        shape, rule = _COMBINED_SECTION_SPECS.get(name, _COMBINED_TEXT_SPEC)
+        is_json = isinstance(content, (dict, list))
+        original = json.dumps(content, indent=2) if is_json else str(content)
+        originals.append(f"#### {name}\n{original}")
+        compact_originals.append(f"#### {name}\n{_compact_json(content) if is_json else original}")
+        shapes.append(f'  "{name}": {shape}')
+        rules.append(f"- {name}: {rule}")
+    style_example = ""
+    if "experience" in sections:
+        style_example = ("\n### STYLE EXAMPLE for experience – do **NOT** copy facts, only copy structure, "
+                         f"brevity and verb–impact–influence pattern\n\n```json\n{EXPERIENCE_STYLE_EXAMPLE}\n```\n")
+    keys = ", ".join(f'"{name}"' for name in sections)
+    shape_lines = ",\n".join(shapes)
+    rule_text = "\n".join(rules)
+
+    prefix = f"""
+You are an expert resume tailoring assistant. Your task is to tailor each resume section provided at the end of this prompt to better match the requirements of the target position described there.
+{style_example}
+### OUTPUT SPEC
 
-        try:
-            # Validate API key format for Claude
-            if not api_key:
-                raise ValueError("Claude API key is missing")
+Return ONE JSON object with exactly these keys: {keys}
 
-            # Import anthropic library (lazy import to handle missing
-            # dependency)
-            try:
-                from anthropic import Anthropic
-                logger.info("Using anthropic SDK for Claude API")
-            except ImportError:
-                logger.error(
-                    "Failed to import anthropic SDK. Make sure it's installed with 'pip install anthropic'")
-                raise
-
-            # Initialize Claude client
-            self.client = Anthropic(api_key=api_key)
-            logger.info(f"Claude API client initialized successfully")
+```json
+{{
+{shape_lines}
+}}
+```
 
-        except Exception as e:
-            logger.error(f"Error initializing Claude API client: {str(e)}")
-            logger.error(traceback.format_exc())
-            raise ValueError(f"Failed to initialize Claude client: {str(e)}")
-    
-    def tailor_resume_content(
-    self,
-    section_name: str,
-    content: str,
-     job_data: Dict) -> Union[Dict, List, str]:
-        """
-        Tailor resume content using Claude API
+Section rules:
+{rule_text}
 
-        Args:
-            section_name: Name of the section to tailor
-            content: Content of the section
-            job_data: Job data including requirements and skills
+IMPORTANT:
+1. Do not include empty strings or whitespace-only strings in any arrays.
+2. Every section key must be present, and the reply must be valid JSON with no text outside the object.
+"""
+    components = _job_context_components(job_data) + [
+        PromptComponent("original", "\n\n".join(originals) + "\n", required=True,
+                        header="\n\n### ORIGINAL SECTIONS\n\n",
+                        compact="\n\n".join(compact_originals) + "\n"),
+    ]
+    fitted = fit_components("combined", components, fixed_tokens=count_instruction_tokens(prefix))
+    return CachedPrompt(prefix=prefix, suffix=fitted.text)
 
-        Returns:
-            Tailored content as structured data (dict/list) or string for simple sections
-        """
-        logger.info(f"Tailoring {section_name} with Claude API")
-            
-        # --- START FIX: Type-aware check for empty content ---
-        # Check if content is None, empty string/list/dict, or whitespace-only string
-        is_empty = False
-        if not content:
-            is_empty = True
-        elif isinstance(content, str) and not content.strip():
-            is_empty = True
-            
-        if is_empty:
-        # --- END FIX ---
-            logger.warning(f"Empty {section_name} content provided, skipping tailoring")
-            return content
 
-        if not self.client:
-            logger.error("Claude client not initialized")
-            return content
+def _valid_combined_section(section_name: str, value: Any) -> bool:
+    """Whether one section of a combined reply has the shape the per-section path returns"""
+    if section_name in ("experience", "education", "projects"):
+        return isinstance(value, list) and bool(value) and all(isinstance(entry, dict) for entry in value)
+    if section_name == "skills":
+        return isinstance(value, (dict, list)) and bool(value)
+    return isinstance(value, str) and bool(value.strip())
 
-        try:
-            # Extract job data
-            job_title = job_data.get('job_title', 'the position')
-            company = job_data.get('company', 'the company')
-            requirements = job_data.get('requirements', [])
-            skills = job_data.get('skills', [])
-
-            # Prepare requirements and skills text
-            requirements_text = "\n".join(
-                [f"- {req}" for req in requirements]) if requirements else "Not specified"
-            skills_text = ", ".join(skills) if skills else "Not specified"
-
-            # Get job analysis if available
-            analysis_prompt = ""
-            if 'analysis' in job_data and isinstance(
-                job_data['analysis'], dict):
-                analysis = job_data['analysis']
-                
-                # Add candidate profile if available
-                if 'candidate_profile' in analysis and analysis['candidate_profile']:
-                    analysis_prompt += f"\n\nCANDIDATE PROFILE:\n{analysis['candidate_profile']}"
-                
-                # Add hard skills if available
-                if 'hard_skills' in analysis and analysis['hard_skills']:
-                    hard_skills = ", ".join(analysis['hard_skills'])
-                    analysis_prompt += f"\n\nKEY HARD SKILLS:\n{hard_skills}"
-                    
-                # Add soft skills if available
-                if 'soft_skills' in analysis and analysis['soft_skills']:
-                    soft_skills = ", ".join(analysis['soft_skills'])
-                    analysis_prompt += f"\n\nKEY SOFT SKILLS:\n{soft_skills}"
-                
-                # Add ideal candidate if available
-                if 'ideal_candidate' in analysis and analysis['ideal_candidate']:
-                    analysis_prompt += f"\n\nIDEAL CANDIDATE:\n{analysis['ideal_candidate']}"
 
-            # Build section-specific prompts
-            if section_name == "experience":
-                # Convert the input list of job objects back to a JSON string for the prompt
-                experience_json_input = json.dumps(content, indent=2) # Assumes content is the list of dicts
+def parse_combined_response(response_text: str, section_names: List[str]) -> Dict[str, Any]:
+    """
+    Validate a combined tailoring reply section by section.
 
-                prompt = f"""
-You are an expert resume tailoring assistant. Your task is to tailor the work experience section (provided as a JSON list) to better match the requirements for a {job_title} position at {company}.
+    A reply that is not one valid JSON object (e.g. cut off at the token
+    limit) is salvaged key by key, so only the sections that fail to parse
+    or validate are missing from the result.
 
-ORIGINAL EXPERIENCE SECTION (JSON):
-```json
-{experience_json_input}
-```
+    Returns:
+        {section_name: tailored content} for the sections that validated
+    """
+    text = response_text.strip()
+    fenced = re.search(r'```(?:json)?\s*(.*?)\s*(?:```|$)', text, re.DOTALL)
+    if fenced and not text.startswith('{'):
+        text = fenced.group(1)
+    start = text.find('{')
+    if start < 0:
+        return {}
+    text = text[start:]
+
+    candidates: Dict[str, Any] = {}
+    try:
+        parsed = json.loads(text[:text.rfind('}') + 1])
+        if isinstance(parsed, dict):
+            candidates = parsed
+    except json.JSONDecodeError:
+        decoder = json.JSONDecoder()
+        for name in section_names:
+            for match in re.finditer(r'"%s"\s*:\s*' % re.escape(name), text):
+                try:
+                    value, _ = decoder.raw_decode(text, match.end())
+                except json.JSONDecodeError:
+                    continue
+                if _valid_combined_section(name, value):
+                    candidates[name] = value
+                    break
 
-JOB REQUIREMENTS:
-{requirements_text}
+    valid = {name: candidates[name] for name in section_names
+             if name in candidates and _valid_combined_section(name, candidates[name])}
+    invalid = [name for name in section_names if name not in valid]
+    if invalid:
+        logger.warning(f"Combined tailoring reply did not validate for: {', '.join(invalid)}")
+    return valid
 
-REQUIRED SKILLS:
-{skills_text}{analysis_prompt}
+
+# Constant instructions per section: the cacheable prefix of each tailoring prompt.
+# Nothing request-specific may appear here, or the provider caches miss.
+_SECTION_INSTRUCTIONS = {
+    "experience": f"""
+You are an expert resume tailoring assistant. Your task is to tailor the work experience section (provided as a JSON list at the end of this prompt) to better match the requirements of the target position described there.
 
 ### STYLE EXAMPLE – do **NOT** copy facts, only copy structure, brevity and verb–impact–influence pattern
 
@@ -314,7 +375,7 @@ Return your response as a structured JSON object containing ONLY the tailored ex
 
 Please process EACH job entry in the input JSON list and restructure it to better match the job requirements by:
 1.  For the "role_description":
-    *   If the original entry has a non-empty "role_description", TAILOR this description to highlight aspects relevant to the target job ({job_title}). Keep it concise (1-2 sentences).
+    *   If the original entry has a non-empty "role_description", TAILOR this description to highlight aspects relevant to the target position. Keep it concise (1-2 sentences).
     *   If the original entry has an empty, null, or missing "role_description", GENERATE a concise (1-2 sentences) description based on the "position" and "achievements" for that specific job entry. This description should summarize the core responsibilities or focus of the role in the context of the achievements listed.
 2.  For the "achievements":
     • Rewrite **each** bullet as **one sentence 115-130 characters** (ideal ≈125). If shorter, extend the influence clause ("for 7 global regions", "across 5 agile squads", etc.).
@@ -330,27 +391,16 @@ IMPORTANT:
 3. Ensure the "role_description" is present and populated for EVERY job entry in the output.
 4. Each achievement must be 115-130 characters and use "??" when the source bullet had no numeric value, NEVER both digits and '??'.
 5. Ensure the output is a valid JSON object containing ONLY the "experience" key with the list of tailored job objects.
-"""
-
-            elif section_name == "education":
-                prompt = f"""
-You are an expert resume tailoring assistant. Your task is to tailor the education section to better match the requirements for a {job_title} position at {company}.
-
-ORIGINAL EDUCATION SECTION:
-            {content}
-
-JOB REQUIREMENTS:
-{requirements_text}
-
-REQUIRED SKILLS:
-{skills_text}{analysis_prompt}
+""",
+    "education": """
+You are an expert resume tailoring assistant. Your task is to tailor the education section (provided at the end of this prompt) to better match the requirements of the target position described there.
 
 Return your response as a structured JSON object with the following format:
 
 ```json
-{{
+{
   "education": [
-    {{
+    {
       "institution": "University Name",
       "location": "City, State",
       "degree": "Degree Name",
@@ -359,9 +409,9 @@ Return your response as a structured JSON object with the following format:
         "Highlight 1",
         "Highlight 2"
       ]
-    }}
+    }
   ]
-}}
+}
 ```
 
 Please rewrite the education section to better match the job requirements. Focus on:
@@ -371,31 +421,20 @@ Please rewrite the education section to better match the job requirements. Focus
 4. Including any certifications or training that matches required skills
 
 Keep the degree names, institutions, and dates exactly the same - only enhance descriptions to make them more relevant.
-"""
-
-            elif section_name == "skills":
-                prompt = f"""
-You are an expert resume tailoring assistant. Your task is to tailor the skills section to better match the requirements for a {job_title} position at {company}.
-
-ORIGINAL SKILLS SECTION:
-{content}
-
-JOB REQUIREMENTS:
-{requirements_text}
-
-REQUIRED SKILLS:
-{skills_text}{analysis_prompt}
+""",
+    "skills": """
+You are an expert resume tailoring assistant. Your task is to tailor the skills section (provided at the end of this prompt) to better match the requirements of the target position described there.
 
 Return your response as a structured JSON object with the following format:
 
 ```json
-{{
-  "skills": {{
+{
+  "skills": {
     "technical": ["Skill 1", "Skill 2"],
     "soft": ["Skill 1", "Skill 2"],
     "other": ["Skill 1", "Skill 2"]
-  }}
-}}
+  }
+}
 ```
 
 Please rewrite the skills section to better match the job requirements. Focus on:
@@ -406,61 +445,61 @@ Please rewrite the skills section to better match the job requirements. Focus on
 5. Removing skills that are irrelevant to this position if the list is very long
 
 Only include skills that are authentic to the candidate based on their resume.
-"""
-
-            elif section_name == "projects":
-                prompt = f"""
-You are an expert resume tailoring assistant. Your task is to tailor the projects section to better match the requirements for a {job_title} position at {company}.
-
-ORIGINAL PROJECTS SECTION:
-{content}
-
-JOB REQUIREMENTS:
-{requirements_text}
-
-REQUIRED SKILLS:
-{skills_text}{analysis_prompt}
+""",
+    "projects": """
+You are an expert resume tailoring assistant. Your task is to tailor the projects section (provided at the end of this prompt) to better match the requirements of the target position described there.
 
 Return your response as a structured JSON object with the following format:
 
 ```json
-{{
+{
   "projects": [
-    {{
+    {
       "title": "Project Name",
       "dates": "Time Period",
       "details": [
         "Detail 1",
         "Detail 2"
       ]
-    }}
+    }
   ]
-}}
+}
 ```
 
 Please rewrite the projects section to better match the job requirements. Focus on:
-1. Highlighting projects that demonstrate skills required for this job
-2. Emphasizing tools, technologies, and methodologies that match the job description
-3. Quantifying project outcomes and impacts where possible
-4. Rephrasing project descriptions to use terminology from the job posting
+1. Highlighting projects that demonstrate skills relevant to this position
+2. Emphasizing technical achievements and technologies that align with the job description
+3. Quantifying impact and results wherever possible
+4. Using terminology from the job description where appropriate
 5. Focusing on the candidate's specific contributions and leadership roles
 
-Keep the project titles and timelines the same, but enhance descriptions to better align with the job requirements.
-"""
+IMPORTANT:
+1. Do not include empty strings or whitespace-only strings in any arrays
+2. Every detail must contain meaningful content
+3. Do not split single project descriptions into multiple entries
+4. Make sure each bullet point contains complete, meaningful content
+5. Ensure all project entries from the original resume are preserved
 
-            else:
-                # For other sections, use a generic prompt
-                prompt = f"""
-You are an expert resume tailoring assistant. Your task is to tailor the {section_name} section to better match the requirements for a {job_title} position at {company}.
+Maintain the original project names and dates - only enhance descriptions to make them more relevant.
+""",
+}
 
-ORIGINAL SECTION:
-{content}
 
-JOB REQUIREMENTS:
-{requirements_text}
+def build_tailoring_prompt(section_name: str, content: Any, job_data: Dict) -> CachedPrompt:
+    """
+    Build the prompt that tailors one resume section.
 
-REQUIRED SKILLS:
-{skills_text}{analysis_prompt}
+    The section's constant instructions come first (the prefix the provider
+    caches can reuse across requests); the job context and the original
+    section follow in the suffix, fitted to the section's token budget.
+    """
+    if section_name in _SECTION_INSTRUCTIONS:
+        prefix = _SECTION_INSTRUCTIONS[section_name]
+    else:
+        # Other sections share a generic prompt; only the section name varies, so
+        # it is the one sentence of the prefix that differs between sections
+        prefix = f"""
+You are an expert resume tailoring assistant. Your task is to tailor the {section_name} section (provided at the end of this prompt) to better match the requirements of the target position described there.
 
 Return your response as a structured JSON object with the following format:
 
@@ -474,19 +513,303 @@ Please rewrite this section to better match the job requirements while maintaini
 Focus on emphasizing elements most relevant to this job opportunity.
 """
 
-            # Make the API call
-            response = self.client.messages.create(
-                model="claude-3-sonnet-20240229",
-                max_tokens=4000,
-                temperature=0.7,
-                messages=[
-                    {"role": "system", "content": "Return valid JSON. Each 'achievements' string must contain: EITHER ≥1 digit (then no '??') OR exactly one '??' placeholder. Nothing else counts as a metric."},
-                    {"role": "user", "content": prompt}
-                ]
+    compact = None
+    if section_name == "experience":
+        # Convert the input list of job objects back to a JSON string for the prompt
+        original = f"ORIGINAL EXPERIENCE SECTION (JSON):\n```json\n{json.dumps(content, indent=2)}\n```\n"
+        compact = f"ORIGINAL EXPERIENCE SECTION (JSON):\n```json\n{_compact_json(content)}\n```\n"
+    elif section_name in _SECTION_INSTRUCTIONS:
+        original = f"ORIGINAL {section_name.upper()} SECTION:\n{content}\n"
+    else:
+        original = f"ORIGINAL SECTION:\n{content}\n"
+
+    components = _job_context_components(job_data) + [
+        PromptComponent("original", original, required=True, header="\n\n", compact=compact),
+    ]
+    fitted = fit_components(section_name, components, fixed_tokens=count_instruction_tokens(prefix))
+    return CachedPrompt(prefix=prefix, suffix=fitted.text)
+
+
+# The provider a tailoring call fails over (or hedges) to
+_FAILOVER_PROVIDERS = {"claude": "openai", "openai": "claude"}
+
+# Monotonic deadline of the tailoring batch the current call belongs to; calls
+# sent under it use the time left as their HTTP timeout
+_call_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "tailoring_call_deadline", default=None)
+
+
+class LLMClient:
+    """Base class for LLM API clients"""
+    
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        self._retry_free_client = None
+        self._failover_clients: Dict[str, "LLMClient"] = {}
+        
+    def tailor_resume_content(
+    self,
+    section_name: str,
+    content: str,
+     job_data: Dict) -> Union[Dict, List, str]:
+        """Tailor resume content using LLM API - to be implemented by subclasses"""
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def _model_settings(self, combined: bool = False) -> Tuple[str, str, float, int]:
+        """(provider, model name, temperature, max output tokens) for a per-section or combined call"""
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def _create_completion(self, model_name: str, temperature: float, max_tokens: int,
+                           system_message: str, prompt: CachedPrompt,
+                           reservation: Optional[Reservation] = None) -> str:
+        """Send one prompt to the provider and return the reply text, settling its rate limit reservation"""
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def _normalize_experience(self, tailored: List[Dict]) -> List[Dict]:
+        """Post-process tailored experience entries (bullet prefixes, metric tokens)"""
+        return tailored
+
+    def _sdk_client(self) -> Any:
+        """
+        The SDK client with its built-in retries off; the resilient call layer retries instead.
+
+        Under a tailoring deadline the client times out when the deadline
+        passes, so a call its batch has given up on frees its provider slot.
+        """
+        if self._retry_free_client is None:
+            with_options = getattr(self.client, 'with_options', None)
+            self._retry_free_client = with_options(max_retries=0) if with_options else self.client
+        deadline = _call_deadline.get()
+        if deadline is None:
+            return self._retry_free_client
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("tailoring deadline passed before the call was sent")
+        with_options = getattr(self._retry_free_client, 'with_options', None)
+        return with_options(timeout=remaining) if with_options else self._retry_free_client
+
+    def _reserve_capacity(self, provider: str, system_message: str, prompt: CachedPrompt,
+                          max_tokens: int) -> Reservation:
+        """Wait for rate limit capacity for one call: its prompt tokens plus the longest reply it may get"""
+        tokens = (count_instruction_tokens(system_message) + count_instruction_tokens(prompt.prefix)
+                  + count_tokens(prompt.suffix))
+        reservation = get_rate_limiter().acquire(provider, self.api_key, tokens + max_tokens)
+        if reservation.waited_seconds:
+            annotate_span(rate_limit_wait_ms=round(reservation.waited_seconds * 1000, 1))
+        return reservation
+
+    def _complete(self, kind: str, system_message: str, prompt: CachedPrompt,
+                  combined: bool = False) -> Tuple[str, str]:
+        """
+        Fresh completion through the resilient call layer: retries, the provider's
+        circuit breaker, and failover or hedging to the other configured provider.
+
+        Args:
+            kind: Section name or "combined"; hedge thresholds are tracked per kind
+
+        Returns:
+            (reply text, provider that answered)
+        """
+        provider = self._model_settings(combined)[0]
+        primary = self._provider_call(system_message, prompt, combined)
+        fallback = self._failover_call(provider, system_message, prompt, combined)
+        response_text, answered_by = get_resilient_caller().call(primary, kind, fallback)
+        if answered_by != provider:
+            annotate_span(answered_by=answered_by)
+        return response_text, answered_by
+
+    def _failover_call(self, provider: str, system_message: str, prompt: CachedPrompt,
+                       combined: bool) -> Optional[ProviderCall]:
+        """The same request against the other provider, or None when its API key is not configured"""
+        from config import Config
+
+        other = _FAILOVER_PROVIDERS.get(provider)
+        api_key = {"claude": Config.CLAUDE_API_KEY, "openai": Config.OPENAI_API_KEY}.get(other)
+        if not api_key:
+            return None
+
+        def target() -> ProviderCall:
+            # Built on first use, so a healthy primary never initializes the other client
+            if other not in self._failover_clients:
+                self._failover_clients[other] = ClaudeClient(api_key) if other == "claude" \
+                    else OpenAIClient(api_key)
+            return self._failover_clients[other]._provider_call(system_message, prompt, combined)
+        return ProviderCall(other, lambda reservation: target().call(reservation),
+                            reserve=lambda: target().reserve())
+
+    def _provider_call(self, system_message: str, prompt: CachedPrompt, combined: bool) -> ProviderCall:
+        """This client's completion call; rate limit capacity is reserved before each attempt"""
+        provider, model_name, temperature, max_tokens = self._model_settings(combined)
+        return ProviderCall(
+            provider,
+            lambda reservation: self._create_completion(model_name, temperature, max_tokens,
+                                                        system_message, prompt, reservation),
+            reserve=lambda: self._reserve_capacity(provider, system_message, prompt, max_tokens))
+
+    def tailor_sections_combined(self, sections: Dict[str, Any], job_data: Dict) -> Dict[str, Any]:
+        """
+        Tailor several sections with one structured request.
+
+        Args:
+            sections: {section_name: original content} for the sections to tailor
+            job_data: Job data including requirements and skills
+
+        Returns:
+            Tailored content for each section whose part of the reply validated;
+            the caller tailors any missing section with tailor_resume_content
+        """
+        if not self.client:
+            logger.error(f"{type(self).__name__} client not initialized")
+            return {}
+
+        prompt = build_combined_tailoring_prompt(sections, job_data)
+        provider, model_name, temperature, _ = self._model_settings(combined=True)
+
+        response_cache = get_llm_response_cache()
+        cache_key = make_cache_key(provider, model_name, prompt.text, temperature, TAILORING_SYSTEM_MESSAGE)
+        response_text = response_cache.get(cache_key)
+        is_fresh_response = response_text is None
+        if is_fresh_response:
+            response_text, answered_by = self._complete("combined", TAILORING_SYSTEM_MESSAGE, prompt,
+                                                        combined=True)
+            # A failover or hedge reply is not cached under this provider's key
+            is_fresh_response = answered_by == provider
+        else:
+            logger.info(f"Using cached {provider} response for combined tailoring")
+            annotate_span(cache_hit=True)
+        logger.info(f"Combined {provider} response for {len(sections)} sections: {len(response_text)} chars")
+
+        tailored = parse_combined_response(response_text, list(sections))
+        # Only cache completions where every section validated, so a bad reply is not replayed
+        if is_fresh_response and len(tailored) == len(sections):
+            response_cache.set(cache_key, response_text)
+        if "experience" in tailored:
+            tailored["experience"] = self._normalize_experience(tailored["experience"])
+        return tailored
+
+
+class ClaudeClient(LLMClient):
+    """Client for interacting with Claude API"""
+    
+    def __init__(self, api_key: str, api_url: str = None):
+        """Initialize the Claude API client"""
+        super().__init__(api_key)
+        self.api_key = api_key
+        self.api_url = api_url
+        self.client = None
+
+        try:
+            # Validate API key format for Claude
+            if not api_key:
+                raise ValueError("Claude API key is missing")
+
+            # Shared SDK client: reuses pooled keep-alive connections across requests
+            self.client = get_llm_client('claude', api_key)
+            logger.info(f"Claude API client initialized successfully")
+
+        except Exception as e:
+            logger.error(f"Error initializing Claude API client: {str(e)}")
+            logger.error(traceback.format_exc())
+            raise ValueError(f"Failed to initialize Claude client: {str(e)}")
+    
+    def _model_settings(self, combined: bool = False) -> Tuple[str, str, float, int]:
+        # claude-3-sonnet caps output at 4096 tokens, per-section or combined
+        return "claude", "claude-3-sonnet-20240229", 0.7, 4096 if combined else 4000
+
+    def _create_completion(self, model_name: str, temperature: float, max_tokens: int,
+                           system_message: str, prompt: CachedPrompt,
+                           reservation: Optional[Reservation] = None) -> str:
+        reservation = reservation or Reservation()
+        try:
+            # The system message goes in `system`; a long enough prefix carries the cache breakpoint
+            response = self._sdk_client().messages.create(
+                model=model_name,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                **anthropic_request(prompt, system_message)
             )
+        except Exception:
+            # A failed attempt must not hold its tokens in the bucket shared by every worker
+            reservation.refund()
+            raise
+        reservation.settle(sum(_token_usage(response).values()) or None)
+        _record_completion_usage("claude", model_name, response)
+        return response.content[0].text.strip()
+
+    def _normalize_experience(self, tailored: List[Dict]) -> List[Dict]:
+        # --- START: Updated post-processing guardrail using normalize_bullet ---
+        for job in tailored:
+            fixed_achievements = []
+            if "achievements" in job and isinstance(job["achievements"], list):
+                for achievement in job["achievements"]:
+                    if isinstance(achievement, str):
+                        # Strip leading bullet chars FIRST (using existing util)
+                        clean = strip_bullet_prefix(achievement)
+                        # Apply the NEW normalization function
+                        clean = normalize_bullet(clean)
+                        # Add only if not empty after normalization
+                        if clean:
+                            fixed_achievements.append(clean)
+                    elif achievement: # Keep non-string items, but not None or empty ones
+                        fixed_achievements.append(achievement)
+            job["achievements"] = fixed_achievements
+        # --- END: Updated post-processing guardrail ---
+        return tailored
+
+    def tailor_resume_content(
+    self,
+    section_name: str,
+    content: str,
+     job_data: Dict) -> Union[Dict, List, str]:
+        """
+        Tailor resume content using Claude API
+
+        Args:
+            section_name: Name of the section to tailor
+            content: Content of the section
+            job_data: Job data including requirements and skills
+
+        Returns:
+            Tailored content as structured data (dict/list) or string for simple sections
+        """
+        logger.info(f"Tailoring {section_name} with Claude API")
+            
+        # --- START FIX: Type-aware check for empty content ---
+        # Check if content is None, empty string/list/dict, or whitespace-only string
+        is_empty = False
+        if not content:
+            is_empty = True
+        elif isinstance(content, str) and not content.strip():
+            is_empty = True
+            
+        if is_empty:
+        # --- END FIX ---
+            logger.warning(f"Empty {section_name} content provided, skipping tailoring")
+            return content
+
+        if not self.client:
+            logger.error("Claude client not initialized")
+            return content
+
+        try:
+            prompt = build_tailoring_prompt(section_name, content, job_data)
+
+            _, model_name, temperature, _ = self._model_settings()
+            system_message = TAILORING_SYSTEM_MESSAGE
 
-            # Get the response content
-            response_content = response.content[0].text.strip()
+            # Reuse an identical earlier completion if one is cached
+            response_cache = get_llm_response_cache()
+            cache_key = make_cache_key("claude", model_name, prompt.text, temperature, system_message)
+            response_content = response_cache.get(cache_key)
+            is_fresh_response = False
+
+            if response_content is not None:
+                logger.info(f"Using cached Claude response for {section_name}")
+                annotate_span(cache_hit=True)
+            else:
+                response_content, answered_by = self._complete(section_name, system_message, prompt)
+                # A failover or hedge reply is not cached under this provider's key
+                is_fresh_response = answered_by == "claude"
             logger.info(
     f"Claude API response for {section_name}: {len(response_content)} chars")
 
@@ -503,29 +826,13 @@ Focus on emphasizing elements most relevant to this job opportunity.
 
                 json_response = json.loads(json_str)
 
+                # Only cache completions that parsed, so a bad reply is not replayed
+                if is_fresh_response:
+                    response_cache.set(cache_key, response_content)
+
                 # Process JSON based on section type
                 if section_name == "experience" and "experience" in json_response:
-                    tailored = json_response["experience"]
-                    # --- START: Updated post-processing guardrail using normalize_bullet ---
-                    for job in tailored:
-                        fixed_achievements = []
-                        if "achievements" in job and isinstance(job["achievements"], list):
-                            for achievement in job["achievements"]:
-                                if isinstance(achievement, str):
-                                    # Strip leading bullet chars FIRST (using existing util)
-                                    clean = strip_bullet_prefix(achievement)
-                                    # Apply the NEW normalization function
-                                    clean = normalize_bullet(clean)
-                                    # Add only if not empty after normalization
-                                    if clean:
-                                        fixed_achievements.append(clean)
-                                else:
-                                     # Keep non-string items (should ideally not happen with strict JSON)
-                                     if achievement: # Avoid adding None or empty items
-                                         fixed_achievements.append(achievement)
-                        job["achievements"] = fixed_achievements
-                    # --- END: Updated post-processing guardrail ---
-                    return tailored
+                    return self._normalize_experience(json_response["experience"])
                 elif section_name == "education" and "education" in json_response:
                     return json_response["education"]
                 elif section_name == "skills" and "skills" in json_response:
@@ -569,11 +876,9 @@ class OpenAIClient(LLMClient):
             print(f"API key length: {len(self.api_key)} characters")
             print("Testing OpenAI API connection...")
 
-            from openai import OpenAI
-            self.client = OpenAI(api_key=self.api_key)
-
-            # Test connection with a simple request - removed limit parameter
-            self.client.models.list()
+            # Shared SDK client; the connection test only runs when it is first created
+            self.client = get_llm_client(
+                'openai', self.api_key, verify=lambda client: client.models.list())
             print("OpenAI client initialized successfully")
 
         except Exception as e:
@@ -581,6 +886,52 @@ class OpenAIClient(LLMClient):
             self.client = None
             raise
 
+    def _model_settings(self, combined: bool = False) -> Tuple[str, str, float, int]:
+        model_name = "gpt-4o" if "4" in os.environ.get('OPENAI_MODEL_NAME', 'gpt-4') else "gpt-3.5-turbo"
+        # gpt-4o replies up to 16k tokens; leave a combined reply room for every section
+        max_tokens = 8192 if combined and model_name == "gpt-4o" else 4096
+        return "openai", model_name, 0.3, max_tokens
+
+    def _create_completion(self, model_name: str, temperature: float, max_tokens: int,
+                           system_message: str, prompt: CachedPrompt,
+                           reservation: Optional[Reservation] = None) -> str:
+        reservation = reservation or Reservation()
+        try:
+            response = self._sdk_client().chat.completions.create(
+                model=model_name,
+                messages=openai_messages(prompt, system_message),
+                temperature=temperature,
+                max_tokens=max_tokens,
+                top_p=1.0
+            )
+        except Exception:
+            reservation.refund()
+            raise
+        logger.info(f"Completion tokens: {response.usage.completion_tokens}, "
+                    f"Prompt tokens: {response.usage.prompt_tokens}")
+        reservation.settle(sum(_token_usage(response).values()) or None)
+        _record_completion_usage("openai", model_name, response)
+        return response.choices[0].message.content
+
+    def _normalize_experience(self, tailored: List[Dict]) -> List[Dict]:
+        # --- START: Updated post-processing guardrail using normalize_bullet ---
+        for job in tailored:
+            fixed_achievements = []
+            if "achievements" in job and isinstance(job["achievements"], list):
+                for achievement in job["achievements"]:
+                    if isinstance(achievement, str):
+                        # Strip leading bullet chars FIRST
+                        clean = re.sub(r'^[•\\\\-\\\\u2022\\\\*]\\\\s*', '', achievement).strip()
+                        # Apply the cleaning function
+                        clean = _clean_metric_tokens(clean)
+                        fixed_achievements.append(clean)
+                    else:
+                        # Keep non-string items or already valid strings
+                        fixed_achievements.append(achievement) # Use original item if not string
+                job["achievements"] = fixed_achievements
+        # --- END: Update post-processing guardrail ---
+        return tailored
+
     def tailor_resume_content(
     self,
     section_name: str,
@@ -617,272 +968,24 @@ class OpenAIClient(LLMClient):
             return content
 
         try:
-            # Extract job data
-            job_title = job_data.get('job_title', 'the position')
-            company = job_data.get('company', 'the company')
-            requirements = job_data.get('requirements', [])
-            skills = job_data.get('skills', [])
-
-            # Prepare requirements and skills text
-            requirements_text = "\n".join(
-                [f"- {req}" for req in requirements]) if requirements else "Not specified"
-            skills_text = ", ".join(skills) if skills else "Not specified"
-
-            # Get job analysis if available
-            analysis_prompt = ""
-            if 'analysis' in job_data and isinstance(
-                job_data['analysis'], dict):
-                analysis = job_data['analysis']
-                
-                # Add candidate profile if available
-                if 'candidate_profile' in analysis and analysis['candidate_profile']:
-                    analysis_prompt += f"\n\nCANDIDATE PROFILE:\n{analysis['candidate_profile']}"
-                
-                # Add hard skills if available
-                if 'hard_skills' in analysis and analysis['hard_skills']:
-                    hard_skills = ", ".join(analysis['hard_skills'])
-                    analysis_prompt += f"\n\nKEY HARD SKILLS:\n{hard_skills}"
-                    
-                # Add soft skills if available
-                if 'soft_skills' in analysis and analysis['soft_skills']:
-                    soft_skills = ", ".join(analysis['soft_skills'])
-                    analysis_prompt += f"\n\nKEY SOFT SKILLS:\n{soft_skills}"
-                
-                # Add ideal candidate if available
-                if 'ideal_candidate' in analysis and analysis['ideal_candidate']:
-                    analysis_prompt += f"\n\nIDEAL CANDIDATE:\n{analysis['ideal_candidate']}"
-
-            # Build section-specific prompts
-            if section_name == "experience":
-                # Convert the input list of job objects back to a JSON string for the prompt
-                experience_json_input = json.dumps(content, indent=2) # Assumes content is the list of dicts
-
-                prompt = f"""
-You are an expert resume tailoring assistant. Your task is to tailor the work experience section (provided as a JSON list) to better match the requirements for a {job_title} position at {company}.
-
-ORIGINAL EXPERIENCE SECTION (JSON):
-```json
-{experience_json_input}
-```
-
-JOB REQUIREMENTS:
-{requirements_text}
-
-REQUIRED SKILLS:
-{skills_text}{analysis_prompt}
-
-### STYLE EXAMPLE – do **NOT** copy facts, only copy structure, brevity and verb–impact–influence pattern
-
-```json
-{EXPERIENCE_STYLE_EXAMPLE}
-```
-
-### OUTPUT SPEC
-
-Return your response as a structured JSON object containing ONLY the tailored experience list, matching the exact input structure but with tailored content AND the addition/modification of the "role_description" field:
-
-```json
-{{
-  "experience": [
-    {{
-      "company": "Company Name",
-      "location": "City, State",
-      "position": "Job Title",
-      "dates": "Time Period",
-      "role_description": "A 1-2 sentence tailored or generated description of the role.",
-      "achievements": [
-        "Tailored Achievement 1",
-        "Tailored Achievement 2"
-      ]
-    }}
-    // ... other job entries
-  ]
-}}
-```
-
-Please process EACH job entry in the input JSON list and restructure it to better match the job requirements by:
-1.  For the "role_description":
-    *   If the original entry has a non-empty "role_description", TAILOR this description to highlight aspects relevant to the target job ({job_title}). Keep it concise (1-2 sentences).
-    *   If the original entry has an empty, null, or missing "role_description", GENERATE a concise (1-2 sentences) description based on the "position" and "achievements" for that specific job entry. This description should summarize the core responsibilities or focus of the role in the context of the achievements listed.
-2.  For the "achievements":
-    • Rewrite **each** bullet as **one sentence 115-130 characters** (ideal ≈125). If shorter, extend the influence clause ("for 7 global regions", "across 5 agile squads", etc.).
-    • If the original bullet already contained any digit (0-9), **keep that number** and **do NOT write '??' anywhere**.
-    • If no digit was present, insert the literal string **'??'** followed by a unit (?? %, ?? hrs, ?? TB …). Never mix real digits and '??'.
-    • Prefer placing the metric immediately after the quantified verb phrase (e.g., "… reducing latency by ?? % across …"), not as a tail clause.
-    • Do not add or remove bullets.
-3.  Maintain the original "company", "location", "position", and "dates" for each entry precisely.
-
-IMPORTANT:
-1. Do not include empty strings or whitespace-only strings in any arrays (like achievements).
-2. Every achievement must contain meaningful content.
-3. Ensure the "role_description" is present and populated for EVERY job entry in the output.
-4. Each achievement must be 115-130 characters and use "??" when the source bullet had no numeric value, NEVER both digits and '??'.
-5. Ensure the output is a valid JSON object containing ONLY the "experience" key with the list of tailored job objects.
-"""
-
-            elif section_name == "education":
-                prompt = f"""
-You are an expert resume tailoring assistant. Your task is to tailor the education section to better match the requirements for a {job_title} position at {company}.
-
-ORIGINAL EDUCATION SECTION:
-            {content}
-
-JOB REQUIREMENTS:
-{requirements_text}
-
-REQUIRED SKILLS:
-{skills_text}{analysis_prompt}
-
-Return your response as a structured JSON object with the following format:
-
-```json
-{{
-  "education": [
-    {{
-      "institution": "University Name",
-      "location": "City, State",
-      "degree": "Degree Name",
-      "dates": "Time Period",
-      "highlights": [
-        "Highlight 1",
-        "Highlight 2"
-      ]
-    }}
-  ]
-}}
-```
-
-Please rewrite the education section to better match the job requirements. Focus on:
-1. Highlighting relevant coursework, projects, or achievements that match the job requirements
-2. Emphasizing academic accomplishments that demonstrate skills needed for this position
-3. Formatting in a way that emphasizes the most relevant educational experiences
-4. Including any certifications or training that matches required skills
-
-Keep the degree names, institutions, and dates exactly the same - only enhance descriptions to make them more relevant.
-"""
-
-            elif section_name == "skills":
-                prompt = f"""
-You are an expert resume tailoring assistant. Your task is to tailor the skills section to better match the requirements for a {job_title} position at {company}.
-
-ORIGINAL SKILLS SECTION:
-{content}
-
-JOB REQUIREMENTS:
-{requirements_text}
-
-REQUIRED SKILLS:
-{skills_text}{analysis_prompt}
-
-Return your response as a structured JSON object with the following format:
-
-```json
-{{
-  "skills": {{
-    "technical": ["Skill 1", "Skill 2"],
-    "soft": ["Skill 1", "Skill 2"],
-    "other": ["Skill 1", "Skill 2"]
-  }}
-}}
-```
-
-Please rewrite the skills section to better match the job requirements. Focus on:
-1. Reordering skills to prioritize those mentioned in the job description
-2. Adding any missing skills that the candidate likely has based on their experience (must be reasonable to infer from other sections)
-3. Grouping skills into relevant categories that align with the job posting
-4. Rephrasing skills using the exact terminology from the job description
-5. Removing skills that are irrelevant to this position if the list is very long
-
-Only include skills that are authentic to the candidate based on their resume.
-"""
-
-            elif section_name == "projects":
-                prompt = f"""
-You are an expert resume tailoring assistant. Your task is to tailor the projects section to better match the requirements for a {job_title} position at {company}.
-
-ORIGINAL PROJECTS SECTION:
-{content}
-
-JOB REQUIREMENTS:
-{requirements_text}
-
-REQUIRED SKILLS:
-{skills_text}{analysis_prompt}
-
-Return your response as a structured JSON object with the following format:
-
-```json
-{{
-  "projects": [
-    {{
-      "title": "Project Name",
-      "dates": "Time Period",
-      "details": [
-        "Detail 1",
-        "Detail 2"
-      ]
-    }}
-  ]
-}}
-```
+            prompt = build_tailoring_prompt(section_name, content, job_data)
 
-Please rewrite the projects section to better match the job requirements. Focus on:
-1. Highlighting projects that demonstrate skills relevant to this position
-2. Emphasizing technical achievements and technologies that align with the job description
-3. Quantifying impact and results wherever possible
-4. Using terminology from the job description where appropriate
-
-IMPORTANT:
-1. Do not include empty strings or whitespace-only strings in any arrays
-2. Every detail must contain meaningful content
-3. Do not split single project descriptions into multiple entries
-4. Make sure each bullet point contains complete, meaningful content
-5. Ensure all project entries from the original resume are preserved
+            _, model_name, temperature, _ = self._model_settings()
+            system_message = TAILORING_SYSTEM_MESSAGE
 
-Maintain the original project names and dates - only enhance descriptions to make them more relevant.
-"""
+            # Reuse an identical earlier completion if one is cached
+            response_cache = get_llm_response_cache()
+            cache_key = make_cache_key("openai", model_name, prompt.text, temperature, system_message)
+            response_text = response_cache.get(cache_key)
+            is_fresh_response = False
 
+            if response_text is not None:
+                logger.info(f"Using cached OpenAI response for {section_name}")
+                annotate_span(cache_hit=True)
             else:
-                # For other sections, use a generic prompt
-                prompt = f"""
-You are an expert resume tailoring assistant. Your task is to tailor the {section_name} section to better match the requirements for a {job_title} position at {company}.
-
-ORIGINAL SECTION:
-{content}
-
-JOB REQUIREMENTS:
-{requirements_text}
-
-REQUIRED SKILLS:
-{skills_text}{analysis_prompt}
-
-Return your response as a structured JSON object with the following format:
-
-```json
-{{
-  "{section_name}": "The tailored content goes here as a single string"
-}}
-```
-
-Please rewrite this section to better match the job requirements while maintaining the same basic structure and information.
-Focus on emphasizing elements most relevant to this job opportunity.
-"""
-
-            # Send the request to OpenAI API
-            response = self.client.chat.completions.create(
-                model="gpt-4o" if "4" in os.environ.get(
-    'OPENAI_MODEL_NAME', 'gpt-4') else "gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "Return valid JSON. Each 'achievements' string must contain: EITHER ≥1 digit (then no '??') OR exactly one '??' placeholder. Nothing else counts as a metric."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=4096,
-                top_p=1.0
-            )
-
-            # Get response text and extract JSON
-            response_text = response.choices[0].message.content
+                response_text, answered_by = self._complete(section_name, system_message, prompt)
+                # A failover or hedge reply is not cached under this provider's key
+                is_fresh_response = answered_by == "openai"
 
             # Save raw response for debugging
             self.raw_responses[section_name] = response_text
@@ -910,12 +1013,6 @@ Focus on emphasizing elements most relevant to this job opportunity.
 
             logger.info(
     f"OpenAI API response for {section_name}: {len(response_text)} chars")
-            
-            # Log token usage
-            prompt_tokens = response.usage.prompt_tokens
-            completion_tokens = response.usage.completion_tokens
-            logger.info(
-    f"Completion tokens: {completion_tokens}, Prompt tokens: {prompt_tokens}")
 
             # Extract JSON from the response
             json_match = re.search(
@@ -944,26 +1041,13 @@ Focus on emphasizing elements most relevant to this job opportunity.
                 # Store the raw response as fallback
                 return response_text
 
+            # Only cache completions that parsed, so a bad reply is not replayed
+            if is_fresh_response:
+                response_cache.set(cache_key, response_text)
+
             # Process JSON based on section type
             if section_name == "experience" and "experience" in json_response:
-                tailored = json_response["experience"]
-                # --- START: Updated post-processing guardrail using normalize_bullet ---
-                for job in tailored:
-                    fixed_achievements = []
-                    if "achievements" in job and isinstance(job["achievements"], list):
-                        for achievement in job["achievements"]:
-                             if isinstance(achievement, str):
-                                # Strip leading bullet chars FIRST
-                                clean = re.sub(r'^[•\\\\-\\\\u2022\\\\*]\\\\s*', '', achievement).strip()
-                                # Apply the cleaning function
-                                clean = _clean_metric_tokens(clean)
-                                fixed_achievements.append(clean)
-                             else:
-                                 # Keep non-string items or already valid strings
-                                 fixed_achievements.append(achievement) # Use original item if not string
-                        job["achievements"] = fixed_achievements
-                 # --- END: Update post-processing guardrail ---
-                return tailored
+                return self._normalize_experience(json_response["experience"])
             elif section_name == "education" and "education" in json_response:
                 return json_response["education"]
             elif section_name == "skills" and "skills" in json_response:
@@ -1486,13 +1570,223 @@ def extract_resume_sections(doc_path: str) -> Dict[str, str]:
         }
 
 
+# Per-provider semaphores cap how many tailoring calls this process has in flight
+# against one provider, across all concurrent /tailor-resume requests.
+_provider_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_provider_semaphores_lock = threading.Lock()
+
+
+def _get_provider_semaphore(provider: str) -> threading.BoundedSemaphore:
+    """Return the process-wide concurrency semaphore for an LLM provider"""
+    from config import Config
+
+    key = provider.lower()
+    with _provider_semaphores_lock:
+        if key not in _provider_semaphores:
+            limit = max(1, Config.TAILORING_MAX_CONCURRENCY_PER_PROVIDER)
+            _provider_semaphores[key] = threading.BoundedSemaphore(limit)
+            logger.info(f"Created {key} tailoring semaphore with limit {limit}")
+        return _provider_semaphores[key]
+
+
+def _section_fallback(section_name: str, resume_sections: Dict[str, Any]) -> Any:
+    """Original section content to keep when tailoring a section fails or times out"""
+    original = resume_sections.get(section_name)
+    if original is None or (isinstance(original, str) and not original.strip()):
+        return ""
+    return original
+
+
+def _section_data_for_storage(section_name: str, content: Any) -> Any:
+    """
+    Normalize a tailored section into the JSON structure saved in temp_session_data.
+
+    JSON strings are parsed, other strings are wrapped as {"content": ...} and
+    dicts/lists are kept as-is, which is what html_generator and docx_builder expect.
+    """
+    if isinstance(content, str):
+        # Attempt to parse if it looks like JSON, otherwise wrap it
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            return {"content": content}
+    if isinstance(content, (dict, list)):
+        return content
+    logger.warning(f"Unexpected data type for section {section_name}: {type(content)}. Saving as string.")
+    return {"content": str(content)}
+
+
+def _run_section_jobs_sequentially(
+    section_jobs: Dict[str, Callable[[], Any]],
+    resume_sections: Dict[str, Any],
+    on_result: Optional[Callable[[str, Any], None]] = None
+) -> Dict[str, Any]:
+    """Run section tailoring jobs one after another"""
+    results = {}
+    for section_name, job in section_jobs.items():
+        try:
+            results[section_name] = job()
+        except Exception as e:
+            logger.error(f"Error tailoring {section_name} section: {e}")
+            results[section_name] = _section_fallback(section_name, resume_sections)
+        if on_result:
+            on_result(section_name, results[section_name])
+    return results
+
+
+def _run_section_jobs_concurrently(
+    section_jobs: Dict[str, Callable[[], Any]],
+    resume_sections: Dict[str, Any],
+    provider: str,
+    on_result: Optional[Callable[[str, Any], None]] = None
+) -> Dict[str, Any]:
+    """
+    Run section tailoring jobs on a bounded thread pool and join them.
+
+    Each job holds the provider semaphore while it talks to the LLM, so the
+    number of in-flight calls per provider stays under
+    Config.TAILORING_MAX_CONCURRENCY_PER_PROVIDER. The batch has one deadline,
+    Config.TAILORING_SECTION_TIMEOUT_SECONDS after it starts, covering both
+    the wait for a slot and the call; a section not done by then keeps its
+    original content. Its worker thread is abandoned, not killed, but its
+    HTTP call times out at the same deadline and gives the slot back.
+
+    on_result, if given, is called on the calling thread with each section's
+    result (or fallback) as soon as that section finishes.
+    """
+    from config import Config
+
+    semaphore = _get_provider_semaphore(provider)
+    section_timeout = Config.TAILORING_SECTION_TIMEOUT_SECONDS
+    # Worker threads need the app context for current_app (raw response saving)
+    app = current_app._get_current_object() if has_app_context() else None
+
+    def run_job(section_name: str, job: Callable[[], Any]) -> Any:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not semaphore.acquire(timeout=remaining):
+            raise TimeoutError(f"no {provider} slot free within {section_timeout:.0f}s")
+        try:
+            _call_deadline.set(deadline)
+            if app is not None:
+                with app.app_context():
+                    return job()
+            return job()
+        finally:
+            semaphore.release()
+
+    logger.info(f"Tailoring {len(section_jobs)} sections concurrently with {provider} "
+                f"(timeout {section_timeout:.0f}s per section)")
+    batch_start = time.monotonic()
+    deadline = batch_start + section_timeout
+    executor = ThreadPoolExecutor(max_workers=len(section_jobs), thread_name_prefix="tailor")
+    # Each job runs in a copy of this context so its spans join the request's trace
+    futures = {executor.submit(contextvars.copy_context().run, run_job, name, job): name
+               for name, job in section_jobs.items()}
+    results = {}
+    pending = set(futures)
+    try:
+        while pending:
+            done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in done:
+                section_name = futures[future]
+                try:
+                    results[section_name] = future.result()
+                    logger.info(f"Section {section_name} tailored after "
+                                f"{time.monotonic() - batch_start:.2f}s")
+                except Exception as e:
+                    logger.error(f"Error tailoring {section_name} section: {e}")
+                    results[section_name] = _section_fallback(section_name, resume_sections)
+                if on_result:
+                    on_result(section_name, results[section_name])
+
+            if pending and time.monotonic() > deadline:
+                for future in list(pending):
+                    section_name = futures[future]
+                    logger.error(f"Tailoring {section_name} timed out after {section_timeout:.0f}s, "
+                                 f"keeping original content")
+                    results[section_name] = _section_fallback(section_name, resume_sections)
+                    pending.discard(future)
+                    if on_result:
+                        on_result(section_name, results[section_name])
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    logger.info(f"Concurrent tailoring finished in {time.monotonic() - batch_start:.2f}s")
+    return results
+
+
+def _tailor_sections_combined(
+    llm_client: LLMClient,
+    sections: Dict[str, Any],
+    job_data: Dict,
+    provider: str
+) -> Dict[str, Any]:
+    """
+    Tailor sections with one combined request, holding one provider slot
+    for at most Config.TAILORING_SECTION_TIMEOUT_SECONDS.
+
+    Returns the sections that came back valid; an error or an unparsable
+    reply returns {} so every section falls back to its own call.
+    """
+    from config import Config
+
+    semaphore = _get_provider_semaphore(provider)
+    timeout = Config.TAILORING_SECTION_TIMEOUT_SECONDS
+    deadline = time.monotonic() + timeout
+    with trace_span("tailor_combined", provider=provider, sections=len(sections)) as span:
+        if not semaphore.acquire(timeout=timeout):
+            logger.error(f"No {provider} slot free for combined tailoring, tailoring sections separately")
+            return {}
+        token = _call_deadline.set(deadline)
+        try:
+            tailored = llm_client.tailor_sections_combined(sections, job_data)
+        except Exception as e:
+            logger.error(f"Combined tailoring failed, tailoring sections separately: {e}")
+            tailored = {}
+        finally:
+            _call_deadline.reset(token)
+            semaphore.release()
+        span.set(tailored=len(tailored), fallback=len(sections) - len(tailored))
+    logger.info(f"Combined tailoring returned {len(tailored)}/{len(sections)} sections")
+    return tailored
+
+
+def _token_usage(response: Any) -> Dict[str, int]:
+    """Input/output token counts from an Anthropic or OpenAI response, for span attributes"""
+    usage = getattr(response, 'usage', None)
+    counts = {
+        'input_tokens': getattr(usage, 'input_tokens', None) or getattr(usage, 'prompt_tokens', None),
+        'output_tokens': getattr(usage, 'output_tokens', None) or getattr(usage, 'completion_tokens', None),
+    }
+    return {key: value for key, value in counts.items() if isinstance(value, int)}
+
+
+def _record_completion_usage(provider: str, model_name: str, response: Any) -> None:
+    """Annotate the current span with token and prompt cache usage and count it per provider"""
+    usage = cache_usage(response)
+    get_prompt_cache_stats().record(provider, usage)
+    annotate_span(cache_hit=False, model=model_name, prompt_cache_read_tokens=usage['cache_read_tokens'],
+                  prompt_cache_write_tokens=usage['cache_write_tokens'], **_token_usage(response))
+
+
+def _traced_section_job(section_name: str, provider: str, job: Callable[[], Any]) -> Callable[[], Any]:
+    """Wrap a section tailoring job in a tailor_section span"""
+    def run() -> Any:
+        with trace_span("tailor_section", section=section_name, provider=provider):
+            return job()
+    return run
+
+
 def tailor_resume_with_llm(
     resume_path: str,
     job_data: Dict,
     api_key: str,
     provider: str = "openai",
     api_url: str = None,
-    request_id: str = None
+    request_id: str = None,
+    concurrent: Optional[bool] = None,
+    on_section_complete: Optional[Callable[[str, Any], None]] = None,
+    combined: Optional[bool] = None
 ) -> Tuple[Dict[str, Any], Union[ClaudeClient, OpenAIClient]]:
     """
     Main function to tailor resume using either Claude or OpenAI LLM
@@ -1504,16 +1798,39 @@ def tailor_resume_with_llm(
         provider (str): LLM provider ("claude" or "openai")
         api_url (str): API URL for Claude (optional)
         request_id (str): Unique identifier for this tailoring request
+        concurrent (bool): Tailor sections in parallel; defaults to Config.USE_CONCURRENT_TAILORING
+        on_section_complete (Callable): Called with (section_name, section_data) as each
+            section becomes final; section_data is in the saved temp_session_data format
+        combined (bool): Tailor all sections in one request, falling back to per-section
+            calls for sections that fail to validate; defaults to Config.USE_COMBINED_TAILORING
         
     Returns:
         Tuple[Dict[str, Any], Union[ClaudeClient, OpenAIClient]]: Dictionary of tailored sections, LLM client instance
     """
+    with trace_request(request_id), trace_span("tailor_resume", provider=provider):
+        return _tailor_resume_with_llm(resume_path, job_data, api_key, provider, api_url,
+                                       request_id, concurrent, on_section_complete, combined)
+
+
+def _tailor_resume_with_llm(
+    resume_path: str,
+    job_data: Dict,
+    api_key: str,
+    provider: str,
+    api_url: Optional[str],
+    request_id: Optional[str],
+    concurrent: Optional[bool],
+    on_section_complete: Optional[Callable[[str, Any], None]],
+    combined: Optional[bool]
+) -> Tuple[Dict[str, Any], Union[ClaudeClient, OpenAIClient]]:
     global last_llm_client
     
     logger.info(f"Tailoring resume with {provider} LLM")
     
     # Extract resume sections
-    resume_sections = extract_resume_sections(resume_path)
+    with trace_span("extract_resume_sections") as span:
+        resume_sections = extract_resume_sections(resume_path)
+        span.set(sections=len(resume_sections))
     
     # Initialize the appropriate LLM client
     llm_client = None
@@ -1524,6 +1841,14 @@ def tailor_resume_with_llm(
     else:
         raise ValueError(f"Unsupported LLM provider: {provider}")
     
+    def notify_section_complete(section_name: str, content: Any) -> None:
+        if on_section_complete is None or content is None:
+            return
+        try:
+            on_section_complete(section_name, _section_data_for_storage(section_name, content))
+        except Exception as e:
+            logger.warning(f"Section completion callback failed for {section_name}: {e}")
+
     # Tailor each section
     tailored_sections = {}
     section_order = ["contact", "summary", "experience", "education", "skills", "projects"]
@@ -1536,19 +1861,23 @@ def tailor_resume_with_llm(
     else:
         logger.warning("Contact section not found in resume")
         tailored_sections["contact"] = "" # Ensure key exists
+    notify_section_complete("contact", tailored_sections["contact"])
+
+    # Collect one tailoring job per section; the jobs are independent of each
+    # other so they can run sequentially or fanned out across a thread pool.
+    # section_inputs holds the sections whose job is a plain tailor_resume_content
+    # call, which combined mode can fold into one request.
+    section_jobs = {}
+    section_inputs = {}
 
     # Handle summary - generate if missing or tailor if present
     if "summary" not in resume_sections or not resume_sections["summary"].strip():
         logger.warning("No summary information found in resume sections, generating a new summary")
-        try:
-            tailored_sections["summary"] = generate_professional_summary(resume_sections, job_data, llm_client, provider)
-            logger.info(f"Generated new professional summary: {len(tailored_sections['summary'])} chars")
-        except Exception as summary_err:
-            logger.error(f"Error generating professional summary: {summary_err}")
-            tailored_sections["summary"] = "" # Default to empty if generation fails
+        section_jobs["summary"] = lambda: generate_professional_summary(resume_sections, job_data, llm_client, provider)
     else:
         logger.info("Tailoring existing summary section")
-        tailored_sections["summary"] = llm_client.tailor_resume_content("summary", resume_sections["summary"], job_data)
+        section_jobs["summary"] = lambda: llm_client.tailor_resume_content("summary", resume_sections["summary"], job_data)
+        section_inputs["summary"] = resume_sections["summary"]
 
     # Tailor other sections
     for section_name in section_order:
@@ -1573,12 +1902,45 @@ def tailor_resume_with_llm(
             # --- END FIX ---
                 logger.info(f"Tailoring {section_name} section")
                 # Pass the original content (string or list) directly to tailoring
-                tailored_content_result = llm_client.tailor_resume_content(section_name, section_content, job_data)
-                tailored_sections[section_name] = tailored_content_result
+                section_jobs[section_name] = (
+                    lambda name=section_name, content=section_content:
+                        llm_client.tailor_resume_content(name, content, job_data)
+                )
+                section_inputs[section_name] = section_content
             else:
                 logger.info(f"Skipping empty or missing section: {section_name}")
                 # Ensure key exists even if skipped, potentially use the original empty value
                 tailored_sections[section_name] = section_content if section_content is not None else ""
+                notify_section_complete(section_name, tailored_sections[section_name])
+
+    from config import Config
+    section_results = {}
+    use_combined = Config.USE_COMBINED_TAILORING if combined is None else combined
+    if use_combined and len(section_inputs) > 1:
+        # One request for the shared job context; only sections that fail to
+        # validate keep their own job below
+        for section_name, content in _tailor_sections_combined(llm_client, section_inputs,
+                                                               job_data, provider).items():
+            section_results[section_name] = content
+            del section_jobs[section_name]
+            notify_section_complete(section_name, content)
+
+    section_jobs = {name: _traced_section_job(name, provider, job) for name, job in section_jobs.items()}
+
+    use_concurrency = Config.USE_CONCURRENT_TAILORING if concurrent is None else concurrent
+    if use_concurrency and len(section_jobs) > 1:
+        section_results.update(_run_section_jobs_concurrently(section_jobs, resume_sections, provider,
+                                                              on_result=notify_section_complete))
+    else:
+        section_results.update(_run_section_jobs_sequentially(section_jobs, resume_sections,
+                                                              on_result=notify_section_complete))
+
+    # Reassemble in the canonical section order regardless of completion order
+    tailored_sections = {
+        name: section_results[name] if name in section_results else tailored_sections[name]
+        for name in section_order
+        if name in section_results or name in tailored_sections
+    }
 
     # --- START: New saving logic (Step 3.3c) ---
     try:
@@ -1586,46 +1948,21 @@ def tailor_resume_with_llm(
         # Ensure directory exists (might be redundant if created in app.py, but safe)
         os.makedirs(temp_data_dir, exist_ok=True)
 
-        sections_saved_count = 0
         logger.info(f"Attempting to save cleaned sections for request_id: {request_id}")
+        sections_to_save = {}
         # Use tailored_sections collected in this function scope
         for section_name, content in tailored_sections.items():
             if content is not None: # Save even if content is empty string, but not None
-                # Determine the filename using request_id
-                cleaned_filepath = os.path.join(temp_data_dir, f"{request_id}_{section_name}.json")
-                # Save the actual content (which should be the final string or structured data)
-                # We need to decide the format - let's save the direct content string/structure
-                # For now, let's assume the values in tailored_sections are the final desired JSON-compatible structures
-                # or strings. We'll save them directly.
-                # TODO: Verify the format stored in tailored_sections matches what html_generator expects.
-                # Let's wrap simple strings in a basic JSON structure for consistency.
-                data_to_save = {}
-                if isinstance(content, str):
-                     # Attempt to parse if it looks like JSON, otherwise wrap it
-                    try:
-                        parsed_json = json.loads(content)
-                        data_to_save = parsed_json # Save parsed JSON if valid
-                    except json.JSONDecodeError:
-                        # If not valid JSON, wrap the string content
-                        data_to_save = { "content": content }
-                elif isinstance(content, (dict, list)):
-                    data_to_save = content # Save dicts/lists directly
-                else:
-                    # Handle other types if necessary, or log a warning
-                    logger.warning(f"Unexpected data type for section {section_name}: {type(content)}. Saving as string.")
-                    data_to_save = { "content": str(content) }
-
-                try:
-                    with open(cleaned_filepath, 'w', encoding='utf-8') as f:
-                        json.dump(data_to_save, f, indent=2, ensure_ascii=False)
-                    sections_saved_count += 1
-                    logger.info(f"Saved cleaned {section_name} content for request {request_id} to {cleaned_filepath}")
-                except Exception as save_err:
-                    logger.error(f"Error saving cleaned section {section_name} for request {request_id} to {cleaned_filepath}: {save_err}")
+                # Simple strings are wrapped in a basic JSON structure for consistency
+                sections_to_save[section_name] = _section_data_for_storage(section_name, content)
             else:
                  logger.warning(f"Content for section {section_name} is None, skipping save for request {request_id}.")
 
-        logger.info(f"Saved {sections_saved_count} cleaned sections for request {request_id} to {temp_data_dir}")
+        # All sections go into one packed session file (see utils.session_store)
+        with trace_span("save_sections", sections=len(sections_to_save)) as span:
+            saved_path = get_session_store(temp_data_dir).save_sections(request_id, sections_to_save)
+            span.set(bytes_written=os.path.getsize(saved_path))
+        logger.info(f"Saved {len(sections_to_save)} cleaned sections for request {request_id} to {temp_data_dir}")
 
     except Exception as e:
         logger.error(f"Error saving cleaned session data for request {request_id}: {e}")
@@ -1748,6 +2085,7 @@ def generate_summary_with_claude(prompt: str, claude_client) -> str:
         
         # Extract and clean the summary
         summary = response.content[0].text
+        annotate_span(**_token_usage(response))
         
         # Save the raw response
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -1782,6 +2120,7 @@ def generate_summary_with_openai(prompt: str, openai_client) -> str:
         
         # Extract the summary
         summary = response.choices[0].message.content
+        annotate_span(**_token_usage(response))
         
         # Save the raw response
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -7,6 +7,9 @@ load_dotenv()
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key'
     UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static/uploads')
+    # SQLite stores (response and parse caches, job queue, resume index, metrics) hold resume
+    # text and tailored output, so they live outside static/, which Flask serves at /static/
+    DATA_DIR = os.getenv('DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance'))
     ALLOWED_EXTENSIONS = {'docx'}
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max upload size
     
@@ -24,7 +27,144 @@ class Config:
     # Job analysis configuration
     USE_LLM_JOB_ANALYSIS = os.environ.get('USE_LLM_JOB_ANALYSIS', 'true').lower() == 'true'
     LLM_JOB_ANALYZER_PROVIDER = os.environ.get('LLM_JOB_ANALYZER_PROVIDER', 'auto')  # 'auto', 'claude', 'openai'
-    JOB_ANALYSIS_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static/uploads/job_analysis_cache')
+    JOB_ANALYSIS_CACHE_DIR = os.getenv('JOB_ANALYSIS_CACHE_DIR', os.path.join(DATA_DIR, 'cache'))
 
     # Enhanced Spacing Feature Flag (Phase 4)
     USE_ENHANCED_SPACING = os.getenv('USE_ENHANCED_SPACING', 'true').lower() == 'true'
+
+    # Concurrent section tailoring: fan independent sections out to the LLM in parallel
+    USE_CONCURRENT_TAILORING = os.getenv('USE_CONCURRENT_TAILORING', 'true').lower() == 'true'
+    TAILORING_MAX_CONCURRENCY_PER_PROVIDER = int(os.getenv('TAILORING_MAX_CONCURRENCY_PER_PROVIDER', '3'))
+    TAILORING_SECTION_TIMEOUT_SECONDS = float(os.getenv('TAILORING_SECTION_TIMEOUT_SECONDS', '90'))
+    # Combined tailoring: one request for all sections, per-section calls only for sections that fail to validate
+    USE_COMBINED_TAILORING = os.getenv('USE_COMBINED_TAILORING', 'false').lower() == 'true'
+
+    # Provider prompt caching: Anthropic cache_control breakpoints on the constant tailoring instructions
+    USE_PROMPT_CACHING = os.getenv('USE_PROMPT_CACHING', 'true').lower() == 'true'
+    # Shortest system + prefix the model will cache (1024 tokens for Sonnet/Opus, 2048 for Haiku);
+    # shorter prefixes are sent without a breakpoint, since it could never be used
+    PROMPT_CACHE_MIN_TOKENS = int(os.getenv('PROMPT_CACHE_MIN_TOKENS', '1024'))
+    # Prompt token budgets (utils.prompt_budget): trim low-priority job context to fit; false only measures
+    USE_PROMPT_BUDGETS = os.getenv('USE_PROMPT_BUDGETS', 'true').lower() == 'true'
+    PROMPT_TOKEN_BUDGETS = os.getenv('PROMPT_TOKEN_BUDGETS', '')  # overrides, e.g. "experience=8000,skills=1500"
+
+    # Resilient tailoring calls (utils.resilient_llm): jittered retries on 429/5xx/timeouts, a circuit
+    # breaker per provider and failover to the other provider when its API key is configured
+    LLM_CALL_MAX_ATTEMPTS = int(os.getenv('LLM_CALL_MAX_ATTEMPTS', '3'))
+    LLM_RETRY_BASE_SECONDS = float(os.getenv('LLM_RETRY_BASE_SECONDS', '0.5'))
+    LLM_RETRY_MAX_SECONDS = float(os.getenv('LLM_RETRY_MAX_SECONDS', '8'))
+    LLM_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('LLM_CIRCUIT_FAILURE_THRESHOLD', '5'))
+    LLM_CIRCUIT_RESET_SECONDS = float(os.getenv('LLM_CIRCUIT_RESET_SECONDS', '30'))
+    USE_LLM_FAILOVER = os.getenv('USE_LLM_FAILOVER', 'true').lower() == 'true'
+    # Hedged requests: also ask the other provider once the primary exceeds its pN latency (costs a second call)
+    USE_LLM_HEDGING = os.getenv('USE_LLM_HEDGING', 'false').lower() == 'true'
+    LLM_HEDGE_PERCENTILE = float(os.getenv('LLM_HEDGE_PERCENTILE', '95'))
+    LLM_HEDGE_MIN_SAMPLES = int(os.getenv('LLM_HEDGE_MIN_SAMPLES', '20'))
+
+    # Client-side LLM rate limiter (utils.rate_limiter): requests/min and tokens/min buckets per provider
+    # and API key, shared by all workers through SQLite and adapted from the providers' rate limit headers
+    USE_LLM_RATE_LIMITER = os.getenv('USE_LLM_RATE_LIMITER', 'true').lower() == 'true'
+    LLM_RATE_LIMIT_BACKEND = os.getenv('LLM_RATE_LIMIT_BACKEND', 'sqlite')  # 'memory', 'sqlite'
+    LLM_RATE_LIMIT_DB_PATH = os.getenv(
+        'LLM_RATE_LIMIT_DB_PATH',
+        os.path.join(DATA_DIR, 'cache', 'llm_rate_limits.sqlite3'))
+    LLM_RATE_LIMIT_MAX_WAIT_SECONDS = float(os.getenv('LLM_RATE_LIMIT_MAX_WAIT_SECONDS', '30'))
+    # Starting limits per provider until response headers report the account's real ones
+    CLAUDE_REQUESTS_PER_MINUTE = int(os.getenv('CLAUDE_REQUESTS_PER_MINUTE', '50'))
+    CLAUDE_TOKENS_PER_MINUTE = int(os.getenv('CLAUDE_TOKENS_PER_MINUTE', '40000'))
+    OPENAI_REQUESTS_PER_MINUTE = int(os.getenv('OPENAI_REQUESTS_PER_MINUTE', '500'))
+    OPENAI_TOKENS_PER_MINUTE = int(os.getenv('OPENAI_TOKENS_PER_MINUTE', '30000'))
+
+    # LLM response cache: reuse completions for identical (provider, model, prompt, temperature)
+    USE_LLM_RESPONSE_CACHE = os.getenv('USE_LLM_RESPONSE_CACHE', 'true').lower() == 'true'
+    LLM_RESPONSE_CACHE_BACKEND = os.getenv('LLM_RESPONSE_CACHE_BACKEND', 'tiered')  # 'memory', 'sqlite', 'tiered'
+    LLM_RESPONSE_CACHE_PATH = os.getenv(
+        'LLM_RESPONSE_CACHE_PATH',
+        os.path.join(DATA_DIR, 'cache', 'llm_responses.sqlite3'))
+    LLM_RESPONSE_CACHE_TTL_SECONDS = float(os.getenv('LLM_RESPONSE_CACHE_TTL_SECONDS', str(24 * 3600)))
+    LLM_RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('LLM_RESPONSE_CACHE_MAX_ENTRIES', '2000'))
+    LLM_RESPONSE_CACHE_MAX_BYTES = int(os.getenv('LLM_RESPONSE_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+
+    # Resume index (resume_index.ResumeIndex): SQLite in WAL mode, shared by all workers
+    RESUME_INDEX_DB_PATH = os.getenv(
+        'RESUME_INDEX_DB_PATH',
+        os.path.join(DATA_DIR, 'index', 'resume_index.sqlite3'))
+
+    # Request analytics (utils.request_correlation): bounded recent-request history and
+    # rolling counters; the SQLite store makes /api/analytics/summary consistent across workers
+    REQUEST_METRICS_MAX_COMPLETED = int(os.getenv('REQUEST_METRICS_MAX_COMPLETED', '1000'))
+    REQUEST_METRICS_MAX_USERS = int(os.getenv('REQUEST_METRICS_MAX_USERS', '1000'))
+    REQUEST_METRICS_USER_HISTORY = int(os.getenv('REQUEST_METRICS_USER_HISTORY', '50'))
+    REQUEST_METRICS_BUCKET_SECONDS = int(os.getenv('REQUEST_METRICS_BUCKET_SECONDS', '300'))
+    REQUEST_METRICS_RETENTION_HOURS = int(os.getenv('REQUEST_METRICS_RETENTION_HOURS', '168'))
+    USE_SHARED_REQUEST_METRICS = os.getenv('USE_SHARED_REQUEST_METRICS', 'true').lower() == 'true'
+    REQUEST_METRICS_DB_PATH = os.getenv(
+        'REQUEST_METRICS_DB_PATH',
+        os.path.join(DATA_DIR, 'cache', 'request_metrics.sqlite3'))
+
+    # Pipeline tracing (utils.tracing): per-request span timelines kept for the most
+    # recent requests and a bounded latency sample window per stage
+    TRACE_MAX_REQUESTS = int(os.getenv('TRACE_MAX_REQUESTS', '200'))
+    TRACE_SAMPLES_PER_STAGE = int(os.getenv('TRACE_SAMPLES_PER_STAGE', '1000'))
+
+    # Claude API call log (claude_api_logger): append-only JSONL segments in logs/
+    CLAUDE_API_LOG_MAX_BYTES = int(os.getenv('CLAUDE_API_LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+    CLAUDE_API_LOG_BATCH_SIZE = int(os.getenv('CLAUDE_API_LOG_BATCH_SIZE', '20'))
+    CLAUDE_API_LOG_FLUSH_INTERVAL_SECONDS = float(os.getenv('CLAUDE_API_LOG_FLUSH_INTERVAL_SECONDS', '1.0'))
+    CLAUDE_API_LOG_BACKGROUND_WRITER = os.getenv('CLAUDE_API_LOG_BACKGROUND_WRITER', 'true').lower() == 'true'
+
+    # Shared LLM SDK clients (utils.llm_client_registry): pooled keep-alive HTTP connections
+    LLM_HTTP_MAX_CONNECTIONS = int(os.getenv('LLM_HTTP_MAX_CONNECTIONS', '20'))
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS', '10'))
+    LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv('LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS', '60'))
+    LLM_HTTP_TIMEOUT_SECONDS = float(os.getenv('LLM_HTTP_TIMEOUT_SECONDS', '600'))
+    LLM_HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv('LLM_HTTP_CONNECT_TIMEOUT_SECONDS', '10'))
+    LLM_HTTP_MAX_RETRIES = int(os.getenv('LLM_HTTP_MAX_RETRIES', '2'))
+    LLM_CLIENT_REGISTRY_MAX_CLIENTS = int(os.getenv('LLM_CLIENT_REGISTRY_MAX_CLIENTS', '32'))
+
+    # Streaming tailoring (/tailor-resume/stream): idle seconds between SSE keep-alive comments
+    TAILORING_STREAM_KEEPALIVE_SECONDS = float(os.getenv('TAILORING_STREAM_KEEPALIVE_SECONDS', '10'))
+
+    # Background tailoring job queue: /tailor-resume enqueues and returns immediately
+    # when enabled; "async": true is rejected while it is off. Jobs are run by
+    # `python tailoring_worker.py`, which must share this host's filesystem.
+    USE_TAILORING_JOB_QUEUE = os.getenv('USE_TAILORING_JOB_QUEUE', 'false').lower() == 'true'
+    TAILORING_QUEUE_PATH = os.getenv(
+        'TAILORING_QUEUE_PATH',
+        os.path.join(DATA_DIR, 'queue', 'tailoring_jobs.sqlite3'))
+    TAILORING_QUEUE_WORKERS = int(os.getenv('TAILORING_QUEUE_WORKERS', '2'))
+    TAILORING_QUEUE_MAX_RUNNING_PER_PROVIDER = int(os.getenv('TAILORING_QUEUE_MAX_RUNNING_PER_PROVIDER', '2'))
+    TAILORING_QUEUE_POLL_SECONDS = float(os.getenv('TAILORING_QUEUE_POLL_SECONDS', '1.0'))
+    TAILORING_QUEUE_LEASE_SECONDS = float(os.getenv('TAILORING_QUEUE_LEASE_SECONDS', '300'))
+    TAILORING_JOB_MAX_ATTEMPTS = int(os.getenv('TAILORING_JOB_MAX_ATTEMPTS', '3'))
+    TAILORING_JOB_RETRY_BACKOFF_SECONDS = float(os.getenv('TAILORING_JOB_RETRY_BACKOFF_SECONDS', '5'))
+    # Finished and failed jobs (payload included) are purged by the worker pool after this long
+    TAILORING_JOB_RETENTION_HOURS = float(os.getenv('TAILORING_JOB_RETENTION_HOURS', '24'))
+
+    # Session data store: tailored sections per request, packed into one file with an in-process LRU
+    SESSION_STORE_MEMORY_ENTRIES = int(os.getenv('SESSION_STORE_MEMORY_ENTRIES', '64'))
+
+    # Rendered DOCX cache: reuse build_docx output for unchanged sections and styles
+    USE_DOCX_CACHE = os.getenv('USE_DOCX_CACHE', 'true').lower() == 'true'
+    DOCX_CACHE_MAX_BYTES = int(os.getenv('DOCX_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+
+    # Styled DOCX template: build the styled, empty base document once per design-token
+    # fingerprint and clone it for every build
+    USE_DOCX_TEMPLATE_CACHE = os.getenv('USE_DOCX_TEMPLATE_CACHE', 'true').lower() == 'true'
+    DOCX_TEMPLATE_CACHE_ENTRIES = int(os.getenv('DOCX_TEMPLATE_CACHE_ENTRIES', '4'))
+
+    # Parsed resume cache: one LLM parse per (file content, parser version, provider)
+    USE_RESUME_PARSE_CACHE = os.getenv('USE_RESUME_PARSE_CACHE', 'true').lower() == 'true'
+    RESUME_PARSE_CACHE_PATH = os.getenv(
+        'RESUME_PARSE_CACHE_PATH',
+        os.path.join(DATA_DIR, 'cache', 'resume_parses.sqlite3'))
+    RESUME_PARSE_CACHE_TTL_SECONDS = float(os.getenv('RESUME_PARSE_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+    RESUME_PARSE_CACHE_MAX_ENTRIES = int(os.getenv('RESUME_PARSE_CACHE_MAX_ENTRIES', '500'))
+
+    # Job analysis cache: one LLM analysis per (normalized posting, provider, model, prompt version),
+    # stored in JOB_ANALYSIS_CACHE_DIR (DATA_DIR/cache by default, outside the served static/ folder)
+    USE_JOB_ANALYSIS_CACHE = os.getenv('USE_JOB_ANALYSIS_CACHE', 'true').lower() == 'true'
+    JOB_ANALYSIS_CACHE_TTL_SECONDS = float(os.getenv('JOB_ANALYSIS_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+    JOB_ANALYSIS_CACHE_MEMORY_ENTRIES = int(os.getenv('JOB_ANALYSIS_CACHE_MEMORY_ENTRIES', '128'))
+    JOB_ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv('JOB_ANALYSIS_CACHE_MAX_ENTRIES', '2000'))
+    JOB_ANALYSIS_CACHE_MAX_BYTES = int(os.getenv('JOB_ANALYSIS_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
@@ -2,9 +2,12 @@ import logging
 import re
 import os
 import json
+from functools import cached_property
 from typing import Dict, List, Union, Optional
 from flask import current_app
 from style_manager import StyleManager
+from utils.session_store import get_session_store
+from utils.tracing import traced
 
 # Import universal renderers for consistent cross-format styling
 try:
@@ -334,18 +337,250 @@ def generate_universal_section_header_html(section_name: str) -> str:
     # Legacy fallback
     return f'<div class="section-box">{section_name}</div>'
 
-def generate_preview_from_llm_responses(request_id: str, upload_folder: str, for_screen: bool = True) -> str:
+def _wrap_section_html(title: str, content_class: str, body_html: str) -> str:
+    """Wrap a rendered section body in the standard section box and header."""
+    return ''.join([
+        '<div class="resume-section">',
+        generate_universal_section_header_html(title),
+        f'<div class="{content_class}">',
+        body_html,
+        '</div>',
+        '</div>',
+    ])
+
+
+def _render_contact_html(contact_text: str) -> str:
+    """Render the contact block; the first line is treated as the name."""
+    if not contact_text:
+        return ""
+
+    contact_lines = contact_text.strip().split('\n')
+    contact_html = '<div class="contact-section">'
+
+    # First line is usually the name
+    if contact_lines:
+        contact_html += f'<p class="name">{contact_lines[0]}</p>'
+
+        # Add remaining contact lines
+        for line in contact_lines[1:]:
+            if line.strip():
+                contact_html += f'<p>{line.strip()}</p>'
+
+    contact_html += '</div><hr class="contact-divider"/>'
+    return contact_html
+
+
+def _render_experience_body(experience_data: list) -> str:
+    parts = []
+    for job in experience_data:
+        company = job.get('company', '')
+        location = job.get('location', '')
+        position = job.get('position', '')
+        dates = job.get('dates', '')
+        role_description = job.get('role_description', '')  # Extract role description
+        # The structured data has 'achievements' directly
+        achievements = job.get('achievements', [])
+
+        if not any([company, position]):  # Skip empty entries
+            continue
+
+        parts.append(format_job_entry(company, location, position, dates, achievements, role_description))
+    return ''.join(parts)
+
+
+def _render_education_body(education_data: list) -> str:
+    parts = []
+    for edu_entry in education_data:
+        institution = edu_entry.get('institution', '')
+        location = edu_entry.get('location', '')
+        degree = edu_entry.get('degree', '')
+        dates = edu_entry.get('dates', '')
+        highlights = edu_entry.get('highlights', [])
+        parts.append(format_education_entry(institution, location, degree, dates, highlights))
+    return ''.join(parts)
+
+
+def _render_projects_body(projects_data: list) -> str:
+    parts = []
+    for proj_entry in projects_data:
+        title = proj_entry.get('title', '')
+        dates = proj_entry.get('dates', '')
+        details = proj_entry.get('details', [])
+        parts.append(format_project_entry(title, dates, details))
+    return ''.join(parts)
+
+
+def _render_skills_body(skills_data: Union[Dict, str]) -> str:
+    # Handle both structured dict {"technical": [], ...} and simple {"content": "..."}
+    skills_html = ""
+    if isinstance(skills_data, dict):
+        if 'technical' in skills_data or 'soft' in skills_data or 'other' in skills_data:
+            # Process structured skills
+            if skills_data.get('technical'):
+                skills_html += "<p><strong>Technical Skills:</strong> " + ", ".join(skills_data['technical']) + "</p>"
+            if skills_data.get('soft'):
+                skills_html += "<p><strong>Soft Skills:</strong> " + ", ".join(skills_data['soft']) + "</p>"
+            if skills_data.get('other'):
+                skills_html += "<p><strong>Other Skills:</strong> " + ", ".join(skills_data['other']) + "</p>"
+        elif skills_data.get('content'):
+            # Process simple content string
+            skills_html = format_section_content(skills_data['content'])
+    elif isinstance(skills_data, str):
+        # Handle raw string if saved incorrectly
+        logger.warning("Skills section loaded as raw string.")
+        skills_html = format_section_content(skills_data)
+    return skills_html
+
+
+# Section name -> (display title, content css class, structured-list renderer)
+_LIST_SECTION_RENDERERS = {
+    'experience': ("Experience", "experience-content", _render_experience_body),
+    'education': ("Education", "education-content", _render_education_body),
+    'projects': ("Projects", "projects-content", _render_projects_body),
+}
+
+
+def render_section_html(section_name: str, section_data: Union[Dict, List, str, None]) -> str:
     """
-    Generate an HTML preview from LLM API responses stored in session-specific files.
+    Render a single tailored section into its preview HTML fragment.
+
+    This is the per-section building block used by generate_preview_from_llm_responses
+    and by the streaming tailoring endpoint, which sends each fragment as soon as the
+    section is tailored.
+
+    Args:
+        section_name: One of contact, summary, experience, education, skills, projects
+        section_data: The section payload as saved in temp_session_data
+                      (list of entries, {"content": ...} dict, or raw string)
+
+    Returns:
+        HTML fragment for the section, or an empty string if there is nothing to show
+    """
+    if section_data is None:
+        return ""
+
+    if section_name == 'contact':
+        contact_text = section_data.get('content', '') if isinstance(section_data, dict) else section_data
+        return _render_contact_html(contact_text) if isinstance(contact_text, str) else ""
+
+    if section_name == 'summary':
+        summary_text = section_data.get('content', '') if isinstance(section_data, dict) else section_data
+        if isinstance(summary_text, str) and summary_text.strip():
+            return _wrap_section_html("Professional Summary", "summary-content", format_section_content(summary_text))
+        return ""
+
+    if section_name == 'skills':
+        skills_html = _render_skills_body(section_data)
+        if skills_html.strip():
+            return _wrap_section_html("Skills", "skills-content", skills_html)
+        return ""
+
+    if section_name in _LIST_SECTION_RENDERERS:
+        title, content_class, render_entries = _LIST_SECTION_RENDERERS[section_name]
+        if isinstance(section_data, list):
+            return _wrap_section_html(title, content_class, render_entries(section_data))
+        if isinstance(section_data, dict) and section_data.get('content'):
+            logger.warning(f"{title} section loaded as simple content, formatting as text.")
+            return _wrap_section_html(title, content_class, format_section_content(section_data['content']))
+        if isinstance(section_data, str):
+            logger.warning(f"{title} section loaded as raw string, formatting as text.")
+            return _wrap_section_html(title, content_class, format_section_content(section_data))
+        return ""
+
+    logger.warning(f"No preview renderer for section '{section_name}'")
+    return ""
+
+
+def _load_cached_parse_for_current_resume(upload_folder: str) -> Optional[Dict]:
+    """Load the cached *_llm_parsed.json for g.resume_file_id, if any."""
+    # Avoid flask imports here if possible, but keep g for now
+    try:
+        from flask import g
+        has_g = True
+    except ImportError:
+        has_g = False
+
+    if has_g and hasattr(g, 'resume_file_id') and g.resume_file_id:
+        resume_id = g.resume_file_id
+        logger.info(f"Attempting to recover from original resume parsing (ID: {resume_id})")
+
+        # Try to locate the cached parsing result
+        import glob
+        llm_parsed_files = glob.glob(os.path.join(upload_folder, f"*{resume_id}*_llm_parsed.json"))
+
+        if llm_parsed_files:
+            with open(llm_parsed_files[0], 'r') as f:
+                return json.load(f)
+    return None
+
+
+class PreviewRender:
+    """
+    Rendered preview for one tailoring request.
+
+    Section fragments are built once; the screen fragment and the full print
+    document are cheap wrappers over them, computed on first access only.
+    """
+
+    def __init__(self, request_id: str, content_parts: Optional[List[str]] = None, error: Optional[str] = None):
+        self.request_id = request_id
+        self.content_parts = content_parts or []
+        self.error = error
+
+    @cached_property
+    def screen_html(self) -> str:
+        """HTML fragment for the on-screen preview"""
+        if self.error:
+            return f"<p>{self.error}</p>"
+        html_content = validate_html_content(''.join(self.content_parts))
+        logger.info(f"Generated HTML fragment for preview: {len(html_content)} chars")
+        return html_content
+
+    @cached_property
+    def print_body_html(self) -> str:
+        """Body content of the print document, as used for PDF export"""
+        if self.error:
+            return f"<p>{self.error}</p>"
+        return validate_html_content('\n'.join(self.content_parts)).strip()
+
+    @cached_property
+    def print_html(self) -> str:
+        """Full HTML document suitable for PDF conversion"""
+        if self.error:
+            return f"<!DOCTYPE html><html><head><title>Error</title></head><body><p>{self.error}</p></body></html>"
+        # Construct the full HTML document for PDF generation
+        full_html_parts = [
+            "<!DOCTYPE html>",
+            "<html lang=\"en\">",
+            "<head>",
+            "    <meta charset=\"UTF-8\">",
+            "    <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">",
+            "    <title>Tailored Resume</title>",
+            "    <!-- No CSS link here; PDF exporter adds it -->",
+            "</head>",
+            "<body>"
+        ]
+        full_html_parts.extend(self.content_parts) # Add the core content
+        full_html_parts.extend([
+            "</body>",
+            "</html>"
+        ])
+        html_content = validate_html_content('\n'.join(full_html_parts)) # Use newline for readability
+        logger.info(f"Generated full HTML document for PDF: {len(html_content)} chars")
+        return html_content
+
+
+@traced("render_preview")
+def render_preview_from_llm_responses(request_id: str, upload_folder: str) -> PreviewRender:
+    """
+    Render the preview for a tailoring request from its session-specific section files.
     
-    This function reads the tailored section files from the temporary session data directory
-    based on the request_id and generates an HTML preview.
+    Each section file is read and rendered exactly once; use the returned object's
+    screen_html / print_html for the on-screen fragment or the full print document.
     
     Args:
         request_id (str): The unique identifier for the tailoring request.
         upload_folder (str): The absolute path to the base upload folder.
-        for_screen (bool): If True, returns only the HTML fragment for the resume content.
-                          If False, generates a full HTML document suitable for PDF conversion.
     """
     # Define the temporary session data directory
     temp_data_dir = os.path.join(upload_folder, 'temp_session_data')
@@ -353,9 +588,15 @@ def generate_preview_from_llm_responses(request_id: str, upload_folder: str, for
 
     if not os.path.exists(temp_data_dir):
         logger.error(f"Temporary session data directory not found: {temp_data_dir}")
-        # Return an error message appropriate for the context (fragment or full page)
-        return "<p>Error: Temporary session data directory not found.</p>" if for_screen else \
-               "<!DOCTYPE html><html><head><title>Error</title></head><body><p>Error: Temporary session data directory not found.</p></body></html>"
+        return PreviewRender(request_id, error="Error: Temporary session data directory not found.")
+
+    # One read for the whole request (packed session file or in-process cache)
+    sections = get_session_store(temp_data_dir).load_sections(request_id)
+
+    def load_section(section_name):
+        if section_name not in sections:
+            raise FileNotFoundError(f"No saved {section_name} section for request {request_id}")
+        return sections[section_name]
 
     # Initialize HTML parts for the core content
     content_parts = []
@@ -366,67 +607,20 @@ def generate_preview_from_llm_responses(request_id: str, upload_folder: str, for
     # --- Contact Section ---
     contact_html = ""
     try:
-        contact_filepath = os.path.join(temp_data_dir, f'{request_id}_contact.json')
-        with open(contact_filepath, 'r', encoding='utf-8') as f:
-            contact_data = json.load(f)
-            contact_text = contact_data.get('content', '')
-
-            if contact_text:
-                contact_lines = contact_text.strip().split('\n')
-                contact_html = '<div class="contact-section">'
-
-                # First line is usually the name
-                if contact_lines:
-                    contact_html += f'<p class="name">{contact_lines[0]}</p>'
-
-                    # Add remaining contact lines
-                    for line in contact_lines[1:]:
-                        if line.strip():
-                            contact_html += f'<p>{line.strip()}</p>'
-
-                contact_html += '</div><hr class="contact-divider"/>'
-                logger.info(f"Successfully loaded contact information from {os.path.basename(contact_filepath)}")
+        contact_html = render_section_html('contact', load_section('contact'))
+        if contact_html:
+            logger.info(f"Successfully loaded contact information for request {request_id}")
     except (FileNotFoundError, json.JSONDecodeError) as e:
         # Contact file not found or invalid - try fallback methods
         logger.warning(f"Contact information not found in JSON file: {e}")
         
         # Fallback 1: Try to get contact info from the original resume parsing
         try:
-            # Avoid flask imports here if possible, but keep g for now
-            try:
-                from flask import g
-                has_g = True
-            except ImportError:
-                has_g = False
-
-            if has_g and hasattr(g, 'resume_file_id') and g.resume_file_id:
-                resume_id = g.resume_file_id
-                logger.info(f"Attempting to recover contact from original resume parsing (ID: {resume_id})")
-                
-                # Try to locate the cached parsing result
-                import glob
-                llm_parsed_files = glob.glob(os.path.join(upload_folder, f"*{resume_id}*_llm_parsed.json"))
-                
-                if llm_parsed_files:
-                    with open(llm_parsed_files[0], 'r') as f:
-                        cached_data = json.load(f)
-                        if cached_data.get('contact'):
-                            contact_text = cached_data.get('contact', '')
-                            if contact_text:
-                                contact_lines = contact_text.strip().split('\n')
-                                contact_html = '<div class="contact-section">'
-                                
-                                # First line is usually the name
-                                if contact_lines:
-                                    contact_html += f'<p class="name">{contact_lines[0]}</p>'
-                                    
-                                    # Add remaining contact lines
-                                    for line in contact_lines[1:]:
-                                        if line.strip():
-                                            contact_html += f'<p>{line.strip()}</p>'
-                                
-                                contact_html += '</div><hr class="contact-divider"/>'
-                                logger.info("Successfully recovered contact information from cached parsing")
+            cached_data = _load_cached_parse_for_current_resume(upload_folder)
+            if cached_data and cached_data.get('contact'):
+                contact_html = render_section_html('contact', cached_data.get('contact', ''))
+                if contact_html:
+                    logger.info("Successfully recovered contact information from cached parsing")
         except Exception as fallback_error:
             logger.warning(f"Could not load or recover contact info for request {request_id}: {fallback_error}")
             # The resume will be generated without contact info
@@ -438,271 +632,56 @@ def generate_preview_from_llm_responses(request_id: str, upload_folder: str, for
     try:
         # Add summary section
         try:
-            summary_filepath = os.path.join(temp_data_dir, f'{request_id}_summary.json')
-            with open(summary_filepath, 'r', encoding='utf-8') as f:
-                summary_data = json.load(f)
-                
-            summary_text = summary_data.get('content', '')
-            if summary_text.strip():
-                content_parts.append('<div class="resume-section">')
-                content_parts.append(generate_universal_section_header_html("Professional Summary"))
-                content_parts.append('<div class="summary-content">')
-                content_parts.append(format_section_content(summary_text))
-                content_parts.append('</div>')
-                content_parts.append('</div>')
-                
+            summary_html = render_section_html('summary', load_section('summary'))
+            if summary_html:
+                content_parts.append(summary_html)
         except (FileNotFoundError, json.JSONDecodeError) as e:
             logger.error(f"Error processing summary section for request {request_id}: {e}")
             
             # Fallback: Try to get summary info from the original resume parsing
             try:
-                # Avoid flask imports here if possible, but keep g for now
-                try:
-                    from flask import g
-                    has_g = True
-                except ImportError:
-                    has_g = False
-
-                if has_g and hasattr(g, 'resume_file_id') and g.resume_file_id:
-                    resume_id = g.resume_file_id
-                    logger.info(f"Attempting to recover summary from original resume parsing (ID: {resume_id})")
-                    
-                    # Try to locate the cached parsing result
-                    import glob
-                    llm_parsed_files = glob.glob(os.path.join(upload_folder, f"*{resume_id}*_llm_parsed.json"))
-                    
-                    if llm_parsed_files:
-                        with open(llm_parsed_files[0], 'r') as f:
-                            cached_data = json.load(f)
-                            # Adjust based on actual cached structure if needed
-                            summary_text = cached_data.get('summary') or (cached_data.get('sections') and cached_data['sections'].get('summary'))
-                            if summary_text and summary_text.strip():
-                                content_parts.append('<div class="resume-section">')
-                                content_parts.append(generate_universal_section_header_html("Professional Summary"))
-                                content_parts.append('<div class="summary-content">')
-                                content_parts.append(format_section_content(summary_text))
-                                content_parts.append('</div>')
-                                content_parts.append('</div>')
-                                logger.info("Successfully recovered summary information from cached parsing")
+                cached_data = _load_cached_parse_for_current_resume(upload_folder)
+                if cached_data:
+                    # Adjust based on actual cached structure if needed
+                    summary_text = cached_data.get('summary') or (cached_data.get('sections') and cached_data['sections'].get('summary'))
+                    summary_html = render_section_html('summary', summary_text)
+                    if summary_html:
+                        content_parts.append(summary_html)
+                        logger.info("Successfully recovered summary information from cached parsing")
             except Exception as fallback_error:
                 logger.warning(f"Could not load or recover summary info for request {request_id}: {fallback_error}")
         
-        # Add experience section
-        try:
-            experience_filepath = os.path.join(temp_data_dir, f'{request_id}_experience.json')
-            with open(experience_filepath, 'r', encoding='utf-8') as f:
-                experience_data = json.load(f)
-                
-            if isinstance(experience_data, list):
-                content_parts.append('<div class="resume-section">')
-                content_parts.append(generate_universal_section_header_html("Experience"))
-                content_parts.append('<div class="experience-content">')
-                
-                for job in experience_data:
-                    company = job.get('company', '')
-                    location = job.get('location', '')
-                    position = job.get('position', '')
-                    dates = job.get('dates', '')
-                    role_description = job.get('role_description', '') # Extract role description
-                    # The structured data has 'achievements' directly
-                    achievements = job.get('achievements', [])
-                    
-                    if not any([company, position]):  # Skip empty entries
-                        continue
-                        
-                    # Pass role_description to format_job_entry
-                    content_parts.append(
-                        format_job_entry(company, location, position, dates, achievements, role_description)
-                    )
-                
-                content_parts.append('</div>')
-                content_parts.append('</div>')
-            elif isinstance(experience_data, dict) and experience_data.get('content'):
-                logger.warning(f"Experience section for {request_id} loaded as simple content, formatting as text.")
-                content_parts.append('<div class="resume-section">')
-                content_parts.append(generate_universal_section_header_html("Experience"))
-                content_parts.append('<div class="experience-content">')
-                content_parts.append(format_section_content(experience_data['content']))
-                content_parts.append('</div>')
-                content_parts.append('</div>')
-            elif isinstance(experience_data, str):
-                logger.warning(f"Experience section for {request_id} loaded as raw string, formatting as text.")
-                content_parts.append('<div class="resume-section">')
-                content_parts.append(generate_universal_section_header_html("Experience"))
-                content_parts.append('<div class="experience-content">')
-                content_parts.append(format_section_content(experience_data))
-                content_parts.append('</div>')
-                content_parts.append('</div>')
-        
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            logger.error(f"Error processing experience section for request {request_id}: {e}")
-        
-        # Add education section
-        try:
-            education_filepath = os.path.join(temp_data_dir, f'{request_id}_education.json')
-            # Education might be saved differently, let's load as JSON
-            with open(education_filepath, 'r', encoding='utf-8') as f:
-                # education_content = f.read() # Old way reading raw string
-                education_data = json.load(f) # Should be a list of dicts
-                
-            if isinstance(education_data, list):
-                content_parts.append('<div class="resume-section">')
-                content_parts.append(generate_universal_section_header_html("Education"))
-                content_parts.append('<div class="education-content">')
-                # Iterate and format each entry
-                for edu_entry in education_data:
-                    institution = edu_entry.get('institution', '')
-                    location = edu_entry.get('location', '')
-                    degree = edu_entry.get('degree', '')
-                    dates = edu_entry.get('dates', '')
-                    highlights = edu_entry.get('highlights', [])
-                    content_parts.append(format_education_entry(institution, location, degree, dates, highlights))
-                content_parts.append('</div>')
-                content_parts.append('</div>')
-            elif isinstance(education_data, dict) and education_data.get('content'):
-                logger.warning(f"Education section for {request_id} loaded as simple content, formatting as text.")
-                content_parts.append('<div class="resume-section">')
-                content_parts.append(generate_universal_section_header_html("Education"))
-                content_parts.append('<div class="education-content">')
-                content_parts.append(format_section_content(education_data['content']))
-                content_parts.append('</div>')
-                content_parts.append('</div>')
-            elif isinstance(education_data, str):
-                logger.warning(f"Education section for {request_id} loaded as raw string, formatting as text.")
-                content_parts.append('<div class="resume-section">')
-                content_parts.append(generate_universal_section_header_html("Education"))
-                content_parts.append('<div class="education-content">')
-                content_parts.append(format_section_content(education_data))
-                content_parts.append('</div>')
-                content_parts.append('</div>')
-        
-        except FileNotFoundError as e:
-            logger.error(f"Error processing education section for request {request_id}: {e}")
-        
-        # Add skills section
-        try:
-            skills_filepath = os.path.join(temp_data_dir, f'{request_id}_skills.json')
-            with open(skills_filepath, 'r', encoding='utf-8') as f:
-                skills_data = json.load(f)
-                
-            # Handle both structured dict {"technical": [], ...} and simple {"content": "..."}
-            skills_html = ""
-            if isinstance(skills_data, dict):
-                if 'technical' in skills_data or 'soft' in skills_data or 'other' in skills_data:
-                     # Process structured skills
-                    if skills_data.get('technical'):
-                        skills_html += "<p><strong>Technical Skills:</strong> " + ", ".join(skills_data['technical']) + "</p>"
-                    if skills_data.get('soft'):
-                        skills_html += "<p><strong>Soft Skills:</strong> " + ", ".join(skills_data['soft']) + "</p>"
-                    if skills_data.get('other'):
-                        skills_html += "<p><strong>Other Skills:</strong> " + ", ".join(skills_data['other']) + "</p>"
-                elif skills_data.get('content'):
-                     # Process simple content string
-                     skills_html = format_section_content(skills_data['content'])
-            elif isinstance(skills_data, str):
-                 # Handle raw string if saved incorrectly
-                 logger.warning(f"Skills section for {request_id} loaded as raw string.")
-                 skills_html = format_section_content(skills_data)
-
-            if skills_html.strip():
-                content_parts.append('<div class="resume-section">')
-                content_parts.append(generate_universal_section_header_html("Skills"))
-                content_parts.append('<div class="skills-content">')
-                content_parts.append(skills_html)
-                content_parts.append('</div>')
-                content_parts.append('</div>')
-                
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            logger.error(f"Error processing skills section for request {request_id}: {e}")
-        
-        # Add projects section
-        try:
-            projects_filepath = os.path.join(temp_data_dir, f'{request_id}_projects.json')
-            # Projects might be saved differently, let's load as JSON
-            with open(projects_filepath, 'r', encoding='utf-8') as f:
-                # projects_content = f.read() # Old way reading raw string
-                projects_data = json.load(f) # Should be list of dicts
-                
-            if isinstance(projects_data, list):
-                content_parts.append('<div class="resume-section">')
-                content_parts.append(generate_universal_section_header_html("Projects"))
-                content_parts.append('<div class="projects-content">')
-                # Iterate and format each entry
-                for proj_entry in projects_data:
-                    title = proj_entry.get('title', '')
-                    dates = proj_entry.get('dates', '')
-                    details = proj_entry.get('details', [])
-                    content_parts.append(format_project_entry(title, dates, details))
-                content_parts.append('</div>')
-                content_parts.append('</div>')
-            elif isinstance(projects_data, dict) and projects_data.get('content'):
-                logger.warning(f"Projects section for {request_id} loaded as simple content, formatting as text.")
-                content_parts.append('<div class="resume-section">')
-                content_parts.append(generate_universal_section_header_html("Projects"))
-                content_parts.append('<div class="projects-content">')
-                content_parts.append(format_section_content(projects_data['content']))
-                content_parts.append('</div>')
-                content_parts.append('</div>')
-            elif isinstance(projects_data, str):
-                logger.warning(f"Projects section for {request_id} loaded as raw string, formatting as text.")
-                content_parts.append('<div class="resume-section">')
-                content_parts.append(generate_universal_section_header_html("Projects"))
-                content_parts.append('<div class="projects-content">')
-                content_parts.append(format_section_content(projects_data))
-                content_parts.append('</div>')
-                content_parts.append('</div>')
-        
-        except FileNotFoundError as e:
-            logger.error(f"Error processing projects section for request {request_id}: {e}")
+        # Add experience, education, skills and projects sections
+        for section_name in ('experience', 'education', 'skills', 'projects'):
+            try:
+                section_html = render_section_html(section_name, load_section(section_name))
+                if section_html:
+                    content_parts.append(section_html)
+            except (FileNotFoundError, json.JSONDecodeError) as e:
+                logger.error(f"Error processing {section_name} section for request {request_id}: {e}")
         
     except Exception as e:
         logger.error(f"Error generating preview content for request {request_id}: {e}")
-        # Return error fragment or full page error based on for_screen
-        error_msg = f"<p>Error generating preview: {str(e)}</p>"
-        if for_screen:
-            return error_msg
-        else:
-             return f"<!DOCTYPE html><html><head><title>Error</title></head><body>{error_msg}</body></html>"
+        return PreviewRender(request_id, error=f"Error generating preview: {str(e)}")
 
     # --- End of Core Resume Content ---
     content_parts.append('</div>') # Close tailored-resume-content
 
-    # --- Decide Final Output ---
-    if for_screen:
-        # Return only the content fragment
-        html_content = ''.join(content_parts)
-    else:
-        # Construct the full HTML document for PDF generation
-        full_html_parts = [
-            "<!DOCTYPE html>",
-            "<html lang=\"en\">",
-            "<head>",
-            "    <meta charset=\"UTF-8\">",
-            "    <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">",
-            "    <title>Tailored Resume</title>",
-            "    <!-- No CSS link here; PDF exporter adds it -->",
-            "</head>",
-            "<body>"
-        ]
-        full_html_parts.extend(content_parts) # Add the core content
-        full_html_parts.extend([
-            "</body>",
-            "</html>"
-        ])
-        html_content = '\n'.join(full_html_parts) # Use newline for readability
-
+    return PreviewRender(request_id, content_parts)
 
-    # Validate HTML content (if needed, apply to fragment or full doc)
-    # Consider if validation needs adjustment based on context
-    validated_html = validate_html_content(html_content)
-
-    # Log length based on context
-    if for_screen:
-        logger.info(f"Generated HTML fragment for preview: {len(validated_html)} chars")
-    else:
-        logger.info(f"Generated full HTML document for PDF: {len(validated_html)} chars")
 
-    return validated_html
+def generate_preview_from_llm_responses(request_id: str, upload_folder: str, for_screen: bool = True) -> str:
+    """
+    Generate an HTML preview from LLM API responses stored in session-specific files.
+    
+    Args:
+        request_id (str): The unique identifier for the tailoring request.
+        upload_folder (str): The absolute path to the base upload folder.
+        for_screen (bool): If True, returns only the HTML fragment for the resume content.
+                          If False, generates a full HTML document suitable for PDF conversion.
+    """
+    preview = render_preview_from_llm_responses(request_id, upload_folder)
+    return preview.screen_html if for_screen else preview.print_html
 
 
 def generate_resume_preview(resume_path: str, for_screen: bool = True) -> str:
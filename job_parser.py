@@ -20,7 +20,7 @@ except ImportError:
     logger.warning("Config import failed, using default values for LLM job analysis")
     USE_LLM_JOB_ANALYSIS = True
     LLM_JOB_ANALYZER_PROVIDER = "auto"
-    JOB_ANALYSIS_CACHE_DIR = "static/uploads/job_analysis_cache"
+    JOB_ANALYSIS_CACHE_DIR = os.path.join("instance", "cache")
 
 # Try to import the job analyzer
 try:
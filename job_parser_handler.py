@@ -160,7 +160,7 @@ def setup_job_parser_routes(app):
                 company = parse_result.get('company', 'Unknown Company')
                 
                 # Create cache directory if it doesn't exist
-                cache_dir = app.config.get('JOB_ANALYSIS_CACHE_DIR', os.path.join(app.config['UPLOAD_FOLDER'], 'job_analysis_cache'))
+                cache_dir = app.config.get('JOB_ANALYSIS_CACHE_DIR', os.path.join(app.config.get('DATA_DIR', 'instance'), 'cache'))
                 os.makedirs(cache_dir, exist_ok=True)
                 
                 analysis_results = analyze_job_with_llm(
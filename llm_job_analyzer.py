@@ -10,16 +10,20 @@ The analysis includes:
 - Soft skills required
 - Ideal candidate description
 
-Results are cached to avoid repeated API calls for the same job posting.
+Results are cached by posting content (see utils.job_analysis_cache) to avoid
+repeated API calls for the same job posting.
 """
 
-import os
+import copy
 import json
 import logging
-import hashlib
 import time
 from typing import Dict, Any, List, Optional, Union
 
+from utils.llm_client_registry import get_llm_client
+from utils.prompt_budget import PromptComponent, count_tokens, fit_components
+from utils.job_analysis_cache import get_job_analysis_cache, make_job_analysis_cache_key
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -39,6 +43,15 @@ except ImportError:
     logger.warning("OpenAI package not available. OpenAI API will not be usable.")
     OPENAI_AVAILABLE = False
 
+# Models used per provider; part of the cache key so a model change re-analyzes
+JOB_ANALYSIS_MODELS = {
+    "claude": "claude-3-sonnet-20240229",
+    "openai": "gpt-4o",
+}
+
+# Bump when JOB_ANALYSIS_PROMPT_TEMPLATE or the result shape changes
+JOB_ANALYSIS_PROMPT_VERSION = "v1"
+
 # Default prompt template for job analysis
 JOB_ANALYSIS_PROMPT_TEMPLATE = """
 You are an expert job market analyst and career advisor. I'll share a job description, and I need you to analyze it thoroughly to help job seekers understand what the employer is looking for.
@@ -65,54 +78,50 @@ Return your answer in the following JSON format:
 }}
 """
 
-def get_cache_path(job_title: str, company: str, cache_dir: str) -> str:
-    """Generate a cache file path based on job title and company."""
-    # Create a hash of the job title and company for the filename
-    filename = hashlib.md5(f"{job_title}_{company}".encode('utf-8')).hexdigest()
-    return os.path.join(cache_dir, f"{filename}_job_analysis.json")
+def build_job_analysis_prompt(job_title: str, company: str, job_text: str) -> str:
+    """
+    Format the analysis prompt, cutting the tail of a posting that would push
+    it past the 'job_analysis' token budget (benefits and legal boilerplate
+    usually sit at the end).
+    """
+    template = JOB_ANALYSIS_PROMPT_TEMPLATE.format(job_title=job_title, company=company, job_text="")
+    fitted = fit_components("job_analysis", [PromptComponent("job_text", job_text)],
+                            fixed_tokens=count_tokens(template))
+    return JOB_ANALYSIS_PROMPT_TEMPLATE.format(job_title=job_title, company=company,
+                                              job_text=fitted.component_text("job_text"))
+
 
-def cache_results(job_title: str, company: str, results: Dict[str, Any], cache_dir: str) -> None:
-    """Cache the analysis results to a file."""
+def get_cache_key(job_title: str, company: str, job_text: str, provider: str) -> str:
+    """Generate a cache key from the posting content, provider, model and prompt version."""
+    return make_job_analysis_cache_key(
+        job_title, company, job_text, provider,
+        JOB_ANALYSIS_MODELS.get(provider, "unknown"), JOB_ANALYSIS_PROMPT_VERSION)
+
+def cache_results(cache_key: str, results: Dict[str, Any], cache_dir: Optional[str] = None) -> None:
+    """Cache the analysis results."""
     try:
-        # Ensure cache directory exists
-        os.makedirs(cache_dir, exist_ok=True)
-        
-        # Get cache file path
-        cache_path = get_cache_path(job_title, company, cache_dir)
-        
-        # Add metadata
         results.setdefault("metadata", {})
         results["metadata"]["cached_at"] = time.time()
-        results["metadata"]["job_title"] = job_title
-        results["metadata"]["company"] = company
-        
-        # Write to cache file
-        with open(cache_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2)
-            
-        logger.info(f"Job analysis results cached at {cache_path}")
+        get_job_analysis_cache(cache_dir).set(cache_key, copy.deepcopy(results))
+        logger.info(f"Job analysis results cached under {cache_key}")
     except Exception as e:
         logger.error(f"Error caching job analysis results: {str(e)}")
 
-def get_cached_results(job_title: str, company: str, cache_dir: str) -> Optional[Dict[str, Any]]:
+def get_cached_results(cache_key: str, cache_dir: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """Get cached analysis results if available."""
     try:
-        cache_path = get_cache_path(job_title, company, cache_dir)
-        
-        # Check if cache file exists
-        if not os.path.exists(cache_path):
+        results = get_job_analysis_cache(cache_dir).get(cache_key)
+        if results is None:
             return None
         
-        # Read from cache file
-        with open(cache_path, 'r', encoding='utf-8') as f:
-            results = json.load(f)
-            
-        logger.info(f"Found cached job analysis results for {job_title} at {company}")
+        # Copy so callers annotating the results never touch the memory tier
+        results = copy.deepcopy(results)
+        logger.info(f"Found cached job analysis results for {cache_key}")
         
         # Add metadata about cache retrieval
         results.setdefault("metadata", {})
         results["metadata"]["retrieved_from_cache"] = True
-        results["metadata"]["cache_path"] = cache_path
+        results["metadata"]["cache_key"] = cache_key
         
         return results
     except Exception as e:
@@ -140,20 +149,16 @@ def analyze_with_claude(job_title: str, company: str, job_text: str, api_key: st
     
     try:
         # Initialize Claude client
-        client = anthropic.Anthropic(api_key=api_key)
+        client = get_llm_client('claude', api_key)
         
         # Prepare the prompt
-        prompt = JOB_ANALYSIS_PROMPT_TEMPLATE.format(
-            job_title=job_title,
-            company=company,
-            job_text=job_text
-        )
+        prompt = build_job_analysis_prompt(job_title, company, job_text)
         
         logger.info(f"Sending job analysis request to Claude API for {job_title} at {company}")
         
         # Call Claude API
         response = client.messages.create(
-            model="claude-3-sonnet-20240229",
+            model=JOB_ANALYSIS_MODELS["claude"],
             max_tokens=4000,
             temperature=0.1,
             system="You are an expert job market analyst and career advisor. Your task is to analyze job descriptions and extract structured information to help job seekers understand what employers are looking for.",
@@ -245,20 +250,16 @@ def analyze_with_openai(job_title: str, company: str, job_text: str, api_key: st
     
     try:
         # Initialize OpenAI client
-        client = openai.OpenAI(api_key=api_key)
+        client = get_llm_client('openai', api_key)
         
         # Prepare the prompt
-        prompt = JOB_ANALYSIS_PROMPT_TEMPLATE.format(
-            job_title=job_title,
-            company=company,
-            job_text=job_text
-        )
+        prompt = build_job_analysis_prompt(job_title, company, job_text)
         
         logger.info(f"Sending job analysis request to OpenAI API for {job_title} at {company}")
         
         # Call OpenAI API
         response = client.chat.completions.create(
-            model="gpt-4o",
+            model=JOB_ANALYSIS_MODELS["openai"],
             temperature=0.1,
             messages=[
                 {"role": "system", "content": "You are an expert job market analyst and career advisor. Your task is to analyze job descriptions and extract structured information to help job seekers understand what employers are looking for."},
@@ -331,7 +332,7 @@ def analyze_with_openai(job_title: str, company: str, job_text: str, api_key: st
             }
         }
 
-def analyze_job_with_llm(job_title: str, company: str, job_text: str, api_key: str, provider: str = "openai", api_url: str = None, cache_dir: str = "job_analysis_cache") -> Dict[str, Any]:
+def analyze_job_with_llm(job_title: str, company: str, job_text: str, api_key: str, provider: str = "openai", api_url: str = None, cache_dir: Optional[str] = None) -> Dict[str, Any]:
     """
     Analyze a job posting with the specified LLM provider.
     
@@ -342,16 +343,11 @@ def analyze_job_with_llm(job_title: str, company: str, job_text: str, api_key: s
         api_key: The API key for the LLM provider
         provider: The LLM provider to use ('claude', 'openai', or 'auto')
         api_url: Optional API URL for Claude
-        cache_dir: Directory to cache results
+        cache_dir: Directory holding the job analysis cache (defaults to Config.JOB_ANALYSIS_CACHE_DIR)
     
     Returns:
         A dictionary containing the analysis results
     """
-    # Check for cached results first
-    cached_results = get_cached_results(job_title, company, cache_dir)
-    if cached_results:
-        return cached_results
-    
     # Determine which provider to use
     if provider == "auto":
         # Try OpenAI first, fall back to Claude
@@ -370,6 +366,12 @@ def analyze_job_with_llm(job_title: str, company: str, job_text: str, api_key: s
                 }
             }
     
+    # Check for cached results once the provider (and so the model) is known
+    cache_key = get_cache_key(job_title, company, job_text, provider)
+    cached_results = get_cached_results(cache_key, cache_dir)
+    if cached_results:
+        return cached_results
+    
     # Call the appropriate provider
     if provider == "openai":
         if not OPENAI_AVAILABLE:
@@ -404,7 +406,7 @@ def analyze_job_with_llm(job_title: str, company: str, job_text: str, api_key: s
     
     # If analysis was successful, cache the results
     if "error" not in results:
-        cache_results(job_title, company, results, cache_dir)
+        cache_results(cache_key, results, cache_dir)
     
     return results
 
@@ -1,12 +1,15 @@
 import os
+import copy
 import json
 import time
-import uuid
 import logging
 import traceback
-from typing import Dict, Tuple, Union
+from typing import Dict, Optional, Tuple, Union
 import docx2txt
 
+from utils.llm_client_registry import get_llm_client
+from utils.resume_parse_cache import file_sha256, get_resume_parse_cache, make_parse_cache_key
+
 # Import PDF parser functions
 from pdf_parser import read_pdf_file
 
@@ -24,20 +27,28 @@ except ImportError:
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Global variable to store the most recently cached resume data
-_LAST_CACHED_RESUME = None
+# Bump when the parsing prompt or section format changes so cached parses stop matching
+PARSER_VERSION = 1
 
-def get_cached_parsed_resume() -> Dict:
+def get_cached_parsed_resume(doc_path: str, llm_provider: str) -> Optional[Dict]:
     """
-    Retrieve the most recently cached parsed resume data.
+    Retrieve the cached parse of a resume file without calling the LLM.
     This function is used to access contact information when generating 
     the HTML preview without re-parsing the entire resume.
     
+    Args:
+        doc_path: Path to the resume document
+        llm_provider: Provider the resume was parsed with ('claude' or 'openai')
+    
     Returns:
-        Dict: The cached resume data or None if not available
+        Dict: The cached resume sections or None if not available
     """
-    global _LAST_CACHED_RESUME
-    return _LAST_CACHED_RESUME
+    try:
+        key = make_parse_cache_key(file_sha256(doc_path), PARSER_VERSION, llm_provider)
+    except OSError:
+        return None
+    cached = get_resume_parse_cache().get(key)
+    return copy.deepcopy(cached["sections"]) if cached else None
 
 class LLMResumeParser:
     """Use LLM to parse resume content into structured sections"""
@@ -61,7 +72,7 @@ class LLMResumeParser:
         
         if claude_api_key and Anthropic:
             try:
-                self.anthropic_client = Anthropic(api_key=claude_api_key)
+                self.anthropic_client = get_llm_client('claude', claude_api_key)
                 logger.info("Claude API client initialized")
             except Exception as e:
                 logger.error(f"Failed to initialize Claude API client: {str(e)}")
@@ -74,7 +85,7 @@ class LLMResumeParser:
         
         if openai_api_key and OpenAI:
             try:
-                self.openai_client = OpenAI(api_key=openai_api_key)
+                self.openai_client = get_llm_client('openai', openai_api_key)
                 logger.info("OpenAI API client initialized")
             except Exception as e:
                 logger.error(f"Failed to initialize OpenAI API client: {str(e)}")
@@ -344,35 +355,19 @@ def parse_resume_with_llm(doc_path: str, llm_provider: str = "claude") -> Dict[s
         Dictionary of parsed resume sections
     """
     try:
-        global _LAST_CACHED_RESUME
-        
-        # First, check if we have a cached version of this file
-        cache_filename = None
-        if doc_path:
-            basename = os.path.basename(doc_path)
-            name, ext = os.path.splitext(basename)
-            uploads_dir = os.path.dirname(doc_path)
-            
-            # Generate a deterministic cache filename based on the original file
-            cache_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, name)).split('-')[0]
-            cache_filename = os.path.join(uploads_dir, f"{cache_id}_llm_parsed.json")
-        
-        # Check if cache exists and is recent (less than 1 hour old)
-        cached_result = None
-        if cache_filename and os.path.exists(cache_filename):
-            file_age = time.time() - os.path.getmtime(cache_filename)
-            if file_age < 3600:  # 1 hour in seconds
-                try:
-                    with open(cache_filename, 'r') as f:
-                        cached_data = json.load(f)
-                        if "sections" in cached_data:
-                            cached_result = cached_data["sections"]
-                            logger.info(f"Using cached LLM parsing result for {basename}")
-                            # Store the cached result in the global variable
-                            _LAST_CACHED_RESUME = cached_result
-                            return cached_result
-                except Exception as e:
-                    logger.warning(f"Error reading cache file: {str(e)}")
+        # Parses are cached by file content, so the upload step and every later
+        # tailoring call for the same file share a single LLM round-trip
+        basename = os.path.basename(doc_path)
+        cache = get_resume_parse_cache()
+        cache_key = None
+        try:
+            cache_key = make_parse_cache_key(file_sha256(doc_path), PARSER_VERSION, llm_provider)
+            cached_data = cache.get(cache_key)
+            if cached_data and "sections" in cached_data:
+                logger.info(f"Using cached LLM parsing result for {basename}")
+                return copy.deepcopy(cached_data["sections"])
+        except OSError as e:
+            logger.warning(f"Could not hash resume file for parse cache: {str(e)}")
         
         # If no valid cache, do the parsing
         parser = LLMResumeParser(llm_provider=llm_provider)
@@ -380,23 +375,19 @@ def parse_resume_with_llm(doc_path: str, llm_provider: str = "claude") -> Dict[s
         
         if success:
             # Cache the result for future use
-            if cache_filename:
+            if cache_key:
                 try:
-                    cache_data = {
+                    cache.set(cache_key, {
                         "sections": sections,
                         "metadata": metadata,
-                        "doc_path": doc_path,
+                        "doc_name": basename,
                         "timestamp": time.time()
-                    }
-                    with open(cache_filename, 'w', encoding='utf-8') as f:
-                        json.dump(cache_data, f, indent=2)
-                    logger.info(f"LLM parsing cached to: {cache_filename}")
+                    })
+                    logger.info(f"LLM parsing cached for {basename}")
                 except Exception as e:
-                    logger.warning(f"Error writing cache file: {str(e)}")
+                    logger.warning(f"Error writing parse cache: {str(e)}")
             
-            # Store the parsed result in the global variable
-            _LAST_CACHED_RESUME = sections
-            return sections
+            return copy.deepcopy(sections)
         else:
             logger.warning("LLM parsing failed or was not possible")
             return {}
@@ -3,68 +3,108 @@ Resume Index Module
 
 This module provides functionality for tracking and logging resume processing details.
 It maintains a simple index of resumes and associated metadata like processing notes
-and job targeting information.
+and job targeting information, stored in SQLite so each update is a single-row write.
 """
 
 import os
 import json
 import logging
-import time
+import sqlite3
 from datetime import datetime
 from threading import Lock
 
+from utils.cache_backends import thread_local_connection
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class ResumeIndex:
-    """Class for managing a resume index that tracks processing details."""
+    """Class for managing a resume index that tracks processing details.
+
+    The index lives in a SQLite database in WAL mode: every add_* call is a
+    single-row insert/update, and concurrent gunicorn workers and queue
+    workers share it safely. A legacy resume_index.json is imported once the
+    first time the database is created.
+    """
     
-    def __init__(self, index_file=None):
+    def __init__(self, index_file=None, db_path=None):
         """Initialize the resume index.
         
         Args:
-            index_file (str, optional): Path to the index file. Defaults to 'resume_index.json'
-                                       in the current directory.
+            index_file (str, optional): Legacy JSON index imported on first use. Defaults to
+                                       'resume_index.json' in the current directory.
+            db_path (str, optional): Path to the SQLite index. Defaults to Config.RESUME_INDEX_DB_PATH.
         """
         self.index_file = index_file or os.path.join(os.path.dirname(__file__), 'resume_index.json')
-        self.lock = Lock()  # For thread safety
-        self.index = self._load_index()
+        if db_path is None:
+            from config import Config
+            db_path = Config.RESUME_INDEX_DB_PATH
+        self.db_path = db_path
+        self._connection = thread_local_connection(self.db_path, row_factory=sqlite3.Row)
+        
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._create_schema()
+        self._import_legacy_index()
     
-    def _load_index(self):
-        """Load the index from the index file."""
-        try:
-            if os.path.exists(self.index_file):
-                with open(self.index_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            else:
-                # Initialize with empty structure if file doesn't exist
-                return {"resumes": {}, "last_updated": datetime.now().isoformat()}
-        except Exception as e:
-            logger.warning(f"Error loading resume index: {e}")
-            # Return a default empty index on error
-            return {"resumes": {}, "last_updated": datetime.now().isoformat()}
+    def _create_schema(self):
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS resumes ("
+                "resume_id TEXT PRIMARY KEY, filename TEXT, added_date TEXT NOT NULL, metadata TEXT)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS resume_events ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, resume_id TEXT NOT NULL, "
+                "kind TEXT NOT NULL, timestamp TEXT NOT NULL, payload TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS resume_events_resume ON resume_events (resume_id, kind)")
+            conn.execute("CREATE INDEX IF NOT EXISTS resume_events_time ON resume_events (kind, timestamp)")
+            conn.execute("CREATE INDEX IF NOT EXISTS resumes_added ON resumes (added_date)")
+            conn.execute("CREATE TABLE IF NOT EXISTS index_meta (key TEXT PRIMARY KEY, value TEXT)")
     
-    def _save_index(self):
-        """Save the index to the index file."""
+    def _import_legacy_index(self):
+        """Import resume_index.json into the database once."""
         try:
-            # Update the last updated timestamp
-            self.index["last_updated"] = datetime.now().isoformat()
-            
-            # Ensure the directory exists
-            os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
-            
-            # Save to a temporary file first to avoid corruption
-            temp_file = f"{self.index_file}.tmp"
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(self.index, f, indent=2, ensure_ascii=False)
-            
-            # Rename temporary file to the actual file
-            os.replace(temp_file, self.index_file)
-            
-            logger.debug(f"Resume index saved to {self.index_file}")
+            conn = self._connection()
+            with conn:
+                # BEGIN IMMEDIATE so two workers starting together import only once
+                conn.execute("BEGIN IMMEDIATE")
+                if conn.execute("SELECT 1 FROM index_meta WHERE key = 'legacy_imported'").fetchone():
+                    return
+                imported = 0
+                if os.path.exists(self.index_file):
+                    with open(self.index_file, 'r', encoding='utf-8') as f:
+                        legacy = json.load(f)
+                    for resume_id, entry in legacy.get("resumes", {}).items():
+                        conn.execute(
+                            "INSERT OR IGNORE INTO resumes (resume_id, filename, added_date, metadata) "
+                            "VALUES (?, ?, ?, ?)",
+                            (resume_id, entry.get("filename"),
+                             entry.get("added_date", datetime.now().isoformat()),
+                             json.dumps(entry["metadata"], ensure_ascii=False) if "metadata" in entry else None)
+                        )
+                        for note in entry.get("notes", []):
+                            self._insert_event(conn, resume_id, "note", note)
+                        for record in entry.get("processing_history", []):
+                            self._insert_event(conn, resume_id, "processing", record)
+                        imported += 1
+                conn.execute(
+                    "INSERT INTO index_meta (key, value) VALUES ('legacy_imported', ?)",
+                    (datetime.now().isoformat(),)
+                )
+            if imported:
+                logger.info(f"Imported {imported} resumes from {self.index_file} into {self.db_path}")
         except Exception as e:
-            logger.warning(f"Error saving resume index: {e}")
+            logger.warning(f"Error importing legacy resume index: {e}")
+    
+    @staticmethod
+    def _insert_event(conn, resume_id, kind, entry):
+        conn.execute(
+            "INSERT INTO resume_events (resume_id, kind, timestamp, payload) VALUES (?, ?, ?, ?)",
+            (resume_id, kind, entry.get("timestamp", datetime.now().isoformat()),
+             json.dumps(entry, ensure_ascii=False))
+        )
     
     def add_resume(self, resume_id, filename, metadata=None):
         """Add a resume to the index.
@@ -78,33 +118,50 @@ class ResumeIndex:
             bool: True if successful, False otherwise
         """
         try:
-            with self.lock:  # Thread safety
-                # Initialize resume entry if it doesn't exist
-                if resume_id not in self.index["resumes"]:
-                    self.index["resumes"][resume_id] = {
-                        "filename": filename,
-                        "added_date": datetime.now().isoformat(),
-                        "processing_history": [],
-                        "notes": []
-                    }
+            conn = self._connection()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute(
+                    "SELECT metadata FROM resumes WHERE resume_id = ?", (resume_id,)
+                ).fetchone()
+                if row is None:
+                    conn.execute(
+                        "INSERT INTO resumes (resume_id, filename, added_date, metadata) VALUES (?, ?, ?, ?)",
+                        (resume_id, filename, datetime.now().isoformat(),
+                         json.dumps(metadata, ensure_ascii=False) if metadata else None)
+                    )
                 else:
-                    # Update the filename if resume already exists
-                    self.index["resumes"][resume_id]["filename"] = filename
-                
-                # Add metadata if provided
-                if metadata:
-                    if "metadata" not in self.index["resumes"][resume_id]:
-                        self.index["resumes"][resume_id]["metadata"] = {}
-                    self.index["resumes"][resume_id]["metadata"].update(metadata)
-                
-                self._save_index()
-                
-                logger.info(f"Added resume to index: {resume_id} - {filename}")
-                return True
+                    # Update the filename (and merge metadata) if resume already exists
+                    merged = json.loads(row["metadata"]) if row["metadata"] else None
+                    if metadata:
+                        merged = merged or {}
+                        merged.update(metadata)
+                    conn.execute(
+                        "UPDATE resumes SET filename = ?, metadata = ? WHERE resume_id = ?",
+                        (filename, json.dumps(merged, ensure_ascii=False) if merged is not None else None,
+                         resume_id)
+                    )
+            
+            logger.info(f"Added resume to index: {resume_id} - {filename}")
+            return True
         except Exception as e:
             logger.warning(f"Error adding resume to index: {e}")
             return False
     
+    def _add_event(self, resume_id, kind, entry):
+        """Append an event for an indexed resume. Returns False if the resume is unknown."""
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute(
+                "INSERT INTO resume_events (resume_id, kind, timestamp, payload) "
+                "SELECT ?, ?, ?, ? WHERE EXISTS (SELECT 1 FROM resumes WHERE resume_id = ?)",
+                (resume_id, kind, entry["timestamp"], json.dumps(entry, ensure_ascii=False), resume_id)
+            )
+        if cursor.rowcount == 0:
+            logger.warning(f"Resume not found in index: {resume_id}")
+            return False
+        return True
+    
     def add_note(self, resume_id, note):
         """Add a processing note to a resume.
         
@@ -116,23 +173,16 @@ class ResumeIndex:
             bool: True if successful, False otherwise
         """
         try:
-            with self.lock:  # Thread safety
-                # Check if resume exists in index
-                if resume_id not in self.index["resumes"]:
-                    logger.warning(f"Resume not found in index: {resume_id}")
-                    return False
-                
-                # Add note with timestamp
-                note_entry = {
-                    "timestamp": datetime.now().isoformat(),
-                    "note": note
-                }
-                self.index["resumes"][resume_id]["notes"].append(note_entry)
-                
-                self._save_index()
-                
-                logger.info(f"Added note to resume {resume_id}: {note}")
-                return True
+            # Add note with timestamp
+            note_entry = {
+                "timestamp": datetime.now().isoformat(),
+                "note": note
+            }
+            if not self._add_event(resume_id, "note", note_entry):
+                return False
+            
+            logger.info(f"Added note to resume {resume_id}: {note}")
+            return True
         except Exception as e:
             logger.warning(f"Error adding note to resume: {e}")
             return False
@@ -149,27 +199,20 @@ class ResumeIndex:
             bool: True if successful, False otherwise
         """
         try:
-            with self.lock:  # Thread safety
-                # Check if resume exists in index
-                if resume_id not in self.index["resumes"]:
-                    logger.warning(f"Resume not found in index: {resume_id}")
-                    return False
-                
-                # Add processing record with timestamp
-                record = {
-                    "timestamp": datetime.now().isoformat(),
-                    "process_type": process_type,
-                }
-                
-                if details:
-                    record["details"] = details
-                
-                self.index["resumes"][resume_id]["processing_history"].append(record)
-                
-                self._save_index()
-                
-                logger.info(f"Added processing record to resume {resume_id}: {process_type}")
-                return True
+            # Add processing record with timestamp
+            record = {
+                "timestamp": datetime.now().isoformat(),
+                "process_type": process_type,
+            }
+            
+            if details:
+                record["details"] = details
+            
+            if not self._add_event(resume_id, "processing", record):
+                return False
+            
+            logger.info(f"Added processing record to resume {resume_id}: {process_type}")
+            return True
         except Exception as e:
             logger.warning(f"Error adding processing record to resume: {e}")
             return False
@@ -184,15 +227,109 @@ class ResumeIndex:
             dict: Resume information or None if not found
         """
         try:
-            with self.lock:  # Thread safety
-                if resume_id in self.index["resumes"]:
-                    return self.index["resumes"][resume_id]
-                else:
-                    logger.warning(f"Resume not found in index: {resume_id}")
-                    return None
+            conn = self._connection()
+            row = conn.execute("SELECT * FROM resumes WHERE resume_id = ?", (resume_id,)).fetchone()
+            if row is None:
+                logger.warning(f"Resume not found in index: {resume_id}")
+                return None
+            info = self._resume_from_row(row)
+            for event in conn.execute(
+                "SELECT kind, payload FROM resume_events WHERE resume_id = ? ORDER BY id", (resume_id,)
+            ):
+                key = "notes" if event["kind"] == "note" else "processing_history"
+                info[key].append(json.loads(event["payload"]))
+            return info
         except Exception as e:
             logger.warning(f"Error getting resume info: {e}")
             return None
+    
+    def list_resumes(self, since=None, until=None, limit=None):
+        """List indexed resumes by added date, newest first.
+        
+        Args:
+            since (datetime|str, optional): Only resumes added at or after this time
+            until (datetime|str, optional): Only resumes added before this time
+            limit (int, optional): Maximum number of resumes returned
+        
+        Returns:
+            list: Resume summaries (resume_id, filename, added_date, metadata)
+        """
+        clauses, params = self._date_range("added_date", since, until)
+        sql = "SELECT * FROM resumes"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY added_date DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        try:
+            rows = self._connection().execute(sql, params).fetchall()
+        except Exception as e:
+            logger.warning(f"Error listing resumes: {e}")
+            return []
+        resumes = []
+        for row in rows:
+            entry = self._resume_from_row(row)
+            del entry["notes"], entry["processing_history"]
+            entry["resume_id"] = row["resume_id"]
+            resumes.append(entry)
+        return resumes
+    
+    def get_notes(self, resume_id=None, since=None, until=None):
+        """Notes for one resume (or all resumes) in a date range, oldest first."""
+        return self._events("note", resume_id, since, until)
+    
+    def get_processing_records(self, resume_id=None, process_type=None, since=None, until=None):
+        """Processing records for one resume (or all resumes) in a date range, oldest first."""
+        records = self._events("processing", resume_id, since, until)
+        if process_type is not None:
+            records = [record for record in records if record.get("process_type") == process_type]
+        return records
+    
+    def _events(self, kind, resume_id, since, until):
+        clauses, params = self._date_range("timestamp", since, until)
+        clauses.insert(0, "kind = ?")
+        params.insert(0, kind)
+        if resume_id is not None:
+            clauses.append("resume_id = ?")
+            params.append(resume_id)
+        sql = ("SELECT resume_id, payload FROM resume_events WHERE " + " AND ".join(clauses)
+               + " ORDER BY timestamp, id")
+        try:
+            rows = self._connection().execute(sql, params).fetchall()
+        except Exception as e:
+            logger.warning(f"Error querying resume index: {e}")
+            return []
+        events = []
+        for row in rows:
+            event = json.loads(row["payload"])
+            event["resume_id"] = row["resume_id"]
+            events.append(event)
+        return events
+    
+    @staticmethod
+    def _date_range(column, since, until):
+        # ISO-8601 timestamps sort lexicographically, so range checks are plain comparisons
+        clauses, params = [], []
+        if since is not None:
+            clauses.append(f"{column} >= ?")
+            params.append(since.isoformat() if isinstance(since, datetime) else str(since))
+        if until is not None:
+            clauses.append(f"{column} < ?")
+            params.append(until.isoformat() if isinstance(until, datetime) else str(until))
+        return clauses, params
+    
+    @staticmethod
+    def _resume_from_row(row):
+        info = {
+            "filename": row["filename"],
+            "added_date": row["added_date"],
+            "processing_history": [],
+            "notes": []
+        }
+        if row["metadata"]:
+            info["metadata"] = json.loads(row["metadata"])
+        return info
 
 
 # Singleton instance
@@ -220,6 +357,9 @@ def get_resume_index():
                         def add_note(self, *args, **kwargs): return True
                         def add_processing_record(self, *args, **kwargs): return True
                         def get_resume_info(self, *args, **kwargs): return {}
+                        def list_resumes(self, *args, **kwargs): return []
+                        def get_notes(self, *args, **kwargs): return []
+                        def get_processing_records(self, *args, **kwargs): return []
                     
                     return DummyIndex()
     
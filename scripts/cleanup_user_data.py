@@ -9,7 +9,10 @@ CRITICAL SECURITY TOOL - Use before:
 - Creating backups/archives
 
 This script safely removes all user-generated content while preserving
-the application structure needed for deployment.
+the application structure needed for deployment: uploads and session data
+under static/uploads, and the SQLite stores under Config.DATA_DIR (LLM
+response, resume parse and job analysis caches, tailoring job queue, resume
+index and request metrics).
 
 Usage:
     python scripts/cleanup_user_data.py [--backup] [--dry-run]
@@ -20,6 +23,7 @@ Options:
 """
 
 import os
+import sys
 import shutil
 import glob
 import argparse
@@ -55,8 +59,39 @@ class UserDataCleaner:
             self.log(f"Creating backup at: {backup_dir}")
             if not self.dry_run:
                 shutil.copytree(uploads_dir, backup_dir / "uploads")
-                self.archived_count = len(list(backup_dir.rglob("*")))
-                self.log(f"Backed up {self.archived_count} files to {backup_dir}")
+        
+        for store_path in self.data_store_files():
+            self.log(f"Backing up: {store_path}")
+            if not self.dry_run:
+                (backup_dir / "data").mkdir(parents=True, exist_ok=True)
+                shutil.copy2(store_path, backup_dir / "data" / store_path.name)
+        
+        if not self.dry_run and backup_dir.exists():
+            self.archived_count = len(list(backup_dir.rglob("*")))
+            self.log(f"Backed up {self.archived_count} files to {backup_dir}")
+    
+    def data_store_files(self):
+        """Existing SQLite store files (with their -wal/-shm sidecars) holding user data."""
+        sys.path.insert(0, str(self.base_path))
+        from config import Config
+        from utils.job_analysis_cache import JOB_ANALYSIS_CACHE_FILENAME
+        
+        store_paths = [
+            Config.LLM_RESPONSE_CACHE_PATH,
+            Config.RESUME_PARSE_CACHE_PATH,
+            os.path.join(Config.JOB_ANALYSIS_CACHE_DIR, JOB_ANALYSIS_CACHE_FILENAME),
+            Config.TAILORING_QUEUE_PATH,
+            Config.RESUME_INDEX_DB_PATH,
+            Config.REQUEST_METRICS_DB_PATH,
+            Config.LLM_RATE_LIMIT_DB_PATH,
+        ]
+        files = []
+        for store_path in store_paths:
+            for suffix in ("", "-wal", "-shm"):
+                path = Path(store_path + suffix)
+                if path.is_file():
+                    files.append(path)
+        return files
     
     def clean_uploads_directory(self):
         """Clean the static/uploads directory."""
@@ -105,7 +140,11 @@ class UserDataCleaner:
         user_data_dirs = [
             "job_analysis_cache",
             "api_responses", 
-            "temp_session_data"
+            "temp_session_data",
+            # SQLite stores from before they moved to Config.DATA_DIR
+            "cache",
+            "queue",
+            "index"
         ]
         
         for dir_name in user_data_dirs:
@@ -116,6 +155,14 @@ class UserDataCleaner:
                     shutil.rmtree(dir_path)
                 self.cleaned_count += 1
     
+    def clean_data_stores(self):
+        """Remove the SQLite caches, job queue, resume index and metrics under Config.DATA_DIR."""
+        for store_path in self.data_store_files():
+            self.log(f"🗑️  Removing: {store_path}")
+            if not self.dry_run:
+                store_path.unlink()
+            self.cleaned_count += 1
+    
     def clean_root_user_files(self):
         """Clean user-generated files in root directory."""
         patterns = [
@@ -139,11 +186,11 @@ class UserDataCleaner:
         """Verify that no user data remains."""
         uploads_dir = self.base_path / "static" / "uploads"
         
-        if not uploads_dir.exists():
+        remaining_files = list(self.data_store_files())
+        if not uploads_dir.exists() and not remaining_files:
             self.log("✅ Uploads directory clean (doesn't exist)")
             return True
             
-        remaining_files = []
         for file_path in uploads_dir.rglob("*"):
             if file_path.is_file() and file_path.name not in {".gitkeep", "template_resume.docx"}:
                 remaining_files.append(file_path)
@@ -151,7 +198,7 @@ class UserDataCleaner:
         if remaining_files:
             self.log("⚠️  WARNING: Some files remain:", "WARN")
             for file_path in remaining_files[:5]:  # Show first 5
-                self.log(f"  - {file_path.relative_to(self.base_path)}", "WARN")
+                self.log(f"  - {file_path}", "WARN")
             if len(remaining_files) > 5:
                 self.log(f"  ... and {len(remaining_files) - 5} more", "WARN")
             return False
@@ -173,10 +220,13 @@ class UserDataCleaner:
         # Step 2: Clean uploads directory
         self.clean_uploads_directory()
         
-        # Step 3: Clean root directory
+        # Step 3: Clean the SQLite stores in the data directory
+        self.clean_data_stores()
+        
+        # Step 4: Clean root directory
         self.clean_root_user_files()
         
-        # Step 4: Verify clean state
+        # Step 5: Verify clean state
         self.verify_clean_state()
         
         # Summary
@@ -158,16 +158,152 @@ document.addEventListener('DOMContentLoaded', function() {
         currentRequestId = null; // Reset request ID
         
         // Send the complete job data with AI analysis - using OpenAI specifically
-        fetch('/tailor-resume', {
+        const tailorPayload = {
+            resumeFilename: uploadedResumeFilename,
+            jobRequirements: parsedJobData,
+            llmProvider: 'openai' // Explicitly use OpenAI instead of auto
+        };
+        
+        // Prefer the streaming endpoint so progress shows up section by section
+        const tailoring = (window.ReadableStream && window.TextDecoder)
+            ? tailorResumeStreaming(tailorPayload)
+            : tailorResumeBlocking(tailorPayload);
+        
+        tailoring
+        .then(previewHtml => {
+            showStatus(tailorStatus, 'Resume tailored successfully!', 'success');
+            displayResumePreview(previewHtml);
+            
+            // Enable download button
+            downloadDocxBtn.disabled = false;
+            
+            // 🚨 Check for O3 debugging artifacts
+            checkForO3Artifacts(currentRequestId);
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            showStatus(tailorStatus, 'Error: ' + error.message, 'error');
+        });
+    });
+    
+    // Tailor via /tailor-resume/stream (server-sent events over a POST response).
+    // Resolves with the preview HTML from the final 'complete' event, or, when the
+    // server queued the job instead (202), once the job finishes.
+    function tailorResumeStreaming(payload) {
+        const totalSections = 6;
+        const completedSections = [];
+        
+        return fetch('/tailor-resume/stream', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
             },
-            body: JSON.stringify({
-                resumeFilename: uploadedResumeFilename,
-                jobRequirements: parsedJobData,
-                llmProvider: 'openai' // Explicitly use OpenAI instead of auto
-            })
+            body: JSON.stringify(payload)
+        })
+        .then(response => {
+            if (!response.ok || !response.body) {
+                return response.json().catch(() => ({})).then(errData => {
+                    throw new Error(errData.error || 'Resume tailoring failed');
+                });
+            }
+            
+            // Queued on the background worker pool - poll it like the blocking path
+            if (response.status === 202) {
+                return response.json().then(data => {
+                    currentRequestId = data.request_id;
+                    return waitForTailoringJob(data.status_url).then(fetchTailoredPreview);
+                });
+            }
+            
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            
+            return new Promise((resolve, reject) => {
+                function handleEvent(rawEvent) {
+                    let eventName = 'message';
+                    const dataLines = [];
+                    rawEvent.split('\n').forEach(line => {
+                        if (line.startsWith('event:')) {
+                            eventName = line.slice(6).trim();
+                        } else if (line.startsWith('data:')) {
+                            dataLines.push(line.slice(5).trim());
+                        }
+                    });
+                    if (!dataLines.length) {
+                        return; // keep-alive comment
+                    }
+                    const data = JSON.parse(dataLines.join('\n'));
+                    
+                    if (eventName === 'start') {
+                        currentRequestId = data.request_id;
+                    } else if (eventName === 'section') {
+                        completedSections.push(data.section);
+                        showStatus(tailorStatus,
+                            `Tailoring your resume... ${completedSections.length}/${totalSections} sections ready (${data.section})`,
+                            'loading');
+                    } else if (eventName === 'complete') {
+                        currentRequestId = data.request_id;
+                        console.log('Tailored resume data:', data);
+                        resolve(data.preview);
+                    } else if (eventName === 'error') {
+                        reject(new Error(data.error || 'Tailoring failed on the server.'));
+                    }
+                }
+                
+                function pump() {
+                    reader.read().then(({ done, value }) => {
+                        if (done) {
+                            reject(new Error('Tailoring stream ended unexpectedly.'));
+                            return;
+                        }
+                        buffer += decoder.decode(value, { stream: true });
+                        let boundary;
+                        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                            const rawEvent = buffer.slice(0, boundary);
+                            buffer = buffer.slice(boundary + 2);
+                            handleEvent(rawEvent);
+                        }
+                        pump();
+                    }).catch(reject);
+                }
+                
+                pump();
+            });
+        });
+    }
+    
+    // Poll a queued tailoring job until it succeeds or fails
+    function waitForTailoringJob(statusUrl) {
+        return new Promise((resolve, reject) => {
+            function poll() {
+                fetch(statusUrl)
+                .then(response => response.json())
+                .then(job => {
+                    if (job.status === 'succeeded') {
+                        resolve(job);
+                    } else if (job.status === 'failed') {
+                        reject(new Error(job.error || 'Tailoring failed on the server.'));
+                    } else {
+                        const position = job.queue_position ? ` (position ${job.queue_position + 1} in queue)` : '';
+                        showStatus(tailorStatus, `Tailoring your resume... ${job.status}${position}`, 'loading');
+                        setTimeout(poll, 2000);
+                    }
+                })
+                .catch(reject);
+            }
+            poll();
+        });
+    }
+    
+    // Tailor via the blocking /tailor-resume endpoint, then fetch the preview
+    function tailorResumeBlocking(payload) {
+        return fetch('/tailor-resume', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify(payload)
         })
         .then(response => {
             if (!response.ok) {
@@ -188,11 +324,18 @@ document.addEventListener('DOMContentLoaded', function() {
             currentRequestId = data.request_id;
             console.log('Tailored resume data:', data);
             
-            showStatus(tailorStatus, 'Tailoring complete. Fetching preview...', 'loading');
-            
-            // Fetch the preview using the request_id
-            return fetch(`/preview/${currentRequestId}`);
+            // Queued on the background worker pool - wait for it to finish first
+            return (data.queued ? waitForTailoringJob(data.status_url) : Promise.resolve());
         })
+        .then(fetchTailoredPreview);
+    }
+    
+    // Fetch the rendered preview for currentRequestId once tailoring has finished
+    function fetchTailoredPreview() {
+        showStatus(tailorStatus, 'Tailoring complete. Fetching preview...', 'loading');
+        
+        // Fetch the preview using the request_id
+        return fetch(`/preview/${currentRequestId}`)
         .then(previewResponse => {
             if (!previewResponse.ok) {
                 // Try to get error message from response body if available
@@ -204,22 +347,8 @@ document.addEventListener('DOMContentLoaded', function() {
                 });
             }
             return previewResponse.text(); // Get HTML preview as text
-        })
-        .then(previewHtml => {
-            showStatus(tailorStatus, 'Resume tailored successfully!', 'success');
-            displayResumePreview(previewHtml);
-            
-            // Enable download button
-            downloadDocxBtn.disabled = false;
-            
-            // 🚨 Check for O3 debugging artifacts
-            checkForO3Artifacts(currentRequestId);
-        })
-        .catch(error => {
-            console.error('Error:', error);
-            showStatus(tailorStatus, 'Error: ' + error.message, 'error');
         });
-    });
+    }
     
     // PDF download removed - DOCX only
     
@@ -4,11 +4,9 @@ StyleEngine for Resume Tailor Application
 A unified style engine to ensure consistent styling across HTML/CSS, PDF, and DOCX outputs.
 """
 
-import json
 import os
 import sys
 import logging
-from pathlib import Path
 from typing import Dict, Any, List, Tuple, Optional, Union
 
 from docx.shared import Pt, RGBColor
@@ -19,6 +17,8 @@ from docx import Document
 from docx.shared import Cm
 import traceback
 
+from utils.token_service import DOCX_STYLES_PATH, get_token_service, memoized_token_lookup
+
 logger = logging.getLogger(__name__)
 
 class TokenAccessor:
@@ -82,16 +82,8 @@ class StyleEngine:
     
     @staticmethod
     def load_tokens() -> Dict[str, Any]:
-        """Load design tokens from JSON file."""
-        try:
-            token_path = Path(__file__).parent / 'design_tokens.json'
-            with open(token_path, 'r', encoding='utf-8') as f:
-                tokens = json.load(f)
-            logger.info(f"Successfully loaded design tokens from {token_path}")
-            return tokens
-        except Exception as e:
-            logger.error(f"Error loading design tokens: {e}")
-            return {}
+        """Load design tokens (parsed once per file change by the token service)."""
+        return get_token_service().tokens()
     
     @staticmethod
     def get_structured_tokens() -> Dict[str, Any]:
@@ -99,9 +91,16 @@ class StyleEngine:
         Get structured design tokens optimized for component access.
         
         Returns a structured view of design tokens organized by component type
-        with format-specific sections (base, html, docx).
+        with format-specific sections (base, html, docx). The view is built once
+        per token version by the token service.
         """
-        tokens = StyleEngine.load_tokens()
+        service = get_token_service()
+        return service.derived('structured_tokens',
+                               lambda: StyleEngine._build_structured_tokens(service.tokens()))
+    
+    @staticmethod
+    def _build_structured_tokens(tokens: Dict[str, Any]) -> Dict[str, Any]:
+        """Derive the structured token view from raw design tokens."""
         
         # Check if we have the new typography system
         typography = tokens.get("typography", {})
@@ -321,6 +320,7 @@ class StyleEngine:
         return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
     @staticmethod
+    @memoized_token_lookup
     def get_typography_font_family(tokens: Optional[Dict[str, Any]] = None, format_type: str = "primary") -> str:
         """Get font family for a specific format from typography tokens."""
         if tokens is None:
@@ -347,6 +347,7 @@ class StyleEngine:
         return font_family
 
     @staticmethod
+    @memoized_token_lookup
     def get_typography_font_size(tokens: Optional[Dict[str, Any]] = None, element_type: str = "body", format_type: str = "pt") -> Union[str, int, float]:
         """Get font size for a specific element type from typography tokens."""
         if tokens is None:
@@ -372,6 +373,7 @@ class StyleEngine:
         return font_size
 
     @staticmethod
+    @memoized_token_lookup
     def get_typography_font_color(tokens: Optional[Dict[str, Any]] = None, color_type: str = "primary", format_type: str = "hex") -> str:
         """Get font color for a specific color type from typography tokens."""
         if tokens is None:
@@ -407,6 +409,7 @@ class StyleEngine:
         return color
 
     @staticmethod
+    @memoized_token_lookup
     def get_typography_font_weight(tokens: Optional[Dict[str, Any]] = None, weight_type: str = "normal") -> int:
         """Get font weight from typography tokens."""
         if tokens is None:
@@ -418,6 +421,7 @@ class StyleEngine:
         return font_weights.get(weight_type, 400)
 
     @staticmethod
+    @memoized_token_lookup
     def get_typography_line_height(tokens: Optional[Dict[str, Any]] = None, height_type: str = "normal") -> float:
         """Get line height from typography tokens."""
         if tokens is None:
@@ -429,6 +433,7 @@ class StyleEngine:
         return line_heights.get(height_type, 1.4)
 
     @staticmethod
+    @memoized_token_lookup
     def get_typography_spacing(tokens: Optional[Dict[str, Any]] = None, spacing_type: str = "paragraphAfterPt", format_type: str = "docx") -> int:
         """Get spacing values from typography tokens."""
         if tokens is None:
@@ -455,25 +460,9 @@ class StyleEngine:
         if design_tokens is None:
             design_tokens = StyleEngine.load_tokens()
 
-        try:
-            # Corrected path finding for _docx_styles.json
-            base_path = Path(__file__).parent
-            spec_path = base_path / 'static' / 'styles' / '_docx_styles.json'
-            if not spec_path.exists():
-                # Fallback for common project structures if static is at root sibling to module
-                spec_path = base_path.parent / 'static' / 'styles' / '_docx_styles.json'
-                if not spec_path.exists():
-                    # Another fallback if script is run from project root and module is in subdir
-                    spec_path = Path('.') / 'static' / 'styles' / '_docx_styles.json'
-
-            with open(spec_path, 'r', encoding='utf-8') as f:
-                docx_style_spec = json.load(f)
-            logger.info(f"Successfully loaded DOCX style specification from {spec_path}")
-        except FileNotFoundError:
-            logger.error(f"DOCX style specification file could not be found. Looked at: {Path(__file__).parent / 'static' / 'styles' / '_docx_styles.json'} and other fallbacks. Cannot create custom styles.")
-            return {}
-        except json.JSONDecodeError as e:
-            logger.error(f"Error decoding JSON from DOCX style specification: {e}")
+        docx_style_spec = get_token_service().docx_styles()
+        if not docx_style_spec:
+            logger.error(f"DOCX style specification is missing or invalid ({DOCX_STYLES_PATH}). Cannot create custom styles.")
             return {}
 
         styles_created = {}
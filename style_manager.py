@@ -1,34 +1,16 @@
 """Manages access to design tokens and compiled CSS paths."""
 
 import os
-import json
 from pathlib import Path
 import logging
 
-logger = logging.getLogger(__name__)
+from utils.token_service import get_token_service
 
-_TOKENS = None
-_TOKENS_PATH = Path(__file__).parent / 'design_tokens.json'
-_DOCX_STYLES = None
+logger = logging.getLogger(__name__)
 
 def load_tokens():
-    """Loads design tokens from the JSON file."""
-    global _TOKENS
-    if _TOKENS is None:
-        try:
-            with open(_TOKENS_PATH, 'r') as f:
-                _TOKENS = json.load(f)
-            logger.info(f"Successfully loaded design tokens from {_TOKENS_PATH}")
-        except FileNotFoundError:
-            logger.error(f"Design tokens file not found at {_TOKENS_PATH}")
-            _TOKENS = {} # Fallback to empty dict
-        except json.JSONDecodeError:
-            logger.error(f"Error decoding JSON from {_TOKENS_PATH}")
-            _TOKENS = {} # Fallback to empty dict
-        except Exception as e:
-            logger.error(f"An unexpected error occurred loading tokens: {e}")
-            _TOKENS = {}
-    return _TOKENS
+    """Loads design tokens (parsed once per file change by the token service)."""
+    return get_token_service().tokens()
 
 class StyleManager:
     """Provides access to styling resources."""
@@ -68,21 +50,5 @@ class StyleManager:
 
     @staticmethod
     def load_docx_styles() -> dict:
-        """Load DOCX styles from the JSON file."""
-        global _DOCX_STYLES
-        if _DOCX_STYLES is None:
-            try:
-                path = StyleManager.docx_styles_path()
-                with open(path, 'r') as f:
-                    _DOCX_STYLES = json.load(f)
-                logger.info(f"Successfully loaded DOCX styles from {path}")
-            except FileNotFoundError:
-                logger.error(f"DOCX styles file not found. Run 'python tools/generate_tokens.py' to generate it.")
-                _DOCX_STYLES = {} # Fallback to empty dict
-            except json.JSONDecodeError:
-                logger.error(f"Error decoding JSON from DOCX styles file")
-                _DOCX_STYLES = {} # Fallback to empty dict
-            except Exception as e:
-                logger.error(f"An unexpected error occurred loading DOCX styles: {e}")
-                _DOCX_STYLES = {}
-        return _DOCX_STYLES 
\ No newline at end of file
+        """Load DOCX styles (parsed once per file change by the token service)."""
+        return get_token_service().docx_styles()
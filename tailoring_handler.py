@@ -3,16 +3,273 @@ import json
 import traceback
 import logging
 import uuid
-from flask import request, jsonify, current_app
+import queue
+import threading
+from flask import request, jsonify, current_app, Response, stream_with_context
 from claude_integration import tailor_resume_with_llm, generate_resume_preview, generate_preview_from_llm_responses
+from html_generator import render_section_html, render_preview_from_llm_responses
+from config import Config
+from utils.job_queue import get_tailoring_job_queue, SUCCEEDED, FAILED
 from pdf_exporter import create_pdf_from_html
 from dotenv import load_dotenv
 from resume_index import get_resume_index
+from utils.tracing import trace_request, trace_span, traced
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@traced("build_job_data")
+def _build_job_data(job_requirements):
+    """Normalize the jobRequirements payload into the job_data dict used for tailoring"""
+    job_data = {}
+    if isinstance(job_requirements, dict):
+        # If it's already a complete job data object
+        job_data = job_requirements
+        logger.info("Using complete job data object")
+        
+        # Check for analysis data
+        if 'analysis' in job_data:
+            logger.info("Job analysis data found and will be used for tailoring")
+            
+            # Log some info about the analysis for debugging
+            if isinstance(job_data['analysis'], dict):
+                analysis_keys = job_data['analysis'].keys()
+                logger.info(f"Analysis data contains the following keys: {', '.join(analysis_keys)}")
+                
+                # Log candidate profile length if available
+                if 'candidate_profile' in job_data['analysis']:
+                    profile_len = len(job_data['analysis']['candidate_profile'])
+                    logger.info(f"Candidate profile length: {profile_len} chars")
+                
+                # Log skills count if available
+                if 'hard_skills' in job_data['analysis']:
+                    hard_skills_count = len(job_data['analysis']['hard_skills'])
+                    logger.info(f"Hard skills count: {hard_skills_count}")
+                
+                if 'soft_skills' in job_data['analysis']:
+                    soft_skills_count = len(job_data['analysis']['soft_skills'])
+                    logger.info(f"Soft skills count: {soft_skills_count}")
+        
+    elif isinstance(job_requirements, list):
+        # If it's just a list of requirements
+        job_data = {'requirements': job_requirements, 'skills': []}
+        logger.info("Created job data from requirements list")
+    else:
+        # If it's something else, try to extract requirements
+        try:
+            if hasattr(job_requirements, 'requirements'):
+                job_data = {'requirements': job_requirements.requirements, 'skills': []}
+            else:
+                job_data = {'requirements': [str(job_requirements)], 'skills': []}
+            logger.info("Created job data from alternative format")
+        except Exception as e:
+            logger.error(f"Error processing job requirements: {str(e)}")
+            job_data = {'requirements': ['No specific requirements found'], 'skills': []}
+    return job_data
+
+
+def _resolve_provider_credentials(provider):
+    """
+    Resolve the API key and URL for the requested LLM provider.
+    
+    Returns:
+        (provider, api_key, api_url, error) - provider is the concrete provider when
+        'auto' was requested; error is a user-facing message when no usable key exists
+    """
+    api_key = None
+    api_url = None
+    
+    # Handle 'auto' provider by checking available API keys
+    if provider == 'auto':
+        logger.info("Auto provider selected - checking available API keys")
+        
+        # Reload .env file to ensure latest values
+        load_dotenv(override=True)
+        
+        # First try Claude
+        claude_api_key = current_app.config.get('CLAUDE_API_KEY') or os.environ.get('CLAUDE_API_KEY')
+        
+        # Then try OpenAI
+        openai_api_key = current_app.config.get('OPENAI_API_KEY') or os.environ.get('OPENAI_API_KEY')
+        
+        if claude_api_key and claude_api_key.startswith('sk-ant'):
+            provider = 'claude'
+            api_key = claude_api_key
+            api_url = current_app.config.get('CLAUDE_API_URL', 'https://api.anthropic.com/v1/messages')
+            logger.info("Auto-selected Claude API based on available keys")
+        elif openai_api_key and openai_api_key.startswith('sk-'):
+            provider = 'openai'
+            api_key = openai_api_key
+            logger.info("Auto-selected OpenAI API based on available keys")
+        else:
+            logger.error("No valid API keys found for auto provider selection")
+            return provider, None, None, 'No valid API keys found. Please add either a Claude or OpenAI API key to the .env file.'
+    
+    elif provider == 'claude':
+        api_key = current_app.config.get('CLAUDE_API_KEY')
+        api_url = current_app.config.get('CLAUDE_API_URL', 'https://api.anthropic.com/v1/messages')
+        
+        # Fallback to environment variable if not in config
+        if not api_key:
+            # Reload .env file to ensure latest values
+            load_dotenv(override=True)
+            api_key = os.environ.get('CLAUDE_API_KEY')
+            
+        # Validate Claude API key
+        if not api_key or not api_key.startswith('sk-ant'):
+            logger.error("No valid Claude API key found - cannot use Claude")
+            return provider, None, None, 'No valid Claude API key found. Please add a Claude API key to the .env file or switch to OpenAI.'
+        
+        logger.info(f"Using Claude API with key starting with: {api_key[:8]}...")
+        
+    elif provider == 'openai':
+        api_key = current_app.config.get('OPENAI_API_KEY')
+        
+        # Fallback to environment variable if not in config
+        if not api_key:
+            # Reload .env file to ensure latest values
+            load_dotenv(override=True)
+            api_key = os.environ.get('OPENAI_API_KEY')
+        
+        # Validate OpenAI API key
+        if not api_key or not api_key.startswith('sk-'):
+            logger.error("No valid OpenAI API key found - cannot use OpenAI")
+            return provider, None, None, 'No valid OpenAI API key found. Please add an OpenAI API key to the .env file or switch to Claude.'
+            
+        logger.info(f"Using OpenAI API with key starting with: {api_key[:8]}...")
+        
+    else:
+        logger.error(f"Unsupported LLM provider: {provider}")
+        return provider, None, None, f'Unsupported LLM provider: {provider}. Please use "claude", "openai", or "auto".'
+    
+    return provider, api_key, api_url, None
+
+
+def describe_llm_error(error):
+    """Turn an LLM/API exception into a message suitable for the frontend"""
+    error_message = str(error)
+    if "401" in error_message:
+        error_message = "Authentication failed - invalid API key. Please check your API key in the .env file."
+    elif "429" in error_message:
+        error_message = "Rate limit exceeded. Please try again in a few minutes."
+    elif "500" in error_message:
+        error_message = "API server error. Please try again later."
+    elif "timeout" in error_message.lower():
+        error_message = "API request timed out. Please try again."
+    elif "network" in error_message.lower():
+        error_message = "Network error connecting to API. Please check your internet connection."
+    return error_message
+
+
+def _record_tailoring_in_index(resume_path, job_data):
+    """Log the tailoring run in the resume index system"""
+    # Get resume ID from filename
+    resume_id = os.path.splitext(os.path.basename(resume_path))[0]
+    try:
+        with trace_span("resume_index"):
+            resume_index = get_resume_index()
+            resume_index.add_resume(resume_id, os.path.basename(resume_path))
+            
+            # If we get to this point, update the index with job details
+            job_title = job_data.get('job_title', 'Unknown Position')
+            company = job_data.get('company', 'Unknown Company')
+            resume_index.add_note(resume_id, f"Processing for job: {job_title} at {company}")
+        
+    except Exception as e:
+        logger.warning(f"Error updating resume index: {e}")
+
+
+def _enqueue_tailoring_job(request_id, resume_filename, job_data, provider, data):
+    """Queue a tailoring run for the worker pool and answer 202 with its request_id"""
+    try:
+        priority = max(-10, min(10, int(data.get('priority', 0))))
+    except (TypeError, ValueError):
+        priority = 0
+    
+    job_queue = get_tailoring_job_queue()
+    job_queue.enqueue(
+        request_id,
+        'tailor_resume',
+        {'resume_filename': resume_filename, 'job_data': job_data},
+        provider=provider,
+        priority=priority,
+        max_attempts=Config.TAILORING_JOB_MAX_ATTEMPTS
+    )
+    return jsonify({
+        'success': True,
+        'queued': True,
+        'request_id': request_id,
+        'provider': provider,
+        'status': 'queued',
+        'status_url': f'/tailor-resume/status/{request_id}',
+        'queue_position': job_queue.queue_position(request_id)
+    }), 202
+
+
+def _async_without_queue(data):
+    """
+    A request asking for "async": true while the job queue is off.
+    
+    Without the queue no tailoring_worker runs, so an enqueued job would stay
+    queued forever; such requests are rejected instead.
+    """
+    if data.get('async') and not Config.USE_TAILORING_JOB_QUEUE:
+        return jsonify({
+            'success': False,
+            'error': 'Asynchronous tailoring is not enabled on this server'
+        }), 400
+    return None
+
+
+def is_retryable_tailoring_error(error):
+    """Authentication and input errors will fail the same way on every attempt"""
+    if isinstance(error, (ValueError, FileNotFoundError)):
+        return False
+    return "401" not in str(error)
+
+
+def run_tailoring_job(request_id, payload, provider):
+    """
+    Run one queued tailoring job; called by tailoring_worker inside an app context.
+    
+    Credentials are resolved here rather than stored with the job so API keys
+    never land in the queue database.
+    
+    Returns:
+        Result dict stored on the job; raises on failure so the queue can retry
+    """
+    resume_path = os.path.join(current_app.config['UPLOAD_FOLDER'], payload['resume_filename'])
+    if not os.path.exists(resume_path):
+        raise FileNotFoundError(f"Resume file not found: {resume_path}")
+    
+    job_data = payload['job_data']
+    provider, api_key, api_url, credential_error = _resolve_provider_credentials(provider)
+    if credential_error:
+        raise ValueError(credential_error)
+    
+    with trace_request(request_id):
+        tailor_resume_with_llm(
+            resume_path,
+            job_data,
+            api_key,
+            provider,
+            api_url,
+            request_id
+        )
+        _record_tailoring_in_index(resume_path, job_data)
+    logger.info(f"Queued tailoring job {request_id} completed with {provider}")
+    return {
+        'provider': provider,
+        'message': f'Resume tailored successfully using {provider.upper()}. Use "Generate DOCX" to download.'
+    }
+
+
+def _sse_event(event, payload):
+    """Format one server-sent event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
 def setup_tailoring_routes(app):
     """Set up routes for resume tailoring with Claude API"""
     
@@ -70,129 +327,20 @@ def setup_tailoring_routes(app):
                 }), 404
             
             # Process job data
-            job_data = {}
-            if isinstance(job_requirements, dict):
-                # If it's already a complete job data object
-                job_data = job_requirements
-                logger.info("Using complete job data object")
-                
-                # Check for analysis data
-                if 'analysis' in job_data:
-                    logger.info("Job analysis data found and will be used for tailoring")
-                    
-                    # Log some info about the analysis for debugging
-                    if isinstance(job_data['analysis'], dict):
-                        analysis_keys = job_data['analysis'].keys()
-                        logger.info(f"Analysis data contains the following keys: {', '.join(analysis_keys)}")
-                        
-                        # Log candidate profile length if available
-                        if 'candidate_profile' in job_data['analysis']:
-                            profile_len = len(job_data['analysis']['candidate_profile'])
-                            logger.info(f"Candidate profile length: {profile_len} chars")
-                        
-                        # Log skills count if available
-                        if 'hard_skills' in job_data['analysis']:
-                            hard_skills_count = len(job_data['analysis']['hard_skills'])
-                            logger.info(f"Hard skills count: {hard_skills_count}")
-                        
-                        if 'soft_skills' in job_data['analysis']:
-                            soft_skills_count = len(job_data['analysis']['soft_skills'])
-                            logger.info(f"Soft skills count: {soft_skills_count}")
-                
-            elif isinstance(job_requirements, list):
-                # If it's just a list of requirements
-                job_data = {'requirements': job_requirements, 'skills': []}
-                logger.info("Created job data from requirements list")
-            else:
-                # If it's something else, try to extract requirements
-                try:
-                    if hasattr(job_requirements, 'requirements'):
-                        job_data = {'requirements': job_requirements.requirements, 'skills': []}
-                    else:
-                        job_data = {'requirements': [str(job_requirements)], 'skills': []}
-                    logger.info("Created job data from alternative format")
-                except Exception as e:
-                    logger.error(f"Error processing job requirements: {str(e)}")
-                    job_data = {'requirements': ['No specific requirements found'], 'skills': []}
+            with trace_request(request_id):
+                job_data = _build_job_data(job_requirements)
             
             # Get API key based on provider
-            api_key = None
-            api_url = None
+            provider, api_key, api_url, credential_error = _resolve_provider_credentials(provider)
+            if credential_error:
+                return jsonify({'success': False, 'error': credential_error}), 400
             
-            # Handle 'auto' provider by checking available API keys
-            if provider == 'auto':
-                logger.info("Auto provider selected - checking available API keys")
-                
-                # Reload .env file to ensure latest values
-                load_dotenv(override=True)
-                
-                # First try Claude
-                claude_api_key = current_app.config.get('CLAUDE_API_KEY') or os.environ.get('CLAUDE_API_KEY')
-                
-                # Then try OpenAI
-                openai_api_key = current_app.config.get('OPENAI_API_KEY') or os.environ.get('OPENAI_API_KEY')
-                
-                if claude_api_key and claude_api_key.startswith('sk-ant'):
-                    provider = 'claude'
-                    api_key = claude_api_key
-                    api_url = current_app.config.get('CLAUDE_API_URL', 'https://api.anthropic.com/v1/messages')
-                    logger.info("Auto-selected Claude API based on available keys")
-                elif openai_api_key and openai_api_key.startswith('sk-'):
-                    provider = 'openai'
-                    api_key = openai_api_key
-                    logger.info("Auto-selected OpenAI API based on available keys")
-                else:
-                    logger.error("No valid API keys found for auto provider selection")
-                    return jsonify({
-                        'success': False,
-                        'error': 'No valid API keys found. Please add either a Claude or OpenAI API key to the .env file.'
-                    }), 400
-            
-            elif provider == 'claude':
-                api_key = current_app.config.get('CLAUDE_API_KEY')
-                api_url = current_app.config.get('CLAUDE_API_URL', 'https://api.anthropic.com/v1/messages')
-                
-                # Fallback to environment variable if not in config
-                if not api_key:
-                    # Reload .env file to ensure latest values
-                    load_dotenv(override=True)
-                    api_key = os.environ.get('CLAUDE_API_KEY')
-                    
-                # Validate Claude API key
-                if not api_key or not api_key.startswith('sk-ant'):
-                    logger.error("No valid Claude API key found - cannot use Claude")
-                    return jsonify({
-                        'success': False,
-                        'error': 'No valid Claude API key found. Please add a Claude API key to the .env file or switch to OpenAI.'
-                    }), 400
-                
-                logger.info(f"Using Claude API with key starting with: {api_key[:8]}...")
-                
-            elif provider == 'openai':
-                api_key = current_app.config.get('OPENAI_API_KEY')
-                
-                # Fallback to environment variable if not in config
-                if not api_key:
-                    # Reload .env file to ensure latest values
-                    load_dotenv(override=True)
-                    api_key = os.environ.get('OPENAI_API_KEY')
-                
-                # Validate OpenAI API key
-                if not api_key or not api_key.startswith('sk-'):
-                    logger.error("No valid OpenAI API key found - cannot use OpenAI")
-                    return jsonify({
-                        'success': False,
-                        'error': 'No valid OpenAI API key found. Please add an OpenAI API key to the .env file or switch to Claude.'
-                    }), 400
-                    
-                logger.info(f"Using OpenAI API with key starting with: {api_key[:8]}...")
-                
-            else:
-                logger.error(f"Unsupported LLM provider: {provider}")
-                return jsonify({
-                    'success': False,
-                    'error': f'Unsupported LLM provider: {provider}. Please use "claude", "openai", or "auto".'
-                }), 400
+            # Hand off to the background worker pool so this web worker stays free
+            rejected = _async_without_queue(data)
+            if rejected:
+                return rejected
+            if Config.USE_TAILORING_JOB_QUEUE:
+                return _enqueue_tailoring_job(request_id, resume_filename, job_data, provider, data)
             
             # Tailor the resume with the selected provider
             logger.info(f"Using {provider.upper()} API for tailoring")
@@ -202,74 +350,40 @@ def setup_tailoring_routes(app):
                 # - output_filename: The filename of the generated file (e.g., "resume_tailored_openai.pdf")
                 # - output_path: The full path to the generated file
                 # - llm_client: The LLM client instance used for tailoring
-                tailored_sections, llm_client = tailor_resume_with_llm(
-                    resume_path,
-                    job_data,
-                    api_key,
-                    provider,
-                    api_url,
-                    request_id
-                )
+                with trace_request(request_id):
+                    tailored_sections, llm_client = tailor_resume_with_llm(
+                        resume_path,
+                        job_data,
+                        api_key,
+                        provider,
+                        api_url,
+                        request_id
+                    )
                 
-                # Get upload folder path from current app context
-                upload_folder = current_app.config['UPLOAD_FOLDER']
+                    # Get upload folder path from current app context
+                    upload_folder = current_app.config['UPLOAD_FOLDER']
                 
-                # Generate HTML preview for the screen
-                preview_html_for_screen = generate_preview_from_llm_responses(request_id, upload_folder, for_screen=True)
-                
-                # Generate clean HTML body content for PDF export
-                html_body_for_pdf = generate_preview_from_llm_responses(request_id, upload_folder, for_screen=False)
-                
-                # Extract only the content within the <body> tags for PDF generation
-                # This is a simple regex approach, might need refinement
-                import re
-                body_match = re.search(r'<body.*?>(.*?)</body>', html_body_for_pdf, re.DOTALL | re.IGNORECASE)
-                if body_match:
-                    clean_html_body = body_match.group(1).strip()
-                    # Further clean by removing the outer container if it exists
-                    # clean_html_body = re.sub(r'^<div class="resume-preview-container">(.*)</div>$', r'\1', clean_html_body, flags=re.DOTALL).strip()
-                else:
-                    logger.warning("Could not extract body content for PDF generation. Using full HTML.")
-                    clean_html_body = html_body_for_pdf # Fallback, might cause issues
-
+                    # Render the section fragments once; only the screen fragment is needed
+                    # here. The print document (preview.print_html / print_body_html) is
+                    # built lazily if PDF export is ever re-enabled.
+                    preview = render_preview_from_llm_responses(request_id, upload_folder)
+                    preview_html_for_screen = preview.screen_html
                 
-                # Get original filename without extension
-                filename_base = os.path.splitext(os.path.basename(resume_path))[0]
+                    # Skip PDF generation - just return preview with DOCX download option
+                    logger.info(f"Resume tailored successfully with {provider} - PDF generation disabled")
                 
-                # Create PDF output path
-                pdf_output_path = os.path.join(
-                    current_app.config['UPLOAD_FOLDER'], 
-                    f"{filename_base}_tailored_{provider}.pdf"
-                )
+                    # Log in resume index system
+                    _record_tailoring_in_index(resume_path, job_data)
                 
-                # Skip PDF generation - just return preview with DOCX download option
-                logger.info(f"Resume tailored successfully with {provider} - PDF generation disabled")
-                
-                # Get resume ID from filename
-                resume_id = os.path.splitext(os.path.basename(resume_path))[0]
-                
-                # Log in resume index system
-                try:
-                    resume_index = get_resume_index()
-                    resume_index.add_resume(resume_id, os.path.basename(resume_path))
-                    
-                    # If we get to this point, update the index with job details
-                    job_title = job_data.get('job_title', 'Unknown Position')
-                    company = job_data.get('company', 'Unknown Company')
-                    resume_index.add_note(resume_id, f"Processing for job: {job_title} at {company}")
-                    
-                except Exception as e:
-                    logger.warning(f"Error updating resume index: {e}")
-                
-                return jsonify({
-                    'success': True,
-                    'filename': None,  # No PDF file generated
-                    'preview': preview_html_for_screen, # Return the version for the screen
-                    'request_id': request_id,
-                    'provider': provider,
-                    'fileType': 'html',  # Indicate this is HTML preview only
-                    'message': f'Resume tailored successfully using {provider.upper()}. Use "Generate DOCX" to download.'
-                }), 200
+                    return jsonify({
+                        'success': True,
+                        'filename': None,  # No PDF file generated
+                        'preview': preview_html_for_screen, # Return the version for the screen
+                        'request_id': request_id,
+                        'provider': provider,
+                        'fileType': 'html',  # Indicate this is HTML preview only
+                        'message': f'Resume tailored successfully using {provider.upper()}. Use "Generate DOCX" to download.'
+                    }), 200
                     
             except Exception as e:
                 logger.error(f"Error tailoring resume with {provider.upper()} API: {str(e)}")
@@ -280,17 +394,7 @@ def setup_tailoring_routes(app):
                     logger.error(f"API Key prefix: {api_key[:8]}... (length: {len(api_key)})")
                 
                 # Create a more descriptive error message for the frontend
-                error_message = str(e)
-                if "401" in error_message:
-                    error_message = "Authentication failed - invalid API key. Please check your API key in the .env file."
-                elif "429" in error_message:
-                    error_message = "Rate limit exceeded. Please try again in a few minutes."
-                elif "500" in error_message:
-                    error_message = "API server error. Please try again later."
-                elif "timeout" in error_message.lower():
-                    error_message = "API request timed out. Please try again."
-                elif "network" in error_message.lower():
-                    error_message = "Network error connecting to API. Please check your internet connection."
+                error_message = describe_llm_error(e)
                 
                 return jsonify({
                     'success': False,
@@ -305,3 +409,136 @@ def setup_tailoring_routes(app):
                 'success': False,
                 'error': f'Unexpected error: {str(e)}'
             }), 500
+
+    @app.route('/tailor-resume/status/<request_id>')
+    def tailor_resume_status(request_id):
+        """Report the state of a queued tailoring job"""
+        job = get_tailoring_job_queue().get(request_id)
+        if job is None:
+            return jsonify({'success': False, 'error': 'Unknown tailoring request'}), 404
+        
+        status = job.to_dict()
+        status['success'] = job.status != FAILED
+        if job.status == SUCCEEDED:
+            status['preview_url'] = f'/preview/{request_id}'
+        else:
+            status['queue_position'] = get_tailoring_job_queue().queue_position(request_id)
+        if job.error:
+            status['error'] = f'{(job.provider or "LLM").upper()} API Error: {job.error}'
+        return jsonify(status), 200
+    
+    @app.route('/tailor-resume/stream', methods=['POST'])
+    def tailor_resume_stream():
+        """
+        Streaming variant of /tailor-resume using server-sent events.
+        
+        Emits a 'start' event, one 'section' event per section as soon as it is
+        tailored (section JSON plus its rendered HTML fragment), then 'complete'
+        with the full preview or 'error'. Keep-alive comments are sent while
+        waiting on the provider so the connection never goes silent.
+        
+        With the background queue on, the job is enqueued instead and the reply is
+        the same 202 JSON as /tailor-resume, so the LLM calls never run on a web worker.
+        """
+        logger.info("Received tailor-resume stream request")
+        request_id = str(uuid.uuid4())
+        logger.info(f"Generated unique request_id: {request_id}")
+        
+        data = request.get_json(silent=True)
+        if not data or 'resumeFilename' not in data:
+            logger.error("Missing resumeFilename in request data")
+            return jsonify({'success': False, 'error': 'Missing resume filename'}), 400
+        if 'jobRequirements' not in data:
+            logger.error("Missing jobRequirements in request data")
+            return jsonify({'success': False, 'error': 'Missing job requirements'}), 400
+        
+        provider = data.get('llmProvider', 'openai').lower()
+        upload_folder = current_app.config['UPLOAD_FOLDER']
+        resume_path = os.path.join(upload_folder, data['resumeFilename'])
+        if not os.path.exists(resume_path):
+            logger.error(f"Resume file not found: {resume_path}")
+            return jsonify({'success': False, 'error': 'Resume file not found'}), 404
+        
+        with trace_request(request_id):
+            job_data = _build_job_data(data['jobRequirements'])
+        provider, api_key, api_url, credential_error = _resolve_provider_credentials(provider)
+        if credential_error:
+            return jsonify({'success': False, 'error': credential_error}), 400
+        
+        # Hand off to the background worker pool; the client polls the status URL
+        rejected = _async_without_queue(data)
+        if rejected:
+            return rejected
+        if Config.USE_TAILORING_JOB_QUEUE:
+            return _enqueue_tailoring_job(request_id, data['resumeFilename'], job_data, provider, data)
+        
+        # Tailoring runs on a worker thread and reports through this queue;
+        # None marks the end of the stream.
+        events = queue.Queue()
+        flask_app = current_app._get_current_object()
+        
+        def on_section_complete(section_name, section_data):
+            events.put(('section', {
+                'request_id': request_id,
+                'section': section_name,
+                'data': section_data,
+                'html': render_section_html(section_name, section_data),
+            }))
+        
+        def run_tailoring():
+            with flask_app.app_context(), trace_request(request_id):
+                try:
+                    tailor_resume_with_llm(
+                        resume_path,
+                        job_data,
+                        api_key,
+                        provider,
+                        api_url,
+                        request_id,
+                        on_section_complete=on_section_complete
+                    )
+                    preview_html = generate_preview_from_llm_responses(request_id, upload_folder, for_screen=True)
+                    _record_tailoring_in_index(resume_path, job_data)
+                    logger.info(f"Streamed tailoring for {request_id} completed with {provider}")
+                    events.put(('complete', {
+                        'success': True,
+                        'request_id': request_id,
+                        'provider': provider,
+                        'preview': preview_html,
+                        'message': f'Resume tailored successfully using {provider.upper()}. Use "Generate DOCX" to download.'
+                    }))
+                except Exception as e:
+                    logger.error(f"Error streaming tailoring with {provider.upper()} API: {str(e)}")
+                    logger.error(traceback.format_exc())
+                    events.put(('error', {
+                        'success': False,
+                        'request_id': request_id,
+                        'error': f'{provider.upper()} API Error: {describe_llm_error(e)}'
+                    }))
+                finally:
+                    events.put(None)
+        
+        def generate_events():
+            yield _sse_event('start', {'request_id': request_id, 'provider': provider})
+            keepalive_seconds = Config.TAILORING_STREAM_KEEPALIVE_SECONDS
+            while True:
+                try:
+                    item = events.get(timeout=keepalive_seconds)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                if item is None:
+                    break
+                event, payload = item
+                yield _sse_event(event, payload)
+        
+        threading.Thread(target=run_tailoring, name=f"tailor-stream-{request_id[:8]}", daemon=True).start()
+        
+        return Response(
+            stream_with_context(generate_events()),
+            mimetype='text/event-stream',
+            headers={
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no',  # Disable proxy buffering so events arrive immediately
+            }
+        )
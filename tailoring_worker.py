@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Tailoring worker pool for the background job queue.
+
+Runs queued /tailor-resume jobs (see utils/job_queue.py) in separate worker
+processes so LLM-bound tailoring never ties up a gunicorn web worker.
+
+Usage:
+    python tailoring_worker.py [--processes N]
+
+Each process claims one job at a time, heartbeats while it runs, and reports
+success or failure back to the queue. The parent restarts processes that die,
+purges finished jobs older than TAILORING_JOB_RETENTION_HOURS, and stops them
+all on SIGINT/SIGTERM.
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# How often the supervisor purges finished jobs
+PURGE_INTERVAL_SECONDS = 600
+
+
+def _heartbeat_loop(job_queue, job_id, worker_id, stop_event):
+    """Keep the job lease alive while tailoring runs"""
+    interval = max(1.0, Config.TAILORING_QUEUE_LEASE_SECONDS / 4)
+    while not stop_event.wait(interval):
+        try:
+            job_queue.heartbeat(job_id, worker_id)
+        except Exception as e:
+            logger.warning(f"Heartbeat failed for job {job_id}: {e}")
+
+
+def purge_finished_jobs(job_queue, retention_hours=None):
+    """Delete succeeded and failed jobs, payloads included, past the retention window"""
+    if retention_hours is None:
+        retention_hours = Config.TAILORING_JOB_RETENTION_HOURS
+    try:
+        purged = job_queue.purge_finished(retention_hours * 3600)
+    except Exception as e:
+        logger.warning(f"Could not purge finished tailoring jobs: {e}")
+        return 0
+    if purged:
+        logger.info(f"Purged {purged} finished tailoring job(s) older than {retention_hours:g}h")
+    return purged
+
+
+def run_worker(worker_id, stop_event):
+    """Claim and run jobs until stop_event is set"""
+    from flask import Flask
+    from tailoring_handler import run_tailoring_job, is_retryable_tailoring_error, describe_llm_error
+    from utils.job_queue import get_tailoring_job_queue
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    job_queue = get_tailoring_job_queue()
+    logger.info(f"Tailoring worker {worker_id} started (pid {os.getpid()})")
+
+    while not stop_event.is_set():
+        try:
+            job = job_queue.claim(worker_id)
+        except Exception as e:
+            logger.error(f"Worker {worker_id} could not claim a job: {e}")
+            job = None
+
+        if job is None:
+            stop_event.wait(Config.TAILORING_QUEUE_POLL_SECONDS)
+            continue
+
+        logger.info(f"Worker {worker_id} running job {job.id} "
+                    f"(attempt {job.attempts}/{job.max_attempts}, provider={job.provider})")
+        heartbeat_stop = threading.Event()
+        heartbeat = threading.Thread(target=_heartbeat_loop,
+                                     args=(job_queue, job.id, worker_id, heartbeat_stop),
+                                     daemon=True)
+        heartbeat.start()
+        try:
+            with app.app_context():
+                result = run_tailoring_job(job.id, job.payload, job.provider)
+            job_queue.complete(job.id, result)
+        except Exception as e:
+            logger.exception(f"Job {job.id} failed in worker {worker_id}")
+            job_queue.fail(job.id, describe_llm_error(e),
+                           retryable=is_retryable_tailoring_error(e),
+                           backoff_seconds=Config.TAILORING_JOB_RETRY_BACKOFF_SECONDS)
+        finally:
+            heartbeat_stop.set()
+
+    logger.info(f"Tailoring worker {worker_id} stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the tailoring job worker pool")
+    parser.add_argument('--processes', type=int, default=Config.TAILORING_QUEUE_WORKERS,
+                        help="Number of worker processes (default: TAILORING_QUEUE_WORKERS)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(processName)s - %(name)s - %(levelname)s - %(message)s')
+
+    stop_event = multiprocessing.Event()
+
+    def request_stop(signum, frame):
+        logger.info(f"Received signal {signum}, stopping workers")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    host = socket.gethostname()
+    processes = {}
+
+    def start(slot):
+        worker_id = f"{host}:{os.getpid()}:{slot}"
+        process = multiprocessing.Process(target=run_worker, args=(worker_id, stop_event),
+                                          name=f"tailor-worker-{slot}")
+        process.start()
+        processes[slot] = process
+
+    for slot in range(max(1, args.processes)):
+        start(slot)
+    logger.info(f"Started {len(processes)} tailoring worker process(es)")
+
+    from utils.job_queue import get_tailoring_job_queue
+    job_queue = get_tailoring_job_queue()
+    last_purge = None
+
+    # Supervise: restart crashed workers and purge old jobs until asked to stop
+    while not stop_event.is_set():
+        for slot, process in list(processes.items()):
+            if not process.is_alive():
+                logger.warning(f"Worker process {process.name} exited with {process.exitcode}, restarting")
+                start(slot)
+        if last_purge is None or time.monotonic() - last_purge >= PURGE_INTERVAL_SECONDS:
+            purge_finished_jobs(job_queue)
+            last_purge = time.monotonic()
+        stop_event.wait(2.0)
+
+    for process in processes.values():
+        process.join(timeout=Config.TAILORING_SECTION_TIMEOUT_SECONDS)
+        if process.is_alive():
+            process.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+import time
+import sys
+from unittest import mock
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.cache_backends import MemoryLRUBackend, SQLiteBackend, TieredCache, thread_local_connection
+from utils.llm_response_cache import make_cache_key
+
+
+class TestMemoryLRUBackend(unittest.TestCase):
+    """Tests for the in-memory LRU backend."""
+
+    def test_lru_eviction_by_entries(self):
+        cache = MemoryLRUBackend(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        self.assertEqual(cache.get("a"), "1")  # a is now most recent
+        cache.set("c", "3")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "1")
+        self.assertEqual(cache.stats.evictions, 1)
+
+    def test_eviction_by_bytes(self):
+        cache = MemoryLRUBackend(max_entries=None, max_bytes=10)
+        cache.set("a", "12345")
+        cache.set("b", "12345")
+        cache.set("c", "12345")
+        self.assertIsNone(cache.get("a"))
+        self.assertLessEqual(cache.total_bytes, 10)
+
+    def test_ttl_expiry(self):
+        cache = MemoryLRUBackend(ttl_seconds=0.01)
+        cache.set("a", "1")
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats.expirations, 1)
+        self.assertEqual(cache.stats.misses, 1)
+
+
+class TestSQLiteBackend(unittest.TestCase):
+    """Tests for the SQLite backend."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "cache.sqlite3")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_shared_between_instances(self):
+        writer = SQLiteBackend(self.db_path)
+        writer.set("key", {"experience": [1, 2]})
+        reader = SQLiteBackend(self.db_path)
+        self.assertEqual(reader.get("key"), {"experience": [1, 2]})
+        self.assertEqual(reader.stats.hits, 1)
+
+    def test_prune_limits_entries(self):
+        cache = SQLiteBackend(self.db_path, max_entries=3, prune_interval=1000)
+        for i in range(6):
+            cache.set(f"k{i}", i)
+        cache.prune()
+        self.assertEqual(cache.summary()['entries'], 3)
+        self.assertIsNone(cache.get("k0"))
+        self.assertEqual(cache.get("k5"), 5)
+
+    def test_connections_per_thread_and_reopened_after_fork(self):
+        connection = thread_local_connection(self.db_path, isolation_level=None)
+        conn = connection()
+        self.assertIs(connection(), conn)
+        self.assertIsNone(conn.isolation_level)
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(connection()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], conn)
+        with mock.patch('utils.cache_backends.os.getpid', return_value=os.getpid() + 1):
+            self.assertIsNot(connection(), conn)
+
+
+class TestTieredCache(unittest.TestCase):
+    """Tests for the tiered cache and LLM cache keys."""
+
+    def test_slow_tier_hit_promotes_to_fast_tier(self):
+        fast = MemoryLRUBackend()
+        slow = MemoryLRUBackend()
+        cache = TieredCache([fast, slow])
+        slow.set("k", "v")
+        self.assertEqual(cache.get("k"), "v")
+        self.assertEqual(fast.get("k"), "v")
+        self.assertEqual(cache.stats.hits, 1)
+
+    def test_cache_key_depends_on_all_inputs(self):
+        base = make_cache_key("claude", "m", "prompt", 0.7, "sys")
+        self.assertEqual(base, make_cache_key("Claude", "m", "prompt", 0.7, "sys"))
+        self.assertNotEqual(base, make_cache_key("openai", "m", "prompt", 0.7, "sys"))
+        self.assertNotEqual(base, make_cache_key("claude", "m", "prompt", 0.3, "sys"))
+        self.assertNotEqual(base, make_cache_key("claude", "m", "prompt!", 0.7, "sys"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+import threading
+import sys
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from claude_api_logger import ClaudeAPILogger
+
+
+class TestClaudeAPILogger(unittest.TestCase):
+    """Tests for the append-only JSONL API call log."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _logger(self, **kwargs):
+        kwargs.setdefault('background_writer', False)
+        kwargs.setdefault('flush_interval', 3600)
+        return ClaudeAPILogger(log_dir=self.temp_dir, **kwargs)
+
+    def test_entries_buffered_until_batch_is_full(self):
+        logger = self._logger(batch_size=3)
+        logger.log_api_call({'prompt': 'a'}, {'text': 'b'}, 'r1', 'summary')
+        logger.log_api_call({'prompt': 'a'}, {'text': 'b'}, 'r1', 'skills')
+        self.assertFalse(os.path.exists(logger.log_file))
+
+        logger.log_api_call({'prompt': 'a'}, {'text': 'b'}, 'r2', 'summary', token_usage={'input': 5})
+        with open(logger.log_file, encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual([entry['section'] for entry in lines], ['summary', 'skills', 'summary'])
+        self.assertEqual(lines[2]['token_usage'], {'input': 5})
+
+    def test_rotates_by_size_and_filters_across_segments(self):
+        logger = self._logger(batch_size=1, max_bytes=200)
+        for i in range(6):
+            logger.log_api_call({'prompt': 'x' * 100}, {}, f"r{i % 2}", 'experience' if i < 3 else 'skills')
+
+        self.assertGreater(len(logger.segments()), 1)
+        self.assertEqual(len(logger.get_logs()), 6)
+        self.assertEqual(len(logger.get_logs(resume_id='r0')), 3)
+        self.assertEqual(len(logger.get_logs(resume_id='r1', section='skills')), 2)
+        self.assertEqual(len(logger.get_logs(limit=2)), 2)
+
+    def test_reads_legacy_json_array_logs(self):
+        with open(os.path.join(self.temp_dir, 'claude_api_log_2025-04-13.json'), 'w') as f:
+            json.dump([{'resume_id': 'old', 'section': 'summary'}], f)
+        logger = self._logger()
+        logger.log_api_call({}, {}, 'new', 'summary')
+        self.assertEqual([entry['resume_id'] for entry in logger.get_logs()], ['old', 'new'])
+
+    def test_background_writer_flushes_concurrent_calls(self):
+        logger = self._logger(background_writer=True, batch_size=5, flush_interval=0.05)
+        threads = [threading.Thread(target=lambda n=n: [logger.log_api_call({}, {}, n, 's') for _ in range(20)])
+                   for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(logger.get_logs()), 80)
+
+
+if __name__ == '__main__':
+    unittest.main()
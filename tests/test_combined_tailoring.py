@@ -0,0 +1,108 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+import sys
+from unittest import mock
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+
+import claude_integration
+from claude_integration import build_combined_tailoring_prompt, parse_combined_response
+from utils.cache_backends import DisabledCache
+from utils.fake_llm import FakeLLMProvider
+
+JOB_DATA = {'job_title': 'Data Engineer', 'company': 'Acme',
+            'requirements': ['Python', 'SQL'], 'skills': ['Airflow']}
+SECTIONS = {'contact': 'Jane Doe\njane@example.com', 'summary': 'Engineer',
+            'experience': [{'company': 'Acme', 'position': 'Engineer', 'achievements': ['Shipped it']}],
+            'education': 'BS Computer Science', 'skills': 'Python, SQL', 'projects': 'Pipeline rewrite'}
+EXPERIENCE = [{'company': 'Acme', 'position': 'Engineer', 'achievements': ['- Shipped 3 services']}]
+
+
+class TestCombinedResponseValidation(unittest.TestCase):
+    """Each section of a combined reply is validated on its own."""
+
+    def test_invalid_sections_are_left_out(self):
+        reply = '```json\n' + json.dumps({'experience': EXPERIENCE, 'skills': {'technical': ['Python']},
+                                          'education': 'not a list', 'summary': '  '}) + '\n```'
+        parsed = parse_combined_response(reply, ['experience', 'skills', 'education', 'summary', 'projects'])
+        self.assertEqual(set(parsed), {'experience', 'skills'})
+
+    def test_truncated_reply_keeps_complete_sections(self):
+        reply = json.dumps({'summary': 'Tailored summary', 'experience': EXPERIENCE,
+                            'projects': [{'title': 'Pipeline', 'details': ['Rebuilt ingestion']}]})
+        truncated = reply[:reply.index('Rebuilt')]
+        parsed = parse_combined_response(truncated, ['summary', 'experience', 'projects'])
+        self.assertEqual(parsed, {'summary': 'Tailored summary', 'experience': EXPERIENCE})
+        self.assertEqual(parse_combined_response('no json here', ['summary']), {})
+
+    def test_prompt_sends_job_context_once(self):
+        prompt = build_combined_tailoring_prompt(
+            {name: SECTIONS[name] for name in ('summary', 'experience', 'skills')}, JOB_DATA)
+        self.assertEqual(prompt.text.count('JOB REQUIREMENTS:'), 1)
+        self.assertIn('exactly these keys: "summary", "experience", "skills"', prompt.prefix)
+        self.assertNotIn('Acme', prompt.prefix)
+
+
+class TestCombinedTailoring(unittest.TestCase):
+    """Combined mode makes one provider call and re-asks only for failed sections."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.app = Flask(__name__)
+        self.app.config['UPLOAD_FOLDER'] = self.temp_dir
+        patchers = [
+            mock.patch.object(claude_integration, 'get_llm_response_cache',
+                              return_value=DisabledCache('llm_responses')),
+            mock.patch.object(claude_integration, 'extract_resume_sections',
+                              lambda path: json.loads(json.dumps(SECTIONS))),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _tailor(self, fake, combined):
+        with self.app.app_context(), fake.install():
+            tailored, _ = claude_integration.tailor_resume_with_llm(
+                'resume.docx', JOB_DATA, 'fake-key', 'openai', request_id='req',
+                concurrent=False, combined=combined)
+        return tailored
+
+    def test_one_call_replaces_per_section_calls(self):
+        per_section, combined = FakeLLMProvider(latency_ms=0), FakeLLMProvider(latency_ms=0)
+        separate = self._tailor(per_section, combined=False)
+        together = self._tailor(combined, combined=True)
+
+        self.assertEqual(per_section.stats['calls'], 5)
+        self.assertEqual(combined.stats['calls'], 1)
+        self.assertLess(combined.stats['input_tokens'], per_section.stats['input_tokens'])
+        self.assertEqual(list(together), list(separate))
+        self.assertIsInstance(together['experience'], list)
+        self.assertIn('technical', together['skills'])
+
+    def test_failed_sections_fall_back_to_their_own_call(self):
+        fake = FakeLLMProvider(latency_ms=0)
+        partial = {'skills': {'technical': ['Python']}, 'summary': 'Tailored summary'}
+        with mock.patch.object(claude_integration.OpenAIClient, 'tailor_sections_combined',
+                               return_value=partial) as combined_call:
+            tailored = self._tailor(fake, combined=True)
+
+        self.assertEqual(set(combined_call.call_args[0][0]),
+                         {'summary', 'experience', 'education', 'skills', 'projects'})
+        # experience, education and projects are re-asked one at a time
+        self.assertEqual(fake.stats['calls'], 3)
+        self.assertEqual(tailored['skills'], {'technical': ['Python']})
+        self.assertEqual(tailored['summary'], 'Tailored summary')
+        self.assertIsInstance(tailored['projects'], list)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import os
+import contextvars
+import threading
+import time
+import sys
+from unittest import mock
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import claude_integration
+from config import Config
+
+
+class TestSectionDeadline(unittest.TestCase):
+    """A tailoring batch has one deadline for slot waits and LLM calls."""
+
+    def setUp(self):
+        patchers = [
+            mock.patch.object(Config, 'TAILORING_SECTION_TIMEOUT_SECONDS', 5),
+            mock.patch.object(claude_integration, '_get_provider_semaphore',
+                              return_value=threading.BoundedSemaphore(1)),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_sections_waiting_for_a_slot_share_the_batch_deadline(self):
+        deadlines = {}
+
+        def job(name):
+            def run():
+                time.sleep(0.05)
+                deadlines[name] = claude_integration._call_deadline.get()
+                return {'content': f'tailored {name}'}
+            return run
+
+        start = time.monotonic()
+        results = claude_integration._run_section_jobs_concurrently(
+            {'summary': job('summary'), 'skills': job('skills')}, {}, 'openai')
+
+        self.assertEqual(results['skills'], {'content': 'tailored skills'})
+        # The section that waited for the slot did not get a fresh timeout
+        self.assertEqual(deadlines['summary'], deadlines['skills'])
+        self.assertAlmostEqual(deadlines['summary'], start + 5, delta=0.5)
+        self.assertIsNone(claude_integration._call_deadline.get())
+
+    def test_deadline_is_the_http_timeout(self):
+        llm_client = claude_integration.LLMClient('fake-key')
+        llm_client.client = mock.Mock()
+        retry_free = llm_client.client.with_options.return_value
+
+        def send(deadline):
+            claude_integration._call_deadline.set(deadline)
+            return llm_client._sdk_client()
+
+        self.assertIs(llm_client._sdk_client(), retry_free)
+        contextvars.copy_context().run(send, time.monotonic() + 5)
+        timeout = retry_free.with_options.call_args.kwargs['timeout']
+        self.assertTrue(4 < timeout <= 5)
+        with self.assertRaises(TimeoutError):
+            contextvars.copy_context().run(send, time.monotonic() - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
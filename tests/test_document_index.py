@@ -0,0 +1,90 @@
+import unittest
+import os
+import sys
+from datetime import datetime
+from unittest import mock
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from docx.shared import Pt
+
+from utils.document_index import analyze_document
+from utils.docx_builder import _cleanup_bullet_direct_formatting
+from utils.o3_bullet_core_engine import BulletMetadata, BulletState, O3BulletCoreEngine
+
+
+def _make_document():
+    """Header, two MR_BulletPoint bullets (one numbered, one with a direct indent) and a table bullet"""
+    doc = Document()
+    doc.styles.add_style('MR_BulletPoint', 1)
+    doc.add_paragraph('Experience', style='Heading 2')
+    numbered = doc.add_paragraph('Shipped the billing service', style='MR_BulletPoint')
+    numbered._p.get_or_add_pPr().append(parse_xml(
+        f'<w:numPr {nsdecls("w")}><w:ilvl w:val="0"/><w:numId w:val="7"/></w:numPr>'))
+    indented = doc.add_paragraph('Cut CI time in half', style='MR_BulletPoint')
+    indented.paragraph_format.left_indent = Pt(12)
+    doc.add_table(rows=1, cols=1).cell(0, 0).add_paragraph('Table bullet', style='MR_BulletPoint')
+    return doc
+
+
+class TestDocumentIndex(unittest.TestCase):
+    """One analysis pass records bullets, numbering, indents and headers."""
+
+    def test_analysis_snapshot(self):
+        index = analyze_document(_make_document())
+        bullets = index.bullets()
+        self.assertEqual([entry.paragraph.text for entry in bullets],
+                         ['Shipped the billing service', 'Cut CI time in half', 'Table bullet'])
+        self.assertEqual([entry.body_index for entry in bullets], [1, 2, None])
+        self.assertEqual((bullets[0].num_id, bullets[0].level), ('7', 0))
+        self.assertTrue(bullets[0].has_valid_numbering)
+        self.assertEqual([entry.paragraph.text for entry in index.missing_numbering()],
+                         ['Cut CI time in half', 'Table bullet'])
+        self.assertEqual([entry.paragraph.text for entry in index.direct_formatting()], ['Cut CI time in half'])
+        self.assertEqual(index.header_positions, [0])
+        self.assertEqual(len(index.bullets(body_only=True)), 2)
+
+    def test_style_names_are_not_resolved_per_paragraph(self):
+        doc = _make_document()
+        with mock.patch('docx.text.paragraph.Paragraph.style', new_callable=mock.PropertyMock) as style:
+            analyze_document(doc)
+        style.assert_not_called()
+
+    def test_cleanup_rereads_indents_through_the_index(self):
+        doc = _make_document()
+        index = analyze_document(doc)
+        doc.paragraphs[1].paragraph_format.first_line_indent = Pt(-6)
+        self.assertEqual(_cleanup_bullet_direct_formatting(doc, index), 2)
+        self.assertEqual(analyze_document(doc).direct_formatting(), [])
+
+    def test_o3_reconcile_and_validate_use_the_index(self):
+        doc = _make_document()
+        engine = O3BulletCoreEngine('doc-index-test')
+        numbering_engine = mock.Mock()
+        numbering_engine.apply_native_bullet.side_effect = lambda para, num_id, level: \
+            para._p.get_or_add_pPr().append(parse_xml(
+                f'<w:numPr {nsdecls("w")}><w:ilvl w:val="{level}"/><w:numId w:val="{num_id}"/></w:numPr>'))
+        index = analyze_document(doc)
+
+        results = engine.reconcile_document_bullets(doc, numbering_engine, index)
+
+        # Only the body bullet without numbering is repaired; the second pass finds nothing to do
+        self.assertEqual(results['bullets_repaired'], 1)
+        self.assertEqual(results['bullets_processed'], 4)
+        self.assertEqual(results['success_rate'], 100.0)
+        for bullet_id, text in (('b0', 'Cut CI time in half'), ('b1', 'Never rendered')):
+            engine.bullet_registry[bullet_id] = BulletMetadata(
+                paragraph_id=bullet_id, text_content=text, num_id=7, abstract_num_id=7, level=0,
+                style_name='MR_BulletPoint', state=BulletState.PENDING, created_at=datetime.now())
+        validation = engine.validate_document_bullets(doc, index)
+        self.assertEqual(validation['validated_bullets'], 1)
+        self.assertEqual([issue['bullet_id'] for issue in validation['validation_issues']], ['b1'])
+        self.assertTrue(validation['needs_reconciliation'])
+
+
+if __name__ == '__main__':
+    unittest.main()
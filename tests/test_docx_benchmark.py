@@ -0,0 +1,57 @@
+import unittest
+import os
+import shutil
+import tempfile
+import sys
+from unittest import mock
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import tracing
+from utils.tracing import SpanRecorder
+from tools.benchmark_docx import check_regressions, parse_sizes, run_benchmark, synthetic_sections
+
+
+class TestDocxBenchmark(unittest.TestCase):
+    """The DOCX benchmark times build phases and gates on a baseline."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        patcher = mock.patch.object(tracing, 'get_tracer', return_value=SpanRecorder())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_synthetic_sections_spread_bullets(self):
+        experience = synthetic_sections(3, 10)['experience']
+        self.assertEqual([len(job['achievements']) for job in experience], [4, 3, 3])
+        self.assertEqual(parse_sizes("1x10, 200X5000"), [(1, 10), (200, 5000)])
+
+    def test_build_phases_are_recorded(self):
+        size = run_benchmark([(2, 4)], 1, self.temp_dir)['2x4']
+        self.assertEqual(size['runs'], 1)
+        self.assertGreater(size['bytes'], 0)
+        for phase in ('load', 'base_document', 'experience', 'section_spacing', 'reconciliation', 'save'):
+            self.assertIn(phase, size['phases'])
+        self.assertGreaterEqual(size['phases']['bullet']['count'], 4)
+        self.assertLessEqual(sum(size['phases'][phase]['total_ms'] for phase in ('load', 'base_document', 'experience')),
+                             size['total_ms'])
+
+    def test_regression_gate(self):
+        def result(total, experience, save):
+            return {'sizes': {'10x100': {'total_ms': total, 'phases': {
+                'experience': {'total_ms': experience}, 'save': {'total_ms': save}}}}}
+
+        baseline = result(1000.0, 800.0, 1.0)
+        self.assertEqual(check_regressions(result(1050.0, 820.0, 3.0), baseline), [])
+        regressions = check_regressions(result(1400.0, 1200.0, 3.0), baseline)
+        self.assertEqual([(r[0], r[1]) for r in regressions], [('10x100', 'total'), ('10x100', 'experience')])
+        skipped = {'sizes': {'10x100': {'skipped': True}}}
+        self.assertEqual(check_regressions(result(1400.0, 1200.0, 3.0), skipped), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 import os
 import json
+import shutil
 import zipfile
 import tempfile
 from io import BytesIO
@@ -11,7 +12,13 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Now we can import our modules
-from utils.docx_builder import build_docx, load_section_json
+from docx import Document
+from docx.oxml.ns import qn
+from docx.shared import Pt
+from utils.docx_builder import build_docx, load_section_json, add_section_header, tighten_before_headers
+from utils.session_store import get_session_store
+from tools.benchmark_docx import synthetic_sections
+from style_engine import StyleEngine
 from style_manager import StyleManager
 
 class TestDOCXBuilder(unittest.TestCase):
@@ -131,5 +138,50 @@ class TestDOCXBuilder(unittest.TestCase):
             os.remove(os.path.join(self.temp_dir, file))
         os.rmdir(self.temp_dir)
 
+
+class TestTightenBeforeHeaders(unittest.TestCase):
+    """Tests for the spacing pass before section headers."""
+    
+    def test_only_paragraphs_before_later_headers_are_tightened(self):
+        doc = Document()
+        StyleEngine.create_docx_custom_styles(doc)
+        add_section_header(doc, "Experience")
+        bullet = doc.add_paragraph("Built things")
+        bullet.paragraph_format.space_after = Pt(6)
+        keyword_para = doc.add_paragraph("Improved customer experience and skills")
+        keyword_para.paragraph_format.space_after = Pt(6)
+        doc.add_paragraph("")
+        add_section_header(doc, "Education")
+        doc.add_paragraph("State University")
+        
+        self.assertEqual(tighten_before_headers(doc), 1)
+        
+        texts = [p.text for p in doc.paragraphs]
+        self.assertNotIn("", texts[:-1])
+        # The keyword paragraph is body text, so the bullet before it keeps its spacing
+        self.assertEqual(bullet.paragraph_format.space_after, Pt(6))
+        self.assertEqual(keyword_para.paragraph_format.space_after, Pt(0))
+        self.assertIsNone(keyword_para.paragraph_format.space_before)
+
+    def test_built_document_has_no_space_before_any_section_header(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, True)
+        get_session_store(temp_dir).save_sections('req', synthetic_sections(2, 3))
+        doc = Document(build_docx('req', temp_dir))
+        
+        # Headers are found by their text, not the style IDs or borders the pass matches on
+        header_texts = {"PROFESSIONAL SUMMARY", "EXPERIENCE", "EDUCATION", "SKILLS", "PROJECTS"}
+        body = list(doc.element.body.iterchildren())
+        header_indexes = [i for i, element in enumerate(body)
+                          if element.tag == qn('w:p') and element.xpath('string(.)').strip() in header_texts]
+        self.assertGreaterEqual(len(header_indexes), 4)
+        
+        for index in header_indexes[1:]:
+            before = body[index - 1]
+            self.assertEqual(before.tag, qn('w:p'))
+            spacing = before.find(qn('w:pPr') + '/' + qn('w:spacing'))
+            self.assertIsNotNone(spacing, f"no spacing before {body[index].xpath('string(.)')}")
+            self.assertEqual(spacing.get(qn('w:after')), '0')
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
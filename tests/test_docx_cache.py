@@ -0,0 +1,73 @@
+import unittest
+import os
+import sys
+from io import BytesIO
+from unittest import mock
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import docx_cache
+from utils.cache_backends import MemoryLRUBackend
+from utils.docx_cache import docx_fingerprint, get_cached_docx
+from utils.session_store import SessionDataStore
+
+
+class TestDocxCache(unittest.TestCase):
+    """Tests for the rendered DOCX cache."""
+
+    def setUp(self):
+        self._saved_cache = docx_cache._docx_cache
+        docx_cache._docx_cache = MemoryLRUBackend(max_entries=None, max_bytes=1024)
+        self.sections = {'summary': {'content': 'Platform engineer.'}}
+        self.builds = 0
+
+    def tearDown(self):
+        docx_cache._docx_cache = self._saved_cache
+
+    def build(self):
+        self.builds += 1
+        return BytesIO(b'docx-bytes')
+
+    def test_repeat_download_skips_build(self):
+        first, etag, hit = get_cached_docx('req', self.sections, self.build)
+        self.assertFalse(hit)
+        second, second_etag, hit = get_cached_docx('req', self.sections, self.build)
+        self.assertTrue(hit)
+        self.assertEqual((first, etag), (second, second_etag))
+        self.assertEqual(self.builds, 1)
+
+    def test_fingerprint_tracks_request_and_sections(self):
+        base = docx_fingerprint('req', self.sections)
+        self.assertEqual(base, docx_fingerprint('req', {'summary': {'content': 'Platform engineer.'}}))
+        self.assertNotEqual(base, docx_fingerprint('other', self.sections))
+        self.assertNotEqual(base, docx_fingerprint('req', {'summary': {'content': 'Changed.'}}))
+
+    def test_cache_is_bounded_by_bytes(self):
+        for i in range(5):
+            get_cached_docx(f'req{i}', self.sections, lambda: BytesIO(b'x' * 400))
+        self.assertLessEqual(docx_cache._docx_cache.total_bytes, 1024)
+
+
+class TestDocxDownload(unittest.TestCase):
+    """A download whose ETag the client already holds is answered before any build."""
+
+    def test_matching_etag_skips_cache_and_build(self):
+        import app as app_module
+
+        sections = {'summary': {'content': 'Platform engineer.'}}
+        etag = docx_fingerprint('req', sections)
+        store = mock.Mock(spec=SessionDataStore)
+        store.load_sections.return_value = sections
+        with mock.patch('utils.session_store.get_session_store', return_value=store), \
+                mock.patch.object(docx_cache, 'get_cached_docx') as cached:
+            response = app_module.app.test_client().get('/download/docx/req',
+                                                        headers={'If-None-Match': f'"{etag}"'})
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers['ETag'], f'"{etag}"')
+        cached.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
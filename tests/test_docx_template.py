@@ -0,0 +1,92 @@
+import unittest
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+import sys
+from unittest import mock
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from docx import Document
+
+from utils import docx_template
+from utils.cache_backends import DisabledCache, MemoryLRUBackend
+from utils.docx_builder import build_docx
+from utils.session_store import get_session_store
+from tools.benchmark_docx import synthetic_sections
+
+STYLES = {'page': {'marginTopCm': 1.0}}
+
+
+class TestStyledTemplate(unittest.TestCase):
+    """The styled base document is prepared once and cloned per build."""
+
+    def setUp(self):
+        self.cache = MemoryLRUBackend(max_entries=4)
+        patcher = mock.patch.object(docx_template, 'get_template_cache', return_value=self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.prepared = 0
+
+    def _prepare(self):
+        self.prepared += 1
+        doc = Document()
+        doc.styles.add_style('MR_BulletPoint', 1)
+        return doc, (5100, 5100)
+
+    def test_clones_are_independent_copies(self):
+        first, ids, hit = docx_template.get_styled_document(STYLES, self._prepare)
+        self.assertFalse(hit)
+        first.add_paragraph('only in the first build')
+
+        second, second_ids, hit = docx_template.get_styled_document(STYLES, self._prepare)
+        self.assertTrue(hit)
+        self.assertEqual(self.prepared, 1)
+        self.assertEqual(second_ids, (5100, 5100))
+        self.assertIn('MR_BulletPoint', [style.name for style in second.styles])
+        self.assertEqual([p.text for p in second.paragraphs], [])
+
+    def test_style_changes_prepare_a_new_template(self):
+        docx_template.get_styled_document(STYLES, self._prepare)
+        docx_template.get_styled_document({'page': {'marginTopCm': 2.0}}, self._prepare)
+        with mock.patch.object(docx_template, 'style_fingerprint', return_value='new-tokens'):
+            docx_template.get_styled_document(STYLES, self._prepare)
+        self.assertEqual(self.prepared, 3)
+
+    def test_disabled_cache_prepares_every_time(self):
+        with mock.patch.object(docx_template, 'get_template_cache', return_value=DisabledCache('docx_template')):
+            for _ in range(2):
+                docx_template.get_styled_document(STYLES, self._prepare)
+        self.assertEqual(self.prepared, 2)
+
+
+class TestBuildFromTemplate(unittest.TestCase):
+    """Builds cloned from the template keep their bullet numbering definition."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        get_session_store(self.temp_dir).save_sections('req', synthetic_sections(2, 4))
+        patcher = mock.patch.object(docx_template, 'get_template_cache',
+                                    return_value=MemoryLRUBackend(max_entries=4))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_repeat_builds_reference_defined_numbering(self):
+        for _ in range(2):
+            archive = zipfile.ZipFile(build_docx('req', self.temp_dir))
+            document = archive.read('word/document.xml').decode('utf-8')
+            numbering = archive.read('word/numbering.xml').decode('utf-8')
+            used = set(re.findall(r'<w:numId w:val="(\d+)"/>', document))
+            defined = set(re.findall(r'<w:num w:numId="(\d+)"', numbering))
+            self.assertTrue(used)
+            self.assertLessEqual(used, defined)
+
+
+if __name__ == '__main__':
+    unittest.main()
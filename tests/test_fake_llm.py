@@ -0,0 +1,82 @@
+import unittest
+import os
+import shutil
+import tempfile
+import sys
+from unittest import mock
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+
+import claude_integration
+from utils.cache_backends import DisabledCache
+from utils.fake_llm import FakeLLMError, FakeLLMProvider
+from tools.benchmark_pipeline import compare_results
+
+JOB_DATA = {'job_title': 'Data Engineer', 'company': 'Acme',
+            'requirements': ['Python', 'SQL'], 'skills': ['Airflow']}
+
+
+class TestFakeLLMProvider(unittest.TestCase):
+    """The fake provider answers the real tailoring clients with parsable replies."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.app = Flask(__name__)
+        self.app.config['UPLOAD_FOLDER'] = self.temp_dir
+        patcher = mock.patch.object(claude_integration, 'get_llm_response_cache',
+                                    return_value=DisabledCache('llm_responses'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_sections_parse_for_both_providers(self):
+        fake = FakeLLMProvider(latency_ms=0)
+        with self.app.app_context(), fake.install():
+            for client in (claude_integration.ClaudeClient('fake-key'),
+                           claude_integration.OpenAIClient('fake-key')):
+                experience = client.tailor_resume_content('experience', 'Acme | Engineer', JOB_DATA)
+                self.assertEqual(len(experience), 3)
+                self.assertEqual(len(experience[0]['achievements']), 4)
+                self.assertIn('technical', client.tailor_resume_content('skills', 'Python', JOB_DATA))
+                self.assertIsInstance(client.tailor_resume_content('summary', 'Engineer', JOB_DATA), str)
+        self.assertEqual(fake.stats['calls'], 6)
+        self.assertGreater(fake.stats['output_tokens'], 0)
+
+    def test_replies_are_deterministic_and_scaled(self):
+        small, large = FakeLLMProvider(latency_ms=0), FakeLLMProvider(latency_ms=0, response_scale=3)
+        prompt = 'Return JSON:\n{\n  "experience": [\n'
+        self.assertEqual(small.complete(prompt), small.complete(prompt))
+        self.assertGreater(len(large.complete(prompt)[0]), 2 * len(small.complete(prompt)[0]))
+
+    def test_failure_injection(self):
+        fake = FakeLLMProvider(latency_ms=0, failure_rate=1.0)
+        with self.assertRaises(FakeLLMError):
+            fake.complete('anything')
+        self.assertEqual(fake.stats['failures'], 1)
+
+
+class TestBenchmarkComparison(unittest.TestCase):
+    """Regressions are flagged against the threshold in the right direction."""
+
+    def _result(self, rps, p95, stage_p95):
+        return {'throughput': {'requests_per_second': rps},
+                'latency': {'p50_ms': p95 / 2, 'p95_ms': p95, 'p99_ms': p95},
+                'stages': {'build_docx': {'p95_ms': stage_p95}},
+                'memory': {'peak_rss_mb': 100.0}}
+
+    def test_compare_results(self):
+        rows = {row[0]: row for row in compare_results(self._result(8.0, 100.0, 50.0),
+                                                       self._result(10.0, 100.0, 40.0), threshold_pct=10)}
+        self.assertTrue(rows['requests_per_second'][4])
+        self.assertEqual(rows['requests_per_second'][3], -20.0)
+        self.assertFalse(rows['request.p95_ms'][4])
+        self.assertTrue(rows['build_docx.p95_ms'][4])
+
+
+if __name__ == '__main__':
+    unittest.main()
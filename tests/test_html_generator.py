@@ -0,0 +1,58 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+import sys
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from html_generator import render_preview_from_llm_responses, generate_preview_from_llm_responses
+
+
+class TestPreviewRender(unittest.TestCase):
+    """Tests for the single-pass preview render."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.request_id = "preview_request"
+        session_dir = os.path.join(self.temp_dir, 'temp_session_data')
+        os.makedirs(session_dir)
+        sections = {
+            'contact': {'content': 'Jane Doe\njane@example.com'},
+            'summary': {'content': 'Platform engineer.'},
+            'experience': [{'company': 'Acme', 'position': 'Engineer', 'achievements': ['Shipped it']}],
+            'skills': {'technical': ['Python']},
+        }
+        for name, data in sections.items():
+            with open(os.path.join(session_dir, f'{self.request_id}_{name}.json'), 'w') as f:
+                json.dump(data, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_print_document_is_built_lazily(self):
+        preview = render_preview_from_llm_responses(self.request_id, self.temp_dir)
+        self.assertIn('Acme', preview.screen_html)
+        self.assertNotIn('print_html', preview.__dict__)
+
+        self.assertTrue(preview.print_html.startswith('<!DOCTYPE html>'))
+        self.assertIn('Platform engineer.', preview.print_body_html)
+        self.assertFalse(preview.print_body_html.startswith('<body'))
+
+    def test_wrapper_matches_render(self):
+        preview = render_preview_from_llm_responses(self.request_id, self.temp_dir)
+        self.assertEqual(generate_preview_from_llm_responses(self.request_id, self.temp_dir, for_screen=True),
+                         preview.screen_html)
+        self.assertEqual(generate_preview_from_llm_responses(self.request_id, self.temp_dir, for_screen=False),
+                         preview.print_html)
+
+    def test_missing_session_directory(self):
+        preview = render_preview_from_llm_responses(self.request_id, os.path.join(self.temp_dir, 'missing'))
+        self.assertIn('Temporary session data directory not found', preview.screen_html)
+        self.assertIn('<title>Error</title>', preview.print_html)
+
+
+if __name__ == '__main__':
+    unittest.main()
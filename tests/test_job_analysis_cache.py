@@ -0,0 +1,67 @@
+import unittest
+import os
+import shutil
+import tempfile
+import sys
+from unittest import mock
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import llm_job_analyzer
+from utils.job_analysis_cache import get_job_analysis_cache, make_job_analysis_cache_key
+
+
+class TestJobAnalysisCache(unittest.TestCase):
+    """Tests for the content-keyed job analysis cache."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.analysis = {
+            'candidate_profile': 'Senior backend engineer',
+            'hard_skills': ['Python', 'PostgreSQL'],
+            'soft_skills': ['Communication'],
+            'ideal_candidate': 'Ships reliable services',
+            'metadata': {'analyzed': True, 'provider': 'openai'},
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_key_depends_on_content_not_whitespace(self):
+        key = make_job_analysis_cache_key('Engineer', 'Acme', 'Build  APIs\n\nin Python', 'openai', 'gpt-4o', 'v1')
+        self.assertEqual(key, make_job_analysis_cache_key(' Engineer', 'Acme', 'Build APIs in Python ', 'OpenAI', 'gpt-4o', 'v1'))
+        self.assertNotEqual(key, make_job_analysis_cache_key('Engineer', 'Acme', 'Build APIs in Go', 'openai', 'gpt-4o', 'v1'))
+        self.assertNotEqual(key, make_job_analysis_cache_key('Engineer', 'Acme', 'Build APIs in Python', 'openai', 'gpt-4o', 'v2'))
+        self.assertNotEqual(key, make_job_analysis_cache_key('Engineer', 'Acme', 'Build APIs in Python', 'claude', 'gpt-4o', 'v1'))
+
+    def test_analysis_runs_once_per_posting(self):
+        with mock.patch.object(llm_job_analyzer, 'OPENAI_AVAILABLE', True), \
+                mock.patch.object(llm_job_analyzer, 'analyze_with_openai', return_value=self.analysis) as analyze:
+            first = llm_job_analyzer.analyze_job_with_llm('Engineer', 'Acme', 'Build APIs', 'key',
+                                                          provider='openai', cache_dir=self.temp_dir)
+            second = llm_job_analyzer.analyze_job_with_llm('Engineer', 'Acme', 'Build   APIs', 'key',
+                                                           provider='openai', cache_dir=self.temp_dir)
+            third = llm_job_analyzer.analyze_job_with_llm('Engineer', 'Acme', 'Build UIs', 'key',
+                                                          provider='openai', cache_dir=self.temp_dir)
+
+        self.assertEqual(analyze.call_count, 2)
+        self.assertNotIn('retrieved_from_cache', first['metadata'])
+        self.assertTrue(second['metadata']['retrieved_from_cache'])
+        self.assertEqual(second['hard_skills'], ['Python', 'PostgreSQL'])
+        self.assertNotIn('retrieved_from_cache', third['metadata'])
+
+        stats = get_job_analysis_cache(self.temp_dir).summary()['stats']
+        self.assertEqual((stats['hits'], stats['misses']), (1, 2))
+
+    def test_errors_are_not_cached(self):
+        with mock.patch.object(llm_job_analyzer, 'OPENAI_AVAILABLE', True), \
+                mock.patch.object(llm_job_analyzer, 'analyze_with_openai', return_value={'error': 'boom'}) as analyze:
+            for _ in range(2):
+                llm_job_analyzer.analyze_job_with_llm('Engineer', 'Acme', 'Build APIs', 'key',
+                                                      provider='openai', cache_dir=self.temp_dir)
+        self.assertEqual(analyze.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import os
+import shutil
+import tempfile
+import time
+import sys
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tailoring_worker import purge_finished_jobs
+from utils.job_queue import SQLiteJobQueue, QUEUED, RUNNING, SUCCEEDED, FAILED
+
+
+class TestSQLiteJobQueue(unittest.TestCase):
+    """Tests for the SQLite-backed tailoring job queue."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "jobs.sqlite3")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_claims_by_priority_then_fifo(self):
+        queue = SQLiteJobQueue(self.db_path)
+        queue.enqueue("low", "tailor_resume", {}, priority=0)
+        queue.enqueue("high", "tailor_resume", {}, priority=5)
+        queue.enqueue("low2", "tailor_resume", {}, priority=0)
+
+        self.assertEqual(queue.queue_position("low2"), 2)
+        self.assertEqual([queue.claim("w").id for _ in range(3)], ["high", "low", "low2"])
+        self.assertIsNone(queue.claim("w"))
+
+    def test_provider_limit_skips_to_other_provider(self):
+        queue = SQLiteJobQueue(self.db_path, provider_limits={"openai": 1})
+        queue.enqueue("a1", "tailor_resume", {}, provider="openai")
+        queue.enqueue("a2", "tailor_resume", {}, provider="openai")
+        queue.enqueue("c1", "tailor_resume", {}, provider="claude")
+
+        self.assertEqual(queue.claim("w1").id, "a1")
+        self.assertEqual(queue.claim("w2").id, "c1")
+        self.assertIsNone(queue.claim("w3"))
+
+        queue.complete("a1", {"provider": "openai"})
+        self.assertEqual(queue.claim("w3").id, "a2")
+        self.assertEqual(queue.get("a1").result, {"provider": "openai"})
+
+    def test_retry_then_fail(self):
+        queue = SQLiteJobQueue(self.db_path)
+        queue.enqueue("job", "tailor_resume", {"x": 1}, max_attempts=2)
+
+        queue.claim("w")
+        self.assertEqual(queue.fail("job", "Rate limit exceeded", backoff_seconds=0), QUEUED)
+        job = queue.claim("w")
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(job.payload, {"x": 1})
+        self.assertEqual(queue.fail("job", "Rate limit exceeded", backoff_seconds=0), FAILED)
+        self.assertEqual(queue.get("job").status, FAILED)
+
+    def test_non_retryable_failure_is_final(self):
+        queue = SQLiteJobQueue(self.db_path)
+        queue.enqueue("job", "tailor_resume", {}, max_attempts=3)
+        queue.claim("w")
+        self.assertEqual(queue.fail("job", "bad key", retryable=False), FAILED)
+
+    def test_expired_lease_is_requeued(self):
+        queue = SQLiteJobQueue(self.db_path, lease_seconds=0.01)
+        queue.enqueue("job", "tailor_resume", {})
+        self.assertEqual(queue.claim("crashed").status, RUNNING)
+        time.sleep(0.02)
+
+        job = queue.claim("w2")
+        self.assertEqual(job.id, "job")
+        self.assertEqual(job.worker_id, "w2")
+        queue.complete("job")
+        self.assertEqual(queue.get("job").status, SUCCEEDED)
+
+    def test_finished_jobs_are_purged_after_retention(self):
+        queue = SQLiteJobQueue(self.db_path)
+        for job_id in ("old_done", "old_failed", "new_done", "waiting"):
+            queue.enqueue(job_id, "tailor_resume", {"resume_filename": "resume.docx"}, max_attempts=1)
+        for job_id in ("old_done", "old_failed", "new_done"):
+            queue.claim("w")
+        queue.complete("old_done")
+        queue.fail("old_failed", "bad key", retryable=False)
+        queue.complete("new_done")
+        queue._connect().execute("UPDATE jobs SET finished_at = ?, created_at = ? WHERE id IN (?, ?, ?)",
+                                 (time.time() - 2 * 3600, time.time() - 2 * 3600,
+                                  "old_done", "old_failed", "waiting"))
+
+        self.assertEqual(purge_finished_jobs(queue, retention_hours=1), 2)
+        self.assertIsNone(queue.get("old_done"))
+        self.assertIsNone(queue.get("old_failed"))
+        self.assertEqual(queue.get("new_done").status, SUCCEEDED)
+        self.assertEqual(queue.get("waiting").status, QUEUED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import os
+import sys
+from unittest import mock
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.llm_client_registry import LLMClientRegistry
+
+
+class TestLLMClientRegistry(unittest.TestCase):
+    """Tests for the shared, connection-pooled LLM client registry."""
+
+    def setUp(self):
+        self.registry = LLMClientRegistry(max_connections=4, max_clients=2)
+
+    def tearDown(self):
+        self.registry.close()
+
+    def test_clients_reused_per_credentials(self):
+        claude = self.registry.get_client('claude', 'key-a')
+        self.assertIs(self.registry.get_client('anthropic', 'key-a'), claude)
+        self.assertIsNot(self.registry.get_client('claude', 'key-b'), claude)
+        self.assertEqual(self.registry.summary()['stats'], {'created': 2, 'reused': 1, 'evicted': 0})
+
+    def test_clients_share_one_http_pool_per_sdk(self):
+        first = self.registry.get_client('openai', 'key-a')
+        second = self.registry.get_client('openai', 'key-a', base_url='https://example.com/v1')
+        self.assertIsNot(first, second)
+        self.assertIs(first._client, second._client)
+        self.assertIs(first._client, self.registry.http_client('openai'))
+
+    def test_verify_runs_once_and_failures_are_not_cached(self):
+        verify = mock.Mock()
+        self.registry.get_client('openai', 'key', verify=verify)
+        self.registry.get_client('openai', 'key', verify=verify)
+        self.assertEqual(verify.call_count, 1)
+
+        with self.assertRaises(RuntimeError):
+            self.registry.get_client('openai', 'bad', verify=mock.Mock(side_effect=RuntimeError('401')))
+        self.assertEqual(self.registry.summary()['clients'], 1)
+
+    def test_least_recently_used_client_evicted(self):
+        first = self.registry.get_client('openai', 'a')
+        self.registry.get_client('openai', 'b')
+        self.registry.get_client('openai', 'c')
+        self.assertIsNot(self.registry.get_client('openai', 'a'), first)
+        self.assertEqual(self.registry.summary()['stats']['evicted'], 2)
+
+    def test_pools_reset_after_fork(self):
+        client = self.registry.get_client('claude', 'key')
+        with mock.patch('utils.llm_client_registry.os.getpid', return_value=os.getpid() + 1):
+            self.assertIsNot(self.registry.get_client('claude', 'key'), client)
+
+    def test_unknown_provider(self):
+        with self.assertRaises(ValueError):
+            self.registry.get_client('gemini', 'key')
+
+
+if __name__ == '__main__':
+    unittest.main()
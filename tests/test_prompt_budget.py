@@ -0,0 +1,110 @@
+import unittest
+import json
+import os
+import sys
+from unittest import mock
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from claude_integration import build_tailoring_prompt
+from config import Config
+from llm_job_analyzer import build_job_analysis_prompt
+from utils.prompt_budget import (TRIM_LINES, TRUNCATION_MARKER, PromptComponent, budget_for,
+                                 count_instruction_tokens, count_tokens, fit_components)
+
+EXPERIENCE = [{'company': 'Acme', 'position': 'Engineer', 'dates': '2020 - 2024',
+               'achievements': [f'Shipped service {i} to production' for i in range(40)]}]
+JOB_DATA = {
+    'job_title': 'Data Engineer', 'company': 'Globex',
+    'requirements': [f'Requirement number {i} for the role' for i in range(60)],
+    'skills': ['Python', 'SQL'],
+    'analysis': {'candidate_profile': 'Senior engineer ' * 40, 'hard_skills': ['Spark'],
+                 'soft_skills': ['Ownership'], 'ideal_candidate': 'Someone who ' * 100},
+}
+
+
+class TestFitComponents(unittest.TestCase):
+    """Components are shrunk lowest priority first, required ones only compacted."""
+
+    def test_prompt_within_budget_is_unchanged(self):
+        components = [PromptComponent('a', 'alpha', required=True),
+                      PromptComponent('b', 'beta gamma', header='\nB:\n')]
+        fitted = fit_components('test', components, fixed_tokens=10, budget=1000)
+        self.assertEqual(fitted.text, 'alpha\nB:\nbeta gamma')
+        self.assertEqual(fitted.trimmed, {})
+        self.assertEqual(fitted.tokens, 10 + count_tokens('alpha') + count_tokens('\nB:\nbeta gamma'))
+
+    def test_lowest_priority_goes_first(self):
+        lines = '\n'.join(f'- item {i}' for i in range(50))
+        components = [PromptComponent('keep', 'x ' * 50, required=True),
+                      PromptComponent('list', lines, priority=2, trim=TRIM_LINES, header='\nLIST:\n'),
+                      PromptComponent('notes', 'note ' * 200, priority=0, header='\nNOTES:\n')]
+        budget = count_tokens('x ' * 50) + count_tokens('\nLIST:\n' + lines) // 2
+        fitted = fit_components('test', components, budget=budget)
+
+        self.assertLessEqual(fitted.tokens, budget)
+        self.assertEqual(fitted.component_text('notes'), '')
+        self.assertNotIn('NOTES', fitted.text)
+        kept = fitted.component_text('list').split('\n')
+        self.assertEqual(kept, [f'- item {i}' for i in range(len(kept))])
+        self.assertLess(len(kept), 50)
+        self.assertEqual(fitted.component_text('keep'), 'x ' * 50)
+
+    def test_tail_trim_marks_the_cut(self):
+        fitted = fit_components('test', [PromptComponent('text', 'word ' * 500)], budget=40)
+        self.assertTrue(fitted.text.startswith('word word'))
+        self.assertTrue(fitted.text.endswith(TRUNCATION_MARKER))
+        self.assertLessEqual(fitted.tokens, 40)
+
+    def test_request_text_is_not_memoized(self):
+        count_instruction_tokens.cache_clear()
+        build_tailoring_prompt('experience', EXPERIENCE, JOB_DATA)
+        memoized = count_instruction_tokens.cache_info().currsize
+        build_tailoring_prompt('experience', [{'company': 'Initech', 'achievements': ['Fixed it']}],
+                               dict(JOB_DATA, company='Umbrella'))
+        # Only the constant prefix and headers are kept, not resume or posting text
+        self.assertEqual(count_instruction_tokens.cache_info().currsize, memoized)
+        self.assertFalse(hasattr(count_tokens, 'cache_info'))
+
+
+class TestTailoringPromptBudget(unittest.TestCase):
+    """Tailoring prompts keep the instructions and resume content and cut job context."""
+
+    def test_job_context_trimmed_before_resume_content(self):
+        full = build_tailoring_prompt('experience', EXPERIENCE, JOB_DATA)
+        budget = count_tokens(full.prefix) + count_tokens(full.suffix) // 2
+        with mock.patch.object(Config, 'PROMPT_TOKEN_BUDGETS', f'experience={budget}'):
+            fitted = build_tailoring_prompt('experience', EXPERIENCE, JOB_DATA)
+
+        self.assertEqual(fitted.prefix, full.prefix)
+        self.assertLess(count_tokens(fitted.suffix), count_tokens(full.suffix))
+        self.assertNotIn('IDEAL CANDIDATE', fitted.suffix)
+        self.assertIn('TARGET POSITION: Data Engineer at Globex', fitted.suffix)
+        self.assertIn('- Requirement number 0 for the role', fitted.suffix)
+        # Compacted, but every achievement is still there
+        original = fitted.suffix.split('```json\n')[1].split('\n```')[0]
+        self.assertEqual(json.loads(original), EXPERIENCE)
+
+    def test_budgets_disabled_only_measure(self):
+        full = build_tailoring_prompt('experience', EXPERIENCE, JOB_DATA)
+        with mock.patch.object(Config, 'USE_PROMPT_BUDGETS', False), \
+                mock.patch.object(Config, 'PROMPT_TOKEN_BUDGETS', 'experience=100'):
+            self.assertIsNone(budget_for('experience'))
+            self.assertEqual(build_tailoring_prompt('experience', EXPERIENCE, JOB_DATA), full)
+        with mock.patch.object(Config, 'PROMPT_TOKEN_BUDGETS', 'skills=1500, bad'):
+            self.assertEqual(budget_for('skills'), 1500)
+            self.assertEqual(budget_for('experience'), 6000)
+
+    def test_long_posting_is_cut_for_job_analysis(self):
+        posting = 'About the role. ' + 'We offer great benefits and perks. ' * 3000
+        with mock.patch.object(Config, 'PROMPT_TOKEN_BUDGETS', 'job_analysis=2000'):
+            prompt = build_job_analysis_prompt('Data Engineer', 'Globex', posting)
+        self.assertLessEqual(count_tokens(prompt), 2000 + 5)
+        self.assertIn('JOB DESCRIPTION:\nAbout the role.', prompt)
+        self.assertIn(TRUNCATION_MARKER, prompt)
+        self.assertIn('"ideal_candidate"', prompt)
+
+
+if __name__ == '__main__':
+    unittest.main()
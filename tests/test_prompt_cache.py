@@ -0,0 +1,112 @@
+import unittest
+import os
+import shutil
+import tempfile
+import sys
+from types import SimpleNamespace
+from unittest import mock
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+
+import claude_integration
+from claude_integration import build_tailoring_prompt
+from config import Config
+from utils.cache_backends import DisabledCache
+from utils.fake_llm import FakeLLMProvider
+from utils.prompt_cache import PromptCacheStats, anthropic_request, cache_usage
+
+EXPERIENCE = [{'company': 'Acme', 'position': 'Engineer', 'achievements': ['Shipped the billing service']}]
+JOBS = [
+    {'job_title': 'Data Engineer', 'company': 'Globex', 'requirements': ['Python'], 'skills': ['SQL']},
+    {'job_title': 'Platform Engineer', 'company': 'Initech', 'requirements': ['Go'], 'skills': ['Kubernetes']},
+]
+
+
+class TestPromptLayout(unittest.TestCase):
+    """Constant instructions come first, request data last."""
+
+    def test_prefix_is_identical_across_requests(self):
+        for section in ('experience', 'education', 'skills', 'projects', 'summary'):
+            first = build_tailoring_prompt(section, EXPERIENCE, JOBS[0])
+            second = build_tailoring_prompt(section, 'Other content', JOBS[1])
+            self.assertEqual(first.prefix, second.prefix)
+            self.assertNotIn('Globex', first.prefix)
+            self.assertIn('Globex', first.suffix)
+
+    def test_anthropic_breakpoint_follows_config(self):
+        prompt = build_tailoring_prompt('experience', EXPERIENCE, JOBS[0])
+        request = anthropic_request(prompt, 'system')
+        prefix_block, suffix_block = request['messages'][0]['content']
+        self.assertEqual(prefix_block['cache_control'], {'type': 'ephemeral'})
+        self.assertNotIn('cache_control', suffix_block)
+        self.assertEqual(request['system'], [{'type': 'text', 'text': 'system'}])
+        with mock.patch.object(Config, 'USE_PROMPT_CACHING', False):
+            self.assertNotIn('cache_control', anthropic_request(prompt, 'system')['messages'][0]['content'][0])
+
+    def test_no_breakpoint_below_minimum_cacheable_length(self):
+        # The short sections' instructions are far below the 1024-token minimum
+        for section in ('summary', 'education', 'skills', 'projects'):
+            prompt = build_tailoring_prompt(section, 'Python', JOBS[0])
+            prefix_block = anthropic_request(prompt, 'system')['messages'][0]['content'][0]
+            self.assertNotIn('cache_control', prefix_block)
+            self.assertEqual(prefix_block['text'], prompt.prefix)
+        with mock.patch.object(Config, 'PROMPT_CACHE_MIN_TOKENS', 100):
+            prompt = build_tailoring_prompt('skills', 'Python', JOBS[0])
+            self.assertIn('cache_control', anthropic_request(prompt, 'system')['messages'][0]['content'][0])
+
+    def test_cache_usage_for_both_sdks(self):
+        anthropic = SimpleNamespace(usage=SimpleNamespace(
+            input_tokens=50, output_tokens=10, cache_read_input_tokens=1200, cache_creation_input_tokens=0))
+        openai = SimpleNamespace(usage=SimpleNamespace(
+            prompt_tokens=1300, completion_tokens=10, prompt_tokens_details=SimpleNamespace(cached_tokens=1152)))
+        self.assertEqual(cache_usage(anthropic),
+                         {'prompt_tokens': 1250, 'cache_read_tokens': 1200, 'cache_write_tokens': 0})
+        self.assertEqual(cache_usage(openai),
+                         {'prompt_tokens': 1300, 'cache_read_tokens': 1152, 'cache_write_tokens': 0})
+        self.assertEqual(cache_usage(SimpleNamespace())['prompt_tokens'], 0)
+
+
+class TestProviderCacheHits(unittest.TestCase):
+    """Repeat instruction prefixes are served from the provider caches and counted."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.app = Flask(__name__)
+        self.app.config['UPLOAD_FOLDER'] = self.temp_dir
+        self.stats = PromptCacheStats()
+        patchers = [
+            mock.patch.object(claude_integration, 'get_llm_response_cache',
+                              return_value=DisabledCache('llm_responses')),
+            mock.patch.object(claude_integration, 'get_prompt_cache_stats', return_value=self.stats),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_second_request_reads_the_cached_prefix(self):
+        fake = FakeLLMProvider(latency_ms=0)
+        with self.app.app_context(), fake.install():
+            for client in (claude_integration.ClaudeClient('fake-key'),
+                           claude_integration.OpenAIClient('fake-key')):
+                for job_data in JOBS:
+                    client.tailor_resume_content('experience', EXPERIENCE, job_data)
+
+        summary = self.stats.summary()
+        for provider in ('claude', 'openai'):
+            self.assertEqual(summary[provider]['requests'], 2)
+            self.assertEqual(summary[provider]['cache_hits'], 1)
+            self.assertEqual(summary[provider]['request_hit_rate'], 0.5)
+            self.assertGreater(summary[provider]['token_hit_rate'], 0.3)
+        self.assertGreater(summary['claude']['cache_write_tokens'], 1024)
+        self.assertEqual(fake.stats['cache_read_tokens'],
+                         summary['claude']['cache_read_tokens'] + summary['openai']['cache_read_tokens'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import unittest
+import os
+import shutil
+import tempfile
+import sys
+from unittest import mock
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+
+import claude_integration
+from utils.cache_backends import DisabledCache
+from utils.fake_llm import FakeLLMProvider
+from utils.rate_limiter import (MemoryBucketStore, RateLimiter, RateLimitWaitTimeout, SQLiteBucketStore,
+                                api_key_from_headers)
+from utils.resilient_llm import ResilientCaller, is_retryable
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_limiter(clock, store=None, limits=None, max_wait_seconds=120):
+    return RateLimiter(store or MemoryBucketStore(), limits or {'claude': (3, 1000)},
+                       max_wait_seconds=max_wait_seconds, clock=clock.time, sleep=clock.sleep)
+
+
+class TestTokenBuckets(unittest.TestCase):
+    """Calls beyond the per-minute budget wait for the bucket to refill."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_burst_beyond_requests_per_minute_waits(self):
+        limiter = make_limiter(self.clock)
+        for _ in range(3):
+            self.assertEqual(limiter.acquire('claude', 'key', 10).waited_seconds, 0)
+        reservation = limiter.acquire('claude', 'key', 10)
+        # 3 requests/min refill one request every 20s
+        self.assertAlmostEqual(reservation.waited_seconds, 20, delta=2.5)
+        self.assertEqual(limiter.acquire('claude', 'other-key', 10).waited_seconds, 0)
+        self.assertEqual(limiter.summary()['providers']['claude']['waited'], 1)
+
+    def test_unused_reserved_tokens_are_refunded(self):
+        limiter = make_limiter(self.clock, limits={'claude': (100, 1000)})
+        limiter.acquire('claude', 'key', 800).settle(200)
+        self.assertEqual(limiter.acquire('claude', 'key', 800).waited_seconds, 0)
+        self.assertGreater(limiter.acquire('claude', 'key', 800).waited_seconds, 0)
+
+    def test_wait_is_bounded(self):
+        limiter = make_limiter(self.clock, limits={'claude': (1, 1000)}, max_wait_seconds=5)
+        limiter.acquire('claude', 'key', 10)
+        with self.assertRaises(RateLimitWaitTimeout) as raised:
+            limiter.acquire('claude', 'key', 10)
+        self.assertTrue(is_retryable(raised.exception))
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_headers_adapt_limits(self):
+        limiter = make_limiter(self.clock, limits={'claude': (100, 100000)})
+        limiter.observe('claude', 'key', {'anthropic-ratelimit-requests-limit': '6',
+                                          'anthropic-ratelimit-requests-remaining': '0'})
+        self.assertAlmostEqual(limiter.acquire('claude', 'key', 10).waited_seconds, 10, delta=1.5)
+        requests = [b for key, b in limiter.summary()['buckets'].items() if key.endswith(':requests')][0]
+        self.assertEqual(requests['per_minute'], 6)
+
+        limiter.observe('claude', 'key', {'retry-after': '30'}, status_code=429)
+        self.assertGreaterEqual(limiter.acquire('claude', 'key', 10).waited_seconds, 30)
+        self.assertEqual(api_key_from_headers({'authorization': 'Bearer sk-test'}), 'sk-test')
+
+
+class TestSharedStore(unittest.TestCase):
+    """Limiters in different workers draw from the same SQLite buckets."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_workers_share_one_budget(self):
+        clock = FakeClock()
+        db_path = os.path.join(self.temp_dir, 'rate_limits.sqlite3')
+        worker_a = make_limiter(clock, SQLiteBucketStore(db_path), {'openai': (2, 1000)})
+        worker_b = make_limiter(clock, SQLiteBucketStore(db_path), {'openai': (2, 1000)})
+
+        worker_a.acquire('openai', 'key', 10)
+        worker_a.acquire('openai', 'key', 10)
+        self.assertAlmostEqual(worker_b.acquire('openai', 'key', 10).waited_seconds, 30, delta=3.5)
+        self.assertEqual(worker_b.summary()['store'], 'sqlite')
+
+
+class TestClientPacing(unittest.TestCase):
+    """Tailoring calls take capacity before sending and settle it from the reported usage."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.app = Flask(__name__)
+        self.app.config['UPLOAD_FOLDER'] = self.temp_dir
+        patcher = mock.patch.object(claude_integration, 'get_llm_response_cache',
+                                    return_value=DisabledCache('llm_responses'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_tailoring_call_is_paced_and_settled(self):
+        limiter = RateLimiter(MemoryBucketStore(), {'openai': (60, 100000)})
+        fake = FakeLLMProvider(latency_ms=0)
+        with self.app.app_context(), fake.install(rate_limiter=limiter):
+            client = claude_integration.OpenAIClient('fake-key')
+            client.tailor_resume_content('skills', 'Python, SQL', {'job_title': 'Data Engineer'})
+
+        self.assertEqual(limiter.summary()['providers']['openai']['acquired'], 1)
+        tokens = [b for key, b in limiter.summary()['buckets'].items() if key.endswith(':tokens')][0]
+        used = fake.stats['input_tokens'] + fake.stats['output_tokens']
+        # Only the used tokens stay taken, not the 4096 reserved for the reply
+        self.assertAlmostEqual(tokens['level'], 100000 - used, delta=50)
+
+    def test_failed_calls_refund_their_reservation(self):
+        limiter = RateLimiter(MemoryBucketStore(), {'openai': (60, 100000)})
+        fake = FakeLLMProvider(latency_ms=0, failure_rate=1.0)
+        caller = ResilientCaller(failover=False, sleep=lambda seconds: None)
+        with self.app.app_context(), fake.install(rate_limiter=limiter), \
+                mock.patch.object(claude_integration, 'get_resilient_caller', return_value=caller):
+            client = claude_integration.OpenAIClient('fake-key')
+            client.tailor_resume_content('skills', 'Python, SQL', {'job_title': 'Data Engineer'})
+
+        self.assertEqual(fake.stats['failures'], 3)
+        self.assertEqual(limiter.summary()['providers']['openai']['acquired'], 3)
+        tokens = [b for key, b in limiter.summary()['buckets'].items() if key.endswith(':tokens')][0]
+        self.assertAlmostEqual(tokens['level'], 100000, delta=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+import os
+import shutil
+import tempfile
+import time
+import sys
+from unittest import mock
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import Config
+from utils.request_correlation import RequestCorrelationManager, RequestMetrics
+from utils.request_metrics_store import MemoryMetricsStore, SQLiteMetricsStore
+
+
+def _metrics(request_id, start_time, errors=(), bullets=2, ok=2, features=None):
+    return RequestMetrics(request_id=request_id, start_time=start_time, total_bullets=bullets,
+                          successful_bullets=ok, total_duration_ms=100.0, errors=list(errors),
+                          features_enabled=features or {})
+
+
+class TestRequestMetricsStores(unittest.TestCase):
+    """Memory and SQLite stores aggregate the same rolling totals."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_stores_agree_and_respect_window(self):
+        now = time.time()
+        stores = [MemoryMetricsStore(bucket_seconds=60),
+                  SQLiteMetricsStore(os.path.join(self.temp_dir, 'metrics.sqlite3'), bucket_seconds=60)]
+        for store in stores:
+            store.record(_metrics('old', now - 3 * 3600, errors=['stale']))
+            store.record(_metrics('a', now, errors=['Bullet failed: x'], features={'native': True}))
+            store.record(_metrics('b', now, bullets=4, ok=3, features={'native': False}))
+
+        results = [store.totals(now - 3600) for store in stores]
+        self.assertEqual(results[0], results[1])
+        totals = results[0]
+        self.assertEqual((totals['requests'], totals['total_bullets'], totals['successful_bullets']), (2, 6, 5))
+        self.assertEqual(totals['error_patterns'], {'Bullet failed: x': 1})
+        self.assertEqual(totals['feature_usage'], {'native': {'enabled': 1, 'disabled': 1}})
+
+        for store in stores:
+            store.prune(max_age_hours=1)
+            self.assertEqual(store.totals(0)['requests'], 2)
+
+    def test_sqlite_store_shared_between_instances(self):
+        path = os.path.join(self.temp_dir, 'metrics.sqlite3')
+        SQLiteMetricsStore(path).record(_metrics('a', time.time()))
+        SQLiteMetricsStore(path).record(_metrics('b', time.time()))
+        self.assertEqual(SQLiteMetricsStore(path).totals(time.time() - 60)['requests'], 2)
+
+
+class TestRequestCorrelationManager(unittest.TestCase):
+    """The manager keeps bounded history and reports from rolling counters."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'metrics.sqlite3')
+        self._saved_instance = RequestCorrelationManager._instance
+        RequestCorrelationManager._instance = None
+        # The store opens on first use, so the settings stay patched for the whole test
+        patcher = mock.patch.multiple(Config, REQUEST_METRICS_MAX_COMPLETED=3, REQUEST_METRICS_MAX_USERS=2,
+                                      REQUEST_METRICS_USER_HISTORY=2, USE_SHARED_REQUEST_METRICS=False,
+                                      REQUEST_METRICS_DB_PATH=self.db_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.manager = RequestCorrelationManager()
+
+    def tearDown(self):
+        RequestCorrelationManager._instance = self._saved_instance
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _run_request(self, user_id):
+        request_id = self.manager.start_request(user_id=user_id)
+        self.manager.add_bullet_success(request_id)
+        self.manager.add_bullet_failure("Numbering failed", request_id)
+        self.manager.end_request(request_id)
+        return request_id
+
+    def test_history_is_bounded(self):
+        ids = [self._run_request('u1') for _ in range(5)]
+        self._run_request('u2')
+        self._run_request('u3')
+
+        self.assertEqual(len(self.manager.completed_requests), 3)
+        self.assertIsNone(self.manager.get_request_metrics(ids[0]))
+        self.assertEqual(list(self.manager.user_sessions), ['u2', 'u3'])
+        self.assertEqual(len(self.manager.get_user_request_history('u2')), 1)
+
+    def test_summary_counts_every_request_in_window(self):
+        for _ in range(5):
+            self._run_request('u1')
+        summary = self.manager.get_analytics_summary(24)
+        self.assertEqual(summary['summary']['total_requests'], 5)
+        self.assertEqual(summary['summary']['bullet_success_rate'], 50.0)
+        self.assertEqual(summary['error_patterns'], {'Numbering failed': 5})
+        self.assertEqual(summary['active_requests'], 0)
+
+    def test_shared_store_opens_lazily_and_keeps_its_retention(self):
+        RequestCorrelationManager._instance = None
+        with mock.patch.object(Config, 'USE_SHARED_REQUEST_METRICS', True):
+            manager = RequestCorrelationManager()
+            self.assertFalse(os.path.exists(self.db_path))
+            request_id = manager.start_request(user_id='u1')
+            manager.end_request(request_id)
+        self.assertEqual(manager.metrics_store.name, 'sqlite')
+        self.assertTrue(os.path.exists(self.db_path))
+
+        # One caller's short window must not wipe the counters every worker shares
+        manager.metrics_store.record(_metrics('earlier', time.time() - 2 * 3600))
+        manager.completed_requests[0].start_time -= 2 * 3600
+        manager.cleanup_old_requests(max_age_hours=1)
+        self.assertEqual(len(manager.completed_requests), 0)
+        self.assertEqual(manager.get_analytics_summary(24)['summary']['total_requests'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+import unittest
+import os
+import shutil
+import tempfile
+import sys
+import threading
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+
+import claude_integration
+from config import Config
+from utils.cache_backends import DisabledCache
+from utils.fake_llm import FakeLLMProvider
+from utils.resilient_llm import (CircuitBreaker, ProviderCall, ProviderUnavailableError, ResilientCaller,
+                                 is_retryable)
+
+
+class StatusError(Exception):
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        headers = {'retry-after': str(retry_after)} if retry_after is not None else {}
+        self.response = SimpleNamespace(headers=headers)
+
+
+def flaky(*outcomes):
+    """A call that raises or returns each outcome in turn"""
+    remaining = list(outcomes)
+
+    def call():
+        outcome = remaining.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    return call
+
+
+class TestRetriesAndBreaker(unittest.TestCase):
+    """Retryable errors are retried with bounded jittered backoff; repeated ones open the breaker."""
+
+    def setUp(self):
+        self.sleeps = []
+        self.caller = ResilientCaller(max_attempts=3, retry_base_seconds=0.5, retry_max_seconds=4.0,
+                                      failure_threshold=3, sleep=self.sleeps.append)
+
+    def test_retryable_errors_are_retried(self):
+        call = ProviderCall('claude', flaky(StatusError(529), StatusError(429, retry_after=2), 'reply'))
+        self.assertEqual(self.caller.call(call, 'skills'), ('reply', 'claude'))
+        self.assertEqual(len(self.sleeps), 2)
+        self.assertLessEqual(self.sleeps[0], 0.5)
+        self.assertEqual(self.sleeps[1], 2.0)
+        self.assertEqual(self.caller.summary()['providers']['claude']['retries'], 2)
+
+    def test_client_errors_are_not_retried_or_failed_over(self):
+        self.assertFalse(is_retryable(StatusError(400)))
+        self.assertTrue(is_retryable(TimeoutError()))
+        fallback = ProviderCall('openai', mock.Mock(return_value='other'))
+        with self.assertRaises(StatusError):
+            self.caller.call(ProviderCall('claude', flaky(StatusError(400))), 'skills', fallback)
+        self.assertEqual(self.sleeps, [])
+        fallback.call.assert_not_called()
+
+    def test_breaker_opens_and_probes_after_cooldown(self):
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=2, reset_seconds=10, clock=lambda: now[0])
+        self.assertFalse(breaker.record_failure())
+        self.assertTrue(breaker.record_failure())
+        self.assertFalse(breaker.allow())
+        now[0] = 10
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())  # one probe at a time
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_open_breaker_fails_fast_then_fails_over(self):
+        failing = ProviderCall('claude', mock.Mock(side_effect=StatusError(503)))
+        with self.assertRaises(StatusError):
+            self.caller.call(failing, 'skills')
+        self.assertEqual(self.caller.breaker('claude').state, CircuitBreaker.OPEN)
+
+        with self.assertRaises(ProviderUnavailableError):
+            self.caller.call(failing, 'skills')
+        self.assertEqual(failing.call.call_count, 3)
+
+        fallback = ProviderCall('openai', mock.Mock(return_value='other'))
+        self.assertEqual(self.caller.call(failing, 'skills', fallback), ('other', 'openai'))
+        counters = self.caller.summary()['providers']['claude']
+        self.assertEqual((counters['short_circuited'], counters['failovers']), (2, 1))
+
+    def test_reserve_runs_outside_the_latency_sample(self):
+        call = ProviderCall('claude', lambda reservation: reservation, reserve=lambda: time.sleep(0.2) or 'slot')
+        self.assertEqual(self.caller.call(call, 'skills'), ('slot', 'claude'))
+        self.assertLess(self.caller.latency('claude', 'skills').percentile(100, 1), 0.1)
+
+
+class TestHedging(unittest.TestCase):
+    """A primary slower than its latency percentile is raced against the other provider."""
+
+    def test_slow_primary_is_hedged(self):
+        caller = ResilientCaller(hedging=True, hedge_percentile=90, hedge_min_samples=5)
+        for _ in range(5):
+            caller.latency('claude', 'experience').record(0.05)
+        release = threading.Event()
+        primary = ProviderCall('claude', lambda: release.wait(5) and 'slow')
+        fallback = ProviderCall('openai', lambda: 'fast')
+
+        start = time.monotonic()
+        self.assertEqual(caller.call(primary, 'experience', fallback), ('fast', 'openai'))
+        self.assertLess(time.monotonic() - start, 1)
+        release.set()
+        counters = caller.summary()['providers']['claude']
+        self.assertEqual((counters['hedges'], counters['hedge_wins']), (1, 1))
+
+    def test_no_hedge_before_enough_samples(self):
+        caller = ResilientCaller(hedging=True, hedge_min_samples=5)
+        fallback = ProviderCall('openai', mock.Mock(return_value='other'))
+        self.assertIsNone(caller.hedge_delay('claude', 'skills'))
+        self.assertEqual(caller.call(ProviderCall('claude', lambda: 'reply'), 'skills', fallback),
+                         ('reply', 'claude'))
+        fallback.call.assert_not_called()
+
+
+class TestClientFailover(unittest.TestCase):
+    """Tailoring falls over to the other configured provider instead of returning the original."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.app = Flask(__name__)
+        self.app.config['UPLOAD_FOLDER'] = self.temp_dir
+        self.caller = ResilientCaller(sleep=lambda seconds: None)
+        patchers = [
+            mock.patch.object(claude_integration, 'get_llm_response_cache',
+                              return_value=DisabledCache('llm_responses')),
+            mock.patch.object(claude_integration, 'get_resilient_caller', return_value=self.caller),
+            mock.patch.object(Config, 'OPENAI_API_KEY', 'fake-openai-key'),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_overloaded_claude_fails_over_to_openai(self):
+        fake = FakeLLMProvider(latency_ms=0)
+        job_data = {'job_title': 'Data Engineer', 'company': 'Globex', 'skills': ['Python']}
+        with self.app.app_context(), fake.install(), \
+                mock.patch.object(claude_integration.ClaudeClient, '_create_completion',
+                                  side_effect=StatusError(529)) as claude_call:
+            client = claude_integration.ClaudeClient('fake-key')
+            tailored = client.tailor_resume_content('skills', 'Python, SQL', job_data)
+
+        self.assertEqual(claude_call.call_count, 3)
+        self.assertIsInstance(tailored, dict)
+        self.assertIn('technical', tailored)
+        self.assertEqual(fake.stats['calls'], 1)
+        self.assertEqual(self.caller.summary()['providers']['claude']['failovers'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
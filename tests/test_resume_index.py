@@ -0,0 +1,80 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+import sys
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from resume_index import ResumeIndex
+
+
+class TestResumeIndex(unittest.TestCase):
+    """Tests for the SQLite-backed resume index."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.index_file = os.path.join(self.temp_dir, 'resume_index.json')
+        self.db_path = os.path.join(self.temp_dir, 'resume_index.sqlite3')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _index(self):
+        return ResumeIndex(index_file=self.index_file, db_path=self.db_path)
+
+    def test_records_visible_to_other_instances(self):
+        index = self._index()
+        self.assertTrue(index.add_resume('r1', 'r1.pdf', metadata={'source': 'upload'}))
+        self.assertTrue(index.add_note('r1', 'Processing for job: Engineer at Acme'))
+        self.assertTrue(index.add_processing_record('r1', 'tailoring', {'provider': 'openai'}))
+        self.assertFalse(index.add_note('missing', 'ignored'))
+
+        # A second instance (e.g. another gunicorn worker) sees the same data
+        info = self._index().get_resume_info('r1')
+        self.assertEqual(info['filename'], 'r1.pdf')
+        self.assertEqual(info['metadata'], {'source': 'upload'})
+        self.assertEqual([n['note'] for n in info['notes']], ['Processing for job: Engineer at Acme'])
+        self.assertEqual(info['processing_history'][0]['details'], {'provider': 'openai'})
+        self.assertIsNone(index.get_resume_info('missing'))
+
+    def test_add_resume_updates_filename_and_merges_metadata(self):
+        index = self._index()
+        index.add_resume('r1', 'old.pdf', metadata={'a': 1})
+        index.add_resume('r1', 'new.pdf', metadata={'b': 2})
+        info = index.get_resume_info('r1')
+        self.assertEqual(info['filename'], 'new.pdf')
+        self.assertEqual(info['metadata'], {'a': 1, 'b': 2})
+
+    def test_legacy_json_imported_once(self):
+        legacy = {'resumes': {'old': {
+            'filename': 'old.pdf', 'added_date': '2025-04-24T10:07:24',
+            'processing_history': [], 'notes': [{'timestamp': '2025-04-24T10:07:25', 'note': 'legacy'}],
+        }}}
+        with open(self.index_file, 'w') as f:
+            json.dump(legacy, f)
+
+        self.assertEqual(self._index().get_resume_info('old')['notes'][0]['note'], 'legacy')
+        self._index()  # Re-opening must not import the notes again
+        self.assertEqual(len(self._index().get_resume_info('old')['notes']), 1)
+
+    def test_query_helpers(self):
+        index = self._index()
+        index.add_resume('r1', 'r1.pdf')
+        index.add_resume('r2', 'r2.pdf')
+        index.add_note('r1', 'first')
+        index.add_processing_record('r1', 'parsing')
+        index.add_processing_record('r2', 'tailoring')
+
+        self.assertEqual({r['resume_id'] for r in index.list_resumes()}, {'r1', 'r2'})
+        self.assertEqual(len(index.list_resumes(limit=1)), 1)
+        self.assertEqual(index.list_resumes(since='2999-01-01'), [])
+        self.assertEqual([n['note'] for n in index.get_notes('r1')], ['first'])
+        self.assertEqual([r['resume_id'] for r in index.get_processing_records(process_type='tailoring')], ['r2'])
+        self.assertEqual(index.get_processing_records(until='2000-01-01'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import os
+import shutil
+import tempfile
+import sys
+from unittest import mock
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import llm_resume_parser
+from utils import resume_parse_cache
+from utils.cache_backends import MemoryLRUBackend, TieredCache
+
+
+class TestResumeParseCache(unittest.TestCase):
+    """Tests for the content-hash keyed parsed-resume cache."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self._saved_cache = resume_parse_cache._parse_cache
+        resume_parse_cache._parse_cache = TieredCache([MemoryLRUBackend()], name="resume_parses")
+        self.parse_calls = []
+
+        def fake_parse(parser, doc_path):
+            self.parse_calls.append((parser.llm_provider, os.path.basename(doc_path)))
+            return {'contact': 'Jane Doe', 'experience': [{'company': 'Acme'}]}, {}, True
+
+        self.patches = [
+            mock.patch.object(llm_resume_parser.LLMResumeParser, '__init__',
+                              lambda parser, llm_provider="claude": setattr(parser, 'llm_provider', llm_provider)),
+            mock.patch.object(llm_resume_parser.LLMResumeParser, 'parse_resume', fake_parse),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        resume_parse_cache._parse_cache = self._saved_cache
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, name, content):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def test_same_content_is_parsed_once(self):
+        first = self._write('upload_a.docx', b'resume bytes')
+        second = self._write('upload_b.docx', b'resume bytes')
+
+        sections = llm_resume_parser.parse_resume_with_llm(first, 'openai')
+        sections['experience'].append({'company': 'Mutated'})
+        again = llm_resume_parser.parse_resume_with_llm(second, 'openai')
+
+        self.assertEqual(len(self.parse_calls), 1)
+        self.assertEqual(again['experience'], [{'company': 'Acme'}])
+        self.assertEqual(llm_resume_parser.get_cached_parsed_resume(first, 'openai')['contact'], 'Jane Doe')
+
+    def test_content_and_provider_are_part_of_the_key(self):
+        path = self._write('resume.docx', b'version one')
+        llm_resume_parser.parse_resume_with_llm(path, 'openai')
+        llm_resume_parser.parse_resume_with_llm(path, 'claude')
+        self._write('resume.docx', b'version two')
+        llm_resume_parser.parse_resume_with_llm(path, 'openai')
+        self.assertEqual(len(self.parse_calls), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+import sys
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.session_store import SessionDataStore
+from utils.docx_builder import build_docx
+
+
+class TestSessionDataStore(unittest.TestCase):
+    """Tests for the packed per-request session store."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.sections = {
+            'contact': {'name': 'Jane Doe', 'email': 'jane@example.com'},
+            'summary': {'content': 'Platform engineer.'},
+            'experience': [{'company': 'Acme', 'position': 'Engineer', 'dates': '2020 - 2024',
+                            'achievements': ['Shipped the thing']}],
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_sections_packed_into_one_file(self):
+        SessionDataStore(self.temp_dir).save_sections('req', self.sections)
+        self.assertEqual(os.listdir(self.temp_dir), ['req.sections.json'])
+
+        # A fresh store (e.g. another gunicorn worker) reads the packed file
+        self.assertEqual(SessionDataStore(self.temp_dir).load_sections('req'), self.sections)
+
+    def test_loaded_data_is_a_copy(self):
+        store = SessionDataStore(self.temp_dir)
+        store.save_sections('req', self.sections)
+        store.load_section('req', 'experience').append({'company': 'Mutated'})
+        self.assertEqual(len(store.load_section('req', 'experience')), 1)
+        self.assertEqual(store.summary()['stats']['hits'], 2)
+
+    def test_legacy_per_section_files(self):
+        with open(os.path.join(self.temp_dir, 'old_summary.json'), 'w') as f:
+            json.dump({'content': 'Legacy summary'}, f)
+        store = SessionDataStore(self.temp_dir)
+        self.assertEqual(store.load_sections('old'), {'summary': {'content': 'Legacy summary'}})
+        self.assertEqual(store.load_sections('unknown'), {})
+
+    def test_build_docx_from_packed_session(self):
+        SessionDataStore(self.temp_dir).save_sections('req', self.sections)
+        docx_bytes = build_docx('req', self.temp_dir)
+        self.assertGreater(len(docx_bytes.getvalue()), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+import sys
+from unittest import mock
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+
+import claude_integration
+import tailoring_handler
+from config import Config
+from html_generator import render_section_html
+from utils.job_queue import SQLiteJobQueue, QUEUED
+
+
+class FakeLLMClient:
+    """Stand-in LLM client that tags each section as tailored."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def tailor_resume_content(self, section_name, content, job_data):
+        if section_name == 'experience':
+            return [{'company': 'Acme', 'position': 'Engineer', 'achievements': ['Shipped it']}]
+        return {'content': f'tailored {section_name}'}
+
+
+def parse_sse(body):
+    """Split an SSE body into (event, data) pairs, skipping comments."""
+    events = []
+    for block in body.strip().split('\n\n'):
+        lines = [line for line in block.split('\n') if not line.startswith(':')]
+        if not lines:
+            continue
+        event = next(line[6:].strip() for line in lines if line.startswith('event:'))
+        data = json.loads(''.join(line[5:].strip() for line in lines if line.startswith('data:')))
+        events.append((event, data))
+    return events
+
+
+class TestRenderSectionHtml(unittest.TestCase):
+    """Tests for per-section preview fragments."""
+
+    def test_experience_entries(self):
+        html = render_section_html('experience', [
+            {'company': 'Acme', 'position': 'Engineer', 'achievements': ['Shipped it']},
+            {'company': '', 'position': ''},
+        ])
+        self.assertIn('experience-content', html)
+        self.assertIn('Acme', html)
+        self.assertEqual(html.count('class="job"'), 1)
+
+    def test_empty_sections_render_nothing(self):
+        self.assertEqual(render_section_html('summary', {'content': '  '}), '')
+        self.assertEqual(render_section_html('projects', None), '')
+
+
+class TestTailorResumeStream(unittest.TestCase):
+    """Tests for the /tailor-resume/stream SSE endpoint."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.temp_dir, 'resume.docx'), 'w') as f:
+            f.write('placeholder')
+
+        self.app = Flask(__name__)
+        self.app.config['UPLOAD_FOLDER'] = self.temp_dir
+        self.app.config['OPENAI_API_KEY'] = 'sk-test'
+        tailoring_handler.setup_tailoring_routes(self.app)
+
+        sections = {'contact': 'Jane Doe\njane@example.com', 'summary': 'Engineer',
+                    'experience': [{'company': 'Acme'}], 'education': 'BS', 'skills': 'Python',
+                    'projects': ''}
+        self.patches = [
+            mock.patch.object(claude_integration, 'OpenAIClient', FakeLLMClient),
+            mock.patch.object(claude_integration, 'extract_resume_sections', lambda path: dict(sections)),
+            mock.patch.object(tailoring_handler, '_record_tailoring_in_index', lambda *args: None),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_streams_each_section_then_complete(self):
+        response = self.app.test_client().post('/tailor-resume/stream', json={
+            'resumeFilename': 'resume.docx',
+            'jobRequirements': {'title': 'Engineer'},
+        })
+        self.assertEqual(response.mimetype, 'text/event-stream')
+
+        events = parse_sse(response.get_data(as_text=True))
+        self.assertEqual(events[0][0], 'start')
+        self.assertEqual(events[-1][0], 'complete')
+
+        sections = {data['section']: data for event, data in events if event == 'section'}
+        self.assertEqual(set(sections),
+                         {'contact', 'summary', 'experience', 'education', 'skills', 'projects'})
+        self.assertIn('Acme', sections['experience']['html'])
+        self.assertIn('tailored summary', events[-1][1]['preview'])
+
+    def test_queue_mode_enqueues_instead_of_streaming(self):
+        job_queue = SQLiteJobQueue(os.path.join(self.temp_dir, 'jobs.sqlite3'))
+        with mock.patch.object(Config, 'USE_TAILORING_JOB_QUEUE', True), \
+                mock.patch.object(tailoring_handler, 'get_tailoring_job_queue', return_value=job_queue), \
+                mock.patch.object(tailoring_handler, 'tailor_resume_with_llm') as tailor:
+            response = self.app.test_client().post('/tailor-resume/stream', json={
+                'resumeFilename': 'resume.docx',
+                'jobRequirements': {'title': 'Engineer'},
+            })
+
+        self.assertEqual(response.status_code, 202)
+        data = response.get_json()
+        self.assertTrue(data['queued'])
+        self.assertEqual(data['status_url'], f"/tailor-resume/status/{data['request_id']}")
+        self.assertEqual(job_queue.get(data['request_id']).status, QUEUED)
+        tailor.assert_not_called()
+
+    def test_async_request_is_rejected_while_queue_is_off(self):
+        with mock.patch.object(Config, 'USE_TAILORING_JOB_QUEUE', False), \
+                mock.patch.object(tailoring_handler, 'get_tailoring_job_queue') as get_queue:
+            for endpoint in ('/tailor-resume', '/tailor-resume/stream'):
+                response = self.app.test_client().post(endpoint, json={
+                    'resumeFilename': 'resume.docx',
+                    'jobRequirements': {'title': 'Engineer'},
+                    'async': True,
+                })
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.get_json()['success'])
+        get_queue.assert_not_called()
+
+    def test_missing_resume_is_rejected_before_streaming(self):
+        response = self.app.test_client().post('/tailor-resume/stream', json={
+            'resumeFilename': 'missing.docx',
+            'jobRequirements': {},
+        })
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import sys
+from pathlib import Path
+from unittest import mock
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import style_engine
+import style_manager
+from utils import token_service
+from utils.token_service import TokenService
+from style_engine import StyleEngine
+from style_manager import StyleManager, load_tokens
+
+TOKENS = {
+    'typography': {
+        'fontSize': {'body': '11pt'},
+        'docx': {'fontSize': {'sectionHeaderPt': 14}},
+    },
+    'color': {'primary': '#0D2B7E'},
+}
+
+
+class TestTokenService(unittest.TestCase):
+    """Token files are parsed once and re-parsed only when their content changes."""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.tokens_path = self.temp_dir / 'design_tokens.json'
+        self.styles_path = self.temp_dir / '_docx_styles.json'
+        self._write(self.tokens_path, TOKENS)
+        self._write(self.styles_path, {'styles': {'MR_BulletPoint': {'indentCm': 0.3}}})
+        self.service = TokenService(self.tokens_path, self.styles_path)
+        for module in (token_service, style_engine, style_manager):
+            patcher = mock.patch.object(module, 'get_token_service', return_value=self.service)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, path, data, mtime_ns=None):
+        path.write_text(json.dumps(data), encoding='utf-8')
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def test_sources_are_parsed_once(self):
+        with mock.patch('utils.token_service.json.loads', wraps=json.loads) as loads:
+            for _ in range(3):
+                self.assertEqual(StyleEngine.load_tokens()['color']['primary'], '#0D2B7E')
+                self.assertIs(load_tokens(), self.service.tokens())
+                self.assertEqual(StyleManager.load_docx_styles()['styles']['MR_BulletPoint']['indentCm'], 0.3)
+        self.assertEqual(loads.call_count, 2)
+
+    def test_lookups_are_memoized_per_version(self):
+        self.assertEqual(StyleEngine.get_typography_font_size(None, 'sectionHeader', 'pt'), 14)
+        self.assertEqual(StyleEngine.get_typography_font_size(element_type='sectionHeader'), 14)
+        self.assertEqual(StyleEngine.get_typography_font_size(StyleEngine.load_tokens(), 'sectionHeader'), 14)
+        self.assertEqual(self.service.stats()['hits'], 2)
+
+        structured = StyleEngine.get_structured_tokens()
+        self.assertIs(StyleEngine.get_structured_tokens(), structured)
+
+        # Tokens that are not the service's own are computed directly
+        hits = self.service.stats()['hits']
+        other = {'typography': {'fontSize': {'body': '9pt'}}}
+        self.assertEqual(StyleEngine.get_typography_font_size(other, 'body', 'pt'), 9)
+        self.assertEqual(self.service.stats()['hits'], hits)
+
+    def test_content_change_invalidates_views_and_fingerprint(self):
+        fingerprint = self.service.fingerprint()
+        self.assertEqual(self.service.css_variables()['--color-primary'], '#0D2B7E')
+        self.assertEqual(StyleEngine.get_typography_font_size(None, 'body', 'pt'), 11)
+        version = self.service.version
+
+        # A touched file with identical content keeps the version and fingerprint
+        os.utime(self.tokens_path, ns=(1, 1))
+        self.assertEqual(self.service.fingerprint(), fingerprint)
+        self.assertEqual(self.service.version, version)
+
+        changed = dict(TOKENS, typography={'fontSize': {'body': '10pt'}})
+        self._write(self.tokens_path, changed, mtime_ns=2)
+        self.assertEqual(StyleEngine.get_typography_font_size(None, 'body', 'pt'), 10)
+        self.assertNotEqual(self.service.fingerprint(), fingerprint)
+        self.assertEqual(self.service.version, version + 1)
+
+    def test_missing_source_yields_empty_views(self):
+        service = TokenService(self.temp_dir / 'absent.json', self.styles_path)
+        self.assertEqual(service.tokens(), {})
+        self.assertEqual(service.css_variables(), {})
+        self.assertEqual(len(service.fingerprint()), 64)
+
+
+if __name__ == '__main__':
+    unittest.main()
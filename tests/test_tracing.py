@@ -0,0 +1,96 @@
+import unittest
+import os
+import contextvars
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+# Add the parent directory to sys.path to import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import tracing
+from utils.tracing import SpanRecorder, annotate_span, trace_request, trace_span, traced
+
+
+class TestTracing(unittest.TestCase):
+    """Spans land in per-request timelines and per-stage percentiles."""
+
+    def setUp(self):
+        self.recorder = SpanRecorder(max_traces=2, samples_per_stage=100)
+        patcher = mock.patch.object(tracing, 'get_tracer', return_value=self.recorder)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_nested_spans_and_attributes(self):
+        @traced("render")
+        def render():
+            annotate_span(bytes_written=42)
+
+        with trace_request('req-1'):
+            with trace_span("tailor_resume", provider="openai"):
+                render()
+
+        timeline = self.recorder.timeline('req-1')
+        spans = {span['name']: span for span in timeline['spans']}
+        self.assertEqual(spans['tailor_resume']['parent'], None)
+        self.assertEqual(spans['render']['parent'], 'tailor_resume')
+        self.assertEqual(spans['render']['attributes'], {'bytes_written': 42})
+        self.assertEqual(spans['tailor_resume']['attributes'], {'provider': 'openai'})
+        self.assertEqual(timeline['spans'][0]['start_offset_ms'], 0.0)
+
+    def test_spans_on_worker_threads_join_the_request(self):
+        def job(section):
+            with trace_span("tailor_section", section=section):
+                pass
+
+        with trace_request('req-1'), ThreadPoolExecutor(max_workers=2) as executor:
+            for future in [executor.submit(contextvars.copy_context().run, job, name)
+                           for name in ('summary', 'skills')]:
+                future.result()
+
+        sections = {span['attributes']['section'] for span in self.recorder.timeline('req-1')['spans']}
+        self.assertEqual(sections, {'summary', 'skills'})
+
+    def test_errors_are_recorded_and_reraised(self):
+        with self.assertRaises(ValueError):
+            with trace_request('req-1'), trace_span("build_docx"):
+                raise ValueError("boom")
+        self.assertEqual(self.recorder.timeline('req-1')['spans'][0]['error'], 'ValueError')
+        self.assertEqual(self.recorder.stage_summary()['build_docx']['errors'], 1)
+
+    def test_stage_percentiles(self):
+        for duration in range(1, 101):
+            span = tracing.Span("tailor_section", None, None, {})
+            span.duration_ms = float(duration)
+            self.recorder.record(span)
+        stage = self.recorder.stage_summary()['tailor_section']
+        self.assertEqual(stage['count'], 100)
+        self.assertEqual((stage['p50_ms'], stage['p95_ms'], stage['p99_ms'], stage['max_ms']),
+                         (50.0, 95.0, 99.0, 100.0))
+        self.assertEqual(stage['mean_ms'], 50.5)
+
+    def test_phase_timer_records_sibling_phases(self):
+        with trace_request('req-1'), trace_span("build_docx"):
+            phases = tracing.PhaseTimer("build_docx")
+            phases.mark("load")
+            phases.mark("save", bytes=10)
+            phases.mark("save")
+
+        spans = self.recorder.timeline('req-1')['spans']
+        self.assertEqual([span['parent'] for span in spans if span['name'] != 'build_docx'], ['build_docx'] * 3)
+        stages = self.recorder.stage_summary()
+        self.assertEqual(stages['build_docx.save']['count'], 2)
+        self.assertLessEqual(stages['build_docx.load']['total_ms'] + stages['build_docx.save']['total_ms'],
+                             stages['build_docx']['total_ms'])
+
+    def test_trace_history_is_bounded(self):
+        for request_id in ('a', 'b', 'c'):
+            with trace_request(request_id), trace_span("stage"):
+                pass
+        self.assertEqual(self.recorder.recent_traces(), ['c', 'b'])
+        self.assertIsNone(self.recorder.timeline('a'))
+        self.assertEqual(self.recorder.stage_summary()['stage']['count'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
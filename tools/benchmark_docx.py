@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+DOCX Build Micro-Benchmark
+
+Generates synthetic temp_session_data sets of increasing size, times
+utils.docx_builder.build_docx end to end and per phase (the PhaseTimer marks
+and traced helpers inside the builder), and compares the result with a stored
+baseline so builder optimizations can be checked for regressions.
+
+Examples:
+    python tools/benchmark_docx.py --save-baseline
+    python tools/benchmark_docx.py --fail-on-regression
+    python tools/benchmark_docx.py --sizes 1x10,10x100 --repeat 5 --output /tmp/docx.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from datetime import datetime
+
+# Add parent directory to path for imports
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+logger = logging.getLogger("benchmark_docx")
+
+RESULT_FORMAT_VERSION = 1
+# (jobs, bullets) per size; bullets are spread evenly across the jobs
+DEFAULT_SIZES = "1x10,10x100,50x1000,200x5000"
+DEFAULT_BASELINE = os.path.join(ROOT_DIR, 'logs', 'benchmarks', 'docx_build_baseline.json')
+
+
+def parse_sizes(spec):
+    """'1x10,10x100' -> [(1, 10), (10, 100)]"""
+    sizes = []
+    for item in spec.split(','):
+        jobs, bullets = item.lower().strip().split('x')
+        sizes.append((max(1, int(jobs)), max(0, int(bullets))))
+    return sizes
+
+
+def size_label(jobs, bullets):
+    return f"{jobs}x{bullets}"
+
+
+def synthetic_sections(jobs, bullets):
+    """Session sections in the shape the tailoring pipeline saves them"""
+    per_job, extra = divmod(bullets, jobs)
+    experience = []
+    for index in range(jobs):
+        count = per_job + (1 if index < extra else 0)
+        experience.append({
+            'company': f"Company {index + 1}",
+            'location': "Remote",
+            'position': "Senior Engineer",
+            'dates': f"{2000 + index % 25} - {2001 + index % 25}",
+            'role_description': "Owned delivery of customer-facing platform services.",
+            'achievements': [
+                f"Delivered {bullet + 2} platform improvements that cut p95 latency by "
+                f"{(bullet * 7) % 60 + 5}% across {index % 9 + 2} regions"
+                for bullet in range(count)
+            ],
+        })
+    return {
+        'contact': {'content': "Jordan Example\nSpringfield | 555-0100 | jordan@example.com"},
+        'summary': {'summary': "Engineer focused on reliable data and platform services."},
+        'experience': experience,
+        'education': [{'institution': "State University", 'location': "Springfield",
+                       'degree': "B.S. Computer Science", 'dates': "2008 - 2012",
+                       'highlights': ["Graduated with honors"]}],
+        'skills': {'technical': ["Python", "SQL", "Kubernetes"], 'soft': ["Mentoring"]},
+        'projects': [{'title': "Open source scheduler", 'dates': "2021",
+                      'details': ["Used by 300 teams"]}],
+    }
+
+
+def time_build(request_id, temp_dir):
+    """
+    Run one build and return its end-to-end and per-phase timings.
+
+    Returns:
+        {'total_ms': float, 'bytes': int, 'phases': {phase: {'total_ms', 'count'}}}
+    """
+    from utils.docx_builder import build_docx
+    from utils.tracing import get_tracer
+
+    tracer = get_tracer()
+    tracer.clear()
+    started = time.perf_counter()
+    output = build_docx(request_id, temp_dir)
+    total_ms = (time.perf_counter() - started) * 1000
+    phases = {}
+    for name, stage in tracer.stage_summary().items():
+        if name.startswith('build_docx.'):
+            phases[name[len('build_docx.'):]] = {'total_ms': stage['total_ms'], 'count': stage['count']}
+    return {'total_ms': total_ms, 'bytes': output.getbuffer().nbytes, 'phases': phases}
+
+
+def run_benchmark(sizes, repeat, work_dir, budget_seconds=None):
+    """
+    Time every size up to `repeat` times and keep the fastest time per phase
+    (the minimum is the least noisy estimate of the builder's own cost).
+
+    With a budget, a size stops repeating once its builds have used the budget,
+    and larger sizes are skipped once a single build takes longer than it.
+    """
+    from utils.session_store import get_session_store
+
+    temp_dir = os.path.join(work_dir, 'temp_session_data')
+    store = get_session_store(temp_dir)
+    results = {}
+    over_budget = False
+    for jobs, bullets in sizes:
+        label = size_label(jobs, bullets)
+        if over_budget:
+            results[label] = {'jobs': jobs, 'bullets': bullets, 'skipped': True}
+            continue
+        request_id = f"docx-bench-{label}"
+        store.save_sections(request_id, synthetic_sections(jobs, bullets))
+        runs = []
+        started = time.perf_counter()
+        while len(runs) < repeat:
+            runs.append(time_build(request_id, temp_dir))
+            if budget_seconds and time.perf_counter() - started > budget_seconds:
+                break
+        over_budget = bool(budget_seconds) and min(run['total_ms'] for run in runs) > budget_seconds * 1000
+        phase_names = sorted({name for run in runs for name in run['phases']})
+        results[label] = {
+            'jobs': jobs,
+            'bullets': bullets,
+            'runs': len(runs),
+            'total_ms': round(min(run['total_ms'] for run in runs), 3),
+            'median_total_ms': round(statistics.median(run['total_ms'] for run in runs), 3),
+            'bytes': runs[-1]['bytes'],
+            'phases': {
+                name: {
+                    'total_ms': round(min(
+                        run['phases'].get(name, {}).get('total_ms', 0.0) for run in runs), 3),
+                    'count': runs[-1]['phases'].get(name, {}).get('count', 0),
+                }
+                for name in phase_names
+            },
+        }
+        logger.info(f"{label}: {results[label]['total_ms']}ms")
+    return results
+
+
+def check_regressions(current, baseline, threshold_pct=20.0, min_delta_ms=5.0):
+    """
+    Compare per-size totals and phases against a baseline.
+
+    A metric regresses when it is more than threshold_pct slower AND at least
+    min_delta_ms slower, so sub-millisecond phases do not trip on noise.
+
+    Returns:
+        List of (size, metric, baseline_ms, current_ms, change_pct) regressions
+    """
+    regressions = []
+
+    def check(label, metric, before, after):
+        if before is None or after is None:
+            return
+        if after - before >= min_delta_ms and after > before * (1 + threshold_pct / 100):
+            change = (after - before) / before * 100 if before else float('inf')
+            regressions.append((label, metric, before, after, round(change, 1)))
+
+    for label, size in current['sizes'].items():
+        base = baseline.get('sizes', {}).get(label)
+        if not base or base.get('skipped') or size.get('skipped'):
+            continue
+        check(label, 'total', base.get('total_ms'), size['total_ms'])
+        for phase, values in size['phases'].items():
+            check(label, phase, base.get('phases', {}).get(phase, {}).get('total_ms'), values['total_ms'])
+    return regressions
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def print_report(result, regressions=None):
+    print(f"\nDOCX build benchmark (commit {result['meta']['commit'] or 'unknown'}, "
+          f"fastest of up to {result['meta']['repeat']} runs)")
+    for label, size in result['sizes'].items():
+        if size.get('skipped'):
+            print(f"\n  {label}: skipped (a smaller size already exceeded the time budget)")
+            continue
+        print(f"\n  {label} ({size['jobs']} jobs, {size['bullets']} bullets): "
+              f"{size['total_ms']}ms total, {size['bytes']} bytes")
+        for phase, values in sorted(size['phases'].items(), key=lambda item: -item[1]['total_ms']):
+            print(f"    {phase:<22}{values['total_ms']:>12}ms{values['count']:>8}x")
+    if regressions is not None:
+        if regressions:
+            print(f"\n  {len(regressions)} regression(s) against the baseline:")
+            for label, metric, before, after, change in regressions:
+                print(f"    {label:<12}{metric:<22}{before:>12}ms -> {after:>12}ms  (+{change}%)")
+        else:
+            print("\n  No regressions against the baseline")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark utils.docx_builder.build_docx per phase")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help="Comma-separated JOBSxBULLETS sizes")
+    parser.add_argument('--repeat', type=int, default=3, help="Builds per size (the fastest run is reported)")
+    parser.add_argument('--budget-seconds', type=float, default=60.0,
+                        help="Per-size time budget; larger sizes are skipped once one build exceeds it (0 = none)")
+    parser.add_argument('--output', help="Results JSON path (default: logs/benchmarks/docx_build_<commit>.json)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline results to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the baseline")
+    parser.add_argument('--threshold', type=float, default=20.0, help="Regression threshold in percent")
+    parser.add_argument('--min-delta-ms', type=float, default=5.0,
+                        help="Ignore slowdowns smaller than this many milliseconds")
+    parser.add_argument('--fail-on-regression', action='store_true')
+    parser.add_argument('--verbose', action='store_true')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    logging.basicConfig(level=logging.INFO if options.verbose else logging.ERROR,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if not options.verbose:
+        # The builder logs every paragraph at INFO; keep the report readable
+        logging.disable(logging.ERROR)
+    os.environ.setdefault('TRACE_SAMPLES_PER_STAGE', '10000')
+
+    sizes = parse_sizes(options.sizes)
+    work_dir = tempfile.mkdtemp(prefix="docx-bench-")
+    try:
+        # Warm up imports, style loading and numbering singletons outside the measurements
+        run_benchmark([(1, 1)], 1, work_dir)
+        measured = run_benchmark(sizes, max(1, options.repeat), work_dir, options.budget_seconds)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    result = {
+        'benchmark': 'docx_build',
+        'format_version': RESULT_FORMAT_VERSION,
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': max(1, options.repeat),
+            'budget_seconds': options.budget_seconds,
+        },
+        'sizes': measured,
+    }
+
+    output = options.output or os.path.join(
+        ROOT_DIR, 'logs', 'benchmarks', f"docx_build_{result['meta']['commit'] or 'unknown'}.json")
+    targets = [output] + ([options.baseline] if options.save_baseline else [])
+    for path in targets:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+
+    regressions = None
+    if not options.save_baseline and os.path.exists(options.baseline):
+        with open(options.baseline, 'r', encoding='utf-8') as f:
+            regressions = check_regressions(result, json.load(f), options.threshold, options.min_delta_ms)
+    print_report(result, regressions)
+    print(f"\nResults written to {', '.join(targets)}")
+
+    if options.fail_on_regression and regressions:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
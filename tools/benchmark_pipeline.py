@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+Tailoring Pipeline Benchmark
+
+Replays a corpus of resumes and job postings through the tailoring pipeline
+against the local fake LLM provider (utils.fake_llm), so throughput and
+per-stage latency can be measured without API keys and compared between
+commits.
+
+Modes:
+    direct  tailor_resume_with_llm -> render_preview_from_llm_responses -> build_docx
+    http    POST /tailor-resume and GET /download/docx/<id> through the Flask test client
+
+Examples:
+    python tools/benchmark_pipeline.py --requests 50 --concurrency 4 --latency-ms 300
+    python tools/benchmark_pipeline.py --requests 20 --combined
+    python tools/benchmark_pipeline.py --mode http --output logs/benchmarks/after.json \\
+        --compare logs/benchmarks/before.json --fail-on-regression
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import random
+import logging
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Add parent directory to path for imports
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+logger = logging.getLogger("benchmark_pipeline")
+
+RESULT_FORMAT_VERSION = 1
+
+_ROLES = ("Software Engineer", "Data Engineer", "Platform Engineer", "Product Analyst")
+_COMPANIES = ("Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries")
+_REQUIREMENTS = (
+    "5+ years building backend services in Python",
+    "Experience operating Kubernetes in production",
+    "Strong SQL and data modelling skills",
+    "Track record of mentoring engineers",
+    "Familiarity with AWS networking and IAM",
+    "Comfort owning on-call for customer-facing systems",
+)
+_SKILLS = ("Python", "SQL", "Kubernetes", "AWS", "Terraform", "Airflow", "React", "Go")
+
+
+def configure_environment(work_dir, options):
+    """
+    Point every on-disk store at the work directory and set the cache flags.
+
+    Must run before config (and anything importing it) is imported, since
+    Config reads the environment at class definition time.
+    """
+    warm = 'true' if options.warm_caches else 'false'
+    os.environ.update({
+        'USE_LLM_RESUME_PARSING': 'false',
+        'USE_LLM_RESPONSE_CACHE': warm,
+        'USE_RESUME_PARSE_CACHE': warm,
+        'USE_TAILORING_JOB_QUEUE': 'false',
+        'USE_COMBINED_TAILORING': 'true' if options.combined else 'false',
+        'LLM_RESPONSE_CACHE_PATH': os.path.join(work_dir, 'cache', 'llm_responses.sqlite3'),
+        'RESUME_PARSE_CACHE_PATH': os.path.join(work_dir, 'cache', 'resume_parses.sqlite3'),
+        'RESUME_INDEX_DB_PATH': os.path.join(work_dir, 'index', 'resume_index.sqlite3'),
+        'REQUEST_METRICS_DB_PATH': os.path.join(work_dir, 'cache', 'request_metrics.sqlite3'),
+        'TAILORING_QUEUE_PATH': os.path.join(work_dir, 'queue', 'tailoring_jobs.sqlite3'),
+        'TRACE_MAX_REQUESTS': str(max(200, options.requests)),
+        'TRACE_SAMPLES_PER_STAGE': str(max(1000, options.requests * 10)),
+    })
+
+
+def build_synthetic_corpus(corpus_dir, count, seed=0):
+    """
+    Write `count` deterministic resumes (DOCX) and job postings.
+
+    Returns:
+        List of (resume_path, job_data) pairs
+    """
+    from docx import Document
+
+    rng = random.Random(seed)
+    os.makedirs(corpus_dir, exist_ok=True)
+    corpus = []
+    for index in range(count):
+        doc = Document()
+        doc.add_heading("Contact Information", level=1)
+        doc.add_paragraph(f"Candidate {index} | candidate{index}@example.com | 555-01{index:02d}")
+        doc.add_heading("Professional Summary", level=1)
+        doc.add_paragraph("Engineer focused on reliable data and platform services. " * rng.randint(1, 3))
+        doc.add_heading("Experience", level=1)
+        for role in range(rng.randint(2, 5)):
+            doc.add_paragraph(f"{rng.choice(_COMPANIES)} | {rng.choice(_ROLES)} | {2012 + role} - {2013 + role}")
+            for _ in range(rng.randint(3, 6)):
+                doc.add_paragraph(f"• Delivered {rng.randint(2, 30)} projects improving "
+                                  f"latency by {rng.randint(5, 70)}% for internal teams")
+        doc.add_heading("Education", level=1)
+        doc.add_paragraph("State University | B.S. Computer Science | 2008 - 2012")
+        doc.add_heading("Skills", level=1)
+        doc.add_paragraph(", ".join(rng.sample(_SKILLS, 5)))
+        doc.add_heading("Projects", level=1)
+        doc.add_paragraph(f"Open source scheduler | 2021 | Used by {rng.randint(10, 500)} teams")
+
+        resume_path = os.path.join(corpus_dir, f"resume_{index:03d}.docx")
+        doc.save(resume_path)
+        job_data = {
+            'job_title': rng.choice(_ROLES),
+            'company': rng.choice(_COMPANIES),
+            'requirements': rng.sample(_REQUIREMENTS, 4),
+            'skills': rng.sample(_SKILLS, 4),
+        }
+        corpus.append((resume_path, job_data))
+    return corpus
+
+
+def load_corpus(corpus_dir):
+    """
+    Load a corpus directory: *.docx resumes plus jobs.json (a list of job_data dicts).
+
+    Resumes and jobs are paired round-robin.
+    """
+    resumes = sorted(os.path.join(corpus_dir, name) for name in os.listdir(corpus_dir)
+                     if name.lower().endswith('.docx'))
+    with open(os.path.join(corpus_dir, 'jobs.json'), 'r', encoding='utf-8') as f:
+        jobs = json.load(f)
+    if not resumes or not jobs:
+        raise ValueError(f"Corpus {corpus_dir} needs at least one .docx resume and one job in jobs.json")
+    count = max(len(resumes), len(jobs))
+    return [(resumes[i % len(resumes)], jobs[i % len(jobs)]) for i in range(count)]
+
+
+class RSSSampler:
+    """Samples process RSS on a background thread and keeps the peak."""
+
+    def __init__(self, interval=0.05):
+        import psutil
+
+        self.interval = interval
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+        self.start_bytes = self._process.memory_info().rss
+        self.peak_bytes = self.start_bytes
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_bytes = max(self.peak_bytes, self._process.memory_info().rss)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, self._process.memory_info().rss)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def _direct_runner(options, upload_folder):
+    """One request = tailor, render the preview, build the DOCX (what a user round trip costs)"""
+    from flask import Flask
+    from claude_integration import tailor_resume_with_llm
+    from html_generator import render_preview_from_llm_responses
+    from utils.docx_builder import build_docx
+
+    app = Flask("benchmark")
+    app.config['UPLOAD_FOLDER'] = upload_folder
+    temp_dir = os.path.join(upload_folder, 'temp_session_data')
+
+    def run(request_id, resume_path, job_data):
+        with app.app_context():
+            tailor_resume_with_llm(resume_path, job_data, "fake-benchmark-key", options.provider,
+                                   None, request_id)
+            render_preview_from_llm_responses(request_id, upload_folder)
+            build_docx(request_id, temp_dir)
+    return run
+
+
+def _http_runner(options, upload_folder):
+    """One request = POST /tailor-resume then GET /download/docx/<request_id>"""
+    from app import app
+
+    app.config.update({
+        'UPLOAD_FOLDER': upload_folder,
+        'TESTING': True,
+        'CLAUDE_API_KEY': 'sk-ant-fake-benchmark',
+        'OPENAI_API_KEY': 'sk-fake-benchmark',
+    })
+    client = app.test_client()
+
+    def run(request_id, resume_path, job_data):
+        filename = os.path.basename(resume_path)
+        response = client.post('/tailor-resume', json={
+            'resumeFilename': filename,
+            'jobRequirements': job_data,
+            'llmProvider': options.provider,
+        })
+        payload = response.get_json() or {}
+        if response.status_code != 200 or not payload.get('success'):
+            raise RuntimeError(f"/tailor-resume returned {response.status_code}: {payload.get('error')}")
+        download = client.get(f"/download/docx/{payload['request_id']}")
+        if download.status_code != 200:
+            raise RuntimeError(f"/download/docx returned {download.status_code}")
+    return run
+
+
+def run_benchmark(options, work_dir):
+    """
+    Replay the corpus and collect throughput, latency, memory and allocation figures.
+
+    The process must already be configured with configure_environment().
+    """
+    from utils.fake_llm import FakeLLMProvider
+    from utils.tracing import get_tracer, trace_request, trace_span
+
+    upload_folder = os.path.join(work_dir, 'uploads')
+    os.makedirs(upload_folder, exist_ok=True)
+    if options.corpus:
+        corpus = load_corpus(options.corpus)
+    else:
+        corpus = build_synthetic_corpus(os.path.join(work_dir, 'corpus'), options.resumes, options.seed)
+    # The HTTP route resolves resumes relative to the upload folder
+    for resume_path, _ in corpus:
+        shutil.copy(resume_path, upload_folder)
+    corpus = [(os.path.join(upload_folder, os.path.basename(path)), job) for path, job in corpus]
+
+    fake = FakeLLMProvider(latency_ms=options.latency_ms, jitter_ms=options.jitter_ms,
+                           response_scale=options.response_scale, failure_rate=options.failure_rate,
+                           seed=options.seed)
+    runner = (_http_runner if options.mode == 'http' else _direct_runner)(options, upload_folder)
+    tracer = get_tracer()
+    errors = []
+
+    def one_request(index):
+        resume_path, job_data = corpus[index % len(corpus)]
+        request_id = f"bench-{index:05d}"
+        try:
+            with trace_request(request_id), trace_span("request", mode=options.mode):
+                runner(request_id, resume_path, job_data)
+        except Exception as e:
+            errors.append(f"{request_id}: {e}")
+
+    rate_limiter = None
+    if options.rate_limit_rpm:
+        from utils.rate_limiter import MemoryBucketStore, RateLimiter
+        # Pace requests only; the fake reports no quota headers
+        limits = {provider: (options.rate_limit_rpm, 10 ** 9) for provider in ('claude', 'openai')}
+        rate_limiter = RateLimiter(MemoryBucketStore(), limits, max_wait_seconds=3600)
+
+    with fake.install(rate_limiter=rate_limiter):
+        # Warm-up requests pay for imports and first-use initialisation; they are not measured
+        for index in range(options.warmup):
+            one_request(-1 - index)
+        tracer.clear()
+        errors.clear()
+        fake.stats.update(calls=0, failures=0, input_tokens=0, output_tokens=0)
+
+        if options.trace_allocations:
+            tracemalloc.start()
+        blocks_before = sys.getallocatedblocks()
+        with RSSSampler() as rss:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options.concurrency,
+                                    thread_name_prefix="bench") as executor:
+                list(executor.map(one_request, range(options.requests)))
+            wall_seconds = time.perf_counter() - started
+        blocks_after = sys.getallocatedblocks()
+        traced_peak = None
+        if options.trace_allocations:
+            traced_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    stages = tracer.stage_summary()
+    request_stage = stages.pop('request', {})
+    return {
+        'benchmark': 'pipeline',
+        'format_version': RESULT_FORMAT_VERSION,
+        'meta': {
+            'label': options.label,
+            'commit': _git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'mode': options.mode,
+            'provider': options.provider,
+            'corpus': options.corpus or f"synthetic:{options.resumes}",
+            'concurrency': options.concurrency,
+            'latency_ms': options.latency_ms,
+            'jitter_ms': options.jitter_ms,
+            'response_scale': options.response_scale,
+            'failure_rate': options.failure_rate,
+            'warm_caches': options.warm_caches,
+            'combined': options.combined,
+            'rate_limit_rpm': options.rate_limit_rpm,
+            'seed': options.seed,
+        },
+        'throughput': {
+            'requests': options.requests,
+            'failed': len(errors),
+            'wall_seconds': round(wall_seconds, 3),
+            'requests_per_second': round(options.requests / wall_seconds, 3) if wall_seconds else 0.0,
+        },
+        'latency': {key: value for key, value in request_stage.items() if key.endswith('_ms')},
+        'stages': stages,
+        'memory': {
+            'rss_start_mb': round(rss.start_bytes / (1024 * 1024), 2),
+            'peak_rss_mb': round(rss.peak_bytes / (1024 * 1024), 2),
+            'allocated_blocks_delta': blocks_after - blocks_before,
+            'tracemalloc_peak_mb': round(traced_peak / (1024 * 1024), 2) if traced_peak is not None else None,
+        },
+        'llm': dict(fake.stats),
+        'rate_limits': rate_limiter.summary()['providers'] if rate_limiter else None,
+        'errors': errors[:20],
+    }
+
+
+def compare_results(current, baseline, threshold_pct=10.0):
+    """
+    Compare two result files.
+
+    Returns:
+        List of (metric, baseline_value, current_value, change_pct, regressed) rows;
+        throughput regresses when it drops, latencies when they rise, by more than threshold_pct
+    """
+    rows = []
+
+    def add(metric, before, after, higher_is_better=False):
+        if not before or after is None:
+            return
+        change = (after - before) / before * 100
+        regressed = (-change if higher_is_better else change) > threshold_pct
+        rows.append((metric, before, after, round(change, 1), regressed))
+
+    add('requests_per_second', baseline['throughput'].get('requests_per_second'),
+        current['throughput'].get('requests_per_second'), higher_is_better=True)
+    for key in ('p50_ms', 'p95_ms', 'p99_ms'):
+        add(f'request.{key}', baseline['latency'].get(key), current['latency'].get(key))
+    for stage, values in sorted(current['stages'].items()):
+        before = baseline['stages'].get(stage)
+        if before:
+            add(f'{stage}.p95_ms', before.get('p95_ms'), values.get('p95_ms'))
+    add('peak_rss_mb', baseline['memory'].get('peak_rss_mb'), current['memory'].get('peak_rss_mb'))
+    return rows
+
+
+def print_report(result, comparison=None):
+    throughput = result['throughput']
+    print(f"\nPipeline benchmark ({result['meta']['mode']}, {result['meta']['provider']}, "
+          f"commit {result['meta']['commit'] or 'unknown'})")
+    print(f"  {throughput['requests']} requests, {throughput['failed']} failed, "
+          f"{throughput['wall_seconds']}s -> {throughput['requests_per_second']} req/s")
+    latency = result['latency']
+    if latency:
+        print(f"  request latency p50 {latency['p50_ms']}ms  p95 {latency['p95_ms']}ms  p99 {latency['p99_ms']}ms")
+    print(f"  {'stage':<28}{'count':>7}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}")
+    for stage, values in result['stages'].items():
+        print(f"  {stage:<28}{values['count']:>7}{values['p50_ms']:>11}{values['p95_ms']:>11}{values['p99_ms']:>11}")
+    memory = result['memory']
+    print(f"  peak RSS {memory['peak_rss_mb']}MB (start {memory['rss_start_mb']}MB), "
+          f"allocated blocks delta {memory['allocated_blocks_delta']}"
+          + (f", tracemalloc peak {memory['tracemalloc_peak_mb']}MB" if memory['tracemalloc_peak_mb'] is not None else ""))
+    if comparison:
+        print(f"\n  {'metric':<36}{'baseline':>12}{'current':>12}{'change':>9}")
+        for metric, before, after, change, regressed in comparison:
+            flag = "  REGRESSION" if regressed else ""
+            print(f"  {metric:<36}{before:>12}{after:>12}{change:>8}%{flag}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the tailoring pipeline against a fake LLM provider")
+    parser.add_argument('--mode', choices=['direct', 'http'], default='direct')
+    parser.add_argument('--provider', choices=['claude', 'openai'], default='openai')
+    parser.add_argument('--requests', type=int, default=20, help="Measured requests")
+    parser.add_argument('--warmup', type=int, default=1, help="Unmeasured warm-up requests")
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--corpus', help="Directory of *.docx resumes plus jobs.json (default: synthetic)")
+    parser.add_argument('--resumes', type=int, default=5, help="Synthetic corpus size")
+    parser.add_argument('--latency-ms', type=float, default=200.0, help="Fake LLM latency per call")
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--response-scale', type=float, default=1.0, help="Fake reply size multiplier")
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--warm-caches', action='store_true',
+                        help="Keep the LLM response and resume parse caches on (replays then hit them)")
+    parser.add_argument('--combined', action='store_true',
+                        help="Tailor all sections in one LLM request (USE_COMBINED_TAILORING)")
+    parser.add_argument('--rate-limit-rpm', type=int, default=0,
+                        help="Pace fake LLM calls with the client-side rate limiter at this many requests/min")
+    parser.add_argument('--trace-allocations', action='store_true',
+                        help="Measure peak allocations with tracemalloc (slows the run)")
+    parser.add_argument('--label', default=None, help="Free-form label stored with the results")
+    parser.add_argument('--output', help="Results JSON path (default: logs/benchmarks/pipeline_<commit>.json)")
+    parser.add_argument('--compare', help="Baseline results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=10.0, help="Regression threshold in percent")
+    parser.add_argument('--fail-on-regression', action='store_true')
+    parser.add_argument('--keep-workdir', action='store_true')
+    parser.add_argument('--verbose', action='store_true')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    logging.basicConfig(level=logging.INFO if options.verbose else logging.ERROR,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if not options.verbose:
+        # The pipeline logs (and prints) heavily at INFO; keep the report readable
+        logging.disable(logging.ERROR)
+
+    work_dir = tempfile.mkdtemp(prefix="pipeline-bench-")
+    configure_environment(work_dir, options)
+    try:
+        if options.verbose:
+            result = run_benchmark(options, work_dir)
+        else:
+            with open(os.devnull, 'w') as devnull:
+                stdout = sys.stdout
+                sys.stdout = devnull
+                try:
+                    result = run_benchmark(options, work_dir)
+                finally:
+                    sys.stdout = stdout
+    finally:
+        if options.keep_workdir:
+            print(f"Work directory kept at {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = options.output or os.path.join(
+        ROOT_DIR, 'logs', 'benchmarks', f"pipeline_{result['meta']['commit'] or 'unknown'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2)
+
+    comparison = None
+    if options.compare:
+        with open(options.compare, 'r', encoding='utf-8') as f:
+            comparison = compare_results(result, json.load(f), options.threshold)
+    print_report(result, comparison)
+    print(f"\nResults written to {output}")
+
+    if options.fail_on_regression and comparison and any(row[4] for row in comparison):
+        return 1
+    return 1 if result['throughput']['failed'] and not options.failure_rate else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
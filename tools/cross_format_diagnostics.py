@@ -8,10 +8,16 @@ across HTML, PDF, and DOCX formats to identify inconsistencies.
 
 import json
 import logging
+import os
+import sys
 from pathlib import Path
 from typing import Dict, Any, List, Tuple
 from dataclasses import dataclass
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.token_service import TOKENS_PATH, get_token_service
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -36,8 +42,11 @@ class CrossFormatDiagnostics:
     def _load_design_tokens(self) -> Dict[str, Any]:
         """Load and parse design tokens."""
         try:
-            with open(self.design_tokens_path, 'r') as f:
-                tokens = json.load(f)
+            if self.design_tokens_path.resolve() == TOKENS_PATH:
+                tokens = get_token_service().tokens()
+            else:
+                with open(self.design_tokens_path, 'r') as f:
+                    tokens = json.load(f)
             logger.info(f"Loaded {len(tokens)} design tokens")
             return tokens
         except Exception as e:
@@ -92,12 +101,7 @@ class CrossFormatDiagnostics:
         logger.info("🔍 Analyzing DOCX alignment...")
         
         # Check DOCX style configuration
-        docx_styles_path = Path("static/styles/_docx_styles.json")
-        docx_styles = {}
-        
-        if docx_styles_path.exists():
-            with open(docx_styles_path, 'r') as f:
-                docx_styles = json.load(f)
+        docx_styles = get_token_service().docx_styles()
         
         return FormatDiagnostic(
             format_name="DOCX",
@@ -1,8 +1,7 @@
 #!/usr/bin/env python3
 
 import google.generativeai as genai
-from openai import OpenAI, AzureOpenAI
-from anthropic import Anthropic
+from openai import AzureOpenAI
 import argparse
 import os
 from dotenv import load_dotenv
@@ -12,6 +11,9 @@ import base64
 from typing import Optional, Union, List
 import mimetypes
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.llm_client_registry import get_llm_client, get_llm_client_registry
+
 def load_environment():
     """Load environment variables from .env files in order of precedence"""
     # Order of precedence:
@@ -71,10 +73,7 @@ def create_llm_client(provider="openai"):
         base_url = os.getenv('OPENAI_BASE_URL', "https://api.openai.com/v1")
         if not api_key:
             raise ValueError("OPENAI_API_KEY not found in environment variables")
-        return OpenAI(
-            api_key=api_key,
-            base_url=base_url
-        )
+        return get_llm_client("openai", api_key, base_url=base_url)
     elif provider == "azure":
         api_key = os.getenv('AZURE_OPENAI_API_KEY')
         if not api_key:
@@ -82,31 +81,24 @@ def create_llm_client(provider="openai"):
         return AzureOpenAI(
             api_key=api_key,
             api_version="2024-08-01-preview",
-            azure_endpoint="https://msopenai.openai.azure.com"
+            azure_endpoint="https://msopenai.openai.azure.com",
+            http_client=get_llm_client_registry().http_client("openai")
         )
     elif provider == "deepseek":
         api_key = os.getenv('DEEPSEEK_API_KEY')
         if not api_key:
             raise ValueError("DEEPSEEK_API_KEY not found in environment variables")
-        return OpenAI(
-            api_key=api_key,
-            base_url="https://api.deepseek.com/v1",
-        )
+        return get_llm_client("openai", api_key, base_url="https://api.deepseek.com/v1")
     elif provider == "siliconflow":
         api_key = os.getenv('SILICONFLOW_API_KEY')
         if not api_key:
             raise ValueError("SILICONFLOW_API_KEY not found in environment variables")
-        return OpenAI(
-            api_key=api_key,
-            base_url="https://api.siliconflow.cn/v1"
-        )
+        return get_llm_client("openai", api_key, base_url="https://api.siliconflow.cn/v1")
     elif provider == "anthropic":
         api_key = os.getenv('ANTHROPIC_API_KEY')
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY not found in environment variables")
-        return Anthropic(
-            api_key=api_key
-        )
+        return get_llm_client("anthropic", api_key)
     elif provider == "gemini":
         api_key = os.getenv('GOOGLE_API_KEY')
         if not api_key:
@@ -114,10 +106,7 @@ def create_llm_client(provider="openai"):
         genai.configure(api_key=api_key)
         return genai
     elif provider == "local":
-        return OpenAI(
-            base_url="http://192.168.180.137:8006/v1",
-            api_key="not-needed"
-        )
+        return get_llm_client("openai", "not-needed", base_url="http://192.168.180.137:8006/v1")
     else:
         raise ValueError(f"Unsupported provider: {provider}")
 
@@ -33,6 +33,8 @@ from docx import Document
 from docx.oxml import parse_xml
 from flask import current_app
 
+from utils.document_index import DocumentIndex, analyze_document
+
 # A12: XML Namespace Helper - Extract WordprocessingML namespace constant
 W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
 
@@ -69,7 +71,8 @@ class BulletReconciliationEngine:
         self.start_time = None
         self.memory_start = None
         
-    def reconcile_bullet_styles(self, doc: Document, numbering_engine, num_id: int) -> Dict[str, Any]:
+    def reconcile_bullet_styles(self, doc: Document, numbering_engine, num_id: int,
+                                index: Optional[DocumentIndex] = None) -> Dict[str, Any]:
         """
         Single pass to ensure all bullets have native numbering.
         
@@ -84,6 +87,7 @@ class BulletReconciliationEngine:
             doc: The Document object to reconcile
             numbering_engine: NumberingEngine instance for applying bullets
             num_id: The numbering ID to use for repairs
+            index: Analysis of doc from analyze_document (built here if omitted)
             
         Returns:
             Dict with reconciliation statistics and performance metrics
@@ -97,11 +101,12 @@ class BulletReconciliationEngine:
             else:
                 self.logger.info(f"🛡️ Starting bullet reconciliation for request {self.request_id}")
             
-            # B1: Handle user-supplied style name collision
-            self._handle_style_collision(doc)
+            # B1: Handle user-supplied style name collision (a rename invalidates the index)
+            if self._handle_style_collision(doc):
+                index = None
             
             # A3 + B10: Scan full document tree including tables, headers, footers, text-boxes
-            bullet_paragraphs = self._scan_bullet_paragraphs(doc)
+            bullet_paragraphs = self._scan_bullet_paragraphs(doc, index)
             
             repaired_count = 0
             total_bullets = len(bullet_paragraphs)
@@ -164,12 +169,15 @@ class BulletReconciliationEngine:
             self.logger.error(f"🚨 Traceback: {traceback.format_exc()}")
             raise
     
-    def _handle_style_collision(self, doc: Document) -> None:
+    def _handle_style_collision(self, doc: Document) -> bool:
         """
         B1: Handle user-supplied style name collision.
         
         If uploaded résumé already contains a style called 'MR_BulletPoint',
         rename it to avoid our style definition being overridden.
+        
+        Returns:
+            True if a style was renamed
         """
         try:
             existing_style = None
@@ -190,18 +198,21 @@ class BulletReconciliationEngine:
                 
                 existing_style.name = new_name
                 self.logger.info(f"🔄 Renamed existing MR_BulletPoint style to {new_name}")
+                return True
                 
         except Exception as e:
             self.logger.warning(f"⚠️ Could not check for style collision: {e}")
+        return False
     
-    def _scan_bullet_paragraphs(self, doc: Document) -> List[Dict[str, Any]]:
+    def _scan_bullet_paragraphs(self, doc: Document,
+                                index: Optional[DocumentIndex] = None) -> List[Dict[str, Any]]:
         """
         A3 + B10: Find all paragraphs with MR_BulletPoint style in the full document.
         
         This scans:
-        - Main document body (including tables)
-        - Headers and footers (B10)
-        - Text boxes and drawing canvases (B10)
+        - Main document body, tables, text boxes and drawing canvases (one
+          analysis pass over every w:p under the body, shared with the caller)
+        - Headers and footers (B10), which live in their own parts
         
         Returns:
             List of dicts with paragraph info including location and original level
@@ -209,18 +220,15 @@ class BulletReconciliationEngine:
         bullet_paragraphs = []
         
         try:
-            # A3: Scan main body using full document tree (includes tables)
-            body_paras = self._scan_body_paragraphs(doc)
-            bullet_paragraphs.extend(body_paras)
+            # A3 + B10: Everything under the body comes from the analysis index
+            if index is None:
+                index = analyze_document(doc)
+            bullet_paragraphs.extend(self._scan_body_paragraphs(index))
             
             # B10: Scan headers and footers
             header_footer_paras = self._scan_headers_footers(doc)
             bullet_paragraphs.extend(header_footer_paras)
             
-            # B10: Scan text boxes and drawing canvases
-            drawing_paras = self._scan_drawing_elements(doc)
-            bullet_paragraphs.extend(drawing_paras)
-            
         except Exception as e:
             self.logger.error(f"Error scanning bullet paragraphs: {e}")
             # Fallback to basic doc.paragraphs scan
@@ -234,40 +242,16 @@ class BulletReconciliationEngine:
         
         return bullet_paragraphs
     
-    def _scan_body_paragraphs(self, doc: Document) -> List[Dict[str, Any]]:
-        """Scan main document body using XPath for full tree traversal."""
-        paragraphs = []
-        
-        try:
-            # A3: Use XPath to get all paragraphs in document body (includes tables)
-            body_element = doc._body._element
-            
-            # Fix: Use proper namespace prefix registration for XPath
-            nsmap = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
-            para_elements = body_element.xpath('.//w:p', namespaces=nsmap)
-            
-            for i, para_element in enumerate(para_elements):
-                # Find corresponding paragraph object
-                para_obj = self._element_to_paragraph(doc, para_element)
-                if para_obj and para_obj.style and para_obj.style.name == 'MR_BulletPoint':
-                    paragraphs.append({
-                        'paragraph': para_obj,
-                        'location': f'main_body[{i}]',
-                        'level': self._get_original_level(para_obj)
-                    })
-                    
-        except Exception as e:
-            self.logger.warning(f"XPath body scan failed, using fallback: {e}")
-            # Fallback to standard iteration
-            for i, para in enumerate(doc.paragraphs):
-                if para.style and para.style.name == 'MR_BulletPoint':
-                    paragraphs.append({
-                        'paragraph': para,
-                        'location': f'main_body_fallback[{i}]',
-                        'level': self._get_original_level(para)
-                    })
-        
-        return paragraphs
+    def _scan_body_paragraphs(self, index: DocumentIndex) -> List[Dict[str, Any]]:
+        """Bullet paragraphs under the body (tables and text boxes included) from the index."""
+        return [
+            {
+                'paragraph': entry.paragraph,
+                'location': f'main_body[{entry.position}]',
+                'level': entry.level
+            }
+            for entry in index.bullets('MR_BulletPoint')
+        ]
     
     def _scan_headers_footers(self, doc: Document) -> List[Dict[str, Any]]:
         """B10: Scan headers and footers for bullet paragraphs."""
@@ -305,40 +289,6 @@ class BulletReconciliationEngine:
         
         return paragraphs
     
-    def _scan_drawing_elements(self, doc: Document) -> List[Dict[str, Any]]:
-        """B10: Scan text boxes and drawing canvases for bullet paragraphs."""
-        paragraphs = []
-        
-        try:
-            # Scan for drawing elements that might contain text boxes
-            drawing_elements = doc._body._element.xpath('.//w:drawing')
-            for i, drawing in enumerate(drawing_elements):
-                para_elements = drawing.xpath(f'.//{W}p')
-                for j, para_element in enumerate(para_elements):
-                    para_obj = self._element_to_paragraph_generic(para_element)
-                    if para_obj and self._has_bullet_style(para_element):
-                        paragraphs.append({
-                            'paragraph': para_obj,
-                            'location': f'drawing[{i}][{j}]',
-                            'level': self._get_original_level_from_element(para_element)
-                        })
-                        
-        except Exception as e:
-            self.logger.warning(f"Drawing elements scan failed: {e}")
-        
-        return paragraphs
-    
-    def _element_to_paragraph(self, doc: Document, para_element) -> Optional[Any]:
-        """Convert XML element to paragraph object."""
-        try:
-            # Find matching paragraph in doc.paragraphs
-            for para in doc.paragraphs:
-                if para._element == para_element:
-                    return para
-        except Exception:
-            pass
-        return None
-    
     def _element_to_paragraph_generic(self, para_element) -> Optional[Any]:
         """Create a generic paragraph object from XML element."""
         try:
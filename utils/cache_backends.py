@@ -0,0 +1,458 @@
+"""
+Cache Backends
+
+This module provides small key/value cache backends shared by the
+application's caching layers (LLM responses, parsed resumes, job analysis).
+
+Key Features:
+- In-memory LRU backend with TTL, entry-count and byte-size limits
+- SQLite backend (WAL mode) shared safely across gunicorn workers
+- thread_local_connection(): per-thread WAL connections, reopened after fork,
+  used by every SQLite store in the app
+- Tiered cache that layers a fast front backend over a persistent one
+- Hit/miss/eviction counters on every backend
+
+Author: Resume Tailor Team
+Status: Production Ready
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def thread_local_connection(db_path: str, timeout: float = 10.0, isolation_level: Optional[str] = "",
+                            row_factory: Optional[Callable] = None) -> Callable[[], sqlite3.Connection]:
+    """
+    Return a callable giving each thread its own WAL-mode connection to db_path.
+
+    The connection is opened on a thread's first call and opened again in a
+    forked child, since SQLite connections must not cross fork(). Pass
+    isolation_level=None for autocommit (transactions opened with BEGIN).
+    """
+    local = threading.local()
+
+    def connection() -> sqlite3.Connection:
+        conn = getattr(local, 'conn', None)
+        if conn is None or getattr(local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(db_path, timeout=timeout, isolation_level=isolation_level)
+            if row_factory is not None:
+                conn.row_factory = row_factory
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            local.conn = conn
+            local.pid = os.getpid()
+        return conn
+    return connection
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate the stored size of a cache value in bytes."""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    try:
+        return len(json.dumps(value, default=str).encode('utf-8'))
+    except (TypeError, ValueError):
+        return 0
+
+
+@dataclass
+class CacheStats:
+    """Counters collected by a cache backend."""
+    hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        lookups = self.hits + self.misses
+        data['hit_rate'] = (self.hits / lookups * 100) if lookups else 0.0
+        return data
+
+
+class CacheBackend:
+    """Base class for cache backends."""
+
+    name = "base"
+
+    def __init__(self, ttl_seconds: Optional[float] = None,
+                 max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None):
+        """
+        Initialize the backend limits.
+
+        Args:
+            ttl_seconds: Entries older than this are treated as missing (None = no expiry)
+            max_entries: Maximum number of entries kept (None = unbounded)
+            max_bytes: Maximum total value size kept (None = unbounded)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._stats_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def set(self, key: str, value: Any) -> None:
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def clear(self) -> None:
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def summary(self) -> Dict[str, Any]:
+        """Return backend configuration and counters."""
+        with self._stats_lock:
+            stats = self.stats.to_dict()
+        return {
+            'backend': self.name,
+            'ttl_seconds': self.ttl_seconds,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'stats': stats,
+        }
+
+    def _count(self, counter: str, amount: int = 1):
+        with self._stats_lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + amount)
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+
+class MemoryLRUBackend(CacheBackend):
+    """Thread-safe in-process LRU cache."""
+
+    name = "memory"
+
+    def __init__(self, ttl_seconds: Optional[float] = None,
+                 max_entries: Optional[int] = 256,
+                 max_bytes: Optional[int] = None):
+        super().__init__(ttl_seconds, max_entries, max_bytes)
+        # key -> (value, created_at, size)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[1], now):
+                self._remove(key)
+                self._count('expirations')
+                entry = None
+            if entry is None:
+                self._count('misses')
+                return None
+            self._entries.move_to_end(key)
+        self._count('hits')
+        return entry[0]
+
+    def set(self, key: str, value: Any) -> None:
+        size = estimate_size(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            logger.debug(f"Cache value for {key[:12]} larger than max_bytes, not cached")
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.time(), size)
+            self._total_bytes += size
+            self._evict()
+        self._count('sets')
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def summary(self) -> Dict[str, Any]:
+        data = super().summary()
+        with self._lock:
+            data['entries'] = len(self._entries)
+            data['total_bytes'] = self._total_bytes
+        return data
+
+    def _remove(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self._total_bytes -= size
+
+    def _evict(self):
+        """Drop least recently used entries until limits hold (lock held)."""
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries) or
+            (self.max_bytes is not None and self._total_bytes > self.max_bytes)
+        ):
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self._count('evictions')
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    SQLite-backed cache shared by every process that opens the same file.
+
+    Values are stored as JSON text. The database runs in WAL mode so readers
+    in one gunicorn worker do not block writers in another. Size limits are
+    enforced every ``prune_interval`` writes to keep writes O(1) amortized.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, db_path: str, table: str = "cache_entries",
+                 ttl_seconds: Optional[float] = None,
+                 max_entries: Optional[int] = 5000,
+                 max_bytes: Optional[int] = None,
+                 prune_interval: int = 32):
+        super().__init__(ttl_seconds, max_entries, max_bytes)
+        if not table.isidentifier():
+            raise ValueError(f"Invalid cache table name: {table}")
+        self.db_path = db_path
+        self.table = table
+        self.prune_interval = max(1, prune_interval)
+        self._writes_since_prune = 0
+        self._connection = thread_local_connection(db_path)
+        self._write_lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, "
+                "last_access REAL NOT NULL, size INTEGER NOT NULL)"
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.table}_last_access "
+                f"ON {self.table} (last_access)"
+            )
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self._expired(row[1], now):
+                with conn:
+                    conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._count('expirations')
+                row = None
+            if row is None:
+                self._count('misses')
+                return None
+            with conn:
+                conn.execute(
+                    f"UPDATE {self.table} SET last_access = ? WHERE key = ?", (now, key)
+                )
+            self._count('hits')
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"SQLite cache read failed for {self.db_path}: {e}")
+            self._count('misses')
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        try:
+            payload = json.dumps(value, ensure_ascii=False)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Value for cache key {key[:12]} is not JSON serializable: {e}")
+            return
+        size = len(payload.encode('utf-8'))
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        now = time.time()
+        try:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} "
+                    "(key, value, created_at, last_access, size) VALUES (?, ?, ?, ?, ?)",
+                    (key, payload, now, now, size)
+                )
+            self._count('sets')
+            with self._write_lock:
+                self._writes_since_prune += 1
+                should_prune = self._writes_since_prune >= self.prune_interval
+                if should_prune:
+                    self._writes_since_prune = 0
+            if should_prune:
+                self.prune()
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite cache write failed for {self.db_path}: {e}")
+
+    def delete(self, key: str) -> None:
+        try:
+            conn = self._connection()
+            with conn:
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite cache delete failed for {self.db_path}: {e}")
+
+    def clear(self) -> None:
+        try:
+            conn = self._connection()
+            with conn:
+                conn.execute(f"DELETE FROM {self.table}")
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite cache clear failed for {self.db_path}: {e}")
+
+    def prune(self) -> int:
+        """Apply TTL, entry and byte limits. Returns the number of rows removed."""
+        removed = 0
+        try:
+            conn = self._connection()
+            with conn:
+                if self.ttl_seconds is not None:
+                    cursor = conn.execute(
+                        f"DELETE FROM {self.table} WHERE created_at < ?",
+                        (time.time() - self.ttl_seconds,)
+                    )
+                    if cursor.rowcount > 0:
+                        self._count('expirations', cursor.rowcount)
+                        removed += cursor.rowcount
+                if self.max_entries is not None:
+                    cursor = conn.execute(
+                        f"DELETE FROM {self.table} WHERE key IN ("
+                        f"SELECT key FROM {self.table} ORDER BY last_access DESC "
+                        "LIMIT -1 OFFSET ?)",
+                        (self.max_entries,)
+                    )
+                    if cursor.rowcount > 0:
+                        self._count('evictions', cursor.rowcount)
+                        removed += cursor.rowcount
+                if self.max_bytes is not None:
+                    # Keep the most recently used rows whose running size fits the budget
+                    cursor = conn.execute(
+                        f"DELETE FROM {self.table} WHERE key IN ("
+                        "SELECT key FROM (SELECT key, SUM(size) OVER "
+                        "(ORDER BY last_access DESC, key) AS running "
+                        f"FROM {self.table}) WHERE running > ?)",
+                        (self.max_bytes,)
+                    )
+                    if cursor.rowcount > 0:
+                        self._count('evictions', cursor.rowcount)
+                        removed += cursor.rowcount
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite cache prune failed for {self.db_path}: {e}")
+        return removed
+
+    def summary(self) -> Dict[str, Any]:
+        data = super().summary()
+        data['db_path'] = self.db_path
+        try:
+            row = self._connection().execute(
+                f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}"
+            ).fetchone()
+            data['entries'], data['total_bytes'] = row[0], row[1]
+        except sqlite3.Error as e:
+            data['error'] = str(e)
+        return data
+
+
+class TieredCache:
+    """
+    Read-through cache over an ordered list of backends (fastest first).
+
+    A hit in a slower tier is copied into the faster tiers; writes go to all
+    tiers.
+    """
+
+    def __init__(self, backends: List[CacheBackend], name: str = "cache"):
+        if not backends:
+            raise ValueError("TieredCache needs at least one backend")
+        self.backends = backends
+        self.name = name
+        self.stats = CacheStats()
+        self._stats_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        for index, backend in enumerate(self.backends):
+            value = backend.get(key)
+            if value is not None:
+                for faster in self.backends[:index]:
+                    faster.set(key, value)
+                with self._stats_lock:
+                    self.stats.hits += 1
+                return value
+        with self._stats_lock:
+            self.stats.misses += 1
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        if value is None:
+            return
+        for backend in self.backends:
+            backend.set(key, value)
+        with self._stats_lock:
+            self.stats.sets += 1
+
+    def delete(self, key: str) -> None:
+        for backend in self.backends:
+            backend.delete(key)
+
+    def clear(self) -> None:
+        for backend in self.backends:
+            backend.clear()
+
+    def summary(self) -> Dict[str, Any]:
+        """Return overall counters plus the summary of every tier."""
+        with self._stats_lock:
+            stats = self.stats.to_dict()
+        return {
+            'name': self.name,
+            'stats': stats,
+            'tiers': [backend.summary() for backend in self.backends],
+        }
+
+
+class DisabledCache:
+    """Stand-in used when a cache is turned off: every lookup misses."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def get(self, key: str) -> None:
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def delete(self, key: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def summary(self) -> Dict[str, Any]:
+        return {'name': self.name, 'enabled': False}
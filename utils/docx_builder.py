@@ -20,6 +20,11 @@ from docx.enum.style import WD_STYLE_TYPE
 from docx.text.paragraph import Paragraph
 from docx.oxml.ns import qn
 
+from utils.document_index import SECTION_HEADER_STYLE_NAMES, DocumentIndex, analyze_document
+from utils.docx_template import get_styled_document
+from utils.session_store import get_session_store
+from utils.tracing import PhaseTimer, traced
+
 # Enhanced architecture imports
 try:
     from style_manager import StyleManager
@@ -36,6 +41,7 @@ except ImportError:
 # Import our style registry and section builder
 try:
     from word_styles.registry import USE_STYLE_REGISTRY, get_or_create_style, apply_direct_paragraph_formatting
+    from word_styles.registry import create_registered_styles
     from word_styles.section_builder import add_section_header as registry_add_section_header
     from word_styles.section_builder import add_content_paragraph, add_bullet_point, remove_empty_paragraphs
     from word_styles.section_builder import add_role_box
@@ -79,41 +85,31 @@ DOCX_USE_NATIVE_BULLETS = os.getenv('DOCX_USE_NATIVE_BULLETS', 'true').lower() =
 # Only enable native bullets if both the flag is set AND the engine is available
 NATIVE_BULLETS_ENABLED = DOCX_USE_NATIVE_BULLETS and USE_NATIVE_NUMBERING
 
+# Rogue-formatting checkpoints rescan the document after every bullet; they are
+# diagnostics only, so they run for debug builds or when this flag is set
+DOCX_BULLET_CHECKPOINTS = os.getenv('DOCX_BULLET_CHECKPOINTS', 'false').lower() == 'true'
+
 logger = logging.getLogger(__name__)
 
 logger.info(f"🎯 DOCX Feature Flags: NATIVE_BULLETS={DOCX_USE_NATIVE_BULLETS}, ENGINE_AVAILABLE={USE_NATIVE_NUMBERING}, ENABLED={NATIVE_BULLETS_ENABLED}")
 
+def _section_or_empty(sections: Dict[str, Any], section_name: str) -> Any:
+    """Pick one section out of a loaded request, logging its shape."""
+    data = sections.get(section_name)
+    if data is None:
+        logger.warning(f"Section '{section_name}' not found in session data")
+        return {}
+    logger.info(f"Successfully loaded '{section_name}' section: {type(data)}")
+    if isinstance(data, dict):
+        logger.info(f"Dict keys for {section_name}: {list(data.keys())}")
+    elif isinstance(data, list):
+        logger.info(f"List length for {section_name}: {len(data)}")
+    return data
+
 def load_section_json(request_id: str, section_name: str, temp_dir: str) -> Dict[str, Any]:
     """Load a section's JSON data from the temporary session directory."""
     try:
-        file_path = os.path.join(temp_dir, f"{request_id}_{section_name}.json")
-        logger.info(f"Looking for section file: {file_path}")
-        
-        if not os.path.exists(file_path):
-            logger.warning(f"File not found: {file_path}")
-            return {}
-            
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            logger.info(f"Successfully loaded '{section_name}' section: {type(data)}")
-            if isinstance(data, dict):
-                logger.info(f"Dict keys for {section_name}: {list(data.keys())}")
-            elif isinstance(data, list):
-                logger.info(f"List length for {section_name}: {len(data)}")
-            return data
-    except FileNotFoundError:
-        logger.warning(f"Section file not found: {file_path}")
-        return {}
-    except json.JSONDecodeError as e:
-        logger.error(f"Error decoding JSON from {file_path}: {e}")
-        # Try to get raw content for debugging
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                logger.error(f"Raw content from {file_path} (first 100 chars): {content[:100]}...")
-        except Exception:
-            pass
-        return {}
+        return _section_or_empty(get_session_store(temp_dir).load_sections(request_id), section_name)
     except Exception as e:
         logger.error(f"Error loading section JSON: {e}")
         return {}
@@ -601,6 +597,7 @@ def add_bullet_point_legacy(doc: Document, text: str, docx_styles: Dict[str, Any
     logger.debug(f"✅ Legacy bullet created with design token zero spacing")
     return bullet_para
 
+@traced("build_docx.bullet")
 def create_bullet_point(doc: Document, text: str, docx_styles: Dict[str, Any] = None, 
                        numbering_engine: NumberingEngine = None, num_id: int = 100,
                        o3_engine: Any = None, section_name: str = "unknown") -> Paragraph:
@@ -759,14 +756,26 @@ def add_role_description(doc, text, docx_styles):
     logger.info(f"Applied MR_RoleDescription with design token spacing to: {str(text)[:30]}...")
     return role_para
 
+def _section_header_style_ids(doc) -> set:
+    """Resolve SECTION_HEADER_STYLE_NAMES to the style IDs used in w:pStyle"""
+    style_ids = set()
+    for name in SECTION_HEADER_STYLE_NAMES:
+        try:
+            style_ids.add(doc.styles[name].style_id)
+        except KeyError:
+            continue
+    return style_ids
+
 def tighten_before_headers(doc):
     """
     Finds paragraphs before section headers and sets spacing to zero.
     
-    This enhanced implementation addresses the issues identified:
-    1. Properly detects empty paragraphs that might cause unwanted spacing
-    2. Applies spacing changes directly to XML for maximum compatibility
-    3. Handles various paragraph types correctly
+    Works in one pass over the body's paragraph elements, remembering the
+    previous paragraph, so the cost stays linear in the number of paragraphs:
+    1. Unwanted empty paragraphs are removed first (style registry mode)
+    2. Headers are matched by style ID or a direct paragraph border; only the
+       paragraphs before them get a pPr/spacing change
+    3. Spacing is written as a fresh w:spacing with after=0
     
     Args:
         doc: The document to process
@@ -774,9 +783,6 @@ def tighten_before_headers(doc):
     Returns:
         Number of paragraphs fixed
     """
-    from docx.oxml import parse_xml
-    from docx.oxml.ns import nsdecls
-    
     logger.info("Starting tighten_before_headers process...")
     fixed_instances_count = 0
     
@@ -786,51 +792,32 @@ def tighten_before_headers(doc):
         remove_count = remove_empty_paragraphs(doc)
         logger.info(f"Removed {remove_count} unwanted empty paragraphs")
     
-    # Find all section headers
-    header_indices = []
-    for i, para in enumerate(doc.paragraphs):
-        # Check by style name first (most reliable)
-        if para.style and para.style.name in ['BoxedHeading2', 'Heading 2']:
-            header_indices.append(i)
-            continue
-            
-        # Check by borders (also reliable)
-        p_pr = para._element.get_or_add_pPr()
-        if p_pr.find(qn('w:pBdr')) is not None:
-            header_indices.append(i)
-            continue
-            
-        # Check by common section header names as fallback
-        section_keywords = ["PROFESSIONAL SUMMARY", "SUMMARY", "EXPERIENCE", 
-                            "EDUCATION", "SKILLS", "PROJECTS"]
-        if any(keyword in para.text.upper() for keyword in section_keywords):
-            header_indices.append(i)
-            
-    logger.info(f"Found {len(header_indices)} section headers")
-    
-    # Process paragraphs before each header (skip first header)
-    for header_idx in header_indices[1:]:  # Skip first header (no content before it)
-        if header_idx > 0:  # Safety check
-            prev_para = doc.paragraphs[header_idx - 1]
-            
-            # Apply spacing change
-            p_pr = prev_para._element.get_or_add_pPr()
-            
-            # Create spacing node with zero space after
-            spacing_xml = f'<w:spacing {nsdecls("w")} w:after="0"/>'
-            
-            # Remove existing spacing element to avoid conflicts
-            for existing in p_pr.xpath('./w:spacing'):
-                p_pr.remove(existing)
-                
-            # Add new spacing element
-            p_pr.append(parse_xml(spacing_xml))
-            
-            # Also set via API for maximum compatibility
-            prev_para.paragraph_format.space_after = Pt(0)
-            
-            logger.info(f"Fixed spacing: Set space_after=0 on paragraph before section header at index {header_idx}")
-            fixed_instances_count += 1
+    header_style_ids = _section_header_style_ids(doc)
+    w_ppr, w_pbdr, w_pstyle, w_val = qn('w:pPr'), qn('w:pBdr'), qn('w:pStyle'), qn('w:val')
+    
+    header_count = 0
+    previous = None
+    for element in doc.element.body.iterchildren(qn('w:p')):
+        p_pr = element.find(w_ppr)
+        is_header = False
+        if p_pr is not None:
+            p_style = p_pr.find(w_pstyle)
+            is_header = (p_pr.find(w_pbdr) is not None
+                         or (p_style is not None and p_style.get(w_val) in header_style_ids))
+        
+        # The first header has no content before it
+        if is_header:
+            if header_count and previous is not None:
+                prev_p_pr = previous.get_or_add_pPr()
+                # Replace any existing spacing so only space_after=0 remains
+                prev_p_pr._remove_spacing()
+                prev_p_pr.get_or_add_spacing().after = Pt(0)
+                fixed_instances_count += 1
+            header_count += 1
+        previous = element
+    
+    logger.info(f"Found {header_count} section headers; "
+                f"set space_after=0 on {fixed_instances_count} paragraphs before them")
     
     # DIAGNOSTIC: Check if MR_Company style was actually created (O3 Checklist #2)
     logger.info("🔍 DIAGNOSTIC #2: Listing all document styles before save...")
@@ -940,36 +927,44 @@ def parse_contact_string(contact_text: str) -> Dict[str, str]:
     logger.info(f"Final parsed contact data: {contact_data}")
     return contact_data
 
-def _cleanup_bullet_direct_formatting(doc: Document) -> int:
+def _cleanup_bullet_direct_formatting(doc: Document, index: Optional[DocumentIndex] = None) -> int:
     """
     o3's Nuclear Option: Remove all direct indentation from bullet paragraphs.
     
     This addresses the rogue L-0 direct formatting that causes Word to show
     "Left: 0" instead of the proper bullet indentation from L-1 XML numbering.
     
+    Args:
+        doc: Document to clean
+        index: Analysis of doc from analyze_document (built here if omitted);
+            each indexed bullet's indents are re-read, so repairs made after
+            the analysis are still seen
+    
     Returns:
         Number of bullet paragraphs cleaned
     """
     cleaned_count = 0
-    
-    for para in doc.paragraphs:
-        if para.style and para.style.name == "MR_BulletPoint":
-            # Check if paragraph has rogue direct formatting
-            before_left = para.paragraph_format.left_indent
-            before_first = para.paragraph_format.first_line_indent
+    if index is None:
+        index = analyze_document(doc)
+    
+    for entry in index.bullets("MR_BulletPoint", body_only=True):
+        para = entry.paragraph
+        # Check if paragraph has rogue direct formatting
+        before_left = para.paragraph_format.left_indent
+        before_first = para.paragraph_format.first_line_indent
+        
+        if before_left or before_first:
+            # o3's nuclear cleanup - remove ALL direct formatting
+            para.paragraph_format.left_indent = None
+            para.paragraph_format.first_line_indent = None
+            cleaned_count += 1
             
-            if before_left or before_first:
-                # o3's nuclear cleanup - remove ALL direct formatting
-                para.paragraph_format.left_indent = None
-                para.paragraph_format.first_line_indent = None
-                cleaned_count += 1
-                
-                if before_left:
-                    left_twips = int(before_left.twips)
-                    logger.debug(f"🧹 Removed rogue left indent: {left_twips} twips from '{para.text[:30]}...'")
-                if before_first:
-                    first_twips = int(before_first.twips)
-                    logger.debug(f"🧹 Removed rogue first line indent: {first_twips} twips from '{para.text[:30]}...'")
+            if before_left:
+                left_twips = int(before_left.twips)
+                logger.debug(f"🧹 Removed rogue left indent: {left_twips} twips from '{para.text[:30]}...'")
+            if before_first:
+                first_twips = int(before_first.twips)
+                logger.debug(f"🧹 Removed rogue first line indent: {first_twips} twips from '{para.text[:30]}...'")
     
     if cleaned_count > 0:
         logger.info(f"🧹 o3's Nuclear Cleanup: Removed direct formatting from {cleaned_count} bullet paragraphs")
@@ -978,12 +973,15 @@ def _cleanup_bullet_direct_formatting(doc: Document) -> int:
     
     return cleaned_count
 
+@traced("build_docx.rogue_check")
 def _detect_rogue_bullet_formatting(doc: Document, checkpoint_name: str) -> int:
     """
     o3's DRAMATIC DIAGNOSTIC: Detect rogue direct formatting on bullet paragraphs.
     
     This runs after every major operation to catch exactly when and where
-    direct formatting gets added to bullet paragraphs.
+    direct formatting gets added to bullet paragraphs. Each call is a full
+    analysis pass, so build_docx only runs checkpoints in debug mode (or with
+    DOCX_BULLET_CHECKPOINTS); they never change the document.
     
     Args:
         doc: Document to scan
@@ -996,31 +994,27 @@ def _detect_rogue_bullet_formatting(doc: Document, checkpoint_name: str) -> int:
     
     logger.info(f"🔍 CHECKPOINT '{checkpoint_name}': Scanning for rogue bullet formatting...")
     
-    for i, para in enumerate(doc.paragraphs):
-        if para.style and para.style.name == "MR_BulletPoint":
-            # Check for rogue direct formatting
-            left_indent = para.paragraph_format.left_indent
-            first_line_indent = para.paragraph_format.first_line_indent
-            
-            if left_indent or first_line_indent:
-                rogue_count += 1
-                
-                left_info = f"{int(left_indent.twips)} twips" if left_indent else "None"
-                first_info = f"{int(first_line_indent.twips)} twips" if first_line_indent else "None"
-                
-                logger.error(f"🚨 ROGUE FORMATTING DETECTED at checkpoint '{checkpoint_name}':")
-                logger.error(f"   Paragraph {i}: '{para.text[:50]}...'")
-                logger.error(f"   Left indent: {left_info}")
-                logger.error(f"   First line indent: {first_info}")
-                
-                # Check if it has numbering properties
-                pPr = para._element.find('.//{http://schemas.openxmlformats.org/wordprocessingml/2006/main}pPr')
-                if pPr is not None:
-                    numPr = pPr.find('.//{http://schemas.openxmlformats.org/wordprocessingml/2006/main}numPr')
-                    if numPr is not None:
-                        logger.error(f"   Has numbering: YES (this is the L-0 override bug!)")
-                    else:
-                        logger.error(f"   Has numbering: NO")
+    for entry in analyze_document(doc).direct_formatting("MR_BulletPoint"):
+        if entry.body_index is None:
+            continue
+        para = entry.paragraph
+        rogue_count += 1
+        
+        left_indent = para.paragraph_format.left_indent
+        first_line_indent = para.paragraph_format.first_line_indent
+        left_info = f"{int(left_indent.twips)} twips" if left_indent else "None"
+        first_info = f"{int(first_line_indent.twips)} twips" if first_line_indent else "None"
+        
+        logger.error(f"🚨 ROGUE FORMATTING DETECTED at checkpoint '{checkpoint_name}':")
+        logger.error(f"   Paragraph {entry.body_index}: '{para.text[:50]}...'")
+        logger.error(f"   Left indent: {left_info}")
+        logger.error(f"   First line indent: {first_info}")
+        
+        # Check if it has numbering properties
+        if entry.has_num_pr:
+            logger.error(f"   Has numbering: YES (this is the L-0 override bug!)")
+        else:
+            logger.error(f"   Has numbering: NO")
     
     if rogue_count == 0:
         logger.info(f"✅ CHECKPOINT '{checkpoint_name}': No rogue formatting detected")
@@ -1029,6 +1023,80 @@ def _detect_rogue_bullet_formatting(doc: Document, checkpoint_name: str) -> int:
     
     return rogue_count
 
+def _prepare_base_document(docx_styles: Dict[str, Any]):
+    """
+    Prepare the styled, still empty document every resume build starts from.
+    
+    Everything here depends only on the design tokens and DOCX style spec: the
+    bullet numbering definition, custom and registry styles, and the section
+    margins. build_docx clones the result through utils.docx_template instead
+    of repeating this work per request.
+    
+    Args:
+        docx_styles: DOCX style spec from StyleManager.load_docx_styles()
+        
+    Returns:
+        (Document, (numId, abstractNumId)), with None for the IDs if the
+        numbering definition could not be created
+    """
+    doc = Document()
+    numbering_ids = None
+    
+    if NATIVE_BULLETS_ENABLED:
+        try:
+            # C1/C2: Use safe allocation instead of global counter
+            num_id, abstract_num_id = NumberingEngine._allocate_safe_ids(doc)
+            
+            logger.info(f"🔧 C1/C2: Creating safe numbering definition (numId={num_id}, abstractNumId={abstract_num_id})...")
+            NumberingEngine().get_or_create_numbering_definition(doc, num_id=num_id, abstract_num_id=abstract_num_id)
+            numbering_ids = (num_id, abstract_num_id)
+        except Exception as e:
+            logger.warning(f"Failed to create bullet numbering definition: {e}")
+    
+    # Create custom document styles
+    _create_document_styles(doc, docx_styles)
+    
+    # **FIX: Ensure all custom styles are actually available in the document**
+    logger.info("🔧 VERIFYING: Checking if all custom styles are available...")
+    expected_styles = ['MR_SectionHeader', 'MR_Content', 'MR_RoleDescription', 'MR_BulletPoint', 
+                      'MR_SummaryText', 'MR_SkillCategory', 'MR_SkillList', 'MR_Company']
+    available_styles = [s.name for s in doc.styles]
+    
+    missing_styles = [style for style in expected_styles if style not in available_styles]
+    if missing_styles:
+        logger.error(f"❌ MISSING STYLES: {missing_styles}")
+        logger.error(f"❌ Available styles: {available_styles}")
+        # Force recreation of missing styles
+        logger.info("🔧 FORCING recreation of missing styles...")
+        try:
+            # Try to force recreation
+            from style_engine import StyleEngine
+            StyleEngine.create_docx_custom_styles(doc)
+            logger.info("✅ Successfully forced style recreation")
+        except Exception as e:
+            logger.error(f"❌ Failed to force style recreation: {e}")
+    else:
+        logger.info(f"✅ ALL STYLES AVAILABLE: {expected_styles}")
+    
+    # Get page configuration from new comprehensive specification
+    page_config = docx_styles.get("page", {})
+    
+    # Set all margins from the new specification (1.5cm each)
+    section = doc.sections[0]
+    section.top_margin = Cm(page_config.get("marginTopCm", 1.5))
+    section.bottom_margin = Cm(page_config.get("marginBottomCm", 1.5))
+    section.left_margin = Cm(page_config.get("marginLeftCm", 1.5))
+    section.right_margin = Cm(page_config.get("marginRightCm", 1.5))
+    
+    logger.info(f"Applied document margins from specification: Top={page_config.get('marginTopCm', 1.5)}cm, Bottom={page_config.get('marginBottomCm', 1.5)}cm, Left={page_config.get('marginLeftCm', 1.5)}cm, Right={page_config.get('marginRightCm', 1.5)}cm")
+    
+    # Registry styles are otherwise created lazily while content is added
+    if USE_STYLE_REGISTRY:
+        create_registered_styles(doc)
+    
+    return doc, numbering_ids
+
+@traced("build_docx")
 def build_docx(request_id: str, temp_dir: str, debug: bool = False) -> BytesIO:
     """
     Build a DOCX file from the resume data for the given request ID.
@@ -1046,13 +1114,15 @@ def build_docx(request_id: str, temp_dir: str, debug: bool = False) -> BytesIO:
         logger.info(f"Temp directory path: {temp_dir}")
         logger.info(f"Debug mode: {debug}")
         
-        # Check for files related to this request_id
-        try:
-            file_list = os.listdir(temp_dir)
-            matching_files = [f for f in file_list if request_id in f]
-            logger.info(f"Files containing request ID: {matching_files}")
-        except Exception as e:
-            logger.error(f"Error listing directory: {e}")
+        # Per-phase timings land in the request trace (see tools/benchmark_docx.py)
+        phases = PhaseTimer("build_docx")
+        
+        # Diagnostic rogue-formatting checkpoints each rescan the whole document
+        checkpoints = debug or DOCX_BULLET_CHECKPOINTS
+        
+        # Load every section of this request in one read
+        sections = get_session_store(temp_dir).load_sections(request_id)
+        logger.info(f"Sections available for request ID: {list(sections.keys())}")
         
         # Load DOCX styles from StyleManager
         docx_styles = StyleManager.load_docx_styles()
@@ -1066,8 +1136,13 @@ def build_docx(request_id: str, temp_dir: str, debug: bool = False) -> BytesIO:
                 "body": {"fontFamily": "Calibri", "fontSizePt": 11}
             }
         
-        # Create a new Document
-        doc = Document()
+        phases.mark("load")
+        
+        # Clone the styled base document (styles, numbering definition, margins);
+        # it is only prepared when the design tokens change
+        doc, numbering_ids, template_hit = get_styled_document(
+            docx_styles, lambda: _prepare_base_document(docx_styles))
+        phases.mark("base_document", template_hit=template_hit)
         
         # Initialize NumberingEngine for optimal performance (O3 recommendation)
         # A4: Use singleton with request ID for isolation
@@ -1077,13 +1152,15 @@ def build_docx(request_id: str, temp_dir: str, debug: bool = False) -> BytesIO:
         
         if NATIVE_BULLETS_ENABLED:
             try:
+                if numbering_ids is None:
+                    raise RuntimeError("base document has no bullet numbering definition")
+                
                 # A4: Get singleton instance with request isolation
                 numbering_engine = NumberingEngine.get_instance(request_id)
                 
-                # C1/C2: Use safe allocation instead of global counter
-                custom_num_id, custom_abstract_num_id = NumberingEngine._allocate_safe_ids(doc)
-                
-                logger.info(f"🔧 C1/C2: Creating safe numbering definition (numId={custom_num_id}, abstractNumId={custom_abstract_num_id})...")
+                # C1/C2: The safe IDs were allocated when the base document was prepared;
+                # the definition is already in numbering.xml, so this only registers it
+                custom_num_id, custom_abstract_num_id = numbering_ids
                 numbering_engine.get_or_create_numbering_definition(doc, num_id=custom_num_id, abstract_num_id=custom_abstract_num_id)
                 
                 # O3: Initialize O3 core engine for enhanced bullet management
@@ -1097,60 +1174,17 @@ def build_docx(request_id: str, temp_dir: str, debug: bool = False) -> BytesIO:
                 numbering_engine = None
                 custom_num_id = 100  # Fallback ID
         
-        # Create custom document styles
-        custom_styles = _create_document_styles(doc, docx_styles)
+        phases.mark("numbering_setup")
         
         # o3's CHECKPOINT 1: After style creation
-        _detect_rogue_bullet_formatting(doc, "AFTER_STYLE_CREATION")
-        
-        # **FIX: Ensure all custom styles are actually available in the document**
-        logger.info("🔧 VERIFYING: Checking if all custom styles are available...")
-        expected_styles = ['MR_SectionHeader', 'MR_Content', 'MR_RoleDescription', 'MR_BulletPoint', 
-                          'MR_SummaryText', 'MR_SkillCategory', 'MR_SkillList', 'MR_Company']
-        available_styles = [s.name for s in doc.styles]
-        
-        missing_styles = [style for style in expected_styles if style not in available_styles]
-        if missing_styles:
-            logger.error(f"❌ MISSING STYLES: {missing_styles}")
-            logger.error(f"❌ Available styles: {available_styles}")
-            # Force recreation of missing styles
-            logger.info("🔧 FORCING recreation of missing styles...")
-            try:
-                # Try to force recreation
-                from style_engine import StyleEngine
-                StyleEngine.create_docx_custom_styles(doc)
-                logger.info("✅ Successfully forced style recreation")
-            except Exception as e:
-                logger.error(f"❌ Failed to force style recreation: {e}")
-        else:
-            logger.info(f"✅ ALL STYLES AVAILABLE: {expected_styles}")
-        
-        # Get page configuration from new comprehensive specification
-        page_config = docx_styles.get("page", {})
-        
-        # Set all margins from the new specification (1.5cm each)
-        section = doc.sections[0]
-        section.top_margin = Cm(page_config.get("marginTopCm", 1.5))
-        section.bottom_margin = Cm(page_config.get("marginBottomCm", 1.5))
-        section.left_margin = Cm(page_config.get("marginLeftCm", 1.5))
-        section.right_margin = Cm(page_config.get("marginRightCm", 1.5))
-        
-        logger.info(f"Applied document margins from specification: Top={page_config.get('marginTopCm', 1.5)}cm, Bottom={page_config.get('marginBottomCm', 1.5)}cm, Left={page_config.get('marginLeftCm', 1.5)}cm, Right={page_config.get('marginRightCm', 1.5)}cm")
+        if checkpoints:
+            _detect_rogue_bullet_formatting(doc, "AFTER_STYLE_CREATION")
         
         # ------ CONTACT SECTION ------
         logger.info("Processing Contact section...")
         
-        # Open and inspect the contact file directly to debug structure issues
-        contact_file_path = os.path.join(temp_dir, f"{request_id}_contact.json")
-        if os.path.exists(contact_file_path):
-            try:
-                with open(contact_file_path, 'r', encoding='utf-8') as f:
-                    raw_content = f.read()
-                    logger.info(f"Raw contact file content (first 200 chars): {raw_content[:200]}")
-            except Exception as e:
-                logger.error(f"Error reading raw contact file: {e}")
-        
-        contact = load_section_json(request_id, "contact", temp_dir)
+        # Contact comes from the same session store read as every other section
+        contact = _section_or_empty(sections, "contact")
         logger.info(f"Contact data loaded: {bool(contact)}")
         logger.info(f"Contact data type: {type(contact)}")
         
@@ -1226,29 +1260,10 @@ def build_docx(request_id: str, temp_dir: str, debug: bool = False) -> BytesIO:
                 logger.warning("No name found in contact data, skipping contact section")
         else:
             logger.warning("No contact data found")
-            
-            # Try a fallback approach - look for the file directly
-            fallback_files = [f for f in os.listdir(temp_dir) if f.endswith("_contact.json") and request_id in f]
-            if fallback_files:
-                logger.info(f"Found fallback contact files: {fallback_files}")
-                try:
-                    with open(os.path.join(temp_dir, fallback_files[0]), 'r', encoding='utf-8') as f:
-                        fallback_contact = json.load(f)
-                        logger.info(f"Loaded fallback contact data: {fallback_contact}")
-                        
-                        # Extract name and add to document
-                        if isinstance(fallback_contact, dict):
-                            name = fallback_contact.get("name", "")
-                            if name:
-                                name_para = doc.add_paragraph(name)
-                                _apply_paragraph_style(doc, name_para, "MR_Name", docx_styles)
-                                logger.info(f"Added name from fallback: {name}")
-                except Exception as e:
-                    logger.error(f"Error processing fallback contact data: {e}")
         
         # ------ SUMMARY SECTION ------
         logger.info("Processing Summary section...")
-        summary = load_section_json(request_id, "summary", temp_dir)
+        summary = _section_or_empty(sections, "summary")
         logger.info(f"Summary data loaded: {bool(summary)}")
         
         # Handle both direct summary and summary with 'content' key
@@ -1277,9 +1292,11 @@ def build_docx(request_id: str, temp_dir: str, debug: bool = False) -> BytesIO:
                 # Space after section
                 doc.add_paragraph("").paragraph_format.space_after = Pt(6)
         
+        phases.mark("contact_summary")
+        
         # ------ EXPERIENCE SECTION ------
         logger.info("Processing Experience section...")
-        experience = load_section_json(request_id, "experience", temp_dir)
+        experience = _section_or_empty(sections, "experience")
         logger.info(f"Experience data loaded: {bool(experience)}")
         logger.info(f"Experience contains 'experiences' key: {isinstance(experience, dict) and 'experiences' in experience}")
         
@@ -1361,14 +1378,18 @@ def build_docx(request_id: str, temp_dir: str, debug: bool = False) -> BytesIO:
                         )
                         
                         # o3's CHECKPOINT: After each bullet creation
-                        _detect_rogue_bullet_formatting(doc, f"AFTER_BULLET_{achievement[:20]}")
+                        if checkpoints:
+                            _detect_rogue_bullet_formatting(doc, f"AFTER_BULLET_{achievement[:20]}")
                 
                 # o3's CHECKPOINT 2: After all experience bullets
-                _detect_rogue_bullet_formatting(doc, "AFTER_ALL_EXPERIENCE_BULLETS")
+                if checkpoints:
+                    _detect_rogue_bullet_formatting(doc, "AFTER_ALL_EXPERIENCE_BULLETS")
+        
+        phases.mark("experience", jobs=len(experiences_list))
         
         # ------ EDUCATION SECTION ------
         logger.info("Processing Education section...")
-        education = load_section_json(request_id, "education", temp_dir)
+        education = _section_or_empty(sections, "education")
         logger.info(f"Education data loaded: {bool(education)}")
         logger.info(f"Education contains 'institutions' key: {isinstance(education, dict) and 'institutions' in education}")
         
@@ -1443,9 +1464,11 @@ def build_docx(request_id: str, temp_dir: str, debug: bool = False) -> BytesIO:
                             num_id=custom_num_id, o3_engine=o3_engine, section_name="education"
                         )
         
+        phases.mark("education")
+        
         # ------ SKILLS SECTION ------
         logger.info("Processing Skills section...")
-        skills = load_section_json(request_id, "skills", temp_dir)
+        skills = _section_or_empty(sections, "skills")
         logger.info(f"Skills data loaded: {bool(skills)}")
         logger.info(f"Skills data type: {type(skills)}")
         logger.info(f"Skills content sample: {str(skills)[:100]}")
@@ -1517,9 +1540,11 @@ def build_docx(request_id: str, temp_dir: str, debug: bool = False) -> BytesIO:
                 skills_para = doc.add_paragraph(str(skills), style='MR_SkillList')
                 logger.info(f"Applied MR_SkillList style to fallback skills content")
         
+        phases.mark("skills")
+        
         # ------ PROJECTS SECTION ------
         logger.info("Processing Projects section...")
-        projects = load_section_json(request_id, "projects", temp_dir)
+        projects = _section_or_empty(sections, "projects")
         logger.info(f"Projects data loaded: {bool(projects)}")
         logger.info(f"Projects contains 'projects' key: {isinstance(projects, dict) and 'projects' in projects}")
         
@@ -1606,11 +1631,14 @@ def build_docx(request_id: str, temp_dir: str, debug: bool = False) -> BytesIO:
                             num_id=custom_num_id, o3_engine=o3_engine, section_name="projects"
                         )
         
+        phases.mark("projects")
+        
         # Fix spacing between sections - use our enhanced implementation
         if USE_STYLE_REGISTRY:
             tighten_before_headers(doc)
         else:
             _fix_spacing_between_sections(doc)
+        phases.mark("section_spacing")
         
         # DIAGNOSTIC: Check if MR_Company style was actually created (O3 Checklist #2)
         logger.info("🔍 DIAGNOSTIC #2: Listing all document styles before save...")
@@ -1623,6 +1651,14 @@ def build_docx(request_id: str, temp_dir: str, debug: bool = False) -> BytesIO:
             logger.info("🛠️ Applying O3's backup solution: Creating robust MR_Company style...")
             _create_robust_company_style(doc)
         
+        phases.mark("style_diagnostics")
+        
+        # One analysis pass serves reconciliation and cleanup; the paragraph set
+        # no longer changes after tighten_before_headers
+        document_index = analyze_document(doc)
+        logger.info(f"📑 Document analysis: {document_index.summary()}")
+        phases.mark("analysis")
+        
         # 🚀 O3's Enhanced "Build-Then-Reconcile" Architecture: Final Bullet Consistency Pass
         if NATIVE_BULLETS_ENABLED and numbering_engine and custom_num_id:
             try:
@@ -1631,7 +1667,7 @@ def build_docx(request_id: str, temp_dir: str, debug: bool = False) -> BytesIO:
                 # O3: Use enhanced reconciliation if O3 engine is available
                 if o3_engine is not None:
                     # O3 Enhanced reconciliation
-                    reconciliation_stats = o3_engine.reconcile_document_bullets(doc, numbering_engine)
+                    reconciliation_stats = o3_engine.reconcile_document_bullets(doc, numbering_engine, document_index)
                     
                     # Log O3 results
                     bullets_processed = reconciliation_stats.get('bullets_processed', 0)
@@ -1652,7 +1688,8 @@ def build_docx(request_id: str, temp_dir: str, debug: bool = False) -> BytesIO:
                     if USE_BULLET_RECONCILIATION:
                         logger.info("🛡️ Starting legacy bullet reconciliation pass...")
                         reconciler = BulletReconciliationEngine(request_id)
-                        reconciliation_stats = reconciler.reconcile_bullet_styles(doc, numbering_engine, custom_num_id)
+                        reconciliation_stats = reconciler.reconcile_bullet_styles(doc, numbering_engine, custom_num_id,
+                                                                              document_index)
                         
                         # Log legacy results
                         total_bullets = reconciliation_stats.get('total_bullets', 0)
@@ -1674,17 +1711,21 @@ def build_docx(request_id: str, temp_dir: str, debug: bool = False) -> BytesIO:
                 logger.error(f"🚀 O3: Enhanced reconciliation failed: {e}")
                 logger.warning("🚀 O3: Proceeding with document save despite reconciliation failure")
         
+        phases.mark("reconciliation")
         logger.info("Saving DOCX to BytesIO...")
         
         # 🚨 Legacy O3 Cleanup: Remove direct formatting issues
         # This preserves existing functionality while the reconciliation handles the main logic
-        cleaned_count = _cleanup_bullet_direct_formatting(doc)
+        cleaned_count = _cleanup_bullet_direct_formatting(doc, document_index)
         if cleaned_count > 0:
             logger.info(f"🧹 Cleaned {cleaned_count} bullet paragraphs with direct formatting issues")
         
+        phases.mark("cleanup")
+        
         output = BytesIO()
         doc.save(output)
         output.seek(0)
+        phases.mark("save", bytes=output.getbuffer().nbytes)
         
         # Generate debug report if requested
         if debug:
@@ -0,0 +1,109 @@
+"""
+Rendered DOCX Cache
+
+This module caches the bytes produced by utils.docx_builder.build_docx so
+repeat downloads of the same tailored resume skip the full document build
+(style creation, numbering, bullet reconciliation, spacing passes).
+
+Key Features:
+- Entries keyed by request_id plus a fingerprint of everything the build reads
+- Fingerprint covers section data, design tokens, DOCX style spec and DOCX flags
+  (token content hashes from utils.token_service)
+- Byte-bounded in-process LRU (utils.cache_backends.MemoryLRUBackend)
+- The fingerprint doubles as a strong ETag for conditional GET / HEAD
+
+Author: Resume Tailor Team
+Status: Production Ready
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from utils.cache_backends import DisabledCache, MemoryLRUBackend
+from utils.token_service import get_token_service
+
+logger = logging.getLogger(__name__)
+
+# Bump when build_docx output changes in a way the inputs do not capture
+DOCX_CACHE_VERSION = 1
+
+def style_fingerprint() -> str:
+    """Fingerprint of the design tokens, DOCX style spec and DOCX feature flags"""
+    from utils.docx_builder import NATIVE_BULLETS_ENABLED, USE_BULLET_RECONCILIATION
+
+    material = {
+        'sources': get_token_service().fingerprint(),
+        'native_bullets': NATIVE_BULLETS_ENABLED,
+        'bullet_reconciliation': USE_BULLET_RECONCILIATION,
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def docx_fingerprint(request_id: str, sections: Dict[str, Any]) -> str:
+    """
+    Fingerprint a DOCX build: request_id, section data and style inputs.
+
+    Returns:
+        Hex digest usable as cache key and strong ETag
+    """
+    material = json.dumps(
+        {
+            'v': DOCX_CACHE_VERSION,
+            'request_id': request_id,
+            'sections': sections,
+            'style': style_fingerprint(),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+_docx_cache = None
+_docx_cache_lock = threading.Lock()
+
+
+def get_docx_cache():
+    """Return the process-wide rendered DOCX cache configured from Config"""
+    global _docx_cache
+
+    if _docx_cache is None:
+        with _docx_cache_lock:
+            if _docx_cache is None:
+                from config import Config
+                if Config.USE_DOCX_CACHE:
+                    _docx_cache = MemoryLRUBackend(max_entries=None, max_bytes=Config.DOCX_CACHE_MAX_BYTES)
+                    logger.info(f"DOCX cache enabled ({Config.DOCX_CACHE_MAX_BYTES} bytes)")
+                else:
+                    _docx_cache = DisabledCache('docx')
+    return _docx_cache
+
+
+def get_cached_docx(request_id: str, sections: Dict[str, Any],
+                    build) -> Tuple[bytes, str, bool]:
+    """
+    Return DOCX bytes for a request, building them only on a cache miss.
+
+    Args:
+        request_id: Tailoring request ID
+        sections: The request's section data (from the session store)
+        build: Zero-argument callable returning the DOCX as BytesIO
+
+    Returns:
+        (docx_bytes, etag, cache_hit)
+    """
+    etag = docx_fingerprint(request_id, sections)
+    cache = get_docx_cache()
+    docx_bytes: Optional[bytes] = cache.get(etag)
+    if docx_bytes is not None:
+        logger.info(f"DOCX cache hit for request {request_id}")
+        return docx_bytes, etag, True
+
+    docx_bytes = build().getvalue()
+    cache.set(etag, docx_bytes)
+    logger.info(f"DOCX cache miss for request {request_id}, cached {len(docx_bytes)} bytes")
+    return docx_bytes, etag, False
@@ -0,0 +1,100 @@
+"""
+Styled DOCX Template Cache
+
+This module caches the fully styled, still empty base document that every
+utils.docx_builder.build_docx call starts from (custom styles, registry
+styles, the bullet numbering definition, section margins). The base is built
+once per design-token fingerprint, saved as bytes, and each request clones it
+so per-request work is only content insertion.
+
+Key Features:
+- Templates keyed by utils.docx_cache.style_fingerprint() plus the DOCX style spec
+- Process ID in the key, since bullet numIds are PID-salted (NumberingEngine C2)
+- The numbering IDs allocated in the template travel with its bytes
+- Entry-bounded in-process LRU (utils.cache_backends.MemoryLRUBackend)
+- Disabled with USE_DOCX_TEMPLATE_CACHE=false (every build prepares its own base)
+
+Author: Resume Tailor Team
+Status: Production Ready
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from io import BytesIO
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from docx import Document
+
+from utils.cache_backends import DisabledCache, MemoryLRUBackend
+from utils.docx_cache import style_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Bump when the base document preparation changes in a way the inputs do not capture
+DOCX_TEMPLATE_VERSION = 1
+
+# (numId, abstractNumId) of the bullet numbering definition, or None if it could not be created
+NumberingIds = Optional[Tuple[int, int]]
+
+
+def template_key(docx_styles: Dict[str, Any]) -> str:
+    """Cache key for the base document built from docx_styles in this process"""
+    material = {
+        'v': DOCX_TEMPLATE_VERSION,
+        'style': style_fingerprint(),
+        'docx_styles': docx_styles,
+        'pid': os.getpid(),
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+_template_cache = None
+_template_cache_lock = threading.Lock()
+
+
+def get_template_cache():
+    """Return the process-wide styled template cache configured from Config"""
+    global _template_cache
+
+    if _template_cache is None:
+        with _template_cache_lock:
+            if _template_cache is None:
+                from config import Config
+                if Config.USE_DOCX_TEMPLATE_CACHE:
+                    _template_cache = MemoryLRUBackend(max_entries=Config.DOCX_TEMPLATE_CACHE_ENTRIES)
+                    logger.info(f"DOCX template cache enabled ({Config.DOCX_TEMPLATE_CACHE_ENTRIES} entries)")
+                else:
+                    _template_cache = DisabledCache('docx_template')
+    return _template_cache
+
+
+def get_styled_document(docx_styles: Dict[str, Any],
+                        prepare: Callable[[], Tuple[Any, NumberingIds]]) -> Tuple[Any, NumberingIds, bool]:
+    """
+    Return a styled base document for a build, preparing it only on a cache miss.
+
+    Args:
+        docx_styles: The DOCX style spec the base document is prepared from
+        prepare: Zero-argument callable returning (Document, numbering IDs)
+
+    Returns:
+        (document, numbering_ids, cache_hit); the document is the caller's own
+        copy and can be filled with content
+    """
+    key = template_key(docx_styles)
+    cache = get_template_cache()
+    entry = cache.get(key)
+    if entry is not None:
+        template_bytes, numbering_ids = entry
+        return Document(BytesIO(template_bytes)), numbering_ids, True
+
+    doc, numbering_ids = prepare()
+    if not isinstance(cache, DisabledCache):
+        output = BytesIO()
+        doc.save(output)
+        cache.set(key, (output.getvalue(), numbering_ids))
+        logger.info(f"DOCX template cached ({output.getbuffer().nbytes} bytes, numbering={numbering_ids})")
+    return doc, numbering_ids, False
@@ -0,0 +1,321 @@
+"""
+Fake LLM Provider
+
+This module provides a deterministic, local stand-in for the Anthropic and
+OpenAI SDK clients so the tailoring pipeline can be exercised (benchmarks,
+load tests, offline demos) without API keys or network access.
+
+Key Features:
+- Drop-in replacements for client.messages.create / client.chat.completions.create
+- Section-shaped JSON replies (experience, education, skills, projects, generic)
+  that pass through the real prompt, parsing and caching code paths
+- Combined multi-section replies for the single-request tailoring mode
+- Simulated prompt caches: Anthropic cache_control breakpoints and OpenAI
+  automatic prefix caching, reported in each SDK's usage fields
+- Configurable latency, jitter, response size and failure rate
+- Deterministic: the same prompt always gets the same reply and delay
+- install() routes the shared LLM client registry to the fake for a block
+  (with the client-side rate limiter off unless one is passed)
+
+Author: Resume Tailor Team
+Status: Production Ready
+"""
+
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Output-spec markers in the tailoring prompts, checked in this order
+_SECTION_MARKERS = (
+    ('experience', '"experience": ['),
+    ('education', '"education": ['),
+    ('skills', '"skills": {'),
+    ('projects', '"projects": ['),
+)
+_GENERIC_SECTION = re.compile(r'"(\w+)": "The tailored content goes here')
+# Combined (all sections in one request) prompts list their keys on this line
+_COMBINED_KEYS = re.compile(r'Return ONE JSON object with exactly these keys: ([^\n]+)')
+
+_VERBS = ("Led", "Built", "Cut", "Scaled", "Automated", "Shipped", "Migrated", "Reduced")
+_OBJECTS = ("data platform", "billing service", "onboarding flow", "CI pipeline",
+            "search ranking", "reporting suite", "mobile release train", "ETL jobs")
+_SKILLS = ("Python", "SQL", "Kubernetes", "AWS", "React", "Terraform", "Airflow", "Go",
+           "Spark", "GraphQL", "Docker", "PostgreSQL")
+
+
+class FakeLLMError(RuntimeError):
+    """Injected provider failure (see FakeLLMProvider.failure_rate), shaped like a 503 overload."""
+    status_code = 503
+
+
+class FakeLLMProvider:
+    """Deterministic stand-in for the Claude and OpenAI completion APIs."""
+
+    def __init__(self, latency_ms: float = 200.0, jitter_ms: float = 0.0,
+                 response_scale: float = 1.0, failure_rate: float = 0.0, seed: int = 0,
+                 cache_min_tokens: int = 1024):
+        """
+        Args:
+            latency_ms: Base delay per completion
+            jitter_ms: Extra delay drawn uniformly from [0, jitter_ms) per prompt
+            response_scale: Multiplies the number of roles/bullets/skills in replies
+            failure_rate: Fraction of sends that raise FakeLLMError (a retry draws again)
+            seed: Mixed into the per-prompt random stream
+            cache_min_tokens: Shortest prompt prefix the simulated prompt caches store
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.response_scale = max(0.1, response_scale)
+        self.failure_rate = failure_rate
+        self.seed = seed
+        self.cache_min_tokens = cache_min_tokens
+        self._lock = threading.Lock()
+        self._cached_prefixes = set()
+        self._sends: Dict[str, int] = {}
+        self.stats = {'calls': 0, 'failures': 0, 'input_tokens': 0, 'output_tokens': 0,
+                      'cache_read_tokens': 0, 'cache_write_tokens': 0}
+
+    def complete(self, prompt: str, system: str = "") -> Tuple[str, int, int]:
+        """
+        Produce the reply for a prompt.
+
+        Returns:
+            (text, input_tokens, output_tokens) with tokens estimated at 4 chars each
+        """
+        digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        rng = random.Random(f"{self.seed}:{digest}")
+        delay = self.latency_ms + (rng.random() * self.jitter_ms if self.jitter_ms else 0.0)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        # Failures are drawn per send of a prompt, so a retry can succeed like after a real 503
+        with self._lock:
+            attempt = self._sends[digest] = self._sends.get(digest, 0) + 1
+        failed = self.failure_rate > 0 and \
+            random.Random(f"{self.seed}:{digest}:{attempt}").random() < self.failure_rate
+        text = "" if failed else self._reply(prompt, rng)
+        input_tokens = (len(system) + len(prompt)) // 4
+        output_tokens = len(text) // 4
+        with self._lock:
+            self.stats['calls'] += 1
+            self.stats['input_tokens'] += input_tokens
+            self.stats['output_tokens'] += output_tokens
+            if failed:
+                self.stats['failures'] += 1
+        if failed:
+            raise FakeLLMError("Injected fake provider failure")
+        return text, input_tokens, output_tokens
+
+    def prompt_cache(self, text: str, breakpoint: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Simulate the provider prompt cache for a full prompt text.
+
+        Args:
+            text: System and user text as sent
+            breakpoint: End offset of an explicit cache breakpoint (Anthropic);
+                None means automatic prefix caching in 128-token steps (OpenAI)
+
+        Returns:
+            (cache_read_tokens, cache_write_tokens), tokens estimated at 4 chars each
+        """
+        min_chars = self.cache_min_tokens * 4
+        if breakpoint is not None:
+            candidates = [breakpoint] if breakpoint >= min_chars else []
+        else:
+            candidates = list(range(min_chars, len(text) + 1, 128 * 4))
+        digests = [(length, hashlib.sha256(text[:length].encode('utf-8')).hexdigest()) for length in candidates]
+
+        with self._lock:
+            cached = max((length for length, digest in digests if digest in self._cached_prefixes), default=0)
+            written = 0
+            for length, digest in digests:
+                if digest not in self._cached_prefixes:
+                    self._cached_prefixes.add(digest)
+                    written = max(written, length)
+            read_tokens = cached // 4
+            # OpenAI does not bill or report cache writes
+            write_tokens = written // 4 if breakpoint is not None and not cached else 0
+            self.stats['cache_read_tokens'] += read_tokens
+            self.stats['cache_write_tokens'] += write_tokens
+        return read_tokens, write_tokens
+
+    def _count(self, base: int) -> int:
+        return max(1, round(base * self.response_scale))
+
+    def _bullet(self, rng: random.Random) -> str:
+        return (f"{rng.choice(_VERBS)} the {rng.choice(_OBJECTS)} for {rng.randint(2, 40)} teams, "
+                f"improving throughput by {rng.randint(5, 80)}% across {rng.randint(2, 9)} regions")
+
+    def _section_payload(self, section: str, rng: random.Random) -> Any:
+        if section == 'experience':
+            return [{
+                'company': f"Company {index + 1}",
+                'location': "Remote",
+                'position': "Senior Engineer",
+                'dates': f"{2015 + index} - {2016 + index}",
+                'role_description': "Owned delivery of customer-facing platform services.",
+                'achievements': [self._bullet(rng) for _ in range(self._count(4))],
+            } for index in range(self._count(3))]
+        if section == 'education':
+            return [{
+                'institution': "State University",
+                'location': "Springfield",
+                'degree': "B.S. Computer Science",
+                'dates': "2010 - 2014",
+                'highlights': [self._bullet(rng) for _ in range(self._count(2))],
+            }]
+        if section == 'skills':
+            skills = [rng.choice(_SKILLS) for _ in range(self._count(8))]
+            return {'technical': sorted(set(skills)), 'soft': ["Mentoring", "Communication"], 'other': []}
+        if section == 'projects':
+            return [{
+                'title': f"Project {index + 1}",
+                'dates': "2022",
+                'details': [self._bullet(rng) for _ in range(self._count(2))],
+            } for index in range(self._count(2))]
+        return " ".join(self._bullet(rng) + "." for _ in range(self._count(3)))
+
+    def _reply(self, prompt: str, rng: random.Random) -> str:
+        combined = _COMBINED_KEYS.search(prompt)
+        if combined is not None:
+            sections = re.findall(r'"(\w+)"', combined.group(1))
+            payload = {section: self._section_payload(section, rng) for section in sections}
+            return "```json\n" + json.dumps(payload, indent=2) + "\n```"
+
+        section = next((name for name, marker in _SECTION_MARKERS if marker in prompt), None)
+        if section is None:
+            match = _GENERIC_SECTION.search(prompt)
+            if match is None:
+                # Free-form prompts (e.g. summary generation) get plain text
+                return self._section_payload('', rng)
+            section = match.group(1)
+        return "```json\n" + json.dumps({section: self._section_payload(section, rng)}, indent=2) + "\n```"
+
+    def client_for(self, provider: str) -> Any:
+        """An object shaped like the provider's SDK client"""
+        if provider in ('claude', 'anthropic'):
+            return FakeAnthropicClient(self)
+        if provider == 'openai':
+            return FakeOpenAIClient(self)
+        raise ValueError(f"Unsupported LLM provider: {provider}")
+
+    @contextmanager
+    def install(self, rate_limiter: Any = None):
+        """
+        Serve every get_llm_client() call from this fake for the duration of the block.
+
+        Fake calls spend no provider quota, so the client-side rate limiter is
+        off inside the block unless one is passed (e.g. to benchmark pacing).
+        """
+        from utils import rate_limiter as rate_limiter_module
+        from utils.llm_client_registry import get_llm_client_registry
+
+        registry = get_llm_client_registry()
+        original = registry.get_client
+        original_limiter = rate_limiter_module._rate_limiter
+        rate_limiter_module._rate_limiter = rate_limiter or rate_limiter_module.DisabledRateLimiter()
+        clients: Dict[str, Any] = {}
+
+        def get_client(provider: str, api_key: str, base_url: Optional[str] = None, verify=None):
+            provider = provider.lower()
+            if provider not in clients:
+                clients[provider] = self.client_for(provider)
+            return clients[provider]
+
+        registry.get_client = get_client
+        try:
+            yield self
+        finally:
+            registry.get_client = original
+            rate_limiter_module._rate_limiter = original_limiter
+
+
+def _content_text(content: Any) -> Tuple[str, Optional[int]]:
+    """Text of a string or list of content blocks, and the end offset of its last cache breakpoint"""
+    if not isinstance(content, list):
+        return str(content or ''), None
+    text, breakpoint = "", None
+    for block in content:
+        text += str(block.get('text', '')) if isinstance(block, dict) else str(block)
+        if isinstance(block, dict) and block.get('cache_control'):
+            breakpoint = len(text)
+    return text, breakpoint
+
+
+def _messages_text(messages: List[Dict[str, Any]], role: str) -> str:
+    return "\n".join(_content_text(m.get('content', ''))[0] for m in messages if m.get('role') == role)
+
+
+class _FakeMessages:
+    def __init__(self, provider: FakeLLMProvider):
+        self._provider = provider
+
+    def create(self, model: str = "", messages: Optional[List[Dict[str, Any]]] = None,
+               system: Any = "", **kwargs) -> Any:
+        messages = messages or []
+        system_text, system_breakpoint = _content_text(system) if system else (_messages_text(messages, 'system'), None)
+        user_text, user_breakpoint = "", None
+        for message in messages:
+            if message.get('role') == 'user':
+                text, breakpoint = _content_text(message.get('content', ''))
+                if breakpoint is not None:
+                    user_breakpoint = len(user_text) + breakpoint
+                user_text += text
+
+        # Anthropic caches tools, system and messages in that order, up to the last breakpoint
+        breakpoint = len(system_text) + user_breakpoint if user_breakpoint is not None else system_breakpoint
+        cache_read, cache_write = self._provider.prompt_cache(system_text + user_text, breakpoint) \
+            if breakpoint is not None else (0, 0)
+        text, input_tokens, output_tokens = self._provider.complete(user_text, system_text)
+        return SimpleNamespace(
+            model=model,
+            content=[SimpleNamespace(type='text', text=text)],
+            usage=SimpleNamespace(input_tokens=max(0, input_tokens - cache_read - cache_write),
+                                  output_tokens=output_tokens,
+                                  cache_read_input_tokens=cache_read,
+                                  cache_creation_input_tokens=cache_write),
+            stop_reason='end_turn',
+        )
+
+
+class FakeAnthropicClient:
+    """Anthropic-SDK-shaped client backed by a FakeLLMProvider."""
+
+    def __init__(self, provider: FakeLLMProvider):
+        self.messages = _FakeMessages(provider)
+
+
+class _FakeCompletions:
+    def __init__(self, provider: FakeLLMProvider):
+        self._provider = provider
+
+    def create(self, model: str = "", messages: Optional[List[Dict[str, Any]]] = None, **kwargs) -> Any:
+        messages = messages or []
+        system_text, user_text = _messages_text(messages, 'system'), _messages_text(messages, 'user')
+        cached_tokens, _ = self._provider.prompt_cache(system_text + user_text)
+        text, prompt_tokens, completion_tokens = self._provider.complete(user_text, system_text)
+        return SimpleNamespace(
+            model=model,
+            choices=[SimpleNamespace(index=0, finish_reason='stop',
+                                     message=SimpleNamespace(role='assistant', content=text))],
+            usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                                  total_tokens=prompt_tokens + completion_tokens,
+                                  prompt_tokens_details=SimpleNamespace(cached_tokens=cached_tokens)),
+        )
+
+
+class FakeOpenAIClient:
+    """OpenAI-SDK-shaped client backed by a FakeLLMProvider."""
+
+    def __init__(self, provider: FakeLLMProvider):
+        self.chat = SimpleNamespace(completions=_FakeCompletions(provider))
+        self.models = SimpleNamespace(list=lambda: [])
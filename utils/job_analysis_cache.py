@@ -0,0 +1,91 @@
+"""
+Job Analysis Cache
+
+This module caches LLM job posting analyses keyed by the content of the
+posting, so re-submitting the same job (or the same posting under a
+different title) reuses one analysis instead of calling the LLM again.
+
+Key Features:
+- Keys are a SHA-256 of the normalized job text, title and company plus
+  provider, model and prompt version
+- Memory LRU in front of a SQLite file shared by all gunicorn workers
+- TTL, entry-count and byte-size eviction from utils.cache_backends
+- Hit/miss/eviction counters exposed through get_job_analysis_cache_summary()
+
+Author: Resume Tailor Team
+Status: Production Ready
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import unicodedata
+from typing import Any, Dict, Optional
+
+from utils.cache_backends import DisabledCache, MemoryLRUBackend, SQLiteBackend, TieredCache
+
+logger = logging.getLogger(__name__)
+
+JOB_ANALYSIS_CACHE_FILENAME = "job_analyses.sqlite3"
+
+
+def normalize_job_text(text: Optional[str]) -> str:
+    """Normalize posting text so whitespace-only differences share a cache entry"""
+    if not text:
+        return ""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def make_job_analysis_cache_key(job_title: str, company: str, job_text: str,
+                                provider: str, model: str, prompt_version: str) -> str:
+    """Cache key for one analysis of one posting by one provider/model/prompt"""
+    material = json.dumps(
+        {
+            'job_title': normalize_job_text(job_title),
+            'company': normalize_job_text(company),
+            'job_text': normalize_job_text(job_text),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    content_hash = hashlib.sha256(material.encode('utf-8')).hexdigest()
+    return f"job-analysis:{prompt_version}:{provider.lower()}:{model}:{content_hash}"
+
+
+_caches: Dict[str, Any] = {}
+_caches_lock = threading.Lock()
+
+
+def get_job_analysis_cache(cache_dir: Optional[str] = None):
+    """Return the process-wide job analysis cache for a cache directory"""
+    from config import Config
+
+    key = os.path.abspath(cache_dir or Config.JOB_ANALYSIS_CACHE_DIR)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            if not Config.USE_JOB_ANALYSIS_CACHE:
+                cache = DisabledCache('job_analyses')
+            else:
+                try:
+                    ttl = Config.JOB_ANALYSIS_CACHE_TTL_SECONDS
+                    cache = TieredCache([
+                        MemoryLRUBackend(ttl_seconds=ttl, max_entries=Config.JOB_ANALYSIS_CACHE_MEMORY_ENTRIES),
+                        SQLiteBackend(os.path.join(key, JOB_ANALYSIS_CACHE_FILENAME), table="job_analyses",
+                                      ttl_seconds=ttl,
+                                      max_entries=Config.JOB_ANALYSIS_CACHE_MAX_ENTRIES,
+                                      max_bytes=Config.JOB_ANALYSIS_CACHE_MAX_BYTES),
+                    ], name="job_analyses")
+                    logger.info(f"Job analysis cache enabled at {key}")
+                except Exception as e:
+                    logger.error(f"Failed to initialize job analysis cache: {e}")
+                    cache = DisabledCache('job_analyses')
+            _caches[key] = cache
+        return cache
+
+
+def get_job_analysis_cache_summary(cache_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Return hit/miss/eviction counters and tier details for the job analysis cache."""
+    return get_job_analysis_cache(cache_dir).summary()
@@ -0,0 +1,331 @@
+"""
+Tailoring Job Queue
+
+This module provides a small SQLite-backed job queue so long, LLM-bound
+tailoring runs can be handed off from the web workers to a separate local
+worker pool (see tailoring_worker.py).
+
+Key Features:
+- Durable jobs in a single SQLite file shared by web and worker processes
+- Priority ordering (higher first), then FIFO
+- Retry with exponential backoff up to a per-job attempt limit
+- Per-provider limits on how many jobs may run at once across all workers
+- Lease/heartbeat so jobs held by a crashed worker are picked up again
+
+Author: Resume Tailor Team
+Status: Production Ready
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from utils.cache_backends import thread_local_connection
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+@dataclass
+class Job:
+    """A row of the jobs table"""
+    id: str
+    kind: str
+    payload: Dict[str, Any]
+    provider: Optional[str]
+    priority: int
+    status: str
+    attempts: int
+    max_attempts: int
+    created_at: float
+    available_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    heartbeat_at: Optional[float] = None
+    worker_id: Optional[str] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Public status view (payload omitted)"""
+        return {
+            'request_id': self.id,
+            'kind': self.kind,
+            'provider': self.provider,
+            'priority': self.priority,
+            'status': self.status,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'result': self.result,
+            'error': self.error,
+        }
+
+
+class SQLiteJobQueue:
+    """
+    Job queue stored in SQLite.
+
+    Claiming uses BEGIN IMMEDIATE so only one process at a time can move a
+    job from queued to running; everything else is plain autocommit updates.
+    """
+
+    def __init__(self, db_path: str, lease_seconds: float = 300.0,
+                 provider_limits: Optional[Dict[str, int]] = None,
+                 default_provider_limit: Optional[int] = None):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.provider_limits = {k.lower(): v for k, v in (provider_limits or {}).items()}
+        self.default_provider_limit = default_provider_limit
+        self._connect = thread_local_connection(db_path, timeout=30, isolation_level=None,
+                                                row_factory=sqlite3.Row)
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._init_schema()
+
+    def _init_schema(self) -> None:
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                provider TEXT,
+                priority INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL DEFAULT 3,
+                created_at REAL NOT NULL,
+                available_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                heartbeat_at REAL,
+                worker_id TEXT,
+                result TEXT,
+                error TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_ready "
+                     "ON jobs (status, priority DESC, available_at, created_at)")
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Job:
+        return Job(
+            id=row['id'],
+            kind=row['kind'],
+            payload=json.loads(row['payload']),
+            provider=row['provider'],
+            priority=row['priority'],
+            status=row['status'],
+            attempts=row['attempts'],
+            max_attempts=row['max_attempts'],
+            created_at=row['created_at'],
+            available_at=row['available_at'],
+            started_at=row['started_at'],
+            finished_at=row['finished_at'],
+            heartbeat_at=row['heartbeat_at'],
+            worker_id=row['worker_id'],
+            result=json.loads(row['result']) if row['result'] is not None else None,
+            error=row['error'],
+        )
+
+    def _provider_limit(self, provider: Optional[str]) -> Optional[int]:
+        if not provider:
+            return None
+        return self.provider_limits.get(provider.lower(), self.default_provider_limit)
+
+    def enqueue(self, job_id: str, kind: str, payload: Dict[str, Any],
+                provider: Optional[str] = None, priority: int = 0,
+                max_attempts: int = 3) -> Job:
+        """Add a job; job_id doubles as the tailoring request_id"""
+        now = time.time()
+        self._connect().execute(
+            "INSERT INTO jobs (id, kind, payload, provider, priority, status, attempts, "
+            "max_attempts, created_at, available_at) VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?, ?)",
+            (job_id, kind, json.dumps(payload, ensure_ascii=False),
+             provider.lower() if provider else None, priority, QUEUED,
+             max(1, max_attempts), now, now),
+        )
+        logger.info(f"Enqueued {kind} job {job_id} (provider={provider}, priority={priority})")
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        row = self._connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """Number of queued jobs that will be considered before this one"""
+        job = self.get(job_id)
+        if not job or job.status != QUEUED:
+            return None
+        row = self._connect().execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = ? AND "
+            "(priority > ? OR (priority = ? AND created_at < ?))",
+            (QUEUED, job.priority, job.priority, job.created_at),
+        ).fetchone()
+        return row[0]
+
+    def claim(self, worker_id: str) -> Optional[Job]:
+        """
+        Atomically take the next runnable job.
+
+        Expired leases are returned to the queue first. Jobs whose provider is
+        already at its running limit are skipped, so a backlog for one provider
+        does not block jobs for another.
+        """
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._requeue_expired(conn, now)
+
+            running = dict(conn.execute(
+                "SELECT provider, COUNT(*) FROM jobs WHERE status = ? GROUP BY provider",
+                (RUNNING,),
+            ).fetchall())
+
+            candidates = conn.execute(
+                "SELECT id, provider FROM jobs WHERE status = ? AND available_at <= ? "
+                "ORDER BY priority DESC, available_at, created_at LIMIT 50",
+                (QUEUED, now),
+            ).fetchall()
+
+            chosen = None
+            for row in candidates:
+                limit = self._provider_limit(row['provider'])
+                if limit is None or running.get(row['provider'], 0) < limit:
+                    chosen = row['id']
+                    break
+
+            if chosen is None:
+                conn.execute("COMMIT")
+                return None
+
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, started_at = ?, "
+                "heartbeat_at = ?, worker_id = ?, error = NULL WHERE id = ?",
+                (RUNNING, now, now, worker_id, chosen),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(chosen)
+
+    def _requeue_expired(self, conn: sqlite3.Connection, now: float) -> None:
+        expired = conn.execute(
+            "SELECT id, attempts, max_attempts FROM jobs WHERE status = ? AND heartbeat_at < ?",
+            (RUNNING, now - self.lease_seconds),
+        ).fetchall()
+        for row in expired:
+            if row['attempts'] >= row['max_attempts']:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE id = ?",
+                    (FAILED, now, "Worker lease expired", row['id']),
+                )
+                logger.error(f"Job {row['id']} failed: worker lease expired on final attempt")
+            else:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, available_at = ?, worker_id = NULL WHERE id = ?",
+                    (QUEUED, now, row['id']),
+                )
+                logger.warning(f"Job {row['id']} lease expired, returned to queue")
+
+    def heartbeat(self, job_id: str, worker_id: str) -> None:
+        """Extend the lease on a running job"""
+        self._connect().execute(
+            "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = ? AND worker_id = ?",
+            (time.time(), job_id, RUNNING, worker_id),
+        )
+
+    def complete(self, job_id: str, result: Optional[Any] = None) -> None:
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = NULL WHERE id = ?",
+            (SUCCEEDED, time.time(), json.dumps(result, ensure_ascii=False), job_id),
+        )
+        logger.info(f"Job {job_id} succeeded")
+
+    def fail(self, job_id: str, error: str, retryable: bool = True,
+             backoff_seconds: float = 5.0) -> str:
+        """
+        Record a failed attempt.
+
+        Retryable failures go back to the queue with exponential backoff until
+        max_attempts is reached. Returns the job's new status.
+        """
+        conn = self._connect()
+        job = self.get(job_id)
+        if job is None:
+            return FAILED
+        now = time.time()
+        if retryable and job.attempts < job.max_attempts:
+            delay = backoff_seconds * (2 ** (job.attempts - 1))
+            conn.execute(
+                "UPDATE jobs SET status = ?, available_at = ?, worker_id = NULL, error = ? WHERE id = ?",
+                (QUEUED, now + delay, error, job_id),
+            )
+            logger.warning(f"Job {job_id} attempt {job.attempts}/{job.max_attempts} failed, "
+                           f"retrying in {delay:.0f}s: {error}")
+            return QUEUED
+        conn.execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE id = ?",
+            (FAILED, now, error, job_id),
+        )
+        logger.error(f"Job {job_id} failed after {job.attempts} attempt(s): {error}")
+        return FAILED
+
+    def purge_finished(self, older_than_seconds: float) -> int:
+        """Delete finished jobs older than the given age"""
+        cursor = self._connect().execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+            (SUCCEEDED, FAILED, time.time() - older_than_seconds),
+        )
+        return cursor.rowcount
+
+    def summary(self) -> Dict[str, Any]:
+        """Job counts by status and running jobs by provider"""
+        conn = self._connect()
+        by_status = dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        running = dict(conn.execute(
+            "SELECT provider, COUNT(*) FROM jobs WHERE status = ? GROUP BY provider", (RUNNING,)
+        ).fetchall())
+        return {
+            'db_path': self.db_path,
+            'by_status': by_status,
+            'running_by_provider': running,
+            'provider_limits': self.provider_limits,
+            'default_provider_limit': self.default_provider_limit,
+        }
+
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+
+def get_tailoring_job_queue() -> SQLiteJobQueue:
+    """Return the process-wide tailoring job queue configured from Config"""
+    global _job_queue
+
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                from config import Config
+                _job_queue = SQLiteJobQueue(
+                    Config.TAILORING_QUEUE_PATH,
+                    lease_seconds=Config.TAILORING_QUEUE_LEASE_SECONDS,
+                    default_provider_limit=Config.TAILORING_QUEUE_MAX_RUNNING_PER_PROVIDER,
+                )
+    return _job_queue
@@ -0,0 +1,216 @@
+"""
+LLM Client Registry
+
+This module hands out long-lived Anthropic / OpenAI SDK clients so every
+tailoring request, resume parse and job analysis reuses the same pooled HTTP
+connections instead of paying for a new TCP + TLS handshake per call.
+
+Key Features:
+- SDK clients keyed by (provider, api_key, base_url) in a bounded LRU
+- One pooled HTTP client per SDK, shared by all of that SDK's clients
+- Pool size, keep-alive and timeouts configured from Config.LLM_HTTP_*
+- Optional one-time verification callback when a client is first created
+- Rate limit headers of every response passed to utils.rate_limiter
+- Reset automatically after fork (multiprocessing workers get fresh pools)
+
+Author: Resume Tailor Team
+Status: Production Ready
+"""
+
+import importlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Provider names used across the app -> SDK that serves them
+_PROVIDER_SDKS = {
+    'claude': 'anthropic',
+    'anthropic': 'anthropic',
+    'openai': 'openai',
+}
+
+
+def _sdk_module(sdk_name: str):
+    return importlib.import_module(sdk_name)
+
+
+def _rate_limit_observer(sdk_name: str) -> Callable[[Any], None]:
+    """Response hook feeding every provider response's rate limit headers to the rate limiter"""
+    provider = 'claude' if sdk_name == 'anthropic' else sdk_name
+
+    def observe(response) -> None:
+        try:
+            from utils.rate_limiter import api_key_from_headers, get_rate_limiter
+            get_rate_limiter().observe(provider, api_key_from_headers(response.request.headers),
+                                       response.headers, response.status_code)
+        except Exception as e:
+            logger.debug(f"Could not read {provider} rate limit headers: {e}")
+    return observe
+
+
+class LLMClientRegistry:
+    """Process-wide cache of SDK clients sharing pooled HTTP transports."""
+
+    def __init__(self, max_connections: int = 20, max_keepalive_connections: int = 10,
+                 keepalive_expiry: float = 60.0, timeout_seconds: float = 600.0,
+                 connect_timeout_seconds: float = 10.0, max_retries: int = 2,
+                 max_clients: int = 32):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout_seconds = timeout_seconds
+        self.connect_timeout_seconds = connect_timeout_seconds
+        self.max_retries = max_retries
+        self.max_clients = max_clients
+
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._http_clients: Dict[str, Any] = {}
+        self._clients: "OrderedDict[Tuple[str, str, Optional[str]], Any]" = OrderedDict()
+        self.stats = {'created': 0, 'reused': 0, 'evicted': 0}
+
+    def get_client(self, provider: str, api_key: str, base_url: Optional[str] = None,
+                   verify: Optional[Callable[[Any], None]] = None):
+        """
+        Return a shared SDK client for a provider and credentials.
+
+        Args:
+            provider: 'claude'/'anthropic' or 'openai'
+            api_key: API key for the provider
+            base_url: Optional API base URL (e.g. an OpenAI-compatible endpoint)
+            verify: Called with a newly created client before it is shared;
+                    if it raises, the client is discarded and the error propagates
+
+        Returns:
+            anthropic.Anthropic or openai.OpenAI instance
+        """
+        sdk_name = _PROVIDER_SDKS.get(provider.lower())
+        if sdk_name is None:
+            raise ValueError(f"Unsupported LLM provider: {provider}")
+        key = (sdk_name, api_key, base_url)
+
+        with self._lock:
+            self._reset_after_fork()
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                self.stats['reused'] += 1
+                return client
+
+        # Build outside the lock: SDK construction and verify() may be slow
+        client = self._build_client(sdk_name, api_key, base_url)
+        if verify is not None:
+            verify(client)
+
+        with self._lock:
+            existing = self._clients.get(key)
+            if existing is not None:
+                self.stats['reused'] += 1
+                return existing
+            self._clients[key] = client
+            self.stats['created'] += 1
+            while len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+                self.stats['evicted'] += 1
+        logger.info(f"Created pooled {sdk_name} client"
+                    + (f" for {base_url}" if base_url else ""))
+        return client
+
+    def http_client(self, sdk_name: str):
+        """Return the pooled HTTP client shared by every client of one SDK"""
+        with self._lock:
+            self._reset_after_fork()
+            http_client = self._http_clients.get(sdk_name)
+            if http_client is None:
+                sdk = _sdk_module(sdk_name)
+                http_client = sdk.DefaultHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_keepalive_connections,
+                        keepalive_expiry=self.keepalive_expiry,
+                    ),
+                    timeout=httpx.Timeout(self.timeout_seconds, connect=self.connect_timeout_seconds),
+                    event_hooks={'response': [_rate_limit_observer(sdk_name)]},
+                )
+                self._http_clients[sdk_name] = http_client
+            return http_client
+
+    def _build_client(self, sdk_name: str, api_key: str, base_url: Optional[str]):
+        sdk = _sdk_module(sdk_name)
+        client_class = sdk.Anthropic if sdk_name == 'anthropic' else sdk.OpenAI
+        kwargs = {
+            'api_key': api_key,
+            'http_client': self.http_client(sdk_name),
+            'max_retries': self.max_retries,
+        }
+        if base_url:
+            kwargs['base_url'] = base_url
+        return client_class(**kwargs)
+
+    def _reset_after_fork(self):
+        # Connection pools must not be shared across processes; callers hold self._lock
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._http_clients = {}
+            self._clients = OrderedDict()
+
+    def close(self):
+        """Close every pooled HTTP client and forget all SDK clients"""
+        with self._lock:
+            http_clients = list(self._http_clients.values())
+            self._http_clients = {}
+            self._clients = OrderedDict()
+        for http_client in http_clients:
+            try:
+                http_client.close()
+            except Exception as e:
+                logger.warning(f"Error closing pooled HTTP client: {e}")
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'clients': len(self._clients),
+                'http_pools': sorted(self._http_clients),
+                'max_connections': self.max_connections,
+                'max_keepalive_connections': self.max_keepalive_connections,
+                'keepalive_expiry': self.keepalive_expiry,
+                'timeout_seconds': self.timeout_seconds,
+                'connect_timeout_seconds': self.connect_timeout_seconds,
+                'stats': dict(self.stats),
+            }
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_llm_client_registry() -> LLMClientRegistry:
+    """Return the process-wide LLM client registry configured from Config"""
+    global _registry
+
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                from config import Config
+                _registry = LLMClientRegistry(
+                    max_connections=Config.LLM_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=Config.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=Config.LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+                    timeout_seconds=Config.LLM_HTTP_TIMEOUT_SECONDS,
+                    connect_timeout_seconds=Config.LLM_HTTP_CONNECT_TIMEOUT_SECONDS,
+                    max_retries=Config.LLM_HTTP_MAX_RETRIES,
+                    max_clients=Config.LLM_CLIENT_REGISTRY_MAX_CLIENTS,
+                )
+    return _registry
+
+
+def get_llm_client(provider: str, api_key: str, base_url: Optional[str] = None,
+                   verify: Optional[Callable[[Any], None]] = None):
+    """Shortcut for get_llm_client_registry().get_client(...)"""
+    return get_llm_client_registry().get_client(provider, api_key, base_url, verify=verify)
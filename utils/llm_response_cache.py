@@ -0,0 +1,125 @@
+"""
+LLM Response Cache
+
+This module provides a content-addressed cache for raw LLM completions so
+repeat tailoring requests (re-clicking "Tailor", switching provider and back)
+do not go back to the provider.
+
+Key Features:
+- Keys are a SHA-256 of (provider, model, system prompt, prompt, temperature)
+- Pluggable backends: in-memory LRU, SQLite shared across workers, or both
+- TTL and size-based eviction from utils.cache_backends
+- Hit/miss counters exposed through get_llm_cache_summary()
+
+Author: Resume Tailor Team
+Status: Production Ready
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from utils.cache_backends import DisabledCache, MemoryLRUBackend, SQLiteBackend, TieredCache
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached payload format changes so old entries stop matching
+CACHE_KEY_VERSION = 1
+
+
+def make_cache_key(provider: str, model: str, prompt: str,
+                   temperature: Optional[float] = None,
+                   system: Optional[str] = None) -> str:
+    """
+    Build the content-addressed key for an LLM completion.
+
+    Args:
+        provider: LLM provider name ("claude", "openai")
+        model: Model identifier sent to the provider
+        prompt: User prompt text
+        temperature: Sampling temperature sent with the request
+        system: System prompt, if any
+
+    Returns:
+        Hex SHA-256 digest identifying the request
+    """
+    material = json.dumps(
+        {
+            'v': CACHE_KEY_VERSION,
+            'provider': provider.lower(),
+            'model': model,
+            'system': system or "",
+            'prompt': prompt,
+            'temperature': temperature,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+def build_llm_response_cache(backend: str = "tiered", db_path: Optional[str] = None,
+                             ttl_seconds: Optional[float] = None,
+                             max_entries: Optional[int] = None,
+                             max_bytes: Optional[int] = None) -> TieredCache:
+    """
+    Create an LLM response cache with the requested backend.
+
+    Args:
+        backend: "memory", "sqlite" or "tiered" (memory in front of sqlite)
+        db_path: SQLite file path (required for "sqlite" and "tiered")
+        ttl_seconds: Entry time-to-live
+        max_entries: Entry limit per backend
+        max_bytes: Byte limit per backend
+    """
+    backend = backend.lower()
+    tiers = []
+    if backend in ("memory", "tiered"):
+        memory_entries = max_entries if backend == "memory" else min(max_entries or 256, 256)
+        tiers.append(MemoryLRUBackend(ttl_seconds=ttl_seconds, max_entries=memory_entries,
+                                      max_bytes=max_bytes))
+    if backend in ("sqlite", "tiered"):
+        if not db_path:
+            raise ValueError(f"LLM response cache backend '{backend}' requires db_path")
+        tiers.append(SQLiteBackend(db_path, table="llm_responses", ttl_seconds=ttl_seconds,
+                                   max_entries=max_entries, max_bytes=max_bytes))
+    if not tiers:
+        raise ValueError(f"Unknown LLM response cache backend: {backend}")
+    return TieredCache(tiers, name="llm_responses")
+
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache():
+    """Return the process-wide LLM response cache configured from Config."""
+    global _llm_cache
+
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                from config import Config
+                if not Config.USE_LLM_RESPONSE_CACHE:
+                    _llm_cache = DisabledCache('llm_responses')
+                else:
+                    try:
+                        _llm_cache = build_llm_response_cache(
+                            backend=Config.LLM_RESPONSE_CACHE_BACKEND,
+                            db_path=Config.LLM_RESPONSE_CACHE_PATH,
+                            ttl_seconds=Config.LLM_RESPONSE_CACHE_TTL_SECONDS,
+                            max_entries=Config.LLM_RESPONSE_CACHE_MAX_ENTRIES,
+                            max_bytes=Config.LLM_RESPONSE_CACHE_MAX_BYTES,
+                        )
+                        logger.info(f"LLM response cache enabled ({Config.LLM_RESPONSE_CACHE_BACKEND})")
+                    except Exception as e:
+                        logger.error(f"Failed to initialize LLM response cache: {e}")
+                        _llm_cache = DisabledCache('llm_responses')
+    return _llm_cache
+
+
+def get_llm_cache_summary() -> Dict[str, Any]:
+    """Return hit/miss counters and tier details for the LLM response cache."""
+    return get_llm_response_cache().summary()
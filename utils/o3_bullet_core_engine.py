@@ -31,6 +31,7 @@ from utils.unicode_bullet_sanitizer import sanitize_bullet_text
 from utils.numid_collision_manager import allocate_safe_numid
 from utils.xml_repair_system import analyze_docx_xml_issues
 from utils.style_collision_handler import validate_style_for_bullets
+from utils.document_index import DocumentIndex, analyze_document, has_valid_numbering
 
 logger = logging.getLogger(__name__)
 
@@ -190,12 +191,13 @@ class O3BulletCoreEngine:
             self.stats['bullets_failed'] += 1
             raise
     
-    def validate_document_bullets(self, doc: Document) -> Dict[str, Any]:
+    def validate_document_bullets(self, doc: Document, index: Optional[DocumentIndex] = None) -> Dict[str, Any]:
         """
         Validate all bullets in the document after construction is complete.
         
         Args:
             doc: Complete document to validate
+            index: Analysis of doc from analyze_document (built here if omitted)
             
         Returns:
             Validation results summary
@@ -213,44 +215,42 @@ class O3BulletCoreEngine:
             'needs_reconciliation': False
         }
         
-        # O3: Iterate through all document paragraphs
-        for i, para in enumerate(doc.paragraphs):
-            # Check if this paragraph should be a bullet
-            if para.style and para.style.name == 'MR_BulletPoint':
-                bullet_id = self._find_bullet_by_paragraph(para)
+        if index is None:
+            index = analyze_document(doc)
+        bullets_by_text = self._registry_by_text()
+        found_bullets = set()
+        
+        # O3: Check every bullet paragraph found by the analysis pass
+        for entry in index.bullets('MR_BulletPoint', body_only=True):
+            para = entry.paragraph
+            bullet_id = bullets_by_text.get(para.text.strip())
+            
+            if bullet_id:
+                found_bullets.add(bullet_id)
+                metadata = self.bullet_registry[bullet_id]
+                is_valid = self._validate_single_bullet(para, metadata, entry.style_name)
                 
-                if bullet_id:
-                    metadata = self.bullet_registry[bullet_id]
-                    is_valid = self._validate_single_bullet(para, metadata)
+                if is_valid:
+                    metadata.state = BulletState.VALIDATED
+                    metadata.validated_at = datetime.now()
+                    validation_results['validated_bullets'] += 1
+                    self.stats['bullets_validated'] += 1
+                else:
+                    metadata.state = BulletState.FAILED
+                    validation_results['failed_bullets'] += 1
+                    validation_results['needs_reconciliation'] = True
                     
-                    if is_valid:
-                        metadata.state = BulletState.VALIDATED
-                        metadata.validated_at = datetime.now()
-                        validation_results['validated_bullets'] += 1
-                        self.stats['bullets_validated'] += 1
-                    else:
-                        metadata.state = BulletState.FAILED
-                        validation_results['failed_bullets'] += 1
-                        validation_results['needs_reconciliation'] = True
-                        
-                        issue = {
-                            'bullet_id': bullet_id,
-                            'paragraph_index': i,
-                            'text': para.text[:50],
-                            'issue': metadata.last_error or 'Unknown validation failure'
-                        }
-                        validation_results['validation_issues'].append(issue)
-                        
-                        logger.warning(f"O3: Bullet validation failed: {issue}")
+                    issue = {
+                        'bullet_id': bullet_id,
+                        'paragraph_index': entry.body_index,
+                        'text': para.text[:50],
+                        'issue': metadata.last_error or 'Unknown validation failure'
+                    }
+                    validation_results['validation_issues'].append(issue)
+                    
+                    logger.warning(f"O3: Bullet validation failed: {issue}")
         
         # O3: Check for orphaned bullets (registered but not found in document)
-        found_bullets = set()
-        for para in doc.paragraphs:
-            if para.style and para.style.name == 'MR_BulletPoint':
-                bullet_id = self._find_bullet_by_paragraph(para)
-                if bullet_id:
-                    found_bullets.add(bullet_id)
-        
         orphaned_bullets = set(self.bullet_registry.keys()) - found_bullets
         if orphaned_bullets:
             logger.warning(f"O3: Found {len(orphaned_bullets)} orphaned bullets")
@@ -271,13 +271,15 @@ class O3BulletCoreEngine:
         
         return validation_results
     
-    def reconcile_document_bullets(self, doc: Document, numbering_engine: Any) -> Dict[str, Any]:
+    def reconcile_document_bullets(self, doc: Document, numbering_engine: Any,
+                                   index: Optional[DocumentIndex] = None) -> Dict[str, Any]:
         """
         Perform comprehensive bullet reconciliation using O3's approach.
         
         Args:
             doc: Document to reconcile
             numbering_engine: Numbering engine for repairs
+            index: Analysis of doc from analyze_document (built here if omitted)
             
         Returns:
             Reconciliation results summary
@@ -295,36 +297,41 @@ class O3BulletCoreEngine:
             'success_rate': 0.0
         }
         
+        if index is None:
+            index = analyze_document(doc)
+        bullet_entries = index.bullets('MR_BulletPoint', body_only=True)
+        bullets_by_text = self._registry_by_text()
+        
         # O3: Multi-pass reconciliation for maximum reliability
         for attempt in range(self.config['max_reconciliation_attempts']):
             logger.info(f"O3: Reconciliation attempt {attempt + 1}/{self.config['max_reconciliation_attempts']}")
             
             repaired_this_pass = 0
             
-            # O3: Scan all paragraphs for bullet issues
-            for i, para in enumerate(doc.paragraphs):
-                if para.style and para.style.name == 'MR_BulletPoint':
-                    reconciliation_results['bullets_processed'] += 1
+            # O3: Re-check each indexed bullet's numbering (repairs change it between passes)
+            for entry in bullet_entries:
+                para, i = entry.paragraph, entry.body_index
+                reconciliation_results['bullets_processed'] += 1
+                
+                # O3: Check if bullet has proper numbering
+                has_numbering = self._check_paragraph_numbering(para)
+                
+                if not has_numbering:
+                    logger.info(f"O3: Repairing bullet at paragraph {i}: '{para.text[:30]}...'")
                     
-                    # O3: Check if bullet has proper numbering
-                    has_numbering = self._check_paragraph_numbering(para)
+                    # O3: Attempt repair
+                    repair_success = self._repair_bullet_numbering(para, numbering_engine, bullets_by_text)
+                    reconciliation_results['repair_attempts'] += 1
                     
-                    if not has_numbering:
-                        logger.info(f"O3: Repairing bullet at paragraph {i}: '{para.text[:30]}...'")
-                        
-                        # O3: Attempt repair
-                        repair_success = self._repair_bullet_numbering(para, numbering_engine)
-                        reconciliation_results['repair_attempts'] += 1
-                        
-                        if repair_success:
-                            repaired_this_pass += 1
-                            reconciliation_results['bullets_repaired'] += 1
-                            self.stats['bullets_reconciled'] += 1
-                        else:
-                            logger.warning(f"O3: Failed to repair bullet at paragraph {i}")
+                    if repair_success:
+                        repaired_this_pass += 1
+                        reconciliation_results['bullets_repaired'] += 1
+                        self.stats['bullets_reconciled'] += 1
                     else:
-                        # O3: Bullet is already good
-                        reconciliation_results['bullets_stable'] += 1
+                        logger.warning(f"O3: Failed to repair bullet at paragraph {i}")
+                else:
+                    # O3: Bullet is already good
+                    reconciliation_results['bullets_stable'] += 1
             
             logger.info(f"O3: Reconciliation pass {attempt + 1} repaired {repaired_this_pass} bullets")
             
@@ -349,6 +356,13 @@ class O3BulletCoreEngine:
         self.document_state = "complete"
         return reconciliation_results
     
+    def _registry_by_text(self) -> Dict[str, str]:
+        """Map stripped bullet text to the first bullet ID registered with it."""
+        by_text: Dict[str, str] = {}
+        for bullet_id, metadata in self.bullet_registry.items():
+            by_text.setdefault(metadata.text_content.strip(), bullet_id)
+        return by_text
+    
     def _find_bullet_by_paragraph(self, para: Any) -> Optional[str]:
         """Find bullet ID by matching paragraph text."""
         para_text = para.text.strip()
@@ -359,10 +373,14 @@ class O3BulletCoreEngine:
         
         return None
     
-    def _validate_single_bullet(self, para: Any, metadata: BulletMetadata) -> bool:
-        """Validate a single bullet paragraph."""
+    def _validate_single_bullet(self, para: Any, metadata: BulletMetadata,
+                                style_name: Optional[str] = None) -> bool:
+        """Validate a single bullet paragraph (style_name skips the style lookup when known)."""
         
         try:
+            if style_name is None:
+                style_name = para.style.name if para.style else None
+            
             # O3: Check for numPr element
             if not self._check_paragraph_numbering(para):
                 metadata.last_error = "Missing numPr element"
@@ -370,8 +388,8 @@ class O3BulletCoreEngine:
                 return False
             
             # O3: Check style consistency
-            if not para.style or para.style.name != metadata.style_name:
-                metadata.last_error = f"Style mismatch: expected {metadata.style_name}, got {para.style.name if para.style else 'None'}"
+            if style_name != metadata.style_name:
+                metadata.last_error = f"Style mismatch: expected {metadata.style_name}, got {style_name}"
                 metadata.error_count += 1
                 return False
             
@@ -392,34 +410,15 @@ class O3BulletCoreEngine:
         """Check if paragraph has proper bullet numbering."""
         
         try:
-            # O3: Look for numPr element in paragraph XML
-            pPr = para._element.find('.//{http://schemas.openxmlformats.org/wordprocessingml/2006/main}pPr')
-            if pPr is None:
-                return False
-            
-            numPr = pPr.find('.//{http://schemas.openxmlformats.org/wordprocessingml/2006/main}numPr')
-            if numPr is None:
-                return False
-            
-            # O3: Check for required numId and ilvl elements
-            numId = numPr.find('.//{http://schemas.openxmlformats.org/wordprocessingml/2006/main}numId')
-            ilvl = numPr.find('.//{http://schemas.openxmlformats.org/wordprocessingml/2006/main}ilvl')
-            
-            if numId is None or ilvl is None:
-                return False
-            
-            # O3: Validate numId value
-            num_id_val = numId.get('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val')
-            if not num_id_val or not num_id_val.isdigit():
-                return False
-            
-            return True
+            # O3: numPr must carry a numeric numId and an ilvl
+            return has_valid_numbering(para._element)
             
         except Exception as e:
             logger.debug(f"O3: Error checking paragraph numbering: {e}")
             return False
     
-    def _repair_bullet_numbering(self, para: Any, numbering_engine: Any) -> bool:
+    def _repair_bullet_numbering(self, para: Any, numbering_engine: Any,
+                                 bullets_by_text: Optional[Dict[str, str]] = None) -> bool:
         """Repair bullet numbering for a paragraph."""
         
         try:
@@ -427,15 +426,17 @@ class O3BulletCoreEngine:
             num_id = 100  # Default fallback
             
             # Try to find the original numId from our registry
-            bullet_id = self._find_bullet_by_paragraph(para)
+            if bullets_by_text is not None:
+                bullet_id = bullets_by_text.get(para.text.strip())
+            else:
+                bullet_id = self._find_bullet_by_paragraph(para)
             if bullet_id and bullet_id in self.bullet_registry:
                 num_id = self.bullet_registry[bullet_id].num_id
             
             # O3: Apply numbering repair
             numbering_engine.apply_native_bullet(para, num_id=num_id, level=0)
             
-            # O3: Verify repair worked
-            time.sleep(0.01)  # Brief pause for XML state to settle
+            # O3: Verify repair worked (lxml edits are synchronous, no settling needed)
             return self._check_paragraph_numbering(para)
             
         except Exception as e:
@@ -0,0 +1,275 @@
+"""
+Prompt Token Budgets
+
+This module measures LLM prompts component by component and fits them to a
+per-prompt token budget before they are sent, so prompt size is a controlled
+quantity rather than whatever the job posting and resume happen to produce.
+
+Key Features:
+- count_tokens(): tiktoken cl100k_base counts, encoder loaded once; request text is never retained
+- count_instruction_tokens(): the same count memoized, for constant instruction prefixes only
+- ~4 chars/token estimate when tiktoken or its encoding file is unavailable
+- PromptComponent: one named piece of a prompt with a priority and a trim strategy
+- fit_components(): compact renderings first, then trims the lowest-priority components;
+  required components (instructions, the resume section itself) are never cut
+- Per-prompt budgets, overridable with PROMPT_TOKEN_BUDGETS ("experience=8000,skills=1500")
+- Fitted token counts logged and attached to the current trace span
+
+Author: Resume Tailor Team
+Status: Production Ready
+"""
+
+import functools
+import logging
+import threading
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional
+
+from utils.tracing import annotate_span
+
+logger = logging.getLogger(__name__)
+
+ENCODING_NAME = "cl100k_base"
+_CHARS_PER_TOKEN = 4
+
+# Trim strategies
+TRIM_LINES = "lines"   # drop trailing lines (bullet lists such as job requirements)
+TRIM_TAIL = "tail"     # cut trailing tokens and mark the cut
+TRUNCATION_MARKER = " [...]"
+
+# Token budget per prompt: instructions + job context + original content, system message excluded
+PROMPT_BUDGETS = {
+    "experience": 6000,
+    "education": 2000,
+    "skills": 2000,
+    "projects": 3000,
+    "combined": 10000,
+    "job_analysis": 6000,
+}
+DEFAULT_PROMPT_BUDGET = 2500
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    """The tiktoken encoding, loaded once; None when it cannot be loaded"""
+    global _encoding, _encoding_loaded
+
+    if not _encoding_loaded:
+        with _encoding_lock:
+            if not _encoding_loaded:
+                try:
+                    import tiktoken
+                    _encoding = tiktoken.get_encoding(ENCODING_NAME)
+                except Exception as e:
+                    # Missing package, or the encoding file could not be fetched
+                    logger.warning(f"tiktoken {ENCODING_NAME} unavailable, estimating "
+                                   f"{_CHARS_PER_TOKEN} chars per token: {e}")
+                    _encoding = None
+                _encoding_loaded = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Token count of text; not memoized, since prompts carry resume and job posting text"""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return -(-len(text) // _CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+@functools.lru_cache(maxsize=64)
+def count_instruction_tokens(text: str) -> int:
+    """
+    Token count of constant prompt text (instruction prefixes, system messages,
+    headers), memoized so each is encoded once. Never pass request-specific
+    text: the memo would keep it in memory.
+    """
+    return count_tokens(text)
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """The longest prefix of text within max_tokens, cut back to a word boundary"""
+    if max_tokens <= 0:
+        return ""
+    encoding = _get_encoding()
+    if encoding is None:
+        cut = text[:max_tokens * _CHARS_PER_TOKEN]
+    else:
+        tokens = encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        cut = encoding.decode(tokens[:max_tokens])
+    if len(cut) < len(text) and ' ' in cut:
+        cut = cut[:cut.rfind(' ')]
+    return cut.rstrip()
+
+
+def token_counter_stats() -> Dict[str, Any]:
+    """Encoding in use and the instruction token count memo's counters"""
+    info = count_instruction_tokens.cache_info()
+    return {
+        'encoding': ENCODING_NAME if _get_encoding() is not None else f'estimate ({_CHARS_PER_TOKEN} chars/token)',
+        'hits': info.hits,
+        'misses': info.misses,
+        'size': info.currsize,
+    }
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_budget_overrides(spec: str) -> Dict[str, int]:
+    overrides = {}
+    for item in spec.split(','):
+        name, _, value = item.partition('=')
+        try:
+            overrides[name.strip()] = int(value)
+        except ValueError:
+            if item.strip():
+                logger.warning(f"Ignoring malformed PROMPT_TOKEN_BUDGETS entry: {item!r}")
+    return overrides
+
+
+def budget_for(name: str) -> Optional[int]:
+    """Token budget for a prompt kind; None when budgets are disabled (measure only)"""
+    from config import Config
+
+    if not Config.USE_PROMPT_BUDGETS:
+        return None
+    overrides = _parse_budget_overrides(Config.PROMPT_TOKEN_BUDGETS)
+    return overrides.get(name, PROMPT_BUDGETS.get(name, DEFAULT_PROMPT_BUDGET))
+
+
+@dataclass(frozen=True)
+class PromptComponent:
+    """
+    One named piece of a prompt.
+
+    Lower priority components are trimmed first; required ones are only ever
+    swapped for their compact rendering. The header is rendered before the
+    text and dropped together with it when the text is trimmed away.
+    """
+    name: str
+    text: str
+    priority: int = 0
+    required: bool = False
+    trim: str = TRIM_TAIL
+    header: str = ""
+    compact: Optional[str] = None
+
+    @property
+    def rendered(self) -> str:
+        return self.header + self.text if self.text else ""
+
+
+@dataclass
+class BudgetedPrompt:
+    """Components after fitting, with their token accounting"""
+    name: str
+    components: List[PromptComponent]
+    tokens: int
+    budget: Optional[int]
+    fixed_tokens: int = 0
+    component_tokens: Dict[str, int] = field(default_factory=dict)
+    trimmed: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def text(self) -> str:
+        return "".join(component.rendered for component in self.components)
+
+    def component_text(self, name: str) -> str:
+        return next((c.text for c in self.components if c.name == name), "")
+
+
+def _trim_component(component: PromptComponent, max_tokens: int) -> PromptComponent:
+    """Shrink a component's rendering to at most max_tokens"""
+    available = max_tokens - count_instruction_tokens(component.header)
+    if available <= 0:
+        return replace(component, text="")
+
+    if component.trim == TRIM_LINES:
+        kept, used = [], 0
+        for line in component.text.split('\n'):
+            cost = count_tokens(line) + (1 if kept else 0)
+            if used + cost > available:
+                break
+            kept.append(line)
+            used += cost
+        return replace(component, text='\n'.join(kept))
+
+    text = truncate_tokens(component.text, available - count_instruction_tokens(TRUNCATION_MARKER))
+    return replace(component, text=text + TRUNCATION_MARKER if text else "")
+
+
+def fit_components(
+    name: str,
+    components: List[PromptComponent],
+    fixed_tokens: int = 0,
+    budget: Optional[int] = None
+) -> BudgetedPrompt:
+    """
+    Fit prompt components into the token budget for this prompt kind.
+
+    Over budget, compact renderings are used first (lowest priority first),
+    then optional components are trimmed lowest priority first. A prompt whose
+    required components alone exceed the budget is sent as is and logged.
+
+    Args:
+        name: Prompt kind, the key into PROMPT_BUDGETS (e.g. 'experience')
+        components: Components in the order they are rendered
+        fixed_tokens: Tokens of text outside the components (e.g. the cached instruction prefix)
+        budget: Explicit budget; defaults to budget_for(name)
+
+    Returns:
+        BudgetedPrompt; tokens is the sum of the per-component counts plus fixed_tokens
+    """
+    budget = budget if budget is not None else budget_for(name)
+    fitted = list(components)
+    counts = [count_tokens(c.rendered) for c in fitted]
+    total = fixed_tokens + sum(counts)
+    trimmed: Dict[str, int] = {}
+
+    if budget is not None and total > budget:
+        by_priority = sorted(range(len(fitted)), key=lambda i: fitted[i].priority)
+
+        for i in by_priority:
+            if total <= budget:
+                break
+            if fitted[i].compact is not None:
+                fitted[i] = replace(fitted[i], text=fitted[i].compact, compact=None)
+                saved = counts[i] - count_tokens(fitted[i].rendered)
+                counts[i] -= saved
+                total -= saved
+                trimmed[fitted[i].name] = saved
+
+        for i in by_priority:
+            if total <= budget:
+                break
+            if fitted[i].required or not fitted[i].text:
+                continue
+            fitted[i] = _trim_component(fitted[i], counts[i] - (total - budget))
+            saved = counts[i] - count_tokens(fitted[i].rendered)
+            counts[i] -= saved
+            total -= saved
+            trimmed[fitted[i].name] = trimmed.get(fitted[i].name, 0) + saved
+
+        if total > budget:
+            logger.warning(f"Prompt {name} is {total} tokens after trimming, over its {budget} token budget")
+
+    result = BudgetedPrompt(
+        name=name, components=fitted, tokens=total, budget=budget, fixed_tokens=fixed_tokens,
+        component_tokens={c.name: count for c, count in zip(fitted, counts)}, trimmed=trimmed)
+    _log_budget(result)
+    return result
+
+
+def _log_budget(result: BudgetedPrompt) -> None:
+    budget = result.budget if result.budget is not None else "unlimited"
+    trimmed = ", ".join(f"{name} -{saved}" for name, saved in result.trimmed.items())
+    logger.info(f"Prompt {result.name}: {result.tokens}/{budget} tokens"
+                + (f" (trimmed {trimmed})" if trimmed else ""))
+    annotate_span(prompt_tokens=result.tokens, prompt_budget=result.budget,
+                  prompt_trimmed=",".join(sorted(result.trimmed)))
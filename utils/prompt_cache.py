@@ -0,0 +1,159 @@
+"""
+Provider Prompt Caching
+
+This module shapes tailoring prompts so the providers' own prompt caches can
+reuse the large constant instruction blocks across requests, and records the
+cache hit rates the APIs report back.
+
+Key Features:
+- CachedPrompt: a stable instruction prefix plus the per-request suffix (job, resume)
+- Anthropic: system message and prefix as content blocks, with an ephemeral
+  cache_control breakpoint on the prefix once it reaches the model's minimum
+  cacheable length (PROMPT_CACHE_MIN_TOKENS)
+- OpenAI: static system message and prefix sent first, so its automatic prefix caching applies
+- Cache read/write token counts read from either SDK's usage object
+- Per-provider request, prompt token and cached token counters with hit rates
+- Breakpoints off with USE_PROMPT_CACHING=false (prompt text and order are unchanged)
+
+Author: Resume Tailor Team
+Status: Production Ready
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedPrompt:
+    """A prompt split into the part that is identical across requests and the part that is not."""
+    prefix: str
+    suffix: str
+
+    @property
+    def text(self) -> str:
+        return self.prefix + self.suffix
+
+
+def _caching_enabled() -> bool:
+    from config import Config
+    return Config.USE_PROMPT_CACHING
+
+
+def _cacheable(prompt: CachedPrompt, system_message: str) -> bool:
+    """Whether system + prefix is long enough for Anthropic to cache at all"""
+    from config import Config
+    from utils.prompt_budget import count_instruction_tokens
+
+    return (count_instruction_tokens(system_message) + count_instruction_tokens(prompt.prefix)
+            >= Config.PROMPT_CACHE_MIN_TOKENS)
+
+
+def anthropic_request(prompt: CachedPrompt, system_message: str) -> Dict[str, Any]:
+    """
+    System and messages arguments for client.messages.create.
+
+    The cache breakpoint on the prefix caches system + prefix together; the
+    suffix follows as its own block and is never cached. Prefixes below the
+    model's minimum cacheable length get no breakpoint.
+    """
+    prefix_block: Dict[str, Any] = {"type": "text", "text": prompt.prefix}
+    if _caching_enabled() and _cacheable(prompt, system_message):
+        prefix_block["cache_control"] = {"type": "ephemeral"}
+    return {
+        "system": [{"type": "text", "text": system_message}],
+        "messages": [{
+            "role": "user",
+            "content": [prefix_block, {"type": "text", "text": prompt.suffix}],
+        }],
+    }
+
+
+def openai_messages(prompt: CachedPrompt, system_message: str) -> List[Dict[str, str]]:
+    """Messages for chat.completions.create, constant content first for automatic prefix caching"""
+    return [
+        {"role": "system", "content": system_message},
+        {"role": "user", "content": prompt.text},
+    ]
+
+
+def cache_usage(response: Any) -> Dict[str, int]:
+    """
+    Prompt and cache token counts from an Anthropic or OpenAI response.
+
+    Returns:
+        prompt_tokens (all input tokens, cached or not), cache_read_tokens and
+        cache_write_tokens; zeros when the SDK does not report them
+    """
+    usage = getattr(response, 'usage', None)
+    if usage is None:
+        return {'prompt_tokens': 0, 'cache_read_tokens': 0, 'cache_write_tokens': 0}
+
+    def count(obj: Any, name: str) -> int:
+        value = getattr(obj, name, None)
+        return value if isinstance(value, int) else 0
+
+    if hasattr(usage, 'prompt_tokens'):
+        # OpenAI: prompt_tokens includes the cached ones
+        details = getattr(usage, 'prompt_tokens_details', None)
+        return {
+            'prompt_tokens': count(usage, 'prompt_tokens'),
+            'cache_read_tokens': count(details, 'cached_tokens'),
+            'cache_write_tokens': 0,
+        }
+    # Anthropic: input_tokens excludes cache reads and writes
+    read = count(usage, 'cache_read_input_tokens')
+    write = count(usage, 'cache_creation_input_tokens')
+    return {
+        'prompt_tokens': count(usage, 'input_tokens') + read + write,
+        'cache_read_tokens': read,
+        'cache_write_tokens': write,
+    }
+
+
+class PromptCacheStats:
+    """Process-wide prompt cache counters per provider."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._providers: Dict[str, Dict[str, int]] = {}
+
+    def record(self, provider: str, usage: Dict[str, int]) -> None:
+        with self._lock:
+            counters = self._providers.setdefault(provider, {
+                'requests': 0, 'cache_hits': 0, 'prompt_tokens': 0,
+                'cache_read_tokens': 0, 'cache_write_tokens': 0,
+            })
+            counters['requests'] += 1
+            counters['cache_hits'] += 1 if usage.get('cache_read_tokens') else 0
+            for key in ('prompt_tokens', 'cache_read_tokens', 'cache_write_tokens'):
+                counters[key] += usage.get(key, 0)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Counters per provider plus request and token hit rates"""
+        with self._lock:
+            providers = {name: dict(counters) for name, counters in self._providers.items()}
+        for counters in providers.values():
+            counters['request_hit_rate'] = round(counters['cache_hits'] / counters['requests'], 4) \
+                if counters['requests'] else 0.0
+            counters['token_hit_rate'] = round(counters['cache_read_tokens'] / counters['prompt_tokens'], 4) \
+                if counters['prompt_tokens'] else 0.0
+        return providers
+
+
+_prompt_cache_stats = None
+_prompt_cache_stats_lock = threading.Lock()
+
+
+def get_prompt_cache_stats() -> PromptCacheStats:
+    """Return the process-wide prompt cache counters"""
+    global _prompt_cache_stats
+
+    if _prompt_cache_stats is None:
+        with _prompt_cache_stats_lock:
+            if _prompt_cache_stats is None:
+                _prompt_cache_stats = PromptCacheStats()
+    return _prompt_cache_stats
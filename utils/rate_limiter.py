@@ -0,0 +1,397 @@
+"""
+LLM Rate Limiter
+
+This module paces LLM calls on the client side with token buckets for
+requests per minute and tokens per minute, per provider and API key, so a
+burst of tailoring requests queues briefly instead of drawing 429s and
+burning retries.
+
+Key Features:
+- Requests/min and tokens/min buckets per (provider, API key fingerprint); keys are never stored
+- SQLite bucket store shared by all gunicorn workers (one BEGIN IMMEDIATE transaction per take),
+  per-process memory store as the fallback
+- Callers wait for capacity (up to LLM_RATE_LIMIT_MAX_WAIT_SECONDS) instead of failing
+- Tokens reserved up front (prompt estimate + max output), settled from the reported usage
+  and refunded when the call fails
+- Limits and levels adapted from the providers' rate limit headers (anthropic-ratelimit-*,
+  x-ratelimit-*) and held back for Retry-After after a 429
+- DisabledRateLimiter for USE_LLM_RATE_LIMITER=false
+
+Author: Resume Tailor Team
+Status: Production Ready
+"""
+
+import hashlib
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from utils.cache_backends import thread_local_connection
+
+logger = logging.getLogger(__name__)
+
+REQUESTS = "requests"
+TOKENS = "tokens"
+
+# (limit, remaining) response headers per provider and bucket, most specific first
+_LIMIT_HEADERS = {
+    "claude": {
+        REQUESTS: [("anthropic-ratelimit-requests-limit", "anthropic-ratelimit-requests-remaining")],
+        TOKENS: [("anthropic-ratelimit-tokens-limit", "anthropic-ratelimit-tokens-remaining"),
+                 ("anthropic-ratelimit-input-tokens-limit", "anthropic-ratelimit-input-tokens-remaining")],
+    },
+    "openai": {
+        REQUESTS: [("x-ratelimit-limit-requests", "x-ratelimit-remaining-requests")],
+        TOKENS: [("x-ratelimit-limit-tokens", "x-ratelimit-remaining-tokens")],
+    },
+}
+
+
+class RateLimitWaitTimeout(RuntimeError):
+    """Raised when no capacity frees up within the maximum wait; treated like a 429."""
+    status_code = 429
+
+
+@dataclass
+class BucketState:
+    """One token bucket; capacity is the per-minute limit and refills continuously over a minute."""
+    level: float
+    capacity: float
+    updated: float
+
+    def refilled(self, now: float) -> "BucketState":
+        level = min(self.capacity, self.level + max(0.0, now - self.updated) * self.capacity / 60)
+        return BucketState(level, self.capacity, max(now, self.updated))
+
+
+def _fingerprint(api_key: str) -> str:
+    return hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+
+
+def api_key_from_headers(headers: Mapping[str, str]) -> Optional[str]:
+    """API key of an outgoing Anthropic (x-api-key) or OpenAI (Bearer) request"""
+    api_key = headers.get("x-api-key")
+    if api_key:
+        return api_key
+    authorization = headers.get("authorization", "")
+    return authorization[7:] if authorization.lower().startswith("bearer ") else None
+
+
+def parse_rate_limit_headers(provider: str, headers: Mapping[str, str]) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+    """{bucket: (limit, remaining)} from a provider's response headers"""
+    def number(name: str) -> Optional[float]:
+        try:
+            return float(headers.get(name))
+        except (TypeError, ValueError):
+            return None
+
+    parsed = {}
+    for bucket, candidates in _LIMIT_HEADERS.get(provider, {}).items():
+        for limit_header, remaining_header in candidates:
+            limit, remaining = number(limit_header), number(remaining_header)
+            if limit is not None or remaining is not None:
+                parsed[bucket] = (limit, remaining)
+                break
+    return parsed
+
+
+class MemoryBucketStore:
+    """Buckets for this process only."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._buckets: Dict[str, BucketState] = {}
+        self._lock = threading.Lock()
+
+    def transact(self, keys: List[str], update: Callable[[Dict[str, Optional[BucketState]]], Tuple[Dict[str, BucketState], Any]]) -> Any:
+        """Run update on the current states of keys and store the states it returns, atomically"""
+        with self._lock:
+            changed, result = update({key: self._buckets.get(key) for key in keys})
+            self._buckets.update(changed)
+        return result
+
+    def snapshot(self) -> Dict[str, BucketState]:
+        with self._lock:
+            return dict(self._buckets)
+
+
+class SQLiteBucketStore:
+    """Buckets in a SQLite file shared by every worker process."""
+
+    name = "sqlite"
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        self._connection = thread_local_connection(db_path, isolation_level=None)
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS llm_rate_buckets ("
+            "key TEXT PRIMARY KEY, level REAL NOT NULL, capacity REAL NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def transact(self, keys: List[str], update: Callable[[Dict[str, Optional[BucketState]]], Tuple[Dict[str, BucketState], Any]]) -> Any:
+        """Run update on the current states of keys and store the states it returns, atomically"""
+        conn = self._connection()
+        # IMMEDIATE takes the write lock up front, so concurrent takes from other workers serialize
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            states: Dict[str, Optional[BucketState]] = {key: None for key in keys}
+            placeholders = ", ".join("?" for _ in keys)
+            for key, level, capacity, updated in conn.execute(
+                f"SELECT key, level, capacity, updated FROM llm_rate_buckets WHERE key IN ({placeholders})", keys
+            ):
+                states[key] = BucketState(level, capacity, updated)
+            changed, result = update(states)
+            conn.executemany(
+                "INSERT INTO llm_rate_buckets VALUES (?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET "
+                "level = excluded.level, capacity = excluded.capacity, updated = excluded.updated",
+                [(key, state.level, state.capacity, state.updated) for key, state in changed.items()]
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+    def snapshot(self) -> Dict[str, BucketState]:
+        try:
+            return {key: BucketState(level, capacity, updated) for key, level, capacity, updated in
+                    self._connection().execute("SELECT key, level, capacity, updated FROM llm_rate_buckets")}
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read rate limit buckets from {self.db_path}: {e}")
+            return {}
+
+
+class Reservation:
+    """Capacity taken for one call; settle() corrects the token estimate once usage is known."""
+
+    def __init__(self, limiter: Optional["RateLimiter"] = None, key: str = "",
+                 reserved_tokens: float = 0, waited_seconds: float = 0.0):
+        self._limiter = limiter
+        self._key = key
+        self.reserved_tokens = reserved_tokens
+        self.waited_seconds = waited_seconds
+
+    def settle(self, used_tokens: Optional[int]) -> None:
+        """Refund (or charge) the difference between the reserved and the used tokens"""
+        if self._limiter is None or used_tokens is None:
+            return
+        self._limiter._adjust(f"{self._key}:{TOKENS}", self.reserved_tokens - used_tokens)
+        self._limiter = None
+
+    def refund(self) -> None:
+        """Return every reserved token: the call failed before the provider counted any usage"""
+        self.settle(0)
+
+
+class RateLimiter:
+    """Requests/min and tokens/min token buckets per provider and API key."""
+
+    def __init__(self, store, limits: Dict[str, Tuple[int, int]], max_wait_seconds: float = 30.0,
+                 clock: Callable[[], float] = time.time, sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            store: MemoryBucketStore or SQLiteBucketStore
+            limits: {provider: (requests per minute, tokens per minute)} until headers report the real ones
+            max_wait_seconds: Longest a call waits for capacity before RateLimitWaitTimeout
+        """
+        self.store = store
+        self.limits = limits
+        self.max_wait_seconds = max_wait_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def _count(self, provider: str, **increments: float) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(provider, {
+                'acquired': 0, 'waited': 0, 'wait_seconds': 0.0, 'max_wait_seconds': 0.0,
+                'timeouts': 0, 'header_updates': 0, 'throttled': 0,
+            })
+            for name, value in increments.items():
+                if name == 'max_wait_seconds':
+                    stats[name] = max(stats[name], value)
+                else:
+                    stats[name] += value
+
+    def _default_state(self, provider: str, bucket: str, now: float) -> BucketState:
+        requests_per_minute, tokens_per_minute = self.limits.get(provider, (60, 100000))
+        capacity = float(requests_per_minute if bucket == REQUESTS else tokens_per_minute)
+        return BucketState(capacity, capacity, now)
+
+    def _states(self, provider: str, states: Dict[str, Optional[BucketState]], now: float) -> Dict[str, BucketState]:
+        return {key: (state or self._default_state(provider, key.rsplit(':', 1)[1], now)).refilled(now)
+                for key, state in states.items()}
+
+    def _try_take(self, provider: str, key: str, tokens: float) -> float:
+        """Take one request and the tokens if both buckets have them; else seconds until they will"""
+        keys = [f"{key}:{REQUESTS}", f"{key}:{TOKENS}"]
+
+        def update(states):
+            current = self._states(provider, states, self._clock())
+            # A call larger than the whole bucket could never go out; it waits for a full bucket instead
+            needs = {keys[0]: 1.0, keys[1]: min(tokens, current[keys[1]].capacity)}
+            waits = [(needs[k] - current[k].level) * 60 / current[k].capacity
+                     for k in keys if current[k].level < needs[k]]
+            if waits:
+                return current, max(waits)
+            for k in keys:
+                current[k].level -= needs[k]
+            return current, 0.0
+        return self.store.transact(keys, update)
+
+    def acquire(self, provider: str, api_key: str, tokens: float) -> Reservation:
+        """
+        Wait until one request and `tokens` tokens are available, then take them.
+
+        Raises:
+            RateLimitWaitTimeout: No capacity within max_wait_seconds
+        """
+        key = f"{provider}:{_fingerprint(api_key)}"
+        start = self._clock()
+        while True:
+            try:
+                wait_seconds = self._try_take(provider, key, tokens)
+            except sqlite3.Error as e:
+                # A broken shared store must not block tailoring
+                logger.warning(f"Rate limiter store error, not pacing this {provider} call: {e}")
+                return Reservation()
+            waited = self._clock() - start
+            if wait_seconds <= 0:
+                break
+            if waited + wait_seconds > self.max_wait_seconds:
+                self._count(provider, timeouts=1)
+                raise RateLimitWaitTimeout(
+                    f"No {provider} rate limit capacity within {self.max_wait_seconds:.0f}s")
+            # Small jitter so waiters in other workers do not all retry at the same instant
+            self._sleep(wait_seconds * (1 + 0.1 * random.random()))
+
+        self._count(provider, acquired=1)
+        if waited > 0:
+            self._count(provider, waited=1, wait_seconds=waited, max_wait_seconds=waited)
+            logger.info(f"Waited {waited:.2f}s for {provider} rate limit capacity")
+        return Reservation(self, key, tokens, waited)
+
+    def _adjust(self, bucket_key: str, delta: float) -> None:
+        provider = bucket_key.split(':', 1)[0]
+
+        def update(states):
+            current = self._states(provider, states, self._clock())
+            state = current[bucket_key]
+            state.level = min(state.capacity, state.level + delta)
+            return current, None
+        try:
+            self.store.transact([bucket_key], update)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to settle rate limit reservation: {e}")
+
+    def observe(self, provider: str, api_key: Optional[str], headers: Mapping[str, str],
+                status_code: Optional[int] = None) -> None:
+        """
+        Adapt the buckets to a provider response.
+
+        Reported limits replace the configured capacities; reported remaining
+        quota lowers the bucket level (never raises it, since this process may
+        hold reservations the provider has not seen yet). A 429 empties the
+        request bucket for Retry-After seconds.
+        """
+        if not api_key:
+            return
+        reported = parse_rate_limit_headers(provider, headers)
+        retry_after = None
+        if status_code == 429:
+            try:
+                retry_after = max(0.0, float(headers.get("retry-after")))
+            except (TypeError, ValueError):
+                retry_after = 1.0
+        if not reported and retry_after is None:
+            return
+
+        key = f"{provider}:{_fingerprint(api_key)}"
+        keys = [f"{key}:{REQUESTS}", f"{key}:{TOKENS}"]
+
+        def update(states):
+            current = self._states(provider, states, self._clock())
+            for bucket, (limit, remaining) in reported.items():
+                state = current[f"{key}:{bucket}"]
+                if limit:
+                    state.capacity = limit
+                    state.level = min(state.level, limit)
+                if remaining is not None:
+                    state.level = min(state.level, remaining)
+            if retry_after is not None:
+                state = current[keys[0]]
+                state.level = min(state.level, -retry_after * state.capacity / 60)
+            return current, None
+        try:
+            self.store.transact(keys, update)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to update rate limits from {provider} headers: {e}")
+            return
+        self._count(provider, header_updates=1, throttled=1 if retry_after is not None else 0)
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-provider wait counters and the current bucket levels"""
+        with self._lock:
+            stats = {provider: dict(values) for provider, values in self._stats.items()}
+        now = self._clock()
+        buckets = {key: {'level': round(state.refilled(now).level, 1), 'per_minute': state.capacity}
+                   for key, state in self.store.snapshot().items()}
+        return {'enabled': True, 'store': self.store.name, 'providers': stats, 'buckets': buckets}
+
+
+class DisabledRateLimiter:
+    """Limiter used when USE_LLM_RATE_LIMITER is off: never waits."""
+
+    def acquire(self, provider: str, api_key: str, tokens: float) -> Reservation:
+        return Reservation()
+
+    def observe(self, provider: str, api_key: Optional[str], headers: Mapping[str, str],
+                status_code: Optional[int] = None) -> None:
+        return None
+
+    def summary(self) -> Dict[str, Any]:
+        return {'enabled': False}
+
+
+def create_rate_limiter():
+    """Build the limiter configured in Config, falling back to a per-process store"""
+    from config import Config
+
+    if not Config.USE_LLM_RATE_LIMITER:
+        return DisabledRateLimiter()
+    limits = {
+        "claude": (Config.CLAUDE_REQUESTS_PER_MINUTE, Config.CLAUDE_TOKENS_PER_MINUTE),
+        "openai": (Config.OPENAI_REQUESTS_PER_MINUTE, Config.OPENAI_TOKENS_PER_MINUTE),
+    }
+    store = MemoryBucketStore()
+    if Config.LLM_RATE_LIMIT_BACKEND == 'sqlite':
+        try:
+            store = SQLiteBucketStore(Config.LLM_RATE_LIMIT_DB_PATH)
+        except Exception as e:
+            logger.error(f"Failed to open shared rate limit store, limiting per process: {e}")
+    return RateLimiter(store, limits, max_wait_seconds=Config.LLM_RATE_LIMIT_MAX_WAIT_SECONDS)
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Return the process-wide LLM rate limiter"""
+    global _rate_limiter
+
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = create_rate_limiter()
+    return _rate_limiter
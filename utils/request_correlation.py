@@ -11,6 +11,8 @@ Key Features:
 - Performance tracking and analytics
 - User session tracking
 - Debug artifact correlation
+- Bounded memory: ring buffer of recent requests, capped user histories
+- Analytics from pre-aggregated rolling counters (utils.request_metrics_store)
 
 Author: Resume Tailor Team + O3 Expert Review
 Status: A8 Implementation - Production Ready
@@ -20,10 +22,11 @@ import logging
 import time
 import uuid
 import threading
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Any
 from dataclasses import dataclass, field
-from pathlib import Path
-import json
+
+from utils.request_metrics_store import MemoryMetricsStore, create_metrics_store
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +34,7 @@ logger = logging.getLogger(__name__)
 _request_context = threading.local()
 
 
-@dataclass
+@dataclass(slots=True)
 class RequestMetrics:
     """Performance and error metrics for a request."""
     request_id: str
@@ -89,14 +92,42 @@ class RequestCorrelationManager:
         if hasattr(self, 'initialized'):
             return
         
+        try:
+            from config import Config
+            max_completed = Config.REQUEST_METRICS_MAX_COMPLETED
+            self.max_users = Config.REQUEST_METRICS_MAX_USERS
+            self.user_history_length = Config.REQUEST_METRICS_USER_HISTORY
+        except Exception as e:
+            logger.error(f"A8: Failed to read request metrics settings, using defaults: {e}")
+            max_completed, self.max_users, self.user_history_length = 1000, 1000, 50
+        # Opened on first use, so importing this module creates no files
+        self._metrics_store = None
+        self._metrics_store_lock = threading.Lock()
+        
         self.active_requests: Dict[str, RequestMetrics] = {}
-        self.completed_requests: List[RequestMetrics] = []
-        self.user_sessions: Dict[str, List[str]] = {}  # user_id -> request_ids
+        # Ring buffer of recent completed requests plus an index for lookups by ID
+        self.completed_requests: Deque[RequestMetrics] = deque(maxlen=max_completed)
+        self._completed_by_id: Dict[str, RequestMetrics] = {}
+        # user_id -> recent request_ids, least recently active user evicted first
+        self.user_sessions: "OrderedDict[str, Deque[str]]" = OrderedDict()
         self.lock = threading.Lock()
         self.initialized = True
         
         logger.info("A8: Request correlation manager initialized")
     
+    @property
+    def metrics_store(self):
+        """Rolling counters behind get_analytics_summary(), shared by all workers when configured"""
+        if self._metrics_store is None:
+            with self._metrics_store_lock:
+                if self._metrics_store is None:
+                    try:
+                        self._metrics_store = create_metrics_store()
+                    except Exception as e:
+                        logger.error(f"A8: Failed to open request metrics store, using memory: {e}")
+                        self._metrics_store = MemoryMetricsStore()
+        return self._metrics_store
+    
     def start_request(self, user_id: Optional[str] = None, 
                      session_id: Optional[str] = None) -> str:
         """
@@ -123,9 +154,14 @@ class RequestCorrelationManager:
             
             # Track user sessions
             if user_id:
-                if user_id not in self.user_sessions:
-                    self.user_sessions[user_id] = []
-                self.user_sessions[user_id].append(request_id)
+                history = self.user_sessions.get(user_id)
+                if history is None:
+                    history = self.user_sessions[user_id] = deque(maxlen=self.user_history_length)
+                    while len(self.user_sessions) > self.max_users:
+                        self.user_sessions.popitem(last=False)
+                else:
+                    self.user_sessions.move_to_end(user_id)
+                history.append(request_id)
         
         # Set thread-local context
         self._set_current_request(request_id)
@@ -152,10 +188,17 @@ class RequestCorrelationManager:
             metrics.end_time = time.time()
             metrics.total_duration_ms = (metrics.end_time - metrics.start_time) * 1000
             
-            # Move to completed requests
+            # Move to completed requests, dropping the oldest when the ring buffer is full
+            if len(self.completed_requests) == self.completed_requests.maxlen:
+                evicted = self.completed_requests.popleft()
+                self._completed_by_id.pop(evicted.request_id, None)
             self.completed_requests.append(metrics)
+            self._completed_by_id[request_id] = metrics
             del self.active_requests[request_id]
         
+        # Fold into the rolling counters used by get_analytics_summary()
+        self.metrics_store.record(metrics)
+        
         # Clear thread-local context
         self._clear_current_request()
         
@@ -169,14 +212,10 @@ class RequestCorrelationManager:
     def get_request_metrics(self, request_id: str) -> Optional[RequestMetrics]:
         """Get metrics for a specific request."""
         with self.lock:
-            if request_id in self.active_requests:
-                return self.active_requests[request_id]
-            
-            for metrics in self.completed_requests:
-                if metrics.request_id == request_id:
-                    return metrics
-        
-        return None
+            return self._get_request_metrics_locked(request_id)
+    
+    def _get_request_metrics_locked(self, request_id: str) -> Optional[RequestMetrics]:
+        return self.active_requests.get(request_id) or self._completed_by_id.get(request_id)
     
     def add_bullet_success(self, request_id: Optional[str] = None):
         """Record a successful bullet creation."""
@@ -270,43 +309,19 @@ class RequestCorrelationManager:
             Analytics summary
         """
         cutoff_time = time.time() - (lookback_hours * 3600)
+        totals = self.metrics_store.totals(cutoff_time)
         
-        with self.lock:
-            recent_requests = [
-                metrics for metrics in self.completed_requests
-                if metrics.start_time >= cutoff_time
-            ]
-        
-        if not recent_requests:
+        total_requests = totals['requests']
+        if not total_requests:
             return {"message": f"No requests in last {lookback_hours} hours"}
         
-        # Calculate aggregated metrics
-        total_requests = len(recent_requests)
-        total_bullets = sum(r.total_bullets for r in recent_requests)
-        successful_bullets = sum(r.successful_bullets for r in recent_requests)
-        total_errors = sum(len(r.errors) for r in recent_requests)
-        
-        avg_duration = sum(r.total_duration_ms for r in recent_requests) / total_requests
-        avg_build_time = sum(r.build_duration_ms for r in recent_requests) / total_requests
-        avg_reconciliation_time = sum(r.reconciliation_duration_ms for r in recent_requests) / total_requests
-        
-        # Error patterns
-        error_patterns = {}
-        for req in recent_requests:
-            for error in req.errors:
-                error_key = error[:50]  # Truncate for grouping
-                error_patterns[error_key] = error_patterns.get(error_key, 0) + 1
+        total_bullets = totals['total_bullets']
+        successful_bullets = totals['successful_bullets']
+        total_errors = totals['total_errors']
+        error_patterns = totals['error_patterns']
         
-        # Feature usage
-        feature_usage = {}
-        for req in recent_requests:
-            for feature, enabled in req.features_enabled.items():
-                if feature not in feature_usage:
-                    feature_usage[feature] = {"enabled": 0, "disabled": 0}
-                if enabled:
-                    feature_usage[feature]["enabled"] += 1
-                else:
-                    feature_usage[feature]["disabled"] += 1
+        with self.lock:
+            active_count = len(self.active_requests)
         
         return {
             "period": f"Last {lookback_hours} hours",
@@ -319,13 +334,14 @@ class RequestCorrelationManager:
                 "error_rate": (total_errors / total_requests) if total_requests > 0 else 0
             },
             "performance": {
-                "avg_total_duration_ms": avg_duration,
-                "avg_build_duration_ms": avg_build_time,
-                "avg_reconciliation_duration_ms": avg_reconciliation_time
+                "avg_total_duration_ms": totals['total_duration_ms'] / total_requests,
+                "avg_build_duration_ms": totals['build_duration_ms'] / total_requests,
+                "avg_reconciliation_duration_ms": totals['reconciliation_duration_ms'] / total_requests
             },
             "error_patterns": dict(sorted(error_patterns.items(), key=lambda x: x[1], reverse=True)[:10]),
-            "feature_usage": feature_usage,
-            "active_requests": len(self.active_requests)
+            "feature_usage": totals['feature_usage'],
+            "active_requests": active_count,
+            "metrics_store": self.metrics_store.name
         }
     
     def get_user_request_history(self, user_id: str, limit: int = 10) -> List[RequestMetrics]:
@@ -334,30 +350,37 @@ class RequestCorrelationManager:
             if user_id not in self.user_sessions:
                 return []
             
-            user_request_ids = self.user_sessions[user_id][-limit:]  # Get last N requests
+            user_request_ids = list(self.user_sessions[user_id])[-limit:]  # Get last N requests
             user_requests = []
             
             for req_id in user_request_ids:
-                metrics = self.get_request_metrics(req_id)
+                metrics = self._get_request_metrics_locked(req_id)
                 if metrics:
                     user_requests.append(metrics)
             
             return user_requests
     
     def cleanup_old_requests(self, max_age_hours: int = 168):  # 1 week default
-        """Clean up old completed requests to prevent memory growth."""
+        """
+        Clean up old completed requests to prevent memory growth.
+        
+        max_age_hours only applies to this process's recent-request buffer; the
+        metrics store, which may be shared by every worker, is pruned with its own
+        configured retention (REQUEST_METRICS_RETENTION_HOURS).
+        """
         cutoff_time = time.time() - (max_age_hours * 3600)
         
         with self.lock:
-            old_count = len(self.completed_requests)
-            self.completed_requests = [
-                req for req in self.completed_requests
-                if req.start_time >= cutoff_time
-            ]
-            cleaned_count = old_count - len(self.completed_requests)
-            
-            if cleaned_count > 0:
-                logger.info(f"A8: Cleaned up {cleaned_count} old request records")
+            cleaned_count = 0
+            # The ring buffer is in completion order, so old records sit at the left
+            while self.completed_requests and self.completed_requests[0].start_time < cutoff_time:
+                evicted = self.completed_requests.popleft()
+                self._completed_by_id.pop(evicted.request_id, None)
+                cleaned_count += 1
+        self.metrics_store.prune()
+        
+        if cleaned_count > 0:
+            logger.info(f"A8: Cleaned up {cleaned_count} old request records")
     
     def _generate_request_id(self) -> str:
         """Generate a unique request ID."""
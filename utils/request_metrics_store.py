@@ -0,0 +1,261 @@
+"""
+Request Metrics Store (A8)
+
+This module keeps pre-aggregated rolling counters for completed requests so
+the analytics summary is computed from a fixed number of time buckets
+instead of scanning every request ever served.
+
+Key Features:
+- Requests folded into fixed-width time buckets (Config.REQUEST_METRICS_BUCKET_SECONDS)
+- Per-process store with bounded retention (MemoryMetricsStore)
+- Optional SQLite store shared by all gunicorn workers (SQLiteMetricsStore)
+- Both return the same totals for get_analytics_summary()
+
+Author: Resume Tailor Team
+Status: Production Ready
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from utils.cache_backends import thread_local_connection
+
+logger = logging.getLogger(__name__)
+
+# Errors are grouped by their first characters, as in the original summary
+ERROR_PATTERN_LENGTH = 50
+# Distinct error patterns kept per bucket; the rest are counted as "other"
+MAX_PATTERNS_PER_BUCKET = 50
+OTHER_ERRORS = "(other errors)"
+
+
+class MetricsBucket:
+    """Counters for the requests that started within one time bucket."""
+
+    __slots__ = ('requests', 'total_bullets', 'successful_bullets', 'total_errors',
+                 'total_duration_ms', 'build_duration_ms', 'reconciliation_duration_ms',
+                 'error_patterns', 'feature_usage')
+
+    def __init__(self):
+        self.requests = 0
+        self.total_bullets = 0
+        self.successful_bullets = 0
+        self.total_errors = 0
+        self.total_duration_ms = 0.0
+        self.build_duration_ms = 0.0
+        self.reconciliation_duration_ms = 0.0
+        self.error_patterns: Dict[str, int] = {}
+        self.feature_usage: Dict[str, list] = {}  # feature -> [enabled, disabled]
+
+    def add(self, metrics):
+        self.requests += 1
+        self.total_bullets += metrics.total_bullets
+        self.successful_bullets += metrics.successful_bullets
+        self.total_errors += len(metrics.errors)
+        self.total_duration_ms += metrics.total_duration_ms
+        self.build_duration_ms += metrics.build_duration_ms
+        self.reconciliation_duration_ms += metrics.reconciliation_duration_ms
+        for pattern in error_patterns_for(metrics):
+            if pattern not in self.error_patterns and len(self.error_patterns) >= MAX_PATTERNS_PER_BUCKET:
+                pattern = OTHER_ERRORS
+            self.error_patterns[pattern] = self.error_patterns.get(pattern, 0) + 1
+        for feature, enabled in metrics.features_enabled.items():
+            counts = self.feature_usage.setdefault(feature, [0, 0])
+            counts[0 if enabled else 1] += 1
+
+
+def error_patterns_for(metrics):
+    return [error[:ERROR_PATTERN_LENGTH] for error in metrics.errors]
+
+
+def empty_totals() -> Dict[str, Any]:
+    return {
+        'requests': 0, 'total_bullets': 0, 'successful_bullets': 0, 'total_errors': 0,
+        'total_duration_ms': 0.0, 'build_duration_ms': 0.0, 'reconciliation_duration_ms': 0.0,
+        'error_patterns': {}, 'feature_usage': {},
+    }
+
+
+class MemoryMetricsStore:
+    """Per-process rolling counters with bounded retention."""
+
+    name = "memory"
+
+    def __init__(self, bucket_seconds: int = 300, retention_hours: int = 168):
+        self.bucket_seconds = max(1, int(bucket_seconds))
+        self.retention_hours = retention_hours
+        self._buckets: Dict[int, MetricsBucket] = {}
+        self._lock = threading.Lock()
+
+    def record(self, metrics):
+        bucket_id = int(metrics.start_time // self.bucket_seconds)
+        with self._lock:
+            bucket = self._buckets.get(bucket_id)
+            if bucket is None:
+                bucket = self._buckets[bucket_id] = MetricsBucket()
+                self._prune_locked()
+            bucket.add(metrics)
+
+    def totals(self, since: float) -> Dict[str, Any]:
+        """Sum every bucket that started at or after `since` (bucket-aligned)"""
+        first_bucket = int(since // self.bucket_seconds)
+        totals = empty_totals()
+        with self._lock:
+            for bucket_id, bucket in self._buckets.items():
+                if bucket_id < first_bucket:
+                    continue
+                for field in ('requests', 'total_bullets', 'successful_bullets', 'total_errors',
+                              'total_duration_ms', 'build_duration_ms', 'reconciliation_duration_ms'):
+                    totals[field] += getattr(bucket, field)
+                for pattern, count in bucket.error_patterns.items():
+                    totals['error_patterns'][pattern] = totals['error_patterns'].get(pattern, 0) + count
+                for feature, (enabled, disabled) in bucket.feature_usage.items():
+                    usage = totals['feature_usage'].setdefault(feature, {"enabled": 0, "disabled": 0})
+                    usage["enabled"] += enabled
+                    usage["disabled"] += disabled
+        return totals
+
+    def prune(self, max_age_hours: Optional[float] = None):
+        with self._lock:
+            self._prune_locked(max_age_hours)
+
+    def _prune_locked(self, max_age_hours: Optional[float] = None):
+        hours = self.retention_hours if max_age_hours is None else max_age_hours
+        oldest = int((time.time() - hours * 3600) // self.bucket_seconds)
+        for bucket_id in [b for b in self._buckets if b < oldest]:
+            del self._buckets[bucket_id]
+
+
+class SQLiteMetricsStore:
+    """Rolling counters in a SQLite file shared by every worker process."""
+
+    name = "sqlite"
+
+    def __init__(self, db_path: str, bucket_seconds: int = 300, retention_hours: int = 168,
+                 prune_interval: int = 64):
+        self.db_path = db_path
+        self.bucket_seconds = max(1, int(bucket_seconds))
+        self.retention_hours = retention_hours
+        self.prune_interval = max(1, prune_interval)
+        self._writes_since_prune = 0
+        self._connection = thread_local_connection(db_path)
+        self._write_lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS request_metric_buckets ("
+                "bucket INTEGER PRIMARY KEY, requests INTEGER NOT NULL, total_bullets INTEGER NOT NULL, "
+                "successful_bullets INTEGER NOT NULL, total_errors INTEGER NOT NULL, "
+                "total_duration_ms REAL NOT NULL, build_duration_ms REAL NOT NULL, "
+                "reconciliation_duration_ms REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS request_error_patterns ("
+                "bucket INTEGER NOT NULL, pattern TEXT NOT NULL, count INTEGER NOT NULL, "
+                "PRIMARY KEY (bucket, pattern))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS request_feature_usage ("
+                "bucket INTEGER NOT NULL, feature TEXT NOT NULL, enabled INTEGER NOT NULL, "
+                "disabled INTEGER NOT NULL, PRIMARY KEY (bucket, feature))"
+            )
+
+    def record(self, metrics):
+        bucket_id = int(metrics.start_time // self.bucket_seconds)
+        try:
+            with self._connection() as conn:
+                conn.execute(
+                    "INSERT INTO request_metric_buckets VALUES (?, 1, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(bucket) DO UPDATE SET requests = requests + 1, "
+                    "total_bullets = total_bullets + excluded.total_bullets, "
+                    "successful_bullets = successful_bullets + excluded.successful_bullets, "
+                    "total_errors = total_errors + excluded.total_errors, "
+                    "total_duration_ms = total_duration_ms + excluded.total_duration_ms, "
+                    "build_duration_ms = build_duration_ms + excluded.build_duration_ms, "
+                    "reconciliation_duration_ms = reconciliation_duration_ms + excluded.reconciliation_duration_ms",
+                    (bucket_id, metrics.total_bullets, metrics.successful_bullets, len(metrics.errors),
+                     metrics.total_duration_ms, metrics.build_duration_ms, metrics.reconciliation_duration_ms)
+                )
+                for pattern in error_patterns_for(metrics):
+                    conn.execute(
+                        "INSERT INTO request_error_patterns VALUES (?, ?, 1) "
+                        "ON CONFLICT(bucket, pattern) DO UPDATE SET count = count + 1",
+                        (bucket_id, pattern)
+                    )
+                for feature, enabled in metrics.features_enabled.items():
+                    conn.execute(
+                        "INSERT INTO request_feature_usage VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(bucket, feature) DO UPDATE SET enabled = enabled + excluded.enabled, "
+                        "disabled = disabled + excluded.disabled",
+                        (bucket_id, feature, 1 if enabled else 0, 0 if enabled else 1)
+                    )
+        except sqlite3.Error as e:
+            logger.warning(f"A8: Failed to record request metrics in {self.db_path}: {e}")
+            return
+
+        with self._write_lock:
+            self._writes_since_prune += 1
+            should_prune = self._writes_since_prune >= self.prune_interval
+            if should_prune:
+                self._writes_since_prune = 0
+        if should_prune:
+            self.prune()
+
+    def totals(self, since: float) -> Dict[str, Any]:
+        """Sum every bucket that started at or after `since` (bucket-aligned)"""
+        first_bucket = int(since // self.bucket_seconds)
+        totals = empty_totals()
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT COALESCE(SUM(requests), 0), COALESCE(SUM(total_bullets), 0), "
+                "COALESCE(SUM(successful_bullets), 0), COALESCE(SUM(total_errors), 0), "
+                "COALESCE(SUM(total_duration_ms), 0), COALESCE(SUM(build_duration_ms), 0), "
+                "COALESCE(SUM(reconciliation_duration_ms), 0) "
+                "FROM request_metric_buckets WHERE bucket >= ?", (first_bucket,)
+            ).fetchone()
+            (totals['requests'], totals['total_bullets'], totals['successful_bullets'],
+             totals['total_errors'], totals['total_duration_ms'], totals['build_duration_ms'],
+             totals['reconciliation_duration_ms']) = row
+            for pattern, count in conn.execute(
+                "SELECT pattern, SUM(count) FROM request_error_patterns WHERE bucket >= ? GROUP BY pattern",
+                (first_bucket,)
+            ):
+                totals['error_patterns'][pattern] = count
+            for feature, enabled, disabled in conn.execute(
+                "SELECT feature, SUM(enabled), SUM(disabled) FROM request_feature_usage "
+                "WHERE bucket >= ? GROUP BY feature", (first_bucket,)
+            ):
+                totals['feature_usage'][feature] = {"enabled": enabled, "disabled": disabled}
+        except sqlite3.Error as e:
+            logger.warning(f"A8: Failed to read request metrics from {self.db_path}: {e}")
+        return totals
+
+    def prune(self, max_age_hours: Optional[float] = None):
+        hours = self.retention_hours if max_age_hours is None else max_age_hours
+        oldest = int((time.time() - hours * 3600) // self.bucket_seconds)
+        try:
+            with self._connection() as conn:
+                for table in ('request_metric_buckets', 'request_error_patterns', 'request_feature_usage'):
+                    conn.execute(f"DELETE FROM {table} WHERE bucket < ?", (oldest,))
+        except sqlite3.Error as e:
+            logger.warning(f"A8: Failed to prune request metrics in {self.db_path}: {e}")
+
+
+def create_metrics_store():
+    """Build the metrics store configured in Config, falling back to per-process memory"""
+    from config import Config
+
+    bucket_seconds = Config.REQUEST_METRICS_BUCKET_SECONDS
+    retention_hours = Config.REQUEST_METRICS_RETENTION_HOURS
+    if Config.USE_SHARED_REQUEST_METRICS:
+        try:
+            return SQLiteMetricsStore(Config.REQUEST_METRICS_DB_PATH, bucket_seconds, retention_hours)
+        except Exception as e:
+            logger.error(f"A8: Failed to open shared request metrics store, using memory: {e}")
+    return MemoryMetricsStore(bucket_seconds, retention_hours)
@@ -0,0 +1,361 @@
+"""
+Resilient LLM Calls
+
+This module wraps single provider completions with retries, a per-provider
+circuit breaker, failover to the other configured provider and optional
+hedged requests, so a slow or failing provider costs a bounded delay instead
+of a long wait followed by an untailored section.
+
+Key Features:
+- Retries on 429, 5xx, timeouts and connection errors with full-jitter exponential
+  backoff, honoring Retry-After; other errors are raised at once
+- Per-provider circuit breaker: open after N consecutive failures, one half-open
+  probe after the cooldown; calls to an open provider fail fast
+- Failover to the other provider when the primary's retries are exhausted or its breaker is open
+- Optional hedging: once the primary has taken longer than its pN latency for this
+  kind of call, the same request goes to the other provider and the first reply wins
+- Per-provider counters (attempts, retries, failures, hedges, hedge wins, failovers, breaker state)
+
+Author: Resume Tailor Team
+Status: Production Ready
+"""
+
+import contextvars
+import logging
+import math
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_RETRYABLE_STATUS_CODES = {408, 409, 429}
+_RETRYABLE_ERROR_NAMES = {'APIConnectionError', 'APITimeoutError'}
+
+
+class ProviderUnavailableError(RuntimeError):
+    """Raised instead of calling a provider whose circuit breaker is open."""
+
+
+class ProviderCall(NamedTuple):
+    """
+    One provider and the call that asks it for a completion.
+
+    reserve, when given, runs before each attempt outside the timed region (e.g. waiting
+    for rate limit capacity) and its result is passed to call; otherwise call takes no arguments.
+    """
+    provider: str
+    call: Callable[..., Any]
+    reserve: Optional[Callable[[], Any]] = None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether an SDK error is worth retrying (rate limits, overload, server and network errors)"""
+    if isinstance(error, ProviderUnavailableError):
+        return True
+    status = getattr(error, 'status_code', None)
+    if isinstance(status, int):
+        return status in _RETRYABLE_STATUS_CODES or status >= 500
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return type(error).__name__ in _RETRYABLE_ERROR_NAMES
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Retry-After header of an SDK status error, in seconds"""
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    if not headers:
+        return None
+    try:
+        return max(0.0, float(headers.get('retry-after')))
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one provider."""
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_seconds:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; in half-open state only one probe at a time"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if self._clock() - self._opened_at < self.reset_seconds:
+                    return False
+                self._state = self.HALF_OPEN
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> bool:
+        """Count a failure; True when it opened the circuit"""
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                opened = self._state != self.OPEN
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                return opened
+            return False
+
+
+class LatencyWindow:
+    """Recent successful call latencies for one (provider, kind of call)."""
+
+    def __init__(self, size: int = 200):
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percentile: float, min_samples: int) -> Optional[float]:
+        """Nearest-rank percentile, or None with fewer than min_samples samples"""
+        with self._lock:
+            values = sorted(self._samples)
+        if not values or len(values) < min_samples:
+            return None
+        rank = max(1, math.ceil(percentile / 100 * len(values)))
+        return values[min(rank, len(values)) - 1]
+
+
+class ResilientCaller:
+    """Runs provider calls with retries, circuit breakers, failover and hedging."""
+
+    def __init__(self, max_attempts: int = 3, retry_base_seconds: float = 0.5,
+                 retry_max_seconds: float = 8.0, failure_threshold: int = 5,
+                 reset_seconds: float = 30.0, failover: bool = True, hedging: bool = False,
+                 hedge_percentile: float = 95.0, hedge_min_samples: int = 20,
+                 max_workers: int = 32, sleep: Callable[[float], None] = time.sleep,
+                 rng: Optional[random.Random] = None):
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failover = failover
+        self.hedging = hedging
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.max_workers = max_workers
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[Tuple[str, str], LatencyWindow] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        with self._lock:
+            if provider not in self._breakers:
+                self._breakers[provider] = CircuitBreaker(self.failure_threshold, self.reset_seconds)
+            return self._breakers[provider]
+
+    def latency(self, provider: str, kind: str) -> LatencyWindow:
+        with self._lock:
+            key = (provider, kind)
+            if key not in self._latencies:
+                self._latencies[key] = LatencyWindow()
+            return self._latencies[key]
+
+    def _count(self, provider: str, counter: str) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(provider, {
+                'attempts': 0, 'retries': 0, 'failures': 0, 'circuit_opened': 0,
+                'short_circuited': 0, 'hedges': 0, 'hedge_wins': 0, 'failovers': 0,
+            })
+            counters[counter] += 1
+
+    def _backoff_seconds(self, attempt: int, error: BaseException) -> float:
+        """Full jitter: uniform in [0, min(cap, base * 2^(attempt-1))], at least Retry-After"""
+        ceiling = min(self.retry_max_seconds, self.retry_base_seconds * 2 ** (attempt - 1))
+        delay = self._rng.uniform(0, ceiling)
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.retry_max_seconds))
+        return delay
+
+    def _call_with_retries(self, target: ProviderCall, kind: str) -> Any:
+        breaker = self.breaker(target.provider)
+        for attempt in range(1, self.max_attempts + 1):
+            if not breaker.allow():
+                self._count(target.provider, 'short_circuited')
+                raise ProviderUnavailableError(f"{target.provider} circuit breaker is open")
+            self._count(target.provider, 'attempts')
+            # Waiting for capacity is not provider latency, so it stays out of the hedge samples
+            reservation = target.reserve() if target.reserve else None
+            start = time.monotonic()
+            try:
+                result = target.call(reservation) if target.reserve else target.call()
+            except Exception as e:
+                if not is_retryable(e):
+                    # The provider answered; the request itself was bad
+                    breaker.record_success()
+                    raise
+                self._count(target.provider, 'failures')
+                if breaker.record_failure():
+                    self._count(target.provider, 'circuit_opened')
+                    logger.warning(f"{target.provider} circuit breaker opened after repeated failures")
+                if attempt == self.max_attempts:
+                    raise
+                delay = self._backoff_seconds(attempt, e)
+                self._count(target.provider, 'retries')
+                logger.warning(f"{target.provider} {kind} attempt {attempt} failed ({e}), "
+                               f"retrying in {delay:.2f}s")
+                self._sleep(delay)
+                continue
+            breaker.record_success()
+            self.latency(target.provider, kind).record(time.monotonic() - start)
+            return result
+
+    def hedge_delay(self, provider: str, kind: str) -> Optional[float]:
+        """Seconds to wait for the primary before hedging; None until enough latency samples"""
+        return self.latency(provider, kind).percentile(self.hedge_percentile, self.hedge_min_samples)
+
+    def _submit(self, target: ProviderCall, kind: str):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='llm-call')
+            executor = self._executor
+        # Copy the context so spans opened by the caller still receive annotations
+        return executor.submit(contextvars.copy_context().run, self._call_with_retries, target, kind)
+
+    def call(self, primary: ProviderCall, kind: str,
+             fallback: Optional[ProviderCall] = None) -> Tuple[Any, str]:
+        """
+        Run a completion against the primary provider, with retries, failover and hedging.
+
+        Args:
+            primary: The provider the request was made for
+            kind: Kind of call (e.g. the section name); latencies are tracked per provider and kind
+            fallback: The other configured provider, or None to use the primary only
+
+        Returns:
+            (result, provider that produced it)
+        """
+        fallback = fallback if self.failover else None
+        delay = self.hedge_delay(primary.provider, kind) if fallback and self.hedging else None
+        if delay is None:
+            try:
+                return self._call_with_retries(primary, kind), primary.provider
+            except Exception as e:
+                if fallback is None or not is_retryable(e):
+                    raise
+                return self._fail_over(primary, fallback, kind, e)
+
+        primary_future = self._submit(primary, kind)
+        done, _ = wait([primary_future], timeout=delay)
+        if not done:
+            if self.breaker(fallback.provider).state == CircuitBreaker.OPEN:
+                return primary_future.result(), primary.provider
+            self._count(primary.provider, 'hedges')
+            logger.info(f"{primary.provider} {kind} slower than its p{self.hedge_percentile:g} "
+                        f"({delay:.2f}s), hedging to {fallback.provider}")
+            hedge_future = self._submit(fallback, kind)
+            futures = {primary_future: primary.provider, hedge_future: fallback.provider}
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        if future is hedge_future:
+                            self._count(primary.provider, 'hedge_wins')
+                        return future.result(), futures[future]
+            # Both failed: report the primary's error
+            return primary_future.result(), primary.provider
+
+        try:
+            return primary_future.result(), primary.provider
+        except Exception as e:
+            if not is_retryable(e):
+                raise
+            return self._fail_over(primary, fallback, kind, e)
+
+    def _fail_over(self, primary: ProviderCall, fallback: ProviderCall, kind: str,
+                   error: BaseException) -> Tuple[Any, str]:
+        self._count(primary.provider, 'failovers')
+        logger.warning(f"{primary.provider} {kind} failed ({error}), failing over to {fallback.provider}")
+        try:
+            return self._call_with_retries(fallback, kind), fallback.provider
+        except Exception as fallback_error:
+            logger.error(f"Failover to {fallback.provider} failed too: {fallback_error}")
+            raise error
+
+    def summary(self) -> Dict[str, Any]:
+        """Counters, breaker state and hedge thresholds per provider"""
+        with self._lock:
+            providers = {name: dict(counters) for name, counters in self._counters.items()}
+            breakers = dict(self._breakers)
+            latencies = dict(self._latencies)
+        for name, breaker in breakers.items():
+            providers.setdefault(name, {})['circuit'] = breaker.state
+        for (name, kind), window in latencies.items():
+            threshold = window.percentile(self.hedge_percentile, self.hedge_min_samples)
+            providers.setdefault(name, {}).setdefault('hedge_after_seconds', {})[kind] = \
+                round(threshold, 3) if threshold is not None else None
+        return {
+            'hedging': self.hedging,
+            'failover': self.failover,
+            'providers': providers,
+        }
+
+
+_resilient_caller = None
+_resilient_caller_lock = threading.Lock()
+
+
+def get_resilient_caller() -> ResilientCaller:
+    """Return the process-wide resilient caller, configured from Config"""
+    global _resilient_caller
+
+    if _resilient_caller is None:
+        with _resilient_caller_lock:
+            if _resilient_caller is None:
+                from config import Config
+                _resilient_caller = ResilientCaller(
+                    max_attempts=Config.LLM_CALL_MAX_ATTEMPTS,
+                    retry_base_seconds=Config.LLM_RETRY_BASE_SECONDS,
+                    retry_max_seconds=Config.LLM_RETRY_MAX_SECONDS,
+                    failure_threshold=Config.LLM_CIRCUIT_FAILURE_THRESHOLD,
+                    reset_seconds=Config.LLM_CIRCUIT_RESET_SECONDS,
+                    failover=Config.USE_LLM_FAILOVER,
+                    hedging=Config.USE_LLM_HEDGING,
+                    hedge_percentile=Config.LLM_HEDGE_PERCENTILE,
+                    hedge_min_samples=Config.LLM_HEDGE_MIN_SAMPLES,
+                )
+    return _resilient_caller
@@ -0,0 +1,74 @@
+"""
+Parsed Resume Cache
+
+This module caches LLM resume parses keyed by the content of the uploaded
+file, so the upload step and every later tailoring call share one parse
+instead of each going back to the LLM.
+
+Key Features:
+- Keys are a SHA-256 of the file bytes plus parser version and provider
+- Memory LRU in front of a SQLite file shared by all gunicorn workers
+- TTL and entry-count eviction from utils.cache_backends
+- Hit/miss counters exposed through get_resume_parse_cache_summary()
+
+Author: Resume Tailor Team
+Status: Production Ready
+"""
+
+import hashlib
+import logging
+import threading
+from typing import Any, Dict
+
+from utils.cache_backends import DisabledCache, MemoryLRUBackend, SQLiteBackend, TieredCache
+
+logger = logging.getLogger(__name__)
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Hex SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def make_parse_cache_key(content_hash: str, parser_version: int, provider: str) -> str:
+    """Cache key for one parse of one file's content by one provider"""
+    return f"resume-parse:v{parser_version}:{provider.lower()}:{content_hash}"
+
+
+_parse_cache = None
+_parse_cache_lock = threading.Lock()
+
+
+def get_resume_parse_cache():
+    """Return the process-wide parsed-resume cache configured from Config"""
+    global _parse_cache
+
+    if _parse_cache is None:
+        with _parse_cache_lock:
+            if _parse_cache is None:
+                from config import Config
+                if not Config.USE_RESUME_PARSE_CACHE:
+                    _parse_cache = DisabledCache('resume_parses')
+                else:
+                    try:
+                        ttl = Config.RESUME_PARSE_CACHE_TTL_SECONDS
+                        _parse_cache = TieredCache([
+                            MemoryLRUBackend(ttl_seconds=ttl, max_entries=64),
+                            SQLiteBackend(Config.RESUME_PARSE_CACHE_PATH, table="resume_parses",
+                                          ttl_seconds=ttl,
+                                          max_entries=Config.RESUME_PARSE_CACHE_MAX_ENTRIES),
+                        ], name="resume_parses")
+                        logger.info("Parsed resume cache enabled")
+                    except Exception as e:
+                        logger.error(f"Failed to initialize parsed resume cache: {e}")
+                        _parse_cache = DisabledCache('resume_parses')
+    return _parse_cache
+
+
+def get_resume_parse_cache_summary() -> Dict[str, Any]:
+    """Return hit/miss counters and tier details for the parsed-resume cache."""
+    return get_resume_parse_cache().summary()
@@ -0,0 +1,140 @@
+"""
+Session Data Store
+
+This module stores the tailored sections of a request as one packed JSON
+document per request_id, with a bounded in-process LRU in front, so preview
+and DOCX generation load a whole request with a single read.
+
+Key Features:
+- One file per request: temp_session_data/{request_id}.sections.json
+- Atomic writes (temp file + os.replace) so readers never see partial data
+- Bounded in-memory LRU layer (utils.cache_backends.MemoryLRUBackend)
+- Falls back to legacy {request_id}_{section}.json files for older requests
+- Callers get deep copies, so mutating loaded data never corrupts the cache
+
+Author: Resume Tailor Team
+Status: Production Ready
+"""
+
+import copy
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from utils.cache_backends import MemoryLRUBackend
+
+logger = logging.getLogger(__name__)
+
+SECTION_NAMES = ("contact", "summary", "experience", "education", "skills", "projects")
+
+
+class SessionDataStore:
+    """Per-request tailored section storage for one temp_session_data directory."""
+
+    def __init__(self, base_dir: str, memory_entries: int = 64,
+                 memory_ttl_seconds: Optional[float] = None):
+        self.base_dir = base_dir
+        self._memory = MemoryLRUBackend(ttl_seconds=memory_ttl_seconds, max_entries=memory_entries)
+
+    def packed_path(self, request_id: str) -> str:
+        return os.path.join(self.base_dir, f"{request_id}.sections.json")
+
+    def save_sections(self, request_id: str, sections: Dict[str, Any]) -> str:
+        """
+        Persist all sections of a request in one atomic write.
+
+        Returns:
+            Path of the packed session file
+        """
+        os.makedirs(self.base_dir, exist_ok=True)
+        document = {
+            'request_id': request_id,
+            'saved_at': time.time(),
+            'sections': sections,
+        }
+        path = self.packed_path(request_id)
+        fd, tmp_path = tempfile.mkstemp(dir=self.base_dir, prefix=f".{request_id}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(document, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._memory.set(request_id, copy.deepcopy(sections))
+        logger.info(f"Saved {len(sections)} sections for request {request_id} to {path}")
+        return path
+
+    def load_sections(self, request_id: str) -> Dict[str, Any]:
+        """
+        Load all sections for a request.
+
+        Returns:
+            Dict of section name -> saved data; empty if the request is unknown
+        """
+        sections = self._memory.get(request_id)
+        if sections is None:
+            sections = self._read_packed(request_id)
+            if sections is not None:
+                self._memory.set(request_id, sections)
+            else:
+                # Legacy layouts are read directly and not cached
+                return self._read_legacy(request_id)
+        return copy.deepcopy(sections)
+
+    def load_section(self, request_id: str, section_name: str, default: Any = None) -> Any:
+        """Load a single section, or default if it was not saved"""
+        return self.load_sections(request_id).get(section_name, default)
+
+    def _read_packed(self, request_id: str) -> Optional[Dict[str, Any]]:
+        path = self.packed_path(request_id)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                document = json.load(f)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError as e:
+            logger.error(f"Corrupt session file {path}: {e}")
+            return None
+        return document.get('sections', {})
+
+    def _read_legacy(self, request_id: str) -> Dict[str, Any]:
+        sections = {}
+        for section_name in SECTION_NAMES:
+            path = os.path.join(self.base_dir, f"{request_id}_{section_name}.json")
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    sections[section_name] = json.load(f)
+            except FileNotFoundError:
+                continue
+            except json.JSONDecodeError as e:
+                logger.error(f"Error decoding JSON from {path}: {e}")
+        if sections:
+            logger.info(f"Loaded {len(sections)} legacy per-section files for request {request_id}")
+        return sections
+
+    def summary(self) -> Dict[str, Any]:
+        data = self._memory.summary()
+        data['base_dir'] = self.base_dir
+        return data
+
+
+_stores: Dict[str, SessionDataStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_session_store(base_dir: str) -> SessionDataStore:
+    """Return the process-wide session store for a temp_session_data directory"""
+    key = os.path.abspath(base_dir)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            from config import Config
+            store = SessionDataStore(key, memory_entries=Config.SESSION_STORE_MEMORY_ENTRIES)
+            _stores[key] = store
+        return store
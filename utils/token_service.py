@@ -0,0 +1,223 @@
+"""
+Design Token Service
+
+This module is the single owner of design_tokens.json and the generated DOCX
+style spec (static/styles/_docx_styles.json). Both files are parsed once per
+content change and every consumer (StyleEngine, StyleManager, the style
+registry, the diagnostics tools) reads the same parsed views instead of each
+re-opening and re-parsing the JSON per call.
+
+Key Features:
+- Raw tokens, DOCX style spec and CSS custom property views parsed once
+- Memoized derived lookups (structured tokens, typography getters) per token version
+- Files re-hashed only when (mtime_ns, size) changes; views invalidated only on a new content hash
+- fingerprint() over both files' content hashes for render caches to key on
+- Returned dicts are shared; callers treat them as read-only
+
+Author: Resume Tailor Team
+Status: Production Ready
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_APP_ROOT = Path(__file__).resolve().parent.parent
+TOKENS_PATH = _APP_ROOT / 'design_tokens.json'
+DOCX_STYLES_PATH = _APP_ROOT / 'static' / 'styles' / '_docx_styles.json'
+
+
+class _Source:
+    """One JSON file with its last seen stat signature, content hash and parsed data."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.signature: Optional[Tuple[int, int]] = None
+        self.digest: Optional[str] = None
+        self.data: Dict[str, Any] = {}
+
+    def stat_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def reload(self, signature: Optional[Tuple[int, int]]) -> bool:
+        """Re-read the file for a new signature; True when its content hash changed"""
+        self.signature = signature
+        if signature is None:
+            digest, raw = 'missing', None
+        else:
+            try:
+                raw = self.path.read_bytes()
+            except OSError:
+                raw = None
+            digest = hashlib.sha256(raw).hexdigest() if raw is not None else 'missing'
+        if digest == self.digest:
+            return False
+
+        self.digest = digest
+        if raw is None:
+            logger.error(f"Design token source not found: {self.path}")
+            self.data = {}
+        else:
+            try:
+                self.data = json.loads(raw.decode('utf-8'))
+                logger.info(f"Loaded design token source {self.path.name} ({digest[:12]})")
+            except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                logger.error(f"Error decoding JSON from {self.path}: {e}")
+                self.data = {}
+        return True
+
+
+class TokenService:
+    """
+    Parsed design tokens and DOCX style spec with memoized derived views.
+
+    Every accessor first checks the source files' (mtime_ns, size); a changed
+    signature re-hashes the file, and only a changed content hash re-parses it,
+    bumps the version and drops the memoized views.
+    """
+
+    def __init__(self, tokens_path: Path = TOKENS_PATH, docx_styles_path: Path = DOCX_STYLES_PATH):
+        self._tokens = _Source(tokens_path)
+        self._docx_styles = _Source(docx_styles_path)
+        self._lock = threading.RLock()
+        self._derived: Dict[Hashable, Any] = {}
+        self._fingerprint: Optional[str] = None
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _refresh(self) -> int:
+        """Pick up source file changes; returns the current version"""
+        sources = (self._tokens, self._docx_styles)
+        signatures = [source.stat_signature() for source in sources]
+        if all(source.signature == signature and source.digest is not None
+               for source, signature in zip(sources, signatures)):
+            return self.version
+
+        with self._lock:
+            changed = False
+            for source, signature in zip(sources, signatures):
+                if source.signature != signature or source.digest is None:
+                    changed = source.reload(signature) or changed
+            if changed:
+                self.version += 1
+                self._derived = {}
+                self._fingerprint = None
+            return self.version
+
+    def tokens(self) -> Dict[str, Any]:
+        """Raw design tokens (design_tokens.json)"""
+        self._refresh()
+        return self._tokens.data
+
+    def docx_styles(self) -> Dict[str, Any]:
+        """DOCX style spec (static/styles/_docx_styles.json)"""
+        self._refresh()
+        return self._docx_styles.data
+
+    def derived(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """
+        Return a view derived from the current sources, building it once per version.
+
+        Args:
+            key: Hashable name of the view or lookup (e.g. ('font_size', 'body', 'pt'))
+            build: Zero-argument callable computing the value from the current sources
+        """
+        version = self._refresh()
+        with self._lock:
+            if key in self._derived:
+                self.hits += 1
+                return self._derived[key]
+        value = build()
+        with self._lock:
+            self.misses += 1
+            # A reload while building means the value may be stale; return it but do not keep it
+            if version == self.version:
+                self._derived.setdefault(key, value)
+        return value
+
+    def css_variables(self) -> Dict[str, Any]:
+        """CSS custom properties (--name: value) for the scalar design tokens"""
+        return self.derived('css_variables', lambda: _flatten_css_variables(self.tokens()))
+
+    def fingerprint(self) -> str:
+        """Hash of both sources' content, stable until either file's content changes"""
+        self._refresh()
+        with self._lock:
+            if self._fingerprint is None:
+                material = {
+                    self._tokens.path.name: self._tokens.digest,
+                    self._docx_styles.path.name: self._docx_styles.digest,
+                }
+                self._fingerprint = hashlib.sha256(
+                    json.dumps(material, sort_keys=True).encode('utf-8')).hexdigest()
+            return self._fingerprint
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'version': self.version,
+            'derived_views': len(self._derived),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+def _flatten_css_variables(tokens: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+    """Flatten nested tokens into --parent-child custom property names"""
+    variables = {}
+    for key, value in tokens.items():
+        name = f"{prefix}-{key}" if prefix else key
+        if isinstance(value, dict):
+            variables.update(_flatten_css_variables(value, name))
+        elif not isinstance(value, list):
+            variables[f"--{name.replace('_', '-')}"] = value
+    return variables
+
+
+_token_service = None
+_token_service_lock = threading.Lock()
+
+
+def get_token_service() -> TokenService:
+    """Return the process-wide token service"""
+    global _token_service
+
+    if _token_service is None:
+        with _token_service_lock:
+            if _token_service is None:
+                _token_service = TokenService()
+    return _token_service
+
+
+def memoized_token_lookup(func):
+    """
+    Memoize a (tokens=None, *args) lookup per token version.
+
+    Calls that pass no tokens, or the service's own tokens dict, are answered
+    from the memo; calls with any other tokens dict are computed as before.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(tokens: Optional[Dict[str, Any]] = None, *args, **kwargs):
+        service = get_token_service()
+        if tokens is not None and tokens is not service.tokens():
+            return func(tokens, *args, **kwargs)
+        # Positional, keyword and defaulted spellings of a lookup share one key
+        bound = signature.bind(None, *args, **kwargs)
+        bound.apply_defaults()
+        key = (func.__qualname__,) + tuple(bound.arguments.values())[1:]
+        return service.derived(key, lambda: func(service.tokens(), *args, **kwargs))
+    return wrapper
@@ -0,0 +1,283 @@
+"""
+Pipeline Tracing
+
+This module provides span-style latency instrumentation for the tailoring
+pipeline (resume extraction, per-section LLM calls, session persistence,
+preview rendering, DOCX builds, index updates).
+
+Key Features:
+- trace_span() context manager / traced() decorator for timing a stage
+- trace_request() binds spans to a request ID via contextvars, so spans
+  opened on worker threads (run through contextvars.copy_context) still
+  land in the right request timeline
+- annotate_span() attaches token counts, bytes written, cache hits, etc.
+- PhaseTimer records consecutive phases of one long function as sibling spans
+- Per-request timelines (bounded LRU) and per-stage latency percentiles
+  over a bounded sample window, exposed through get_tracer()
+
+Author: Resume Tailor Team
+Status: Production Ready
+"""
+
+import contextvars
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_current_trace_id: contextvars.ContextVar = contextvars.ContextVar('trace_id', default=None)
+_current_span: contextvars.ContextVar = contextvars.ContextVar('current_span', default=None)
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+class Span:
+    """One timed pipeline stage."""
+
+    __slots__ = ('name', 'trace_id', 'parent', 'start', 'duration_ms', 'attributes', 'error', 'thread')
+
+    def __init__(self, name: str, trace_id: Optional[str], parent: Optional[str],
+                 attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.parent = parent
+        self.start = time.time()
+        self.duration_ms = 0.0
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self.thread = threading.current_thread().name
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_dict(self, origin: Optional[float] = None) -> Dict[str, Any]:
+        data = {
+            'name': self.name,
+            'parent': self.parent,
+            'start_offset_ms': round((self.start - origin) * 1000, 3) if origin is not None else None,
+            'duration_ms': round(self.duration_ms, 3),
+            'thread': self.thread,
+            'attributes': dict(self.attributes),
+        }
+        if self.error:
+            data['error'] = self.error
+        return data
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(percentile / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class SpanRecorder:
+    """Keeps recent per-request timelines and per-stage latency samples."""
+
+    def __init__(self, max_traces: int = 200, max_spans_per_trace: int = 200,
+                 samples_per_stage: int = 1000):
+        self.max_traces = max_traces
+        self.max_spans_per_trace = max_spans_per_trace
+        self.samples_per_stage = samples_per_stage
+        self._traces: "OrderedDict[str, List[Span]]" = OrderedDict()
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+        self._totals: Dict[str, float] = {}
+        self._errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, span: Span):
+        with self._lock:
+            samples = self._samples.get(span.name)
+            if samples is None:
+                samples = self._samples[span.name] = deque(maxlen=self.samples_per_stage)
+            samples.append(span.duration_ms)
+            self._counts[span.name] = self._counts.get(span.name, 0) + 1
+            self._totals[span.name] = self._totals.get(span.name, 0.0) + span.duration_ms
+            if span.error:
+                self._errors[span.name] = self._errors.get(span.name, 0) + 1
+
+            if span.trace_id is None:
+                return
+            spans = self._traces.get(span.trace_id)
+            if spans is None:
+                spans = self._traces[span.trace_id] = []
+                while len(self._traces) > self.max_traces:
+                    self._traces.popitem(last=False)
+            else:
+                self._traces.move_to_end(span.trace_id)
+            if len(spans) < self.max_spans_per_trace:
+                spans.append(span)
+
+    def timeline(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        """Spans of one request ordered by start time, with offsets from the first span"""
+        with self._lock:
+            spans = list(self._traces.get(trace_id, ()))
+        if not spans:
+            return None
+        spans.sort(key=lambda span: span.start)
+        origin = spans[0].start
+        end = max(span.start + span.duration_ms / 1000 for span in spans)
+        return {
+            'request_id': trace_id,
+            'started_at': origin,
+            'wall_time_ms': round((end - origin) * 1000, 3),
+            'spans': [span.to_dict(origin) for span in spans],
+        }
+
+    def recent_traces(self) -> List[str]:
+        with self._lock:
+            return list(reversed(self._traces))
+
+    def stage_summary(self) -> Dict[str, Any]:
+        """Count, mean and percentiles of the recent samples for every stage"""
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self._samples.items()}
+            counts = dict(self._counts)
+            totals = dict(self._totals)
+            errors = dict(self._errors)
+        summary = {}
+        for name, values in sorted(samples.items()):
+            stage = {
+                'count': counts.get(name, 0),
+                'errors': errors.get(name, 0),
+                'total_ms': round(totals.get(name, 0.0), 3),
+                'window': len(values),
+                'mean_ms': round(sum(values) / len(values), 3) if values else 0.0,
+                'max_ms': round(values[-1], 3) if values else 0.0,
+            }
+            for percentile in PERCENTILES:
+                stage[f'p{percentile}_ms'] = round(_percentile(values, percentile), 3)
+            summary[name] = stage
+        return summary
+
+    def clear(self):
+        with self._lock:
+            self._traces.clear()
+            self._samples.clear()
+            self._counts.clear()
+            self._totals.clear()
+            self._errors.clear()
+
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> SpanRecorder:
+    """Return the process-wide span recorder configured from Config"""
+    global _tracer
+
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                try:
+                    from config import Config
+                    _tracer = SpanRecorder(max_traces=Config.TRACE_MAX_REQUESTS,
+                                           samples_per_stage=Config.TRACE_SAMPLES_PER_STAGE)
+                except Exception as e:
+                    logger.error(f"Failed to read tracing settings, using defaults: {e}")
+                    _tracer = SpanRecorder()
+    return _tracer
+
+
+def current_trace_id() -> Optional[str]:
+    return _current_trace_id.get()
+
+
+@contextmanager
+def trace_request(trace_id: Optional[str]):
+    """Bind spans opened in this context (and copied contexts) to a request ID"""
+    if trace_id is None or _current_trace_id.get() == trace_id:
+        yield
+        return
+    token = _current_trace_id.set(trace_id)
+    try:
+        yield
+    finally:
+        _current_trace_id.reset(token)
+
+
+@contextmanager
+def trace_span(name: str, **attributes):
+    """
+    Time a pipeline stage.
+
+    Args:
+        name: Stage name used for the timeline and the percentile summary
+        **attributes: Initial span attributes (section, provider, ...)
+
+    Yields:
+        The Span; call span.set(...) to attach more attributes
+    """
+    parent = _current_span.get()
+    span = Span(name, _current_trace_id.get(), parent.name if parent else None, attributes)
+    token = _current_span.set(span)
+    started = time.perf_counter()
+    try:
+        yield span
+    except BaseException as e:
+        span.error = type(e).__name__
+        raise
+    finally:
+        span.duration_ms = (time.perf_counter() - started) * 1000
+        _current_span.reset(token)
+        try:
+            get_tracer().record(span)
+        except Exception as e:
+            logger.warning(f"Failed to record span {name}: {e}")
+
+
+def traced(name: Optional[str] = None):
+    """Decorator form of trace_span; the stage name defaults to the function name"""
+    def decorator(func):
+        stage = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with trace_span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class PhaseTimer:
+    """
+    Time consecutive phases of one long function without nesting each in a block.
+
+    Each mark(phase) records a span named "<prefix>.<phase>" covering the time
+    since the previous mark (or since the timer was created).
+    """
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        parent = _current_span.get()
+        self._parent = parent.name if parent else None
+        self._started = time.perf_counter()
+        self._wall_start = time.time()
+
+    def mark(self, phase: str, **attributes):
+        now = time.perf_counter()
+        span = Span(f"{self.prefix}.{phase}", _current_trace_id.get(), self._parent, attributes)
+        span.start = self._wall_start
+        span.duration_ms = (now - self._started) * 1000
+        self._started = now
+        self._wall_start = time.time()
+        try:
+            get_tracer().record(span)
+        except Exception as e:
+            logger.warning(f"Failed to record phase {span.name}: {e}")
+
+
+def annotate_span(**attributes):
+    """Attach attributes to the innermost open span, if any"""
+    span = _current_span.get()
+    if span is not None:
+        span.set(**attributes)
@@ -349,6 +349,15 @@ class StyleRegistry:
         """
         return self._styles.get(style_name)
     
+    def names(self) -> List[str]:
+        """
+        List the names of all registered styles.
+        
+        Returns:
+            Style names in registration order
+        """
+        return list(self._styles)
+    
     def apply_compatibility_settings(self, doc: Document):
         """
         Apply Word compatibility settings to the document.
@@ -493,6 +502,22 @@ def get_or_create_style(style_name: str, doc: Document) -> str:
         logger.error(traceback.format_exc())
         return "Normal"  # Fallback
 
+def create_registered_styles(doc: Document) -> List[str]:
+    """
+    Create every registry style in the document up front.
+    
+    Used when preparing the shared styled template so later
+    get_or_create_style calls find the styles already present.
+    
+    Args:
+        doc: Document to create the styles in
+        
+    Returns:
+        Names of the styles now available
+    """
+    return [get_or_create_style(style_name, doc) for style_name in _registry.names()]
+
+
 def apply_direct_paragraph_formatting(paragraph, style_name: str):
     """
     Apply direct formatting to a paragraph based on a registered style.
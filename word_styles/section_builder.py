@@ -371,19 +371,16 @@ def remove_empty_paragraphs(doc: Document) -> int:
     """
     removed_count = 0
     
-    # We need to work backwards since removing elements changes indices
-    for i in range(len(doc.paragraphs) - 1, -1, -1):
-        para = doc.paragraphs[i]
-        
+    # Build the paragraph list once; removing elements does not affect the
+    # proxies already collected. The last paragraph always stays (Word needs one).
+    for para in doc.paragraphs[:-1]:
         # Check if paragraph is empty (no text or only whitespace)
         if not para.text.strip():
-            # Don't remove if it's the last paragraph (Word needs at least one)
-            if i < len(doc.paragraphs) - 1:
-                p_element = para._element
-                parent = p_element.getparent()
-                if parent is not None:
-                    parent.remove(p_element)
-                    removed_count += 1
+            p_element = para._element
+            parent = p_element.getparent()
+            if parent is not None:
+                parent.remove(p_element)
+                removed_count += 1
     
     logger.info(f"Removed {removed_count} empty paragraphs")
     return removed_count